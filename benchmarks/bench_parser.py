@@ -0,0 +1,88 @@
+"""
+Benchmarks of the FirstCycling HTML parser on large race pages.
+
+Measures ``parse_firstcycling_html`` on every page in
+benchmarks/fixtures/firstcycling/ (Grand Tour GC, stage and startlist pages
+with 150-200 riders and several tables, generated by
+``benchmarks/fixtures/generate_firstcycling_pages.py``). Each case records
+parse time, peak memory and the number of riders parsed.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_parser
+    python -m benchmarks.bench_parser --case grand_tour_gc --repeat 20
+    python -m benchmarks.bench_parser --save-baseline
+
+Exits with code 1 when a page regresses beyond the tolerance against the
+baseline (benchmarks/baselines/parser.json by default).
+"""
+
+import os
+import sys
+
+from benchmarks import harness
+from benchmarks.fixtures.generate_firstcycling_pages import FIXTURES_DIR
+from src import api
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+SUITE = 'parser'
+DEFAULT_REPEAT = 5
+
+
+def load_pages(fixtures_dir=FIXTURES_DIR):
+    """
+    Load the fixture pages.
+
+    Args:
+        fixtures_dir (str): Directory with the .html fixtures
+
+    Returns:
+        dict: Page name (file name without extension) -> HTML text
+    """
+    pages = {}
+    for file_name in sorted(os.listdir(fixtures_dir)):
+        if file_name.endswith('.html'):
+            with open(os.path.join(fixtures_dir, file_name), 'r', encoding='utf-8') as f:
+                pages[file_name[:-len('.html')]] = f.read()
+    return pages
+
+
+def run_suite(repeat=DEFAULT_REPEAT, cases=None, fixtures_dir=FIXTURES_DIR):
+    """
+    Run the parser benchmarks.
+
+    Args:
+        repeat (int): Timing runs per page
+        cases (list, optional): Only run these page names
+        fixtures_dir (str): Directory with the .html fixtures
+
+    Returns:
+        dict: Results document (see harness.build_results)
+    """
+    measured = {}
+    for page, html in load_pages(fixtures_dir).items():
+        if cases and page not in cases:
+            continue
+        cyclists, success, error = api.parse_firstcycling_html(html)
+        if not success:
+            raise RuntimeError(f"Parsing {page} failed: {error}")
+
+        case_name = f"parse_firstcycling_html[{page}]"
+        logger.info(f"⏱️  {case_name}")
+        measured[case_name] = dict(harness.measure(lambda _: api.parse_firstcycling_html(html), repeat=repeat),
+                                   html_bytes=len(html.encode('utf-8')), riders=len(cyclists))
+    return harness.build_results(SUITE, measured, harness.calibrate())
+
+
+def main(argv=None):
+    parser = harness.create_parser(SUITE, 'Benchmark the FirstCycling HTML parser on large race pages')
+    parser.set_defaults(repeat=DEFAULT_REPEAT)
+    args = parser.parse_args(argv)
+
+    harness.quiet_logging(logger)
+    return harness.finish(args, run_suite(args.repeat, args.cases))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+End-to-end benchmarks of the processing pipeline on synthetic namespaces.
+
+Builds one synthetic namespace per size (see ``api.generate_synthetic_namespace``)
+in a temporary data directory and measures the pipeline steps against copies
+of it, so every run starts from the same state:
+
+- import_cyclists_from_db      init_cdb.sqlite -> stats.yaml
+- process_new_change_files     pending changes -> inserts.sql + stats.yaml
+- process_uat_namespace        inserts.sql -> tracking database + CSV export
+- export_tracking_data         tracking database -> CSV export
+- validate_yaml_files          all change files and stats.yaml
+- create_automated_change_file one 200-rider race against stats.yaml
+- process_automated_change_request
+                               a [STATS CR] issue for the grand_tour_gc fixture page,
+                               replayed from a cassette (PCM_FETCH_MODE=replay)
+
+Usage (from the repository root):
+    python -m benchmarks.bench_pipeline --sizes 1k,10k
+    python -m benchmarks.bench_pipeline --sizes 1k,10k,100k --repeat 1
+    python -m benchmarks.bench_pipeline --save-baseline
+
+Exits with code 1 when a case regresses beyond the tolerance against the
+baseline (benchmarks/baselines/pipeline.json by default).
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks import harness
+from benchmarks.fixtures.generate_firstcycling_pages import FIXTURES_DIR
+from src import api
+from src.utils import cassettes, commons
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+SUITE = 'pipeline'
+NAMESPACE = 'bench'
+DEFAULT_SIZES = '1k,10k'
+PROJECT_ROOT = os.path.dirname(harness.BENCHMARKS_DIR)
+
+# Workload per size: a fixed number of changes whose size grows with the namespace
+PENDING_CHANGES = 5
+HISTORY_CHANGES = 3
+RACE_RIDERS = 200
+REPLAYED_RACE_URL = 'https://firstcycling.com/race.php?r=17&y=2025&k=8'
+REPLAYED_PAGE = 'grand_tour_gc'
+
+
+def parse_size(value):
+    """Parse a size like '10k' or '2500' into a number of cyclists."""
+    value = value.strip().lower()
+    if value.endswith('k'):
+        return int(float(value[:-1]) * 1000)
+    return int(value)
+
+
+def size_label(cyclists):
+    """Format a number of cyclists like the --sizes option ('10k')."""
+    return f"{cyclists // 1000}k" if cyclists % 1000 == 0 else str(cyclists)
+
+
+class PipelineFixture:
+    """Synthetic namespace states for one size, copied into a fresh data directory per run."""
+
+    def __init__(self, work_dir, cyclists, seed):
+        self.work_dir = work_dir
+        self.cyclists = cyclists
+        self.seed = seed
+        self.stats_per_change = max(10, cyclists // 20)
+        self.templates = {}
+        self._run = 0
+
+    def build(self):
+        """Generate the namespace and snapshot it before and after each pipeline step."""
+        self.use(self._template_path('generated'))
+        api.generate_synthetic_namespace(
+            NAMESPACE, cyclists=self.cyclists, changes=PENDING_CHANGES, stats_per_change=self.stats_per_change,
+            history_depth=HISTORY_CHANGES, seed=self.seed)
+        self.templates['generated'] = commons.DATA_PATH
+
+        self.templates['processed'] = self._snapshot('generated', 'processed')
+        api.process_new_change_files(NAMESPACE)
+
+        self.templates['applied'] = self._snapshot('processed', 'applied')
+        api.process_uat_namespace(NAMESPACE)
+
+    def fresh(self, state):
+        """Copy a template into a new data directory and make it the active one."""
+        self._run += 1
+        return self.use(self._copy(self.templates[state], os.path.join(self.work_dir, f"run-{self._run}")))
+
+    def use(self, data_path):
+        commons.DATA_PATH = data_path
+        return data_path
+
+    def record_race_page(self):
+        """Write a cassette with the Selenium fetch of the replayed race page, and return its directory."""
+        cassette_dir = os.path.join(self.work_dir, 'cassettes')
+        with open(os.path.join(FIXTURES_DIR, f"{REPLAYED_PAGE}.html"), 'r', encoding='utf-8') as f:
+            page = f.read()
+        cassettes.record(cassettes.KIND_SELENIUM, api.normalize_race_url(REPLAYED_RACE_URL),
+                         dict(status=200, headers={}, **cassettes.encode_body(page)), directory=cassette_dir)
+        return cassette_dir
+
+    def init_cdb_path(self):
+        return os.path.join(self.templates['generated'], NAMESPACE, 'init_cdb.sqlite')
+
+    def race_riders(self):
+        """Scraped riders of one race: mostly known FirstCycling IDs plus a few unknown ones."""
+        stats_data = api.load_stats_data(NAMESPACE)
+        known = [cyclist for cyclist in stats_data.values() if cyclist.get('first_cycling_id')]
+        riders = [{'name': cyclist['name'], 'first_cycling_id': cyclist['first_cycling_id']}
+                  for cyclist in known[::max(1, len(known) // RACE_RIDERS)][:RACE_RIDERS - 10]]
+        riders.extend({'name': f'Unknown Rider {i}', 'first_cycling_id': 900000000 + i} for i in range(10))
+        return riders
+
+    def _template_path(self, state):
+        return os.path.join(self.work_dir, state)
+
+    def _snapshot(self, source, state):
+        return self.use(self._copy(self.templates[source], self._template_path(state)))
+
+    @staticmethod
+    def _copy(source, destination):
+        if os.path.exists(destination):
+            shutil.rmtree(destination)
+        shutil.copytree(source, destination)
+        return destination
+
+
+def pipeline_cases(fixture):
+    """
+    Define the benchmark cases of one size.
+
+    Args:
+        fixture (PipelineFixture): Built fixture
+
+    Returns:
+        list: (name, setup, run) tuples
+    """
+    def fresh(state):
+        return lambda: fixture.fresh(state)
+
+    def setup_import():
+        fixture.fresh('generated')
+        os.remove(commons.get_path(NAMESPACE, 'stats_file'))
+        return fixture.init_cdb_path()
+
+    def run_import(db_file):
+        assert api.import_cyclists_from_db(NAMESPACE, db_file)
+
+    def run_process(_):
+        api.process_new_change_files(NAMESPACE)
+
+    def run_uat(_):
+        assert api.process_uat_namespace(NAMESPACE)['success']
+
+    def run_export(_):
+        conn = api.get_database_connection(NAMESPACE)
+        try:
+            assert api.export_tracking_data(NAMESPACE, conn.cursor())
+        finally:
+            conn.close()
+
+    def run_validate(_):
+        api.validate_yaml_files()
+
+    fixture.use(fixture.templates['generated'])
+    riders = fixture.race_riders()
+    form_data = {'author': 'benchmark', 'date': '2025-08-01', 'description': 'Benchmark race',
+                 'race_url': 'https://firstcycling.com/race.php?r=17&y=2025&k=8'}
+
+    def run_automated(_):
+        _, success, error = api.create_automated_change_file(NAMESPACE, 'benchmark-race', form_data, riders)
+        assert success, error
+
+    cassette_dir = fixture.record_race_page()
+    issue_body = (f"### Change Name\nBenchmark race\n\n### Date\n2025-08-01\n\n### Author\nbenchmark\n\n"
+                  f"### Race URL\n{REPLAYED_RACE_URL}\n\n### Namespace\n{NAMESPACE}\n")
+
+    def setup_replay():
+        fixture.fresh('generated')
+        cassettes.reset()
+
+    def run_replayed_request(_):
+        # Replaying keeps the case offline and deterministic: no browser, network or sleeps
+        environment = {'PCM_FETCH_MODE': cassettes.MODE_REPLAY, 'PCM_CASSETTE_DIR': cassette_dir}
+        original = {name: os.environ.get(name) for name in environment}
+        os.environ.update(environment)
+        try:
+            result = api.process_automated_change_request(issue_body)
+        finally:
+            for name, value in original.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        assert result['success'], result['error']
+
+    return [
+        ('import_cyclists_from_db', setup_import, run_import),
+        ('process_new_change_files', fresh('generated'), run_process),
+        ('process_uat_namespace', fresh('processed'), run_uat),
+        ('export_tracking_data', fresh('applied'), run_export),
+        ('validate_yaml_files', fresh('processed'), run_validate),
+        ('create_automated_change_file', fresh('generated'), run_automated),
+        ('process_automated_change_request', setup_replay, run_replayed_request)
+    ]
+
+
+def run_suite(sizes, repeat=harness.DEFAULT_REPEAT, seed=2025, cases=None):
+    """
+    Run the pipeline benchmarks.
+
+    Args:
+        sizes (list): Numbers of cyclists
+        repeat (int): Timing runs per case
+        seed (int): Seed of the synthetic namespaces
+        cases (list, optional): Only run these case names
+
+    Returns:
+        dict: Results document (see harness.build_results)
+    """
+    original_data_path = commons.DATA_PATH
+    original_model_dir_path = commons.MODEL_DIR_PATH
+    commons.MODEL_DIR_PATH = os.path.join(PROJECT_ROOT, 'src', 'model')
+    measured = {}
+    try:
+        for cyclists in sizes:
+            label = size_label(cyclists)
+            work_dir = tempfile.mkdtemp(prefix=f"pcm_bench_{label}_")
+            try:
+                logger.info(f"🧪 Building synthetic namespace with {cyclists} cyclists...")
+                fixture = PipelineFixture(work_dir, cyclists, seed)
+                fixture.build()
+                for name, setup, run in pipeline_cases(fixture):
+                    if cases and name not in cases:
+                        continue
+                    case_name = f"{name}[{label}]"
+                    logger.info(f"⏱️  {case_name}")
+                    measured[case_name] = harness.measure(run, setup, repeat)
+            finally:
+                commons.DATA_PATH = original_data_path
+                shutil.rmtree(work_dir, ignore_errors=True)
+    finally:
+        commons.DATA_PATH = original_data_path
+        commons.MODEL_DIR_PATH = original_model_dir_path
+
+    return harness.build_results(SUITE, measured, harness.calibrate())
+
+
+def main(argv=None):
+    parser = harness.create_parser(SUITE, 'Benchmark the PCM processing pipeline on synthetic namespaces')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'Comma-separated cyclist counts (default: {DEFAULT_SIZES})')
+    parser.add_argument('--seed', type=int, default=2025, help='Seed of the synthetic namespaces')
+    args = parser.parse_args(argv)
+
+    harness.quiet_logging(logger)
+    results = run_suite([parse_size(size) for size in args.sizes.split(',')], args.repeat, args.seed, args.cases)
+    return harness.finish(args, results)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
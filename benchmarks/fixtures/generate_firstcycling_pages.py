@@ -0,0 +1,235 @@
+"""
+Generate the FirstCycling race page fixtures used by the parser benchmark.
+
+The pages mimic the ``pcm=1`` markup of firstcycling.com (see
+tests/test_firstcycling_parser.py): page chrome with navigation links, a
+results or startlist table per section with one PCM stat column per stat, and
+side tables (jerseys, teams) that link the same riders again. All content
+comes from a seeded random generator, so regenerating gives identical files.
+
+Usage (from the repository root):
+    python -m benchmarks.fixtures.generate_firstcycling_pages
+"""
+
+import os
+from html import escape
+
+from src.utils import synthetic
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'firstcycling')
+SEED = 2025
+
+# (header abbreviation, header title) of the PCM stat columns shown with pcm=1
+PCM_COLUMNS = [
+    ('FLA', 'FLAT | Power on the flat (mixed with MTN/MM/HIL on 0-7% slopes)'),
+    ('MTN', 'MOUNTAIN | 30+ min uphill power'),
+    ('MM', 'MEDIUM MOUNTAIN | ~15 min uphill power'),
+    ('HIL', 'HILL | ~5 min uphill power'),
+    ('TTR', 'TIMETRIAL | Flat timetrialing (10-15+ km) ability'),
+    ('PRL', 'PROLOGUE | Short flat timetrialing ability'),
+    ('COB', 'COBBLES | Skill to ride on cobbles (especially 3* - 5*)'),
+    ('SPR', 'SPRINT | Sprintpower & attacks on the flat'),
+    ('ACC', 'ACCELERATION | How fast a rider can accelerate to the maximum power'),
+    ('DHI', 'DOWNHILL | Technical downhill skills'),
+    ('ATT', 'ATTACKING | Attacking frequency'),
+    ('STA', 'STAMINA | Aerobic efforts at the end of hard races'),
+    ('RES', 'RESISTENCE | Anaerobic efforts at the end of hard races'),
+    ('REC', 'RECUPERATION | Day-to-day energy recovery'),
+]
+
+COUNTRIES = ['be', 'ch', 'co', 'de', 'dk', 'es', 'fr', 'gb', 'it', 'nl', 'no', 'pt', 'si', 'us']
+
+TEAM_NAMES = [
+    'Alpecin - Deceuninck', 'Arkea - B&B Hotels', 'Astana Qazaqstan', 'Bahrain - Victorious', 'Cofidis',
+    'Decathlon AG2R', 'EF Education - EasyPost', 'Groupama - FDJ', 'INEOS Grenadiers', 'Intermarche - Wanty',
+    'Lidl - Trek', 'Movistar Team', 'Picnic PostNL', 'Red Bull - BORA', 'Soudal Quick-Step',
+    'Team Jayco AlUla', 'Team Visma | Lease a Bike', 'UAE Team Emirates', 'Uno-X Mobility', 'XDS Astana',
+    'Israel - Premier Tech', 'Tudor Pro Cycling', 'Q36.5 Pro Cycling', 'TotalEnergies', 'Caja Rural'
+]
+
+# name, title, riders per team, teams, extra stage/jersey tables
+PAGES = [
+    ('grand_tour_gc', 'Tour de France 2025 - General Classification', 8, 23, 4),
+    ('grand_tour_startlist', 'Giro d\'Italia 2025 - Startlist', 8, 23, 0),
+    ('grand_tour_stage', 'Vuelta a Espana 2025 - Stage 21', 8, 22, 6),
+    ('one_day_startlist', 'Paris-Roubaix 2025 - Startlist', 7, 25, 0),
+    ('stage_race_gc', 'Tour de Suisse 2025 - General Classification', 7, 22, 3),
+]
+
+
+def _rider_link(rider):
+    href = escape(f"rider.php?r={rider['id']}&y=2025")
+    return (f'<a href="{href}" title="{escape(rider["first"])} {escape(rider["last"])}">'
+            f'<span style="text-transform:uppercase;">{escape(rider["last"])}</span> {escape(rider["first"])}</a>')
+
+
+def _team_link(team_id, team_name):
+    return f'<a href="team.php?l={team_id}&amp;y=2025">{escape(team_name)}</a>'
+
+
+def _pcm_header():
+    cells = ''.join(f'\t\t\t<th style="text-align:center;" title="{escape(title)}">{abbreviation}</th>\n'
+                    for abbreviation, title in PCM_COLUMNS)
+    return cells
+
+
+def _pcm_cells(rider):
+    return ''.join(f'\t\t\t<td align="center"><span class="pcmBox pcm{value}">{value}</span></td>\n'
+                   for value in rider['stats'])
+
+
+def _results_table(riders, css_class, with_time):
+    lines = [f'\t<table class="{css_class}">', '\t\t<thead>', '\t\t\t<tr>',
+             "\t\t\t<th width='3%'>#</th>", '\t\t\t<th>Rider</th>', '\t\t\t<th>Team</th>']
+    if with_time:
+        lines.append('\t\t\t<th>Time</th>')
+    lines.append(_pcm_header() + '\t\t\t</tr>')
+    lines.extend(['\t\t</thead>', '\t\t<tbody>'])
+    for position, rider in enumerate(riders, 1):
+        row = ['\t\t\t<tr>', f'\t\t\t<td>{position} </td>',
+               f'\t\t\t<td>\n\t\t\t\t<span class="flag flag-{rider["country"]}"></span>\n\t\t\t\t{_rider_link(rider)}\n\t\t\t</td>',
+               f'\t\t\t<td>{_team_link(rider["team_id"], rider["team"])}</td>']
+        if with_time:
+            row.append(f'\t\t\t<td align="right">{rider["gap"]}</td>')
+        row.append(_pcm_cells(rider) + '\t\t\t</tr>')
+        lines.extend(row)
+    lines.extend(['\t\t</tbody>', '\t</table>'])
+    return '\n'.join(lines)
+
+
+def _startlist_tables(teams):
+    sections = []
+    for team_id, team_name, riders in teams:
+        sections.append(f'<div class="team-box">\n\t<h3>{_team_link(team_id, team_name)}</h3>')
+        sections.append(_results_table(riders, 'tablesorter startlist', with_time=False))
+        sections.append('</div>')
+    return '\n'.join(sections)
+
+
+def _side_table(title, riders):
+    rows = '\n'.join(f'\t\t<tr><td>{position}</td><td>{_rider_link(rider)}</td><td>{rider["points"]}</td></tr>'
+                     for position, rider in enumerate(riders, 1))
+    return (f'<table class="sidebar">\n\t<thead><tr><th colspan="3">{escape(title)}</th></tr></thead>\n'
+            f'\t<tbody>\n{rows}\n\t</tbody>\n</table>')
+
+
+def _page_chrome(title, body):
+    menu = '\n'.join(f'\t\t<li><a href="race.php?r={race_id}&amp;y=2025">Race {race_id}</a></li>'
+                     for race_id in range(1, 121))
+    news = '\n'.join(f'\t\t<li><a href="news.php?id={news_id}">News item {news_id}</a></li>'
+                     for news_id in range(1, 41))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <title>{escape(title)} | FirstCycling</title>
+  <meta http-equiv="Content-Type" content="text/html; charset=UTF-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <link rel="stylesheet" href="css/style.css?v=42">
+  <script src="js/jquery.min.js"></script>
+  <script>
+    var raceSettings = {{"pcm": 1, "sort": "position", "lang": "en"}};
+    function toggleMenu(id) {{ document.getElementById(id).classList.toggle('open'); }}
+  </script>
+</head>
+<body>
+<div id="header">
+	<ul class="menu">
+{menu}
+	</ul>
+</div>
+<div id='wrapper'>
+<h1>{escape(title)}</h1>
+{body}
+</div>
+<div id="footer">
+	<ul class="news">
+{news}
+	</ul>
+	<p>&copy; FirstCycling 2025</p>
+</div>
+</body>
+</html>
+"""
+
+
+def _generate_riders(rng, riders_per_team, team_count):
+    rider_ids = rng.sample(range(10000, 400000), riders_per_team * team_count)
+    teams = []
+    for team_index in range(team_count):
+        team_id = 1000 + team_index
+        team_name = TEAM_NAMES[team_index % len(TEAM_NAMES)]
+        riders = []
+        for _ in range(riders_per_team):
+            riders.append({
+                'id': rider_ids.pop(),
+                'first': rng.choice(synthetic.FIRST_NAMES),
+                'last': rng.choice(synthetic.LAST_NAMES),
+                'country': rng.choice(COUNTRIES),
+                'team_id': team_id,
+                'team': team_name,
+                'stats': [rng.randint(synthetic.MIN_STAT, synthetic.MAX_STAT) for _ in PCM_COLUMNS],
+                'points': rng.randint(0, 350)
+            })
+        teams.append((team_id, team_name, riders))
+    return teams
+
+
+def build_page(rng, title, riders_per_team, team_count, side_tables):
+    """
+    Build one race page.
+
+    Args:
+        rng (random.Random): Seeded random generator
+        title (str): Page title
+        riders_per_team (int): Riders per team
+        team_count (int): Number of teams
+        side_tables (int): Number of extra jersey/stage tables (0 builds a startlist page)
+
+    Returns:
+        tuple: (html, number of unique riders on the page)
+    """
+    teams = _generate_riders(rng, riders_per_team, team_count)
+    riders = [rider for _, _, team_riders in teams for rider in team_riders]
+
+    if not side_tables:
+        return _page_chrome(title, _startlist_tables(teams)), len(riders)
+
+    ranking = rng.sample(riders, len(riders))
+    gap = 0
+    for rider in ranking:
+        gap += rng.randint(0, 95)
+        rider['gap'] = f"+ {gap // 3600:02d}:{gap // 60 % 60:02d}:{gap % 60:02d}"
+
+    sections = [_results_table(ranking, 'tablesorter sort', with_time=True)]
+    jerseys = ['Points classification', 'Mountains classification', 'Youth classification',
+               'Stage results', 'Combativity', 'Intermediate sprints']
+    for index in range(side_tables):
+        sections.append(_side_table(jerseys[index % len(jerseys)], rng.sample(riders, min(40, len(riders)))))
+    return _page_chrome(title, '\n'.join(sections)), len(riders)
+
+
+def generate_pages(output_dir=FIXTURES_DIR, seed=SEED):
+    """
+    Write all fixture pages.
+
+    Args:
+        output_dir (str): Destination directory
+        seed (int): Random seed
+
+    Returns:
+        dict: Page name -> number of unique riders
+    """
+    rng = synthetic.create_rng(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    rider_counts = {}
+    for name, title, riders_per_team, team_count, side_tables in PAGES:
+        html, rider_count = build_page(rng, title, riders_per_team, team_count, side_tables)
+        with open(os.path.join(output_dir, f'{name}.html'), 'w', encoding='utf-8', newline='\n') as f:
+            f.write(html)
+        rider_counts[name] = rider_count
+    return rider_counts
+
+
+if __name__ == '__main__':
+    for page, count in generate_pages().items():
+        print(f"{page}: {count} riders")
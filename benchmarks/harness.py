@@ -0,0 +1,321 @@
+"""
+Shared benchmark harness: measurement, JSON results and baseline comparison.
+
+Each benchmark case is a ``setup`` callable that prepares fresh state and
+returns the argument of ``run``, the code being measured. Timing runs use
+``time.perf_counter`` without tracing; peak memory comes from one extra run
+under tracemalloc, so tracing overhead never leaks into the timings.
+
+Every results document also records the time of a fixed calibration workload
+(``calibrate``). Baseline timings are scaled by the ratio of the calibration
+times before they are compared, so a baseline recorded on a faster or slower
+machine still catches relative slowdowns.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import yaml
+
+from src.utils.logs import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_VERSION = 1
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+
+# Timings below this are dominated by noise and never count as regressions
+MIN_COMPARED_SECONDS = 0.005
+
+CALIBRATION_REPEAT = 5
+CALIBRATION_CYCLISTS = 50
+STAT_NAMES = ('fla', 'mo', 'mm', 'dh', 'cob', 'tt', 'prl', 'spr', 'acc', 'end', 'res', 'rec', 'hil', 'att')
+
+
+def measure(run, setup=None, repeat=DEFAULT_REPEAT):
+    """
+    Measure the wall time and peak traced memory of a benchmark case.
+
+    Args:
+        run (callable): Code to measure, called with the value returned by setup
+        setup (callable, optional): Prepares fresh state before every run (not measured)
+        repeat (int): Number of timing runs
+
+    Returns:
+        dict: min/median wall time in seconds, peak traced memory in bytes and repeat count
+    """
+    timings = []
+    for _ in range(max(1, repeat)):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+
+    state = setup() if setup else None
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+            tracemalloc.reset_peak()
+        baseline_memory = tracemalloc.get_traced_memory()[0]
+        run(state)
+        peak_memory = tracemalloc.get_traced_memory()[1] - baseline_memory
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    return {
+        'wall_time_min': round(min(timings), 6),
+        'wall_time_median': round(statistics.median(timings), 6),
+        'peak_memory_bytes': max(0, peak_memory),
+        'repeat': len(timings)
+    }
+
+
+def calibrate(repeat=CALIBRATION_REPEAT):
+    """
+    Time a fixed workload that stands for the speed of the machine.
+
+    The workload dumps and loads a small stats mapping with the pure-Python
+    YAML dumper and loader, like most of the pipeline.
+
+    Args:
+        repeat (int): Number of timing runs
+
+    Returns:
+        float: Minimum wall time of the workload in seconds
+    """
+    stats_data = {
+        str(pcm_id): {
+            'name': f'Cyclist {pcm_id}',
+            'first_cycling_id': pcm_id * 7,
+            'stats': {stat_name: 60 + (pcm_id * index) % 20 for index, stat_name in enumerate(STAT_NAMES)}
+        }
+        for pcm_id in range(CALIBRATION_CYCLISTS)
+    }
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        yaml.load(yaml.dump(stats_data, Dumper=yaml.SafeDumper), Loader=yaml.SafeLoader)
+        timings.append(time.perf_counter() - start)
+    return round(min(timings), 6)
+
+
+def environment_info():
+    """Describe the machine the results were recorded on."""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def build_results(suite, cases, calibration_seconds=None):
+    """
+    Wrap measured cases in a results document.
+
+    Args:
+        suite (str): Suite name (e.g. 'pipeline')
+        cases (dict): Case name (e.g. 'process_new_change_files[10k]') -> measure() result
+        calibration_seconds (float, optional): Time of the calibration workload (see calibrate)
+
+    Returns:
+        dict: Results document as written to JSON
+    """
+    results = {
+        'version': RESULTS_VERSION,
+        'suite': suite,
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'cases': cases
+    }
+    if calibration_seconds:
+        results['calibration_seconds'] = calibration_seconds
+    return results
+
+
+def write_results(file_path, results):
+    """
+    Write a results document to a JSON file (parent directories are created).
+
+    Args:
+        file_path (str): Destination path
+        results (dict): Results document from build_results
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_results(file_path):
+    """
+    Load a results document, or None if the file does not exist.
+
+    Args:
+        file_path (str): Path of the JSON file
+
+    Returns:
+        dict: Results document or None
+    """
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare results with a baseline.
+
+    A case regresses when its minimum wall time or its peak memory exceeds the
+    baseline by more than ``tolerance`` (0.25 = 25%). Baseline wall times are
+    first scaled by the ratio of the calibration times when both documents
+    have one. Cases missing from the baseline are reported as new and never fail.
+
+    Args:
+        results (dict): Current results document
+        baseline (dict): Baseline results document
+        tolerance (float): Allowed relative increase
+
+    Returns:
+        dict: 'regressions', 'improvements' and 'new_cases' lists, and the 'machine_scale' applied
+    """
+    machine_scale = 1.0
+    if results.get('calibration_seconds') and baseline.get('calibration_seconds'):
+        machine_scale = results['calibration_seconds'] / baseline['calibration_seconds']
+    comparison = {'regressions': [], 'improvements': [], 'new_cases': [], 'machine_scale': round(machine_scale, 4)}
+    baseline_cases = baseline.get('cases', {})
+
+    for case_name in sorted(results['cases']):
+        current = results['cases'][case_name]
+        previous = baseline_cases.get(case_name)
+        if previous is None:
+            comparison['new_cases'].append(case_name)
+            continue
+
+        for metric, minimum in (('wall_time_min', MIN_COMPARED_SECONDS), ('peak_memory_bytes', 0)):
+            old_value = previous.get(metric)
+            new_value = current.get(metric)
+            if old_value and metric == 'wall_time_min':
+                old_value = round(old_value * machine_scale, 6)
+            if not old_value or new_value is None or max(old_value, new_value) < minimum:
+                continue
+            change = (new_value - old_value) / old_value
+            entry = {'case': case_name, 'metric': metric, 'baseline': old_value, 'current': new_value,
+                     'change': round(change, 4)}
+            if change > tolerance:
+                comparison['regressions'].append(entry)
+            elif change < -tolerance:
+                comparison['improvements'].append(entry)
+
+    return comparison
+
+
+def report_comparison(comparison, tolerance):
+    """Log a baseline comparison and return True when there are no regressions."""
+    machine_scale = comparison.get('machine_scale', 1.0)
+    if machine_scale != 1.0:
+        logger.info(f"⚖️  Baseline timings scaled by {machine_scale:.2f} (calibration workload on this machine)")
+    for entry in comparison['improvements']:
+        logger.info(f"🚀 {entry['case']} {entry['metric']}: {entry['baseline']} -> {entry['current']} "
+                    f"({entry['change']:+.1%})")
+    for case_name in comparison['new_cases']:
+        logger.warning(f"⚠️  {case_name}: not in baseline")
+    for entry in comparison['regressions']:
+        logger.error(f"❌ REGRESSION {entry['case']} {entry['metric']}: {entry['baseline']} -> {entry['current']} "
+                     f"({entry['change']:+.1%}, tolerance {tolerance:.0%})")
+
+    if comparison['regressions']:
+        logger.error(f"❌ {len(comparison['regressions'])} performance regression(s) against the baseline")
+        return False
+    logger.info(f"✅ No regressions beyond {tolerance:.0%} against the baseline")
+    return True
+
+
+def format_table(cases):
+    """Format measured cases as a fixed-width text table."""
+    lines = [f"{'case':<48} {'min (s)':>10} {'median (s)':>11} {'peak mem (MiB)':>15}"]
+    for case_name in sorted(cases):
+        case = cases[case_name]
+        lines.append(f"{case_name:<48} {case['wall_time_min']:>10.4f} {case['wall_time_median']:>11.4f} "
+                     f"{case['peak_memory_bytes'] / (1024 * 1024):>15.2f}")
+    return "\n".join(lines)
+
+
+def print_table(cases):
+    """Print measured cases to stdout."""
+    sys.stdout.write(format_table(cases) + "\n")
+
+
+def create_parser(suite, description):
+    """
+    Create an argument parser with the options shared by all suites.
+
+    Args:
+        suite (str): Suite name, used for the default results and baseline paths
+        description (str): Parser description
+
+    Returns:
+        argparse.ArgumentParser: Parser with --repeat, --case, --output, --baseline, --tolerance, --save-baseline
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timing runs per case')
+    parser.add_argument('--case', action='append', dest='cases', help='Only run this case (repeatable)')
+    parser.add_argument('--output', default=os.path.join(BENCHMARKS_DIR, 'results', f'{suite}.json'),
+                        help='Results JSON file')
+    parser.add_argument('--baseline', default=os.path.join(BENCHMARKS_DIR, 'baselines', f'{suite}.json'),
+                        help='Baseline JSON file to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed relative slowdown or memory growth (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results to the baseline file')
+    return parser
+
+
+def quiet_logging(suite_logger):
+    """Keep the pipeline's own logging out of the timings; the suite logger still reports progress."""
+    configure_logging(logging.ERROR)
+    for name in (suite_logger.name, logger.name):
+        logging.getLogger(name).setLevel(logging.INFO)
+
+
+def finish(args, results):
+    """
+    Write and print the results, then save or compare the baseline.
+
+    Args:
+        args (argparse.Namespace): Parsed options from create_parser
+        results (dict): Results document
+
+    Returns:
+        int: Exit code (1 when a case regressed)
+    """
+    write_results(args.output, results)
+    print_table(results['cases'])
+    logger.info(f"💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        logger.info(f"💾 Baseline written to {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        logger.warning(f"⚠️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    return 0 if report_comparison(compare_to_baseline(results, baseline, args.tolerance), args.tolerance) else 1
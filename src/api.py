@@ -1,10 +1,26 @@
 import sqlite3
 import os
+import json
+import hashlib
 import yaml
 import re
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from src.utils import commons
+from src.utils import deadline as deadlines
+from src.utils import merkle
+from src.utils import metrics
+from src.utils import synthetic
+from src.utils import fetch_orchestrator
+from src.utils import firstcycling
+from src.utils import http_cache
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+CHANGE_FILE_NAMES = ('change.yaml', 'change.yml')
+# Local (uncommitted) cache of change file hashes by modification time and size, see _get_change_file_hash
+DEFAULT_CHANGE_FILE_CACHE = os.path.join('.cache', 'change_files.json')
 
 def _find_change_file(change_dir_path):
     """
@@ -17,7 +33,7 @@ def _find_change_file(change_dir_path):
         str: Path to the change file if found, None otherwise
     """
     # Try change.yaml first, then change.yml
-    for filename in ['change.yaml', 'change.yml']:
+    for filename in CHANGE_FILE_NAMES:
         change_file_path = os.path.join(change_dir_path, filename)
         if os.path.exists(change_file_path):
             return change_file_path
@@ -46,6 +62,43 @@ def _write_stats_yaml_with_flow_style(data, file_path):
     with open(file_path, 'w', encoding='utf-8') as f:
         yaml.dump(data, f, Dumper=StatsYAMLDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
 
+def _write_stats_hash_file(namespace, tree):
+    """
+    Write the stats hash sidecar file, recording the digest of the current stats.yaml.
+    
+    Args:
+        namespace (str): The namespace of the stats file
+        tree (dict): Hash tree of the stats data in stats.yaml
+        
+    Returns:
+        dict: The hash tree as written
+    """
+    tree = dict(tree, stats_digest=merkle.hash_stats_file(commons.get_path(namespace, 'stats_file')))
+    merkle.write_hash_tree(tree, commons.get_path(namespace, 'stats_hash'))
+    return tree
+
+def _update_stats_hash_file(namespace, stats_data, touched_pcm_ids, previous_digest):
+    """
+    Update the stats hash sidecar file after cyclists were touched by a change.
+    Falls back to a full rebuild when no sidecar matches the stats file as it
+    was before the change (missing, or stats.yaml was edited without it).
+    
+    Args:
+        namespace (str): The namespace of the stats file
+        stats_data (dict): The stats data that was just written
+        touched_pcm_ids (set): PCM IDs added or updated by the change
+        previous_digest (str): Digest of stats.yaml before the change (None if it did not exist)
+        
+    Returns:
+        dict: The updated hash tree
+    """
+    tree = merkle.load_hash_tree(commons.get_path(namespace, 'stats_hash'))
+    if not merkle.is_current_hash_tree(tree, previous_digest):
+        tree = merkle.build_hash_tree(stats_data)
+    else:
+        tree = merkle.update_hash_tree(tree, stats_data, touched_pcm_ids)
+    return _write_stats_hash_file(namespace, tree)
+
 def init_namespace(namespace):
     """
     Initialize the directory structure for a given namespace.
@@ -55,7 +108,7 @@ def init_namespace(namespace):
     """
     base_path = commons.get_path(namespace, 'root')
     os.makedirs(base_path, exist_ok=True)
-    print(f"Initialized directory structure for namespace '{namespace}' at: {base_path}")
+    logger.info(f"Initialized directory structure for namespace '{namespace}' at: {base_path}")
 
     base_path = commons.get_path(namespace, 'changes_dir')
     os.makedirs(base_path, exist_ok=True)
@@ -65,16 +118,16 @@ def init_namespace(namespace):
     # Check for init_cdb.sqlite file and import cyclists if it exists
     init_db_path = os.path.join(commons.get_path(namespace, 'root'), 'init_cdb.sqlite')
     if os.path.exists(init_db_path):
-        print(f"🔍 Found init database file: {init_db_path}")
-        print(f"📥 Importing cyclists from init database...")
+        logger.info(f"🔍 Found init database file: {init_db_path}")
+        logger.info(f"📥 Importing cyclists from init database...")
         
         import_success = import_cyclists_from_db(namespace, init_db_path)
         if import_success:
-            print(f"✅ Successfully imported cyclists from init database")
+            logger.info(f"✅ Successfully imported cyclists from init database")
         else:
-            print(f"❌ Failed to import cyclists from init database")
+            logger.error(f"❌ Failed to import cyclists from init database")
     else:
-        print(f"ℹ️  No init database file found at: {init_db_path}")
+        logger.info(f"ℹ️  No init database file found at: {init_db_path}")
 
 def create_new_database(namespace, type='tracking'):
     """
@@ -102,15 +155,16 @@ def create_new_database(namespace, type='tracking'):
         conn.commit()
         conn.close()
         
-        print(f"Tracking database created successfully at: {db_path}")
+        logger.info(f"Tracking database created successfully at: {db_path}")
     return db_path
 
-def get_database_connection(namespace):
+def get_database_connection(namespace, read_only=False):
     """
     Get a connection to the SQLite database for the given namespace.
     
     Args:
         namespace (str): The namespace to connect to
+        read_only (bool): Open the database read-only
     
     Returns:
         sqlite3.Connection: Database connection object
@@ -119,8 +173,145 @@ def get_database_connection(namespace):
     if not os.path.exists(db_path):
         raise FileNotFoundError(f"Database file not found for namespace '{namespace}': {db_path}")
     
+    if read_only:
+        return sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    
     return sqlite3.connect(db_path)
 
+def _migrate_tracking_schema(conn):
+    """
+    Bring a tracking database created with an older schema up to date.
+    Called by the steps that write tbl_changes (process-changes and UAT), not on every connection.
+    
+    Args:
+        conn (sqlite3.Connection): Connection to the tracking database
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(tbl_changes)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if columns and 'content_hash' not in columns:
+        cursor.execute("ALTER TABLE tbl_changes ADD COLUMN content_hash VARCHAR(64) NULL")
+        conn.commit()
+
+def _hash_change_file(change_yaml_path):
+    """
+    Compute the content hash of a change file.
+    
+    Args:
+        change_yaml_path (str): Path to the change.yaml file
+        
+    Returns:
+        str: SHA-256 hex digest of the raw file content
+    """
+    with open(change_yaml_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _load_change_file_cache():
+    """
+    Load the local change file hash cache (PCM_CHANGE_FILE_CACHE, default DEFAULT_CHANGE_FILE_CACHE).
+    
+    Returns:
+        dict: Absolute change file path -> {'mtime_ns', 'size', 'content_hash'} (empty if missing or unreadable)
+    """
+    cache_file = os.getenv('PCM_CHANGE_FILE_CACHE', DEFAULT_CHANGE_FILE_CACHE)
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️  Ignoring unreadable change file cache {cache_file}: {e}")
+        return {}
+
+def _save_change_file_cache(cache):
+    """
+    Write the local change file hash cache (errors are only logged).
+    
+    Args:
+        cache (dict): Cache as returned by _load_change_file_cache
+    """
+    cache_file = os.getenv('PCM_CHANGE_FILE_CACHE', DEFAULT_CHANGE_FILE_CACHE)
+    try:
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        tmp_path = f"{cache_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, sort_keys=True)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        logger.warning(f"⚠️  Could not save change file cache {cache_file}: {e}")
+
+def _get_change_file_hash(change_yaml_path, cache):
+    """
+    Get the content hash of a change file, rehashing it only when its modification time or size changed.
+    The modification time differs on every checkout, so it is kept in the local cache, never in tbl_changes.
+    
+    Args:
+        change_yaml_path (str): Path to the change.yaml file
+        cache (dict): Change file cache (see _load_change_file_cache), updated in place
+        
+    Returns:
+        str: SHA-256 hex digest of the raw file content
+    """
+    file_stat = os.stat(change_yaml_path)
+    key = os.path.abspath(change_yaml_path)
+    entry = cache.get(key)
+    if entry and (entry.get('mtime_ns'), entry.get('size')) == (file_stat.st_mtime_ns, file_stat.st_size):
+        return entry['content_hash']
+    content_hash = _hash_change_file(change_yaml_path)
+    cache[key] = {'mtime_ns': file_stat.st_mtime_ns, 'size': file_stat.st_size, 'content_hash': content_hash}
+    return content_hash
+
+def find_modified_changes(cursor, changes_dir, change_names=None, cache=None):
+    """
+    Find processed changes whose change file was edited after processing.
+    Compares the content hash stored in tbl_changes with the file on disk;
+    changes recorded without a hash (older databases) are not checked.
+    A file whose modification time and size match the local cache is not rehashed.
+    
+    Args:
+        cursor: SQLite cursor connected to the tracking database
+        changes_dir (str): Path to the namespace changes directory
+        change_names (list, optional): Only check these changes (default: all processed changes)
+        cache (dict, optional): Change file cache to use and update (default: load and save the local cache)
+        
+    Returns:
+        list: Sorted names of processed changes whose change file differs or is missing
+    """
+    own_cache = cache is None
+    if own_cache:
+        cache = _load_change_file_cache()
+    cached_entries = dict(cache)
+    
+    query = "SELECT name, content_hash FROM tbl_changes WHERE content_hash IS NOT NULL"
+    if change_names is None:
+        cursor.execute(query)
+        recorded_hashes = cursor.fetchall()
+    else:
+        recorded_hashes = []
+        change_names = list(change_names)
+        for start in range(0, len(change_names), 500):
+            chunk = change_names[start:start + 500]
+            cursor.execute(f"{query} AND name IN ({', '.join('?' * len(chunk))})", chunk)
+            recorded_hashes.extend(cursor.fetchall())
+    
+    modified_changes = []
+    for change_name, stored_hash in recorded_hashes:
+        change_dir_path = os.path.join(changes_dir, change_name)
+        if not os.path.isdir(change_dir_path):
+            continue  # Change directory removed from this branch - nothing to verify
+        
+        change_yaml_path = _find_change_file(change_dir_path)
+        if not change_yaml_path:
+            modified_changes.append(change_name)
+            continue
+        
+        if _get_change_file_hash(change_yaml_path, cache) != stored_hash:
+            modified_changes.append(change_name)
+    
+    if own_cache and cache != cached_entries:
+        _save_change_file_cache(cache)
+    return sorted(modified_changes)
+
 def update_stats_file_with_changes(namespace, change_yaml_path):
     """
     Update the stats.yaml file with changes from a change file.
@@ -140,16 +331,21 @@ def update_stats_file_with_changes(namespace, change_yaml_path):
             change_data = yaml.safe_load(f)
         
         # Load existing stats file
-        if os.path.exists(stats_file_path):
-            with open(stats_file_path, 'r', encoding='utf-8') as f:
-                stats_data = yaml.safe_load(f) or {}
-        else:
-            stats_data = {}
+        with metrics.stage('stats_load'):
+            if os.path.exists(stats_file_path):
+                with open(stats_file_path, 'rb') as f:
+                    stats_content = f.read()
+                stats_data = yaml.safe_load(stats_content) or {}
+                previous_digest = merkle.hash_stats_content(stats_content)
+            else:
+                stats_data = {}
+                previous_digest = None
         
         
         updates_made = 0
         cyclists_added = 0
         stats_updated = 0
+        touched_pcm_ids = set()
         
         # Process each stat update from the change file
         for stat_update in change_data.get('stats', []):
@@ -159,11 +355,13 @@ def update_stats_file_with_changes(namespace, change_yaml_path):
             if not pcm_id or not cyclist_name:
                 continue
             
+            touched_pcm_ids.add(pcm_id)
+            
             # Create cyclist entry if it doesn't exist
             if pcm_id not in stats_data:
                 stats_data[pcm_id] = {}
                 cyclists_added += 1
-                print(f"  ➕ Added new cyclist: {cyclist_name} (PCM ID: {pcm_id})")
+                logger.debug(f"  ➕ Added new cyclist: {cyclist_name} (PCM ID: {pcm_id})")
             
             # Build ordered dictionary for this cyclist
             ordered_cyclist_data = {}
@@ -172,7 +370,7 @@ def update_stats_file_with_changes(namespace, change_yaml_path):
             ordered_cyclist_data['name'] = cyclist_name
             if stats_data[pcm_id].get('name') != cyclist_name:
                 if pcm_id in stats_data and 'name' in stats_data[pcm_id]:
-                    print(f"  📝 Updated name for PCM ID {pcm_id}: {cyclist_name}")
+                    logger.debug(f"  📝 Updated name for PCM ID {pcm_id}: {cyclist_name}")
             
             # 2. first_cycling_id (second if present)
             first_cycling_id = stat_update.get('first_cycling_id')
@@ -180,7 +378,7 @@ def update_stats_file_with_changes(namespace, change_yaml_path):
                 ordered_cyclist_data['first_cycling_id'] = first_cycling_id
                 old_fc_id = stats_data[pcm_id].get('first_cycling_id')
                 if old_fc_id != first_cycling_id:
-                    print(f"  🆔 Updated {cyclist_name} first_cycling_id: {old_fc_id} → {first_cycling_id}")
+                    logger.debug(f"  🆔 Updated {cyclist_name} first_cycling_id: {old_fc_id} → {first_cycling_id}")
             elif 'first_cycling_id' in stats_data.get(pcm_id, {}):
                 # Preserve existing first_cycling_id if not in change
                 ordered_cyclist_data['first_cycling_id'] = stats_data[pcm_id]['first_cycling_id']
@@ -201,7 +399,7 @@ def update_stats_file_with_changes(namespace, change_yaml_path):
                     stats_dict[stat_name] = new_stat_value
                     if old_stat_value != new_stat_value:
                         stats_updated += 1
-                        print(f"  🔄 Updated {cyclist_name} {stat_name}: {old_stat_value} → {new_stat_value}")
+                        logger.debug(f"  🔄 Updated {cyclist_name} {stat_name}: {old_stat_value} → {new_stat_value}")
                 elif old_stat_value is not None:
                     # Preserve existing value if not being changed
                     stats_dict[stat_name] = old_stat_value
@@ -219,8 +417,12 @@ def update_stats_file_with_changes(namespace, change_yaml_path):
         for pcm_id in sorted(stats_data.keys(), key=lambda x: int(x)):
             ordered_stats_data[pcm_id] = stats_data[pcm_id]
         
-        # Write updated stats back to file with custom formatting
-        _write_stats_yaml_with_flow_style(ordered_stats_data, stats_file_path)
+        with metrics.stage('stats_write'):
+            # Write updated stats back to file with custom formatting
+            _write_stats_yaml_with_flow_style(ordered_stats_data, stats_file_path)
+            
+            # Rehash only the buckets containing the cyclists touched by this change
+            _update_stats_hash_file(namespace, ordered_stats_data, touched_pcm_ids, previous_digest)
         
         summary = {
             "stats_file_updated": True,
@@ -231,15 +433,15 @@ def update_stats_file_with_changes(namespace, change_yaml_path):
         }
         
         if updates_made > 0:
-            print(f"  ✅ Updated stats file: {stats_file_path}")
-            print(f"     - Cyclists processed: {updates_made}")
-            print(f"     - New cyclists added: {cyclists_added}")
-            print(f"     - Individual stats updated: {stats_updated}")
+            logger.info(f"  ✅ Updated stats file: {stats_file_path}")
+            logger.info(f"     - Cyclists processed: {updates_made}")
+            logger.info(f"     - New cyclists added: {cyclists_added}")
+            logger.info(f"     - Individual stats updated: {stats_updated}")
         
         return summary
         
     except Exception as e:
-        print(f"❌ Error updating stats file: {e}")
+        logger.error(f"❌ Error updating stats file: {e}")
         return {
             "stats_file_updated": False,
             "error": str(e),
@@ -248,7 +450,98 @@ def update_stats_file_with_changes(namespace, change_yaml_path):
             "stats_updated": 0
         }
 
-def process_new_change_files(namespace):
+def _load_sync_state(namespace):
+    """Load the per-namespace record of the last processed commit for each operation."""
+    sync_state_path = commons.get_path(namespace, 'sync_state')
+    if not os.path.exists(sync_state_path):
+        return {}
+    try:
+        with open(sync_state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+def _record_sync_commit(namespace, state_key, commit):
+    """
+    Record the commit an operation last processed a namespace at.
+    
+    Args:
+        namespace (str): The namespace that was processed
+        state_key (str): Operation name ('process-changes' or 'process-uat')
+        commit (str): Commit hash of HEAD when processing started
+    """
+    state = _load_sync_state(namespace)
+    state[state_key] = commit
+    with open(commons.get_path(namespace, 'sync_state'), 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def discover_change_directories(namespace, incremental=False, state_key='process-changes', file_names=None):
+    """
+    Find the change directories to consider for processing.
+    
+    In incremental mode only directories with files added or modified since the
+    commit recorded for this operation are returned (using git diff), so the
+    cost does not grow with the size of the changes directory. Without a usable
+    record or git history it falls back to scanning the whole directory.
+    
+    Args:
+        namespace (str): The namespace to scan
+        incremental (bool): Whether to use git-based incremental discovery
+        state_key (str): Operation name the last processed commit is recorded under
+        file_names (tuple, optional): Only count changes to files with these names in incremental mode
+        
+    Returns:
+        tuple: (sorted list of change directory names, discovery mode ('full' or 'incremental'), HEAD commit or None)
+    """
+    changes_dir = commons.get_path(namespace, 'changes_dir')
+    head_commit = None
+    
+    if incremental:
+        head_commit = commons.get_git_head()
+        last_commit = _load_sync_state(namespace).get(state_key)
+        changed_paths = None
+        if head_commit and last_commit:
+            changed_paths = commons.get_changed_paths_since(last_commit, changes_dir)
+        
+        if changed_paths is not None:
+            candidates = {path.split('/', 1)[0] for path in changed_paths
+                          if not file_names or path.rsplit('/', 1)[-1] in file_names}
+            change_directories = sorted(d for d in candidates if os.path.isdir(os.path.join(changes_dir, d)))
+            logger.info(f"⚡ Incremental discovery since {last_commit[:12]}: {len(change_directories)} candidate change(s)")
+            return change_directories, 'incremental', head_commit
+        
+        logger.info(f"ℹ️  No usable {state_key} history for {namespace} - falling back to full scan")
+    
+    change_directories = sorted(d for d in os.listdir(changes_dir) 
+                                if os.path.isdir(os.path.join(changes_dir, d)))
+    return change_directories, 'full', head_commit
+
+def _get_recorded_change_names(cursor, change_names=None):
+    """
+    Get the change names recorded in tbl_changes.
+    
+    Args:
+        cursor: SQLite cursor connected to the tracking database
+        change_names (list, optional): Only look up these names (default: all changes)
+        
+    Returns:
+        set: Recorded change names
+    """
+    if change_names is None:
+        cursor.execute("SELECT name FROM tbl_changes")
+        return {row[0] for row in cursor.fetchall()}
+    
+    recorded = set()
+    change_names = list(change_names)
+    for start in range(0, len(change_names), 500):
+        chunk = change_names[start:start + 500]
+        cursor.execute(f"SELECT name FROM tbl_changes WHERE name IN ({', '.join('?' * len(chunk))})", chunk)
+        recorded.update(row[0] for row in cursor.fetchall())
+    return recorded
+
+def process_new_change_files(namespace, incremental=False):
     """
     Process new change YAML files and generate SQL INSERT statements.
     Each change is in its own directory with 'change.yaml' and generates 'inserts.sql'.
@@ -256,6 +549,8 @@ def process_new_change_files(namespace):
     
     Args:
         namespace (str): The namespace to process changes for
+        incremental (bool): Only consider change directories added or modified since the
+            last incremental run (falls back to a full scan without git history)
     
     Returns:
         dict: Summary of processed files and changes
@@ -263,13 +558,12 @@ def process_new_change_files(namespace):
     changes_dir = commons.get_path(namespace, 'changes_dir')
 
     conn = get_database_connection(namespace)
+    _migrate_tracking_schema(conn)
     cursor = conn.cursor()
+    change_file_cache = _load_change_file_cache()
+    cached_entries = dict(change_file_cache)
     
     try:
-        # Get existing change directory names from database 
-        cursor.execute("SELECT name FROM tbl_changes")
-        existing_changes = {row[0] for row in cursor.fetchall()}
-        
         # Get all change directories (subdirectories in changes/)
         if not os.path.exists(changes_dir):
             return {
@@ -277,19 +571,30 @@ def process_new_change_files(namespace):
                 "new_changes": 0,
                 "skipped_files": 0,
                 "output_file": None,
-                "stat_changes": {}
+                "stat_changes": {},
+                "modified_changes": []
             }
         
-        change_directories = [d for d in os.listdir(changes_dir) 
-                            if os.path.isdir(os.path.join(changes_dir, d))]
+        with metrics.stage('namespace_discovery'):
+            change_directories, discovery_mode, head_commit = discover_change_directories(
+                namespace, incremental, 'process-changes', CHANGE_FILE_NAMES)
         
         # Find new change directories that haven't been processed
+        existing_changes = _get_recorded_change_names(
+            cursor, change_directories if discovery_mode == 'incremental' else None)
         new_change_dirs = [d for d in change_directories if d not in existing_changes]
         
+        # Flag processed changes whose change file was edited afterwards
+        modified_changes = find_modified_changes(
+            cursor, changes_dir, change_directories if discovery_mode == 'incremental' else None, change_file_cache)
+        for change_dir_name in modified_changes:
+            logger.warning(f"⚠️  {change_dir_name}: change file was modified after it was processed - edit ignored")
+        
         processed_files = 0
         total_new_changes = 0
         total_sql_files_generated = 0
         all_stat_changes = {}
+        failed_changes = []
         
         for change_dir_name in new_change_dirs:
             change_dir_path = os.path.join(changes_dir, change_dir_name)
@@ -298,59 +603,74 @@ def process_new_change_files(namespace):
             
             # Check if change file exists in this directory
             if not change_yaml_path:
-                print(f"⚠️  Skipping {change_dir_name}: No change.yaml or change.yml file found")
+                logger.warning(f"⚠️  Skipping {change_dir_name}: No change.yaml or change.yml file found")
                 continue
                 
             # Generate SQL for this change
-            step1_sql, step2_sql, changes_count = _generate_sql_for_change_file(cursor, change_dir_name, change_yaml_path)
-            if changes_count >= 0:
-                # Write single SQL file with all statements
-                inserts_sql_path = os.path.join(change_dir_path, 'inserts.sql')
-                with open(inserts_sql_path, 'w', encoding='utf-8') as f:
-                    f.write(f"-- Generated SQL INSERT statements for {change_dir_name}\n")
-                    f.write("-- Review before executing\n\n")
-                    
-                    # Write Step 1 statements (tbl_changes and tbl_cyclists)
-                    if step1_sql:
-                        f.write("-- Step 1: tbl_changes and tbl_cyclists\n")
-                        for sql in step1_sql:
-                            f.write(sql + ";\n")
-                        f.write("\n")
-                    
-                    # Write Step 2 statements (tbl_change_stat_history)
-                    if step2_sql:
-                        f.write("-- Step 2: tbl_change_stat_history\n")
-                        for sql in step2_sql:
-                            f.write(sql + ";\n")
+            with metrics.stage('sql_generation'):
+                step1_sql, step2_sql, changes_count = _generate_sql_for_change_file(cursor, change_dir_name, change_yaml_path,
+                                                                                    change_file_cache)
+                if changes_count >= 0:
+                    # Write single SQL file with all statements
+                    inserts_sql_path = os.path.join(change_dir_path, 'inserts.sql')
+                    with open(inserts_sql_path, 'w', encoding='utf-8') as f:
+                        f.write(f"-- Generated SQL INSERT statements for {change_dir_name}\n")
+                        f.write("-- Review before executing\n\n")
+                        
+                        # Write Step 1 statements (tbl_changes and tbl_cyclists)
+                        if step1_sql:
+                            f.write("-- Step 1: tbl_changes and tbl_cyclists\n")
+                            for sql in step1_sql:
+                                f.write(sql + ";\n")
+                            f.write("\n")
+                        
+                        # Write Step 2 statements (tbl_change_stat_history)
+                        if step2_sql:
+                            f.write("-- Step 2: tbl_change_stat_history\n")
+                            for sql in step2_sql:
+                                f.write(sql + ";\n")
                 
+            if changes_count >= 0:
                 # Update the stats.yaml file with the changes
-                print(f"🔄 Updating stats file for {change_dir_name}...")
+                logger.debug(f"🔄 Updating stats file for {change_dir_name}...")
                 stats_update_summary = update_stats_file_with_changes(namespace, change_yaml_path)
                 all_stat_changes[change_dir_name] = stats_update_summary
                 
                 processed_files += 1
                 total_new_changes += changes_count
                 total_sql_files_generated += 1
-                print(f"✅ Generated {inserts_sql_path} with {changes_count} changes")
+                metrics.increment('changes_processed')
+                metrics.increment('stat_rows_generated', changes_count)
+                logger.info(f"✅ Generated {inserts_sql_path} with {changes_count} changes")
+            else:
+                failed_changes.append(change_dir_name)
         
         summary = {
             "processed_files": processed_files,
             "new_changes": total_new_changes,
             "skipped_files": len(change_directories) - processed_files,
             "sql_files_generated": total_sql_files_generated,
-            "stat_changes": all_stat_changes
+            "stat_changes": all_stat_changes,
+            "modified_changes": modified_changes,
+            "discovery_mode": discovery_mode
         }
         
-        print(f"SQL generation complete: {summary}")
+        # Failed changes must be rediscovered by the next run, so only advance on a clean run
+        if incremental and head_commit and not failed_changes:
+            _record_sync_commit(namespace, 'process-changes', head_commit)
+        
+        logger.info(f"SQL generation complete: {summary}")
         return summary
         
     except Exception as e:
-        print(f"Error processing change files: {e}")
+        logger.error(f"Error processing change files: {e}")
         raise
     finally:
         conn.close()
+        if change_file_cache != cached_entries:
+            _save_change_file_cache(change_file_cache)
 
-def _generate_sql_for_change_file(cursor, change_dir_name, change_yaml_path):
+def _generate_sql_for_change_file(cursor, change_dir_name, change_yaml_path, change_file_cache=None):
     """
     Generate SQL INSERT statements for a single change file.
     Creates statements for tbl_changes, tbl_cyclists, and tbl_change_stat_history.
@@ -359,6 +679,7 @@ def _generate_sql_for_change_file(cursor, change_dir_name, change_yaml_path):
         cursor: SQLite cursor
         change_dir_name (str): Name of the change directory (used as identifier)
         change_yaml_path (str): Full path to the change.yaml file
+        change_file_cache (dict, optional): Change file cache to record the file's hash in (see _get_change_file_hash)
     
     Returns:
         tuple: (list of SQL statements for basic tables, list of SQL statements for stat history, number of changes), (-1) on error
@@ -369,15 +690,17 @@ def _generate_sql_for_change_file(cursor, change_dir_name, change_yaml_path):
         
         # Validate required fields (name is not required since we use directory name)
         if not all(key in change_data for key in ['date', 'stats']):
-            print(f"Skipping {change_dir_name}: Missing required fields (date, stats)")
+            logger.warning(f"Skipping {change_dir_name}: Missing required fields (date, stats)")
             return [], [], -1
         
         step1_statements = []  # tbl_changes and tbl_cyclists
         step2_statements = []  # tbl_change_stat_history
+        content_hash = (_hash_change_file(change_yaml_path) if change_file_cache is None
+                        else _get_change_file_hash(change_yaml_path, change_file_cache))
         
         # Step 1: Generate INSERT for tbl_changes (using change_dir_name as the name)
-        step1_statements.append(f"""INSERT INTO tbl_changes (name, description, author, date)
-VALUES ('{change_dir_name}', '{change_data.get('description', '')}', '{change_data.get('author', 'Unknown')}', '{change_data['date']}')""")
+        step1_statements.append(f"""INSERT INTO tbl_changes (name, description, author, date, content_hash)
+VALUES ('{change_dir_name}', '{change_data.get('description', '')}', '{change_data.get('author', 'Unknown')}', '{change_data['date']}', '{content_hash}')""")
         
         changes_inserted = 0
         
@@ -435,7 +758,7 @@ VALUES (
         return step1_statements, step2_statements, changes_inserted
         
     except Exception as e:
-        print(f"Error processing change {change_dir_name}: {e}")
+        logger.error(f"Error processing change {change_dir_name}: {e}")
         return [], [], -1
 
 def _generate_cyclist_insert_if_not_exists(cursor, pcm_id, name, stat_update):
@@ -445,7 +768,7 @@ def _generate_cyclist_insert_if_not_exists(cursor, pcm_id, name, stat_update):
         first_cycling_id = stat_update.get('first_cycling_id', 'NULL')
         first_cycling_id_sql = f"'{first_cycling_id}'" if first_cycling_id != 'NULL' else 'NULL'
         return f"""
-INSERT INTO tbl_cyclists (pcm_id, name, first_cycling_id)
+INSERT OR IGNORE INTO tbl_cyclists (pcm_id, name, first_cycling_id)
 VALUES ('{pcm_id}', '{name}', {first_cycling_id_sql})"""
     return None
 
@@ -462,36 +785,39 @@ def _should_insert_stat_change(cursor, pcm_id, stat_name, new_value):
     result = cursor.fetchone()
     return result is None or result[0] != new_value
 
-def process_namespace(namespace):
+def process_namespace(namespace, incremental=False):
     """
     Process changes for a single namespace.
     
     Args:
         namespace (str): The namespace to process
+        incremental (bool): Use git-based incremental change discovery
         
     Returns:
         dict: Summary of processing results for this namespace
     """
-    print(f"🔄 Processing namespace: {namespace}")
-    print("-" * 40)
+    logger.info(f"🔄 Processing namespace: {namespace}")
+    logger.info("-" * 40)
     
     try:
         init_namespace(namespace)
 
         # Process changes for this namespace
-        summary = process_new_change_files(namespace)
+        summary = process_new_change_files(namespace, incremental)
         
         # Determine success status
         success = summary.get("processed_files", 0) >= 0  # Even 0 processed files is success
         
         if success:
-            print(f"✅ Successfully processed namespace: {namespace}")
-            print(f"   - Files processed: {summary.get('processed_files', 0)}")
-            print(f"   - New changes: {summary.get('new_changes', 0)}")
-            print(f"   - Files skipped: {summary.get('skipped_files', 0)}")
-            print(f"   - SQL files generated: {summary.get('sql_files_generated', 0)}")
+            logger.info(f"✅ Successfully processed namespace: {namespace}")
+            logger.info(f"   - Files processed: {summary.get('processed_files', 0)}")
+            logger.info(f"   - New changes: {summary.get('new_changes', 0)}")
+            logger.info(f"   - Files skipped: {summary.get('skipped_files', 0)}")
+            logger.info(f"   - SQL files generated: {summary.get('sql_files_generated', 0)}")
+            if summary.get('modified_changes'):
+                logger.info(f"   - Modified after processing: {', '.join(summary['modified_changes'])}")
         else:
-            print(f"❌ Processing failed for namespace: {namespace}")
+            logger.error(f"❌ Processing failed for namespace: {namespace}")
         
         # Return enhanced summary with success status
         return {
@@ -503,7 +829,7 @@ def process_namespace(namespace):
             
     except Exception as e:
         error_msg = str(e)
-        print(f"❌ Error processing namespace {namespace}: {error_msg}")
+        logger.error(f"❌ Error processing namespace {namespace}: {error_msg}")
         
         # Return error summary
         return {
@@ -515,20 +841,24 @@ def process_namespace(namespace):
             "error": error_msg
         }
     finally:
-        print()  # Add spacing between namespaces
+        logger.info("")  # Add spacing between namespaces
 
-def process_all_namespaces():
+def process_all_namespaces(incremental=False):
     """
     Process changes for all available namespaces automatically.
     
+    Args:
+        incremental (bool): Use git-based incremental change discovery
+    
     Returns:
         dict: Summary of processing results for all namespaces
     """
     # Get all available namespaces
-    namespaces = commons.get_available_namespaces()
+    with metrics.stage('namespace_discovery'):
+        namespaces = commons.get_available_namespaces()
     
     if not namespaces:
-        print("⚠️  No namespaces found in the data directory")
+        logger.warning("⚠️  No namespaces found in the data directory")
         return {
             "processed_namespaces": 0,
             "successful_namespaces": [],
@@ -537,8 +867,8 @@ def process_all_namespaces():
             "overall_success": True
         }
     
-    print(f"Found {len(namespaces)} namespace(s): {', '.join(namespaces)}")
-    print()
+    logger.info(f"Found {len(namespaces)} namespace(s): {', '.join(namespaces)}")
+    logger.info("")
     
     overall_summary = {
         "processed_namespaces": 0,
@@ -546,14 +876,17 @@ def process_all_namespaces():
         "failed_namespaces": [],
         "namespace_details": {},
         "total_changes": 0,
+        "modified_changes": {},
         "overall_success": True
     }
     
     for namespace in namespaces:
-        namespace_result = process_namespace(namespace)
+        namespace_result = process_namespace(namespace, incremental)
         overall_summary['processed_namespaces'] += 1
         overall_summary['namespace_details'][namespace] = namespace_result
         overall_summary['total_changes'] += namespace_result.get('new_changes', 0)
+        if namespace_result.get('modified_changes'):
+            overall_summary['modified_changes'][namespace] = namespace_result['modified_changes']
         
         if namespace_result['success']:
             overall_summary['successful_namespaces'].append(namespace)
@@ -562,21 +895,24 @@ def process_all_namespaces():
             overall_summary['overall_success'] = False
     
     # Final summary
-    print("=" * 60)
-    print(f"📊 Processing Summary:")
-    print(f"   - Total namespaces: {len(namespaces)}")
-    print(f"   - Successfully processed: {len(overall_summary['successful_namespaces'])}")
-    print(f"   - Failed: {len(overall_summary['failed_namespaces'])}")
-    print(f"   - Total new changes: {overall_summary['total_changes']}")
+    logger.info("=" * 60)
+    logger.info(f"📊 Processing Summary:")
+    logger.info(f"   - Total namespaces: {len(namespaces)}")
+    logger.info(f"   - Successfully processed: {len(overall_summary['successful_namespaces'])}")
+    logger.info(f"   - Failed: {len(overall_summary['failed_namespaces'])}")
+    logger.info(f"   - Total new changes: {overall_summary['total_changes']}")
+    if overall_summary['modified_changes']:
+        modified_count = sum(len(names) for names in overall_summary['modified_changes'].values())
+        logger.warning(f"   - ⚠️  Changes modified after processing: {modified_count}")
     
     if overall_summary["overall_success"]:
-        print("✅ All namespaces processed successfully")
+        logger.info("✅ All namespaces processed successfully")
     else:
-        print("❌ One or more namespaces had issues")
+        logger.error("❌ One or more namespaces had issues")
         if overall_summary["failed_namespaces"]:
-            print(f"   Failed namespaces: {', '.join(overall_summary['failed_namespaces'])}")
+            logger.info(f"   Failed namespaces: {', '.join(overall_summary['failed_namespaces'])}")
     
-    print("=" * 60)
+    logger.info("=" * 60)
     
     return overall_summary
 
@@ -718,7 +1054,7 @@ def validate_single_yaml_file(file_path):
 
 def validate_change_files():
     """Validate all change.yaml files across all namespaces."""
-    print(f"📋 Validating change files for all namespaces...")
+    logger.info(f"📋 Validating change files for all namespaces...")
     
     try:
         all_change_files = []
@@ -728,7 +1064,7 @@ def validate_change_files():
         namespaces = commons.get_available_namespaces()
         
         for namespace in namespaces:
-            print(f"🔍 Checking change files in namespace: {namespace}")
+            logger.info(f"🔍 Checking change files in namespace: {namespace}")
             
             # Check change files using namespace
             changes_dir = Path(commons.get_path(namespace, 'changes_dir'))
@@ -747,45 +1083,44 @@ def validate_change_files():
                             break  # Only add one file per directory
                 
                 all_change_files.extend([(f, f'change-{namespace}') for f in change_files])
-                print(f"🔍 Found {len(change_files)} change files in {changes_dir}")
+                logger.info(f"🔍 Found {len(change_files)} change files in {changes_dir}")
             else:
-                print(f"ℹ️  Changes directory not found: {changes_dir}")
+                logger.info(f"ℹ️  Changes directory not found: {changes_dir}")
         
         if not all_change_files:
-            print("ℹ️  No change files found to validate")
+            logger.info("ℹ️  No change files found to validate")
             return True
         
-        print(f"🔍 Total {len(all_change_files)} change files to validate")
+        logger.info(f"🔍 Total {len(all_change_files)} change files to validate")
         
         # Validate each change file
         for yaml_file, file_category in all_change_files:
             is_valid, error = validate_single_yaml_file(yaml_file)
+            metrics.increment('yaml_files_validated', kind='change', result='valid' if is_valid else 'invalid')
             
             if is_valid:
-                print(f"✅ {yaml_file.parent.name}/{yaml_file.name} ({file_category}): Valid")
+                logger.debug(f"✅ {yaml_file.parent.name}/{yaml_file.name} ({file_category}): Valid")
             else:
-                print(f"❌ {yaml_file.parent.name}/{yaml_file.name} ({file_category}): {error}")
+                logger.error(f"❌ {yaml_file.parent.name}/{yaml_file.name} ({file_category}): {error}")
                 validation_errors.append((f"{yaml_file.parent.name}/{yaml_file.name}", error))
         
         # Summary
         if validation_errors:
-            print(f"\n❌ Change file validation failed for {len(validation_errors)} files:")
+            logger.error(f"\n❌ Change file validation failed for {len(validation_errors)} files:")
             for filename, error in validation_errors:
-                print(f"   - {filename}: {error}")
+                logger.error(f"   - {filename}: {error}")
             return False
         else:
-            print(f"\n✅ All {len(all_change_files)} change files passed validation!")
+            logger.info(f"\n✅ All {len(all_change_files)} change files passed validation!")
             return True
             
     except Exception as e:
-        print(f"❌ Error during change file validation: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error during change file validation: {e}")
         return False
 
 def validate_stats_files():
     """Validate all stats.yaml files across all namespaces."""
-    print(f"📋 Validating stats files for all namespaces...")
+    logger.info(f"📋 Validating stats files for all namespaces...")
     
     try:
         all_stats_files = []
@@ -795,66 +1130,65 @@ def validate_stats_files():
         namespaces = commons.get_available_namespaces()
         
         for namespace in namespaces:
-            print(f"🔍 Checking stats file in namespace: {namespace}")
+            logger.info(f"🔍 Checking stats file in namespace: {namespace}")
             
             # Check stats file using namespace
             stats_file = Path(commons.get_path(namespace, 'stats_file'))
                 
             if stats_file.exists():
                 all_stats_files.append((stats_file, f'stats-{namespace}'))
-                print(f"🔍 Found stats file: {stats_file}")
+                logger.info(f"🔍 Found stats file: {stats_file}")
             else:
-                print(f"ℹ️  Stats file not found: {stats_file}")
+                logger.info(f"ℹ️  Stats file not found: {stats_file}")
         
         if not all_stats_files:
-            print("ℹ️  No stats files found to validate")
+            logger.info("ℹ️  No stats files found to validate")
             return True
         
-        print(f"🔍 Total {len(all_stats_files)} stats files to validate")
+        logger.info(f"🔍 Total {len(all_stats_files)} stats files to validate")
         
         # Validate each stats file
         for yaml_file, file_category in all_stats_files:
             is_valid, error = validate_single_yaml_file(yaml_file)
+            metrics.increment('yaml_files_validated', kind='stats', result='valid' if is_valid else 'invalid')
             
             if is_valid:
-                print(f"✅ {yaml_file.name} ({file_category}): Valid")
+                logger.debug(f"✅ {yaml_file.name} ({file_category}): Valid")
             else:
-                print(f"❌ {yaml_file.name} ({file_category}): {error}")
+                logger.error(f"❌ {yaml_file.name} ({file_category}): {error}")
                 validation_errors.append((yaml_file.name, error))
         
         # Summary
         if validation_errors:
-            print(f"\n❌ Stats file validation failed for {len(validation_errors)} files:")
+            logger.error(f"\n❌ Stats file validation failed for {len(validation_errors)} files:")
             for filename, error in validation_errors:
-                print(f"   - {filename}: {error}")
+                logger.error(f"   - {filename}: {error}")
             return False
         else:
-            print(f"\n✅ All {len(all_stats_files)} stats files passed validation!")
+            logger.info(f"\n✅ All {len(all_stats_files)} stats files passed validation!")
             return True
             
     except Exception as e:
-        print(f"❌ Error during stats file validation: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error during stats file validation: {e}")
         return False
 
 def validate_yaml_files():
     """Validate all YAML files (both change files and stats files)."""
-    print("🔍 Starting comprehensive YAML validation...")
+    logger.info("🔍 Starting comprehensive YAML validation...")
     
     # Validate change files
     change_files_valid = validate_change_files()
-    print()  # Add spacing
+    logger.info("")  # Add spacing
     
     # Validate stats files
     stats_files_valid = validate_stats_files()
     
     # Overall summary
     if change_files_valid and stats_files_valid:
-        print("\n🎉 All YAML files passed validation!")
+        logger.info("\n🎉 All YAML files passed validation!")
         return True
     else:
-        print("\n❌ Some YAML files failed validation!")
+        logger.error("\n❌ Some YAML files failed validation!")
         return False
 
 
@@ -877,30 +1211,15 @@ def import_cyclists_from_db(namespace, db_file):
     import os
     
     # Column mapping from database to stats.yaml
-    STAT_COLUMN_MAPPING = {
-        'fla': 'charac_i_plain',
-        'mo': 'charac_i_mountain', 
-        'mm': 'charac_i_medium_mountain',
-        'dh': 'charac_i_downhilling',
-        'cob': 'charac_i_cobble',
-        'tt': 'charac_i_timetrial',
-        'prl': 'charac_i_prologue',
-        'spr': 'charac_i_sprint',
-        'acc': 'charac_i_acceleration',
-        'end': 'charac_i_endurance',
-        'res': 'charac_i_resistance',
-        'rec': 'charac_i_recuperation',
-        'hil': 'charac_i_hill',
-        'att': 'charac_i_baroudeur'
-    }
+    STAT_COLUMN_MAPPING = commons.STAT_COLUMN_MAPPING
     
     try:
         # Check if database file exists
         if not os.path.exists(db_file):
-            print(f"❌ Database file not found: {db_file}")
+            logger.error(f"❌ Database file not found: {db_file}")
             return False
         
-        print(f"📂 Reading database file: {db_file}")
+        logger.info(f"📂 Reading database file: {db_file}")
         
         # Connect to database
         conn = sqlite3.connect(db_file)
@@ -909,7 +1228,7 @@ def import_cyclists_from_db(namespace, db_file):
         # Check if DYN_cyclist table exists
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='DYN_cyclist'")
         if not cursor.fetchone():
-            print("❌ Table 'DYN_cyclist' not found in database")
+            logger.error("❌ Table 'DYN_cyclist' not found in database")
             conn.close()
             return False
         
@@ -925,7 +1244,7 @@ def import_cyclists_from_db(namespace, db_file):
         
         missing_columns = [col for col in required_columns if col not in columns]
         if missing_columns:
-            print(f"❌ Missing required columns in DYN_cyclist table: {missing_columns}")
+            logger.error(f"❌ Missing required columns in DYN_cyclist table: {missing_columns}")
             conn.close()
             return False
         
@@ -938,17 +1257,17 @@ def import_cyclists_from_db(namespace, db_file):
         ] + list(STAT_COLUMN_MAPPING.values())
         
         query = f"SELECT {', '.join(select_columns)} FROM DYN_cyclist"
-        print(f"🔍 Executing query: {query}")
+        logger.debug(f"🔍 Executing query: {query}")
         
         cursor.execute(query)
         rows = cursor.fetchall()
         
         if not rows:
-            print("⚠️  No cyclist data found in DYN_cyclist table")
+            logger.warning("⚠️  No cyclist data found in DYN_cyclist table")
             conn.close()
             return False
         
-        print(f"📊 Found {len(rows)} cyclists in database")
+        logger.info(f"📊 Found {len(rows)} cyclists in database")
         
         # Build stats data structure
         stats_data = {}
@@ -1000,32 +1319,726 @@ def import_cyclists_from_db(namespace, db_file):
         # Write stats.yaml file with custom formatting
         stats_file_path = commons.get_path(namespace, 'stats_file')
         
-        print(f"💾 Writing stats file: {stats_file_path}")
+        logger.info(f"💾 Writing stats file: {stats_file_path}")
         
         _write_stats_yaml_with_flow_style(ordered_stats_data, stats_file_path)
+        _write_stats_hash_file(namespace, merkle.build_hash_tree(ordered_stats_data))
         
-        print(f"✅ Successfully imported {len(ordered_stats_data)} cyclists to {stats_file_path}")
-        print(f"   - Namespace: {namespace}")
-        print(f"   - Source: {db_file}")
-        print(f"   - Cyclists: {len(ordered_stats_data)}")
+        logger.info(f"✅ Successfully imported {len(ordered_stats_data)} cyclists to {stats_file_path}")
+        logger.info(f"   - Namespace: {namespace}")
+        logger.info(f"   - Source: {db_file}")
+        logger.info(f"   - Cyclists: {len(ordered_stats_data)}")
         
         return True
         
     except sqlite3.Error as e:
-        print(f"❌ Database error: {e}")
+        logger.error(f"❌ Database error: {e}")
         return False
     except Exception as e:
-        print(f"❌ Error importing from database: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error importing from database: {e}")
         return False
 
 
+# =============================================================================
+# Synthetic Data Functions
+# =============================================================================
+
+def _write_change_yaml(change_dir, change_data):
+    """Write a change.yaml file in the layout used by contributors and return its path."""
+    os.makedirs(change_dir, exist_ok=True)
+    change_file_path = os.path.join(change_dir, 'change.yaml')
+    with open(change_file_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(change_data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    return change_file_path
+
+def generate_synthetic_namespace(namespace, cyclists=1000, changes=10, stats_per_change=50,
+                                 history_depth=3, seed=synthetic.DEFAULT_SEED):
+    """
+    Create a namespace filled with reproducible synthetic data for scale testing.
+    
+    The namespace gets an init_cdb.sqlite with a PCM-style DYN_cyclist table
+    (imported into stats.yaml as usual), ``history_depth`` changes that are
+    already recorded in the tracking database, and ``changes`` pending change
+    directories that have not been processed yet.
+    
+    Args:
+        namespace (str): Name of the namespace to create (must not exist)
+        cyclists (int): Number of cyclists
+        changes (int): Number of pending change directories
+        stats_per_change (int): Number of stat values set by each change
+        history_depth (int): Number of already processed changes in the tracking database
+        seed (int): Random seed; the same arguments always produce the same files
+        
+    Returns:
+        dict: Summary with the generated counts and paths
+    """
+    root_path = commons.get_path(namespace, 'root')
+    if os.path.exists(root_path):
+        raise FileExistsError(f"Namespace '{namespace}' already exists: {root_path}")
+    if cyclists < 1:
+        raise ValueError("At least one cyclist is required")
+    
+    rng = synthetic.create_rng(seed)
+    logger.info(f"🧪 Generating synthetic namespace '{namespace}' (seed {seed})")
+    
+    os.makedirs(root_path)
+    synthetic.write_init_cdb(os.path.join(root_path, 'init_cdb.sqlite'), synthetic.generate_cyclists(cyclists, rng))
+    init_namespace(namespace)
+    
+    stats_data = load_stats_data(namespace)
+    pcm_ids = list(stats_data.keys())
+    changes_dir = commons.get_path(namespace, 'changes_dir')
+    base_date = datetime(2025, 1, 1)
+    
+    # Recorded history: write the change files and insert their rows directly, like a completed UAT run
+    conn = get_database_connection(namespace)
+    try:
+        cursor = conn.cursor()
+        versions = {}
+        history_rows = 0
+        for index in range(history_depth):
+            date = (base_date + timedelta(days=index)).strftime('%Y-%m-%d')
+            change_name = f"{date}-synthetic-history-{index + 1:04d}"
+            change_stats = synthetic.generate_change_stats(stats_data, pcm_ids, stats_per_change, rng)
+            change_file_path = _write_change_yaml(os.path.join(changes_dir, change_name), {
+                'author': 'synthetic', 'date': date, 'description': 'Synthetic history change', 'stats': change_stats
+            })
+            
+            cursor.execute(
+                "INSERT INTO tbl_changes (name, description, author, date, content_hash) VALUES (?, ?, ?, ?, ?)",
+                (change_name, 'Synthetic history change', 'synthetic', date, _hash_change_file(change_file_path)))
+            change_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT OR IGNORE INTO tbl_cyclists (pcm_id, name, first_cycling_id) VALUES (?, ?, ?)",
+                [(str(entry['pcm_id']), entry['name'], entry.get('first_cycling_id')) for entry in change_stats])
+            cyclist_ids = dict(cursor.execute("SELECT pcm_id, id FROM tbl_cyclists").fetchall())
+            
+            rows = []
+            for entry in change_stats:
+                pcm_id = str(entry['pcm_id'])
+                cyclist_stats = stats_data[pcm_id].setdefault('stats', {})
+                for stat_name in commons.STAT_KEYS:
+                    if stat_name not in entry:
+                        continue
+                    version = versions.get((pcm_id, stat_name), 0) + 1
+                    versions[(pcm_id, stat_name)] = version
+                    rows.append((cyclist_ids[pcm_id], change_id, stat_name, entry[stat_name], version))
+                    cyclist_stats[stat_name] = entry[stat_name]
+            cursor.executemany(
+                "INSERT INTO tbl_change_stat_history (cyclist_id, change_id, stat_name, stat_value, version) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+            history_rows += len(rows)
+        conn.commit()
+    finally:
+        conn.close()
+    
+    if history_depth:
+        _write_stats_yaml_with_flow_style(stats_data, commons.get_path(namespace, 'stats_file'))
+        _write_stats_hash_file(namespace, merkle.build_hash_tree(stats_data))
+    
+    # Pending changes, dated after the history so they sort (and apply) last
+    for index in range(changes):
+        date = (base_date + timedelta(days=history_depth + index)).strftime('%Y-%m-%d')
+        _write_change_yaml(os.path.join(changes_dir, f"{date}-synthetic-{index + 1:04d}"), {
+            'author': 'synthetic',
+            'date': date,
+            'description': 'Synthetic pending change',
+            'stats': synthetic.generate_change_stats(stats_data, pcm_ids, stats_per_change, rng)
+        })
+    
+    summary = {
+        "namespace": namespace,
+        "seed": seed,
+        "cyclists": len(stats_data),
+        "history_changes": history_depth,
+        "history_stat_rows": history_rows,
+        "pending_changes": changes,
+        "stats_per_change": stats_per_change,
+        "path": root_path
+    }
+    logger.info(f"✅ Generated synthetic namespace: {namespace}")
+    logger.info(f"   - Cyclists: {summary['cyclists']}")
+    logger.info(f"   - History changes: {history_depth} ({history_rows} stat rows)")
+    logger.info(f"   - Pending changes: {changes}")
+    return summary
+
+
+# =============================================================================
+# Stats Hash Functions
+# =============================================================================
+
+def _read_file_at_git_ref(file_path, ref):
+    """
+    Read the content of a file as it is at a git ref.
+    
+    Args:
+        file_path (str): Path of the file relative to the current directory
+        ref (str): Git ref (branch, tag or commit)
+        
+    Returns:
+        str: File content, or None if the file or ref is not available
+    """
+    git_path = './' + os.path.relpath(file_path).replace(os.sep, '/')
+    return commons.run_git(['show', f'{ref}:{git_path}'])
+
+def load_stats_data(namespace, ref=None):
+    """
+    Load the stats.yaml data of a namespace.
+    
+    Args:
+        namespace (str): The namespace to load
+        ref (str, optional): Git ref to read the stats file from instead of the working tree
+        
+    Returns:
+        dict: Stats data keyed by PCM ID (empty if the file does not exist)
+    """
+    stats_file_path = commons.get_path(namespace, 'stats_file')
+    if ref:
+        content = _read_file_at_git_ref(stats_file_path, ref)
+        return (yaml.safe_load(content) or {}) if content else {}
+    
+    if not os.path.exists(stats_file_path):
+        return {}
+    with metrics.stage('stats_load'), open(stats_file_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+STATS_ENTRY_PATTERN = re.compile(r"^'?(\d+)'?:")
+
+def _load_stats_buckets(namespace, bucket_ids, bucket_size, ref=None):
+    """
+    Load only the cyclists of some hash tree buckets from stats.yaml.
+    Top-level entries start at column 0 (as written by _write_stats_yaml_with_flow_style),
+    so the file is split into entries and only those in the buckets are parsed.
+    Files with another layout are loaded in full.
+    
+    Args:
+        namespace (str): The namespace to load
+        bucket_ids (iterable): Buckets to load (from merkle.diff_hash_trees)
+        bucket_size (int): Bucket size of the hash tree
+        ref (str, optional): Git ref to read the stats file from instead of the working tree
+        
+    Returns:
+        dict: Stats data of the cyclists in the buckets, keyed by PCM ID
+    """
+    stats_file_path = commons.get_path(namespace, 'stats_file')
+    if ref:
+        content = _read_file_at_git_ref(stats_file_path, ref)
+    elif os.path.exists(stats_file_path):
+        with open(stats_file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    else:
+        content = None
+    if not content:
+        return {}
+    
+    bucket_ids = {str(bucket_id) for bucket_id in bucket_ids}
+    selected_lines = []
+    keep = False
+    for line in content.splitlines(keepends=True):
+        if line[:1] in (' ', '\n', '\r', '#'):
+            if keep:
+                selected_lines.append(line)
+            continue
+        match = STATS_ENTRY_PATTERN.match(line)
+        if not match:
+            # Not a plain mapping of PCM IDs - parse the whole file
+            data = yaml.safe_load(content) or {}
+            return {k: v for k, v in data.items() if str(merkle.get_bucket_id(k, bucket_size)) in bucket_ids}
+        keep = str(merkle.get_bucket_id(match.group(1), bucket_size)) in bucket_ids
+        if keep:
+            selected_lines.append(line)
+    
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(''.join(selected_lines), Loader=loader) or {}
+
+def get_stats_hash_tree(namespace, ref=None):
+    """
+    Get the stats hash tree of a namespace, preferring the stats.hash.json sidecar.
+    The sidecar is only used when it was built from the current stats.yaml; otherwise
+    the tree is rebuilt from stats.yaml. The sidecar is not rewritten here: it is
+    refreshed where stats.yaml is written (process-changes, import, gen-synthetic).
+    
+    Args:
+        namespace (str): The namespace to hash
+        ref (str, optional): Git ref to read the files from instead of the working tree
+        
+    Returns:
+        dict: Hash tree (see src.utils.merkle.build_hash_tree)
+    """
+    hash_file_path = commons.get_path(namespace, 'stats_hash')
+    stats_file_path = commons.get_path(namespace, 'stats_file')
+    if ref:
+        content = _read_file_at_git_ref(hash_file_path, ref)
+        try:
+            tree = json.loads(content) if content else None
+        except ValueError:
+            tree = None
+        git_path = './' + os.path.relpath(stats_file_path).replace(os.sep, '/')
+        blob_id = commons.run_git(['rev-parse', '--verify', '--quiet', f'{ref}:{git_path}'])
+        stats_digest = blob_id.strip() if blob_id else None
+    else:
+        tree = merkle.load_hash_tree(hash_file_path)
+        stats_digest = merkle.hash_stats_file(stats_file_path)
+    
+    if merkle.is_current_hash_tree(tree, stats_digest):
+        return tree
+    
+    if tree is not None:
+        logger.warning(f"⚠️  {hash_file_path} does not match stats.yaml{f' at {ref}' if ref else ''} - rehashing")
+    return merkle.build_hash_tree(load_stats_data(namespace, ref))
+
+def compare_namespace_stats(namespace, other_namespace=None, ref=None):
+    """
+    Compare the stats of a namespace with another namespace or with a git ref.
+    Only the root and bucket hashes are compared up front; when buckets differ,
+    only the cyclists in those buckets are loaded to list the ones that changed.
+    
+    Args:
+        namespace (str): The namespace in the working tree
+        other_namespace (str, optional): Namespace to compare against (default: same namespace)
+        ref (str, optional): Git ref to read the other namespace from
+        
+    Returns:
+        dict: Comparison summary with root hashes, differing buckets and cyclist PCM IDs
+    """
+    other_namespace = other_namespace or namespace
+    tree_a = get_stats_hash_tree(namespace)
+    tree_b = get_stats_hash_tree(other_namespace, ref)
+    
+    stats_a = stats_b = None
+    if tree_a['bucket_size'] != tree_b['bucket_size']:
+        # Sidecars built with different settings - rebuild both from the stats files
+        stats_a = load_stats_data(namespace)
+        stats_b = load_stats_data(other_namespace, ref)
+        tree_a = merkle.build_hash_tree(stats_a)
+        tree_b = merkle.build_hash_tree(stats_b)
+    
+    differing_buckets = merkle.diff_hash_trees(tree_a, tree_b)
+    cyclists = {'added': [], 'removed': [], 'changed': []}
+    if differing_buckets:
+        if stats_a is None:
+            stats_a = _load_stats_buckets(namespace, differing_buckets, tree_a['bucket_size'])
+            stats_b = _load_stats_buckets(other_namespace, differing_buckets, tree_a['bucket_size'], ref)
+        cyclists = merkle.diff_cyclists(stats_a, stats_b, differing_buckets, tree_a['bucket_size'])
+    
+    return {
+        "namespace": namespace,
+        "other_namespace": other_namespace,
+        "ref": ref,
+        "identical": not differing_buckets,
+        "root": tree_a['root'],
+        "other_root": tree_b['root'],
+        "differing_buckets": differing_buckets,
+        "cyclists_added": cyclists['added'],
+        "cyclists_removed": cyclists['removed'],
+        "cyclists_changed": cyclists['changed']
+    }
+
+
+# =============================================================================
+# Change Conflict Detection Functions
+# =============================================================================
+
+def _load_yaml_file(file_path):
+    """Load a YAML file using the C loader when PyYAML was built with libyaml."""
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=loader)
+
+def _get_processed_change_names(namespace):
+    """
+    Get the names of all changes already recorded in the tracking database.
+    
+    Args:
+        namespace (str): The namespace to query
+        
+    Returns:
+        set: Change names from tbl_changes (empty if the database does not exist)
+    """
+    db_path = commons.get_path(namespace, 'tracking_db')
+    if not os.path.exists(db_path):
+        return set()
+    
+    conn = get_database_connection(namespace)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM tbl_changes")
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        conn.close()
+
+def _pcm_id_sort_key(pcm_id):
+    """Sort key ordering numeric PCM IDs numerically and anything else first."""
+    return (0, int(pcm_id)) if str(pcm_id).isdigit() else (-1, 0)
+
+def build_change_conflict_index(namespace):
+    """
+    Build an index of (pcm_id, stat) -> pending changes for a namespace.
+    Pending changes are change directories not yet recorded in tbl_changes.
+    Each change file is parsed exactly once.
+    
+    Args:
+        namespace (str): The namespace to index
+        
+    Returns:
+        tuple: (index dict keyed by (pcm_id, stat_name) with lists of {'change', 'value'},
+                list of pending change names, list of (change name, error) for unreadable files)
+    """
+    changes_dir = commons.get_path(namespace, 'changes_dir')
+    if not os.path.exists(changes_dir):
+        return {}, [], []
+    
+    processed_changes = _get_processed_change_names(namespace)
+    pending_changes = sorted(d for d in os.listdir(changes_dir)
+                             if d not in processed_changes and os.path.isdir(os.path.join(changes_dir, d)))
+    
+    index = {}
+    errors = []
+    for change_name in pending_changes:
+        change_yaml_path = _find_change_file(os.path.join(changes_dir, change_name))
+        if not change_yaml_path:
+            continue
+        
+        try:
+            change_data = _load_yaml_file(change_yaml_path) or {}
+        except Exception as e:
+            errors.append((change_name, str(e)))
+            continue
+        
+        _index_change_edits(index, change_name, change_data)
+    
+    return index, pending_changes, errors
+
+def _index_change_edits(index, change_name, change_data):
+    """
+    Add the stat edits of one parsed change file to a (pcm_id, stat) index.
+    
+    Args:
+        index (dict): Index keyed by (pcm_id, stat_name), updated in place
+        change_name (str): Name of the change directory
+        change_data (dict): Parsed change file
+    """
+    for stat_update in change_data.get('stats') or []:
+        if not isinstance(stat_update, dict) or not stat_update.get('pcm_id'):
+            continue
+        pcm_id = str(stat_update['pcm_id'])
+        
+        for stat_name in commons.STAT_KEYS:
+            stat_value = stat_update.get(stat_name)
+            if stat_value is None or stat_value == '':
+                continue
+            index.setdefault((pcm_id, stat_name), []).append({'change': change_name, 'value': stat_value})
+
+def _find_overlapping_edits(index):
+    """
+    Find stats edited by more than one change in a (pcm_id, stat) index.
+    
+    Args:
+        index (dict): Index built by _index_change_edits
+        
+    Returns:
+        tuple: (list of overlapping edits, list of overlapping edits with different values)
+    """
+    overlaps = []
+    conflicts = []
+    for (pcm_id, stat_name), edits in sorted(index.items(), key=lambda item: (_pcm_id_sort_key(item[0][0]), item[0][1])):
+        if len({edit['change'] for edit in edits}) < 2:
+            continue
+        
+        # Keyed by JSON so unhashable values (lists, dicts from malformed change files) are deduplicated too
+        values_by_key = {json.dumps(edit['value'], sort_keys=True, default=str): edit['value'] for edit in edits}
+        values = [values_by_key[key] for key in sorted(values_by_key)]
+        entry = {
+            "pcm_id": pcm_id,
+            "stat": stat_name,
+            "changes": edits,
+            "values": values,
+            "applied_value": edits[-1]['value']
+        }
+        overlaps.append(entry)
+        if len(values) > 1:
+            conflicts.append(entry)
+    
+    return overlaps, conflicts
+
+def detect_change_conflicts(namespace):
+    """
+    Detect pending changes that edit the same cyclist stat.
+    
+    An overlap is a (pcm_id, stat) edited by more than one pending change.
+    It is a conflict when those changes set different values. Changes are
+    applied alphabetically, so the value of the last change wins.
+    
+    Args:
+        namespace (str): The namespace to check
+        
+    Returns:
+        dict: Summary with pending change count, overlaps and conflicts
+    """
+    index, pending_changes, errors = build_change_conflict_index(namespace)
+    overlaps, conflicts = _find_overlapping_edits(index)
+    
+    return {
+        "namespace": namespace,
+        "pending_changes": len(pending_changes),
+        "overlaps": overlaps,
+        "conflicts": conflicts,
+        "errors": [{"change": name, "error": error} for name, error in errors],
+        "success": not conflicts and not errors
+    }
+
+def detect_all_change_conflicts(namespaces=None):
+    """
+    Detect conflicting pending changes across namespaces.
+    
+    Args:
+        namespaces (list, optional): Namespaces to check (default: all available namespaces)
+        
+    Returns:
+        dict: Summary of conflict detection results for all namespaces
+    """
+    if namespaces is None:
+        namespaces = commons.get_available_namespaces()
+    
+    overall_summary = {
+        "namespace_details": {},
+        "total_pending_changes": 0,
+        "total_overlaps": 0,
+        "total_conflicts": 0,
+        "overall_success": True
+    }
+    
+    for namespace in namespaces:
+        result = detect_change_conflicts(namespace)
+        overall_summary['namespace_details'][namespace] = result
+        overall_summary['total_pending_changes'] += result['pending_changes']
+        overall_summary['total_overlaps'] += len(result['overlaps'])
+        overall_summary['total_conflicts'] += len(result['conflicts'])
+        
+        logger.info(f"🔍 {namespace}: {result['pending_changes']} pending changes, "
+              f"{len(result['overlaps'])} overlapping edits, {len(result['conflicts'])} conflicts")
+        for conflict in result['conflicts']:
+            edits = ', '.join(f"{edit['change']}={edit['value']}" for edit in conflict['changes'])
+            logger.error(f"   ❌ PCM ID {conflict['pcm_id']} {conflict['stat']}: {edits}")
+        for error in result['errors']:
+            logger.warning(f"   ⚠️  Could not read {error['change']}: {error['error']}")
+        
+        if not result['success']:
+            overall_summary['overall_success'] = False
+    
+    return overall_summary
+
+
+# =============================================================================
+# Change Planning (Dry-Run) Functions
+# =============================================================================
+
+def _load_tracking_state(cursor):
+    """
+    Load the tracking database state needed to plan changes with set-based queries.
+    
+    Args:
+        cursor: SQLite cursor connected to the tracking database
+        
+    Returns:
+        tuple: (set of recorded change names, set of known cyclist PCM IDs,
+                dict of latest stat values keyed by (pcm_id, stat_name))
+    """
+    cursor.execute("SELECT name FROM tbl_changes")
+    recorded_changes = {row[0] for row in cursor.fetchall()}
+    
+    cursor.execute("SELECT pcm_id FROM tbl_cyclists")
+    known_cyclists = {str(row[0]) for row in cursor.fetchall()}
+    
+    cursor.execute("""
+        SELECT c.pcm_id, csh.stat_name, csh.stat_value
+        FROM tbl_change_stat_history csh
+        JOIN tbl_cyclists c ON csh.cyclist_id = c.id
+        JOIN (
+            SELECT cyclist_id, stat_name, MAX(version) AS version
+            FROM tbl_change_stat_history
+            GROUP BY cyclist_id, stat_name
+        ) latest ON latest.cyclist_id = csh.cyclist_id
+                AND latest.stat_name = csh.stat_name
+                AND latest.version = csh.version
+    """)
+    latest_values = {(str(pcm_id), stat_name): stat_value for pcm_id, stat_name, stat_value in cursor.fetchall()}
+    
+    return recorded_changes, known_cyclists, latest_values
+
+def _plan_change(change_data, known_cyclists, latest_values, stats_data):
+    """
+    Compute the effect of one change file without writing anything.
+    Mirrors _generate_sql_for_change_file (stat rows are compared against the
+    tracking database) and update_stats_file_with_changes (stats_data is
+    updated in place so later changes see earlier ones, like stats.yaml).
+    
+    Args:
+        change_data (dict): Parsed change file
+        known_cyclists (set): PCM IDs already in tbl_cyclists
+        latest_values (dict): Latest tracked stat values keyed by (pcm_id, stat_name)
+        stats_data (dict): In-memory stats.yaml data, updated in place
+        
+    Returns:
+        dict: Planned stat rows, cyclists added and no-op stats skipped
+    """
+    inserted_stat_rows = []
+    noop_stats_skipped = []
+    cyclists_added = []
+    tracking_cyclists_added = []
+    stats_file_updates = 0
+    
+    for stat_update in change_data['stats']:
+        if not isinstance(stat_update, dict):
+            continue
+        pcm_id = stat_update.get('pcm_id')
+        cyclist_name = stat_update.get('name')
+        if not pcm_id or not cyclist_name:
+            continue
+        pcm_id = str(pcm_id)
+        
+        if pcm_id not in known_cyclists and pcm_id not in tracking_cyclists_added:
+            tracking_cyclists_added.append(pcm_id)
+        if pcm_id not in stats_data:
+            stats_data[pcm_id] = {'name': cyclist_name}
+            cyclists_added.append(pcm_id)
+        existing_stats = stats_data[pcm_id].setdefault('stats', {})
+        
+        for stat_name in commons.STAT_KEYS:
+            stat_value = stat_update.get(stat_name)
+            if stat_value is None or stat_value == '':
+                continue
+            
+            old_value = latest_values.get((pcm_id, stat_name))
+            if old_value is None or old_value != stat_value:
+                inserted_stat_rows.append({"pcm_id": pcm_id, "stat": stat_name, "old_value": old_value,
+                                           "new_value": stat_value})
+            else:
+                noop_stats_skipped.append({"pcm_id": pcm_id, "stat": stat_name, "value": stat_value})
+            
+            if existing_stats.get(stat_name) != stat_value:
+                stats_file_updates += 1
+            existing_stats[stat_name] = stat_value
+    
+    return {
+        "inserted_stat_rows": inserted_stat_rows,
+        "cyclists_added": cyclists_added,
+        "tracking_cyclists_added": tracking_cyclists_added,
+        "noop_stats_skipped": noop_stats_skipped,
+        "stats_file_updates": stats_file_updates,
+        "error": None
+    }
+
+def plan_namespace(namespace, incremental=False):
+    """
+    Plan the processing of new change files for a namespace without side effects.
+    Nothing is written: the stats file is loaded once, the tracking database is
+    opened read-only and queried with set-based queries only.
+    
+    Args:
+        namespace (str): The namespace to plan
+        incremental (bool): Use git-based incremental change discovery (the sync state is not updated)
+        
+    Returns:
+        dict: Per-change impact report plus totals and conflicts for the namespace
+    """
+    changes_dir = commons.get_path(namespace, 'changes_dir')
+    report = {
+        "namespace": namespace,
+        "discovery_mode": 'full',
+        "pending_changes": 0,
+        "changes": {},
+        "conflicts": [],
+        "modified_changes": [],
+        "totals": {"stat_rows": 0, "cyclists_added": 0, "noop_stats_skipped": 0, "errors": 0}
+    }
+    if not os.path.exists(changes_dir):
+        return report
+    
+    recorded_changes, known_cyclists, latest_values = set(), set(), {}
+    modified_changes = []
+    change_directories, report['discovery_mode'], _ = discover_change_directories(
+        namespace, incremental, 'process-changes', CHANGE_FILE_NAMES)
+    
+    if os.path.exists(commons.get_path(namespace, 'tracking_db')):
+        conn = get_database_connection(namespace, read_only=True)
+        try:
+            cursor = conn.cursor()
+            recorded_changes, known_cyclists, latest_values = _load_tracking_state(cursor)
+            cursor.execute("PRAGMA table_info(tbl_changes)")
+            if 'content_hash' in [row[1] for row in cursor.fetchall()]:
+                modified_changes = find_modified_changes(
+                    cursor, changes_dir, change_directories if report['discovery_mode'] == 'incremental' else None)
+        finally:
+            conn.close()
+    
+    stats_data = load_stats_data(namespace)
+    pending_changes = [d for d in change_directories if d not in recorded_changes]
+    index = {}
+    
+    for change_name in pending_changes:
+        change_yaml_path = _find_change_file(os.path.join(changes_dir, change_name))
+        if not change_yaml_path:
+            continue
+        
+        try:
+            change_data = _load_yaml_file(change_yaml_path) or {}
+            if not isinstance(change_data, dict) or not all(key in change_data for key in ['date', 'stats']):
+                raise ValueError("Missing required fields (date, stats)")
+            change_plan = _plan_change(change_data, known_cyclists, latest_values, stats_data)
+        except Exception as e:
+            change_plan = {"inserted_stat_rows": [], "cyclists_added": [], "tracking_cyclists_added": [],
+                           "noop_stats_skipped": [], "stats_file_updates": 0, "error": str(e)}
+            report['totals']['errors'] += 1
+        else:
+            _index_change_edits(index, change_name, change_data)
+        
+        report['changes'][change_name] = change_plan
+        report['totals']['stat_rows'] += len(change_plan['inserted_stat_rows'])
+        report['totals']['cyclists_added'] += len(change_plan['cyclists_added'])
+        report['totals']['noop_stats_skipped'] += len(change_plan['noop_stats_skipped'])
+    
+    report['pending_changes'] = len(report['changes'])
+    report['conflicts'] = _find_overlapping_edits(index)[1]
+    report['modified_changes'] = modified_changes
+    return report
+
+def plan_all_namespaces(incremental=False):
+    """
+    Plan change processing for all available namespaces without side effects.
+    
+    Args:
+        incremental (bool): Use git-based incremental change discovery
+        
+    Returns:
+        dict: Impact report for all namespaces
+    """
+    overall_report = {
+        "plan": True,
+        "namespaces": {},
+        "total_changes": 0,
+        "total_stat_rows": 0,
+        "total_conflicts": 0,
+        "overall_success": True
+    }
+    
+    for namespace in commons.get_available_namespaces():
+        report = plan_namespace(namespace, incremental)
+        overall_report['namespaces'][namespace] = report
+        overall_report['total_changes'] += report['pending_changes']
+        overall_report['total_stat_rows'] += report['totals']['stat_rows']
+        overall_report['total_conflicts'] += len(report['conflicts'])
+        if report['totals']['errors']:
+            overall_report['overall_success'] = False
+    
+    return overall_report
+
+
 # =============================================================================
 # UAT Branch Processing Functions
 # =============================================================================
 
-def process_uat_changes():
+def process_uat_changes(incremental=False):
     """
     Process UAT changes for all namespaces by executing SQL inserts and exporting tracking data.
     
@@ -1036,14 +2049,18 @@ def process_uat_changes():
     4. Executes inserts.sql for each new change
     5. Exports vw_tracking_export to tracking_export.csv
     
+    Args:
+        incremental (bool): Use git-based incremental change discovery
+    
     Returns:
         dict: Summary of UAT processing results for all namespaces
     """
     # Get all available namespaces
-    namespaces = commons.get_available_namespaces()
+    with metrics.stage('namespace_discovery'):
+        namespaces = commons.get_available_namespaces()
     
     if not namespaces:
-        print("⚠️  No namespaces found in the data directory")
+        logger.warning("⚠️  No namespaces found in the data directory")
         return {
             "processed_namespaces": 0,
             "successful_namespaces": [],
@@ -1052,8 +2069,8 @@ def process_uat_changes():
             "overall_success": True
         }
     
-    print(f"Found {len(namespaces)} namespace(s): {', '.join(namespaces)}")
-    print()
+    logger.info(f"Found {len(namespaces)} namespace(s): {', '.join(namespaces)}")
+    logger.info("")
     
     overall_summary = {
         "processed_namespaces": 0,
@@ -1065,7 +2082,7 @@ def process_uat_changes():
     }
     
     for namespace in namespaces:
-        namespace_result = process_uat_namespace(namespace)
+        namespace_result = process_uat_namespace(namespace, incremental)
         overall_summary['processed_namespaces'] += 1
         overall_summary['namespace_details'][namespace] = namespace_result
         overall_summary['total_changes_executed'] += namespace_result.get('changes_executed', 0)
@@ -1077,42 +2094,43 @@ def process_uat_changes():
             overall_summary['overall_success'] = False
     
     # Final summary
-    print("=" * 60)
-    print(f"📊 UAT Processing Summary:")
-    print(f"   - Total namespaces: {len(namespaces)}")
-    print(f"   - Successfully processed: {len(overall_summary['successful_namespaces'])}")
-    print(f"   - Failed: {len(overall_summary['failed_namespaces'])}")
-    print(f"   - Total changes executed: {overall_summary['total_changes_executed']}")
+    logger.info("=" * 60)
+    logger.info(f"📊 UAT Processing Summary:")
+    logger.info(f"   - Total namespaces: {len(namespaces)}")
+    logger.info(f"   - Successfully processed: {len(overall_summary['successful_namespaces'])}")
+    logger.info(f"   - Failed: {len(overall_summary['failed_namespaces'])}")
+    logger.info(f"   - Total changes executed: {overall_summary['total_changes_executed']}")
     
     if overall_summary["overall_success"]:
-        print("✅ All namespaces processed successfully")
+        logger.info("✅ All namespaces processed successfully")
     else:
-        print("❌ One or more namespaces had issues")
+        logger.error("❌ One or more namespaces had issues")
         if overall_summary["failed_namespaces"]:
-            print(f"   Failed namespaces: {', '.join(overall_summary['failed_namespaces'])}")
+            logger.info(f"   Failed namespaces: {', '.join(overall_summary['failed_namespaces'])}")
     
-    print("=" * 60)
+    logger.info("=" * 60)
     
     return overall_summary
 
-def process_uat_namespace(namespace):
+def process_uat_namespace(namespace, incremental=False):
     """
     Process UAT changes for a single namespace.
     
     Args:
         namespace (str): The namespace to process
+        incremental (bool): Use git-based incremental change discovery
         
     Returns:
         dict: Summary of UAT processing results for this namespace
     """
-    print(f"🔄 Processing UAT namespace: {namespace}")
-    print("-" * 40)
+    logger.info(f"🔄 Processing UAT namespace: {namespace}")
+    logger.info("-" * 40)
     
     try:
         # Check if tracking database exists
         db_path = commons.get_path(namespace, 'tracking_db')
         if not os.path.exists(db_path):
-            print(f"❌ Tracking database not found for namespace: {namespace}")
+            logger.error(f"❌ Tracking database not found for namespace: {namespace}")
             return {
                 "namespace": namespace,
                 "success": False,
@@ -1121,28 +2139,32 @@ def process_uat_namespace(namespace):
                 "export_created": False
             }
         
-        print(f"📊 Using tracking database: {db_path}")
+        logger.info(f"📊 Using tracking database: {db_path}")
         
         # Get connection to tracking database
         conn = get_database_connection(namespace)
+        _migrate_tracking_schema(conn)
         cursor = conn.cursor()
         
         try:
-            # Get existing changes from database
-            cursor.execute("SELECT name FROM tbl_changes")
-            existing_changes = {row[0] for row in cursor.fetchall()}
-            print(f"📋 Found {len(existing_changes)} existing changes in database")
-            
             # Get all change directories
             changes_dir = commons.get_path(namespace, 'changes_dir')
+            discovery_mode = 'full'
+            head_commit = None
             
             if not os.path.exists(changes_dir):
-                print(f"⚠️  Changes directory not found: {changes_dir}")
+                logger.warning(f"⚠️  Changes directory not found: {changes_dir}")
                 change_directories = []
             else:
-                change_directories = [d for d in os.listdir(changes_dir) 
-                                    if os.path.isdir(os.path.join(changes_dir, d))]
-                print(f"📁 Found {len(change_directories)} change directories")
+                with metrics.stage('namespace_discovery'):
+                    change_directories, discovery_mode, head_commit = discover_change_directories(
+                        namespace, incremental, 'process-uat')
+                logger.info(f"📁 Found {len(change_directories)} change directories")
+            
+            # Get existing changes from database
+            existing_changes = _get_recorded_change_names(
+                cursor, change_directories if discovery_mode == 'incremental' else None)
+            logger.info(f"📋 Found {len(existing_changes)} existing changes in database")
             
             # Find new change directories that haven't been processed
             new_change_dirs = [d for d in change_directories if d not in existing_changes]
@@ -1150,11 +2172,13 @@ def process_uat_namespace(namespace):
             # Sort alphanumerically (highest value processed last)
             new_change_dirs.sort()
             
-            print(f"🆕 Found {len(new_change_dirs)} new changes to process")
+            logger.info(f"🆕 Found {len(new_change_dirs)} new changes to process")
             if new_change_dirs:
-                print(f"   - Changes: {', '.join(new_change_dirs)}")
+                logger.info(f"   - Changes: {', '.join(new_change_dirs)}")
             
             changes_executed = 0
+            statements_executed = 0
+            failed_changes = []
             
             # Process each new change directory
             for change_dir_name in new_change_dirs:
@@ -1163,14 +2187,14 @@ def process_uat_namespace(namespace):
                 
                 # Check if SQL file exists
                 if not os.path.exists(inserts_sql_path):
-                    print(f"⚠️  Skipping {change_dir_name}: No inserts.sql file found")
+                    logger.warning(f"⚠️  Skipping {change_dir_name}: No inserts.sql file found")
                     continue
                 
-                print(f"⚡ Executing SQL for change: {change_dir_name}")
+                logger.debug(f"⚡ Executing SQL for change: {change_dir_name}")
                 
                 # Execute SQL statements
                 try:
-                    print(f"   📋 Executing SQL statements")
+                    logger.debug(f"   📋 Executing SQL statements")
                     with open(inserts_sql_path, 'r', encoding='utf-8') as f:
                         sql_content = f.read()
                     
@@ -1187,24 +2211,32 @@ def process_uat_namespace(namespace):
                     cleaned_sql = ' '.join(cleaned_lines)
                     sql_statements = [stmt.strip() for stmt in cleaned_sql.split(';') if stmt.strip()]
                     
-                    print(f"   🔧 Executing {len(sql_statements)} SQL statements")
-                    for sql_statement in sql_statements:
-                        if sql_statement:
-                            cursor.execute(sql_statement)
-                    
-                    conn.commit()
+                    logger.debug(f"   🔧 Executing {len(sql_statements)} SQL statements")
+                    with metrics.stage('uat_execution'):
+                        for sql_statement in sql_statements:
+                            if sql_statement:
+                                cursor.execute(sql_statement)
+                        
+                        conn.commit()
                     changes_executed += 1
-                    print(f"   ✅ Successfully executed all SQL for {change_dir_name}")
+                    statements_executed += len(sql_statements)
+                    metrics.increment('changes_executed')
+                    metrics.increment('sql_statements_executed', len(sql_statements))
+                    metrics.increment('stat_rows_inserted', sum(
+                        1 for stmt in sql_statements if stmt.upper().startswith('INSERT INTO TBL_CHANGE_STAT_HISTORY')))
+                    logger.debug(f"   ✅ Successfully executed all SQL for {change_dir_name}")
                     
                 except Exception as e:
-                    print(f"   ❌ Error executing SQL for {change_dir_name}: {e}")
+                    logger.error(f"   ❌ Error executing SQL for {change_dir_name}: {e}")
                     conn.rollback()
+                    failed_changes.append(change_dir_name)
                     continue
             
             # Export tracking data to CSV
             conn.commit()
             cursor = conn.cursor()
-            export_success = export_tracking_data(namespace, cursor)
+            with metrics.stage('csv_export'):
+                export_success = export_tracking_data(namespace, cursor)
             
             # Final summary for this namespace
             summary = {
@@ -1214,12 +2246,18 @@ def process_uat_namespace(namespace):
                 "changes_executed": changes_executed,
                 "export_created": export_success,
                 "total_changes_found": len(change_directories),
-                "new_changes_found": len(new_change_dirs)
+                "new_changes_found": len(new_change_dirs),
+                "discovery_mode": discovery_mode
             }
             
-            print(f"✅ Successfully processed namespace: {namespace}")
-            print(f"   - Changes executed: {changes_executed}")
-            print(f"   - Export created: {'Yes' if export_success else 'No'}")
+            # Failed changes must be rediscovered by the next run, so only advance on a clean run
+            if incremental and head_commit and not failed_changes:
+                _record_sync_commit(namespace, 'process-uat', head_commit)
+            
+            logger.info(f"✅ Successfully processed namespace: {namespace}")
+            logger.info(f"   - Changes executed: {changes_executed}")
+            logger.info(f"   - SQL statements executed: {statements_executed}")
+            logger.info(f"   - Export created: {'Yes' if export_success else 'No'}")
             
             return summary
             
@@ -1228,7 +2266,7 @@ def process_uat_namespace(namespace):
             
     except Exception as e:
         error_msg = str(e)
-        print(f"❌ Error processing UAT namespace {namespace}: {error_msg}")
+        logger.error(f"❌ Error processing UAT namespace {namespace}: {error_msg}")
         
         return {
             "namespace": namespace,
@@ -1238,7 +2276,7 @@ def process_uat_namespace(namespace):
             "export_created": False
         }
     finally:
-        print()  # Add spacing between namespaces
+        logger.info("")  # Add spacing between namespaces
 
 def export_tracking_data(namespace, cursor):
     """
@@ -1258,14 +2296,14 @@ def export_tracking_data(namespace, cursor):
         namespace_dir = commons.get_path(namespace, 'root')
         export_path = os.path.join(namespace_dir, 'tracking_export.csv')
         
-        print(f"📤 Exporting tracking data to: {export_path}")
+        logger.info(f"📤 Exporting tracking data to: {export_path}")
         
         # Query the tracking export view
         cursor.execute("SELECT * FROM vw_tracking_export")
         rows = cursor.fetchall()
         
         if not rows:
-            print("⚠️  No data found in tracking export view")
+            logger.warning("⚠️  No data found in tracking export view")
             return False
         
         # Get column names
@@ -1284,11 +2322,11 @@ def export_tracking_data(namespace, cursor):
             # Write data rows
             writer.writerows(rows)
         
-        print(f"✅ Successfully exported {len(rows)} rows to CSV")
+        logger.info(f"✅ Successfully exported {len(rows)} rows to CSV")
         return True
         
     except Exception as e:
-        print(f"❌ Error exporting tracking data: {e}")
+        logger.error(f"❌ Error exporting tracking data: {e}")
         return False
 
 
@@ -1296,6 +2334,10 @@ def export_tracking_data(namespace, cursor):
 # Automated Change Request Functions
 # =============================================================================
 
+# Concurrent fetching of several race pages
+RACE_FETCH_WORKERS = 4
+RACE_FETCH_MIN_INTERVAL = 2.0  # Seconds between two requests to the same host
+
 def parse_github_issue_form(issue_body, issue_title=None):
     """
     Parse GitHub issue form data from issue body text.
@@ -1305,7 +2347,8 @@ def parse_github_issue_form(issue_body, issue_title=None):
         issue_title (str, optional): The issue title to extract change_name from
         
     Returns:
-        dict: Parsed form data with keys: change_name, date, author, race_url, description, namespace, branch_name
+        dict: Parsed form data with keys: change_name, date, author, race_url, race_urls, description,
+              namespace, branch_name (race_url is the first of the race_urls)
     """
     
     def extract_field(pattern, text):
@@ -1324,11 +2367,11 @@ def parse_github_issue_form(issue_body, issue_title=None):
     
     # Calculate date automatically based on when the pipeline runs (current date)
     date = datetime.now().strftime('%Y-%m-%d')
-    print(f"📅 Automatically calculated date: {date}")
+    logger.info(f"📅 Automatically calculated date: {date}")
     
     # Parse other form fields using regex patterns (date field no longer expected in form)
     author = extract_field(r'### Author\s*\n\s*(.+?)(?=\n###|\Z)', issue_body)
-    race_url = extract_field(r'### Race URL\s*\n\s*(.+?)(?=\n###|\Z)', issue_body)
+    race_urls_text = extract_field(r'### Race URLs?\s*\n\s*(.+?)(?=\n###|\Z)', issue_body)
     description = extract_field(r'### Description\s*\n\s*(.+?)(?=\n###|\Z)', issue_body)
     namespace = extract_field(r'### Namespace\s*\n\s*(.+?)(?=\n###|\Z)', issue_body)
     
@@ -1337,22 +2380,35 @@ def parse_github_issue_form(issue_body, issue_title=None):
     change_name =  f'{date}-{change_name}'
     branch_name = f"change/{change_name}"
     
+    # One or more race URLs, separated by new lines, spaces or commas
+    race_urls = [url for url in re.split(r'[\s,]+', race_urls_text) if url]
+    
     return {
         'change_name': change_name,
         'date': date,
         'author': author,
-        'race_url': race_url,
+        'race_url': race_urls[0] if race_urls else '',
+        'race_urls': race_urls,
         'description': description,
         'namespace': namespace,
         'branch_name': branch_name
     }
 
-def fetch_firstcycling_html(race_url):
+def fetch_firstcycling_html(race_url, use_cache=True, deadline=None):
     """
     Fetch HTML content from a FirstCycling.com race URL.
     
+    Pages fetched in the last PCM_HTTP_CACHE_TTL seconds are served from the
+    on-disk page cache (see utils/http_cache.py) without starting a browser.
+    Other pages are fetched by the strategy (Selenium, HTTP session, plain
+    HTTP, proxies) that worked fastest in this environment before, falling
+    back to the others (see utils/fetch_orchestrator.py).
+    
     Args:
         race_url (str): The FirstCycling race URL (should contain pcm=1 parameter for PCM data)
+        use_cache (bool): Whether to use the on-disk page cache (default: True)
+        deadline (Deadline or float, optional): Deadline of the run, or seconds the fetch may take over all
+            strategies (default: PCM_FETCH_DEADLINE)
         
     Returns:
         tuple: (html_content, success boolean, error message)
@@ -1360,7 +2416,7 @@ def fetch_firstcycling_html(race_url):
     try:
         from urllib.parse import urlparse, parse_qs
         
-        print(f"🌐 Fetching HTML from: {race_url}")
+        logger.info(f"🌐 Fetching HTML from: {race_url}")
         
         # Verify pcm=1 parameter is present (should be added by caller if missing)
         parsed_url = urlparse(race_url)
@@ -1368,30 +2424,15 @@ def fetch_firstcycling_html(race_url):
         if 'pcm' not in query_params or '1' not in query_params['pcm']:
             raise ValueError("URL must contain pcm=1 parameter for PCM data extraction (this should be added automatically)")
         
-        # For FirstCycling.com, try Selenium first since it works reliably
-        print("🔄 Trying Selenium WebDriver (most reliable for FirstCycling.com)...")
-        content, success, error = commons.fetch_with_selenium(
-            url=race_url,
-            timeout=30,
-            headless=True
-        )
+        # The only cache lookup of this fetch: a stale entry is handed down to be revalidated
+        cached = http_cache.lookup(race_url) if use_cache else None
+        if cached and cached['fresh']:
+            return cached['content'], True, None
         
-        if success:
-            print(f"✅ Selenium successful - fetched {len(content)} bytes")
-            return content, success, error
-        else:
-            print(f"⚠️  Selenium failed: {error}")
-            print("🔄 Falling back to standard HTTP methods...")
-        
-        # Fallback to standard HTTP methods with proxy rotation
-        content, success, error = commons.make_request_with_proxy_rotation(
-            url=race_url,
-            timeout=30,
-            verify=False,  # Disable SSL verification for firstcycling.com
-            proxy_limit=10,
-            enable_ssl_warnings=False,
-            use_proxies=None  # Auto-detect: False locally, True in GitHub Actions
-        )
+        # Selenium returns whatever loaded once its wait timed out, and bot-challenge pages come with
+        # status 200, so only pages with the rider table are cached
+        content, success, error = fetch_orchestrator.fetch(race_url, deadline=deadline, use_cache=use_cache,
+                                                           cached=cached, cache_if=firstcycling.has_rider_table)
         
         if success:
             return content, success, error
@@ -1411,14 +2452,16 @@ def fetch_firstcycling_html(race_url):
                            f"   For development/testing, you can:\n"
                            f"   • Save sample HTML files and use those for testing\n"
                            f"   • Use a VPN or different network\n"
-                           f"   • Run the code in GitHub Actions where proxies are used")
+                           f"   • Run the code in GitHub Actions where proxies are used\n"
+                           f"   \n"
+                           f"   {error}")
                 return None, False, error_msg
             else:
                 return content, success, error
         
     except Exception as e:
         error_msg = f"Error fetching HTML: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error(f"❌ {error_msg}")
         return None, False, error_msg
 
 def parse_firstcycling_html(html_content):
@@ -1432,114 +2475,198 @@ def parse_firstcycling_html(html_content):
         tuple: (list of cyclist dicts, success boolean, error message)
     """
     try:
-        from bs4 import BeautifulSoup
-        
-        print("🔍 Parsing HTML content for cyclist data...")
-        
-        # Parse HTML
-        soup = BeautifulSoup(html_content, 'html.parser')
+        logger.info("🔍 Parsing HTML content for cyclist data...")
+        logger.debug(f"   Parser backend: {firstcycling.get_parser_backend()}")
         
-        cyclists = []
+        # Riders linked from the result tables, first occurrence of each rider ID
+        unique_cyclists = firstcycling.extract_cyclists(html_content)
         
-        # Look for the main results table (usually contains PCM data when pcm=1 is set)
-        tables = soup.find_all('table')
-        
-        for table in tables:
-            rows = table.find_all('tr')
-            
-            for row_index, row in enumerate(rows):
-                # Skip header rows (usually row 0)
-                if row_index == 0:
-                    continue
-                
-                # Look for cyclist links in this row (with or without leading slash)
-                cyclist_links = row.find_all('a', href=re.compile(r'/?rider\.php\?r=\d+'))
-                
-                for link in cyclist_links:
-                    # Extract cyclist ID from href
-                    href = link.get('href', '')
-                    match = re.search(r'r=(\d+)', href)
-                    
-                    if match:
-                        rider_id = match.group(1)
-                        
-                        # Try to get name from title attribute first (more reliable)
-                        name = link.get('title', '').strip()
-                        
-                        # If we got name from title, convert from "First Last" to "Last First" format
-                        if name and ' ' in name:
-                            parts = name.strip().split()
-                            if len(parts) >= 2:
-                                # Convert "First Last" to "Last First"
-                                first_name = parts[0]
-                                last_name = ' '.join(parts[1:])  # Handle multiple last names
-                                name = f"{last_name} {first_name}"
-                        
-                        # If no title, try to parse the link text more carefully
-                        if not name:
-                            name = link.get_text(strip=True)
-                            # Handle case where we get "LampertiLuke" format
-                            # Try to add space before capital letters (crude but works for this case)
-                            name = re.sub(r'([a-z])([A-Z])', r'\1 \2', name)
-                        
-                        # Basic validation
-                        if name and len(name) > 1 and rider_id:
-                            cyclist_data = {
-                                'name': name,
-                                'href': href,
-                                'rider_id': rider_id,
-                                'table_row_number': row_index,
-                                'first_cycling_id': int(rider_id)  # For compatibility
-                            }
-                            cyclists.append(cyclist_data)
-        
-        # Remove duplicates based on rider_id (keep first occurrence)
-        seen_ids = set()
-        unique_cyclists = []
-        for cyclist in cyclists:
-            if cyclist['rider_id'] not in seen_ids:
-                seen_ids.add(cyclist['rider_id'])
-                unique_cyclists.append(cyclist)
-        
-        print(f"✅ Parsed {len(unique_cyclists)} unique cyclists")
+        logger.info(f"✅ Parsed {len(unique_cyclists)} unique cyclists")
         return unique_cyclists, True, None
         
     except Exception as e:
         error_msg = f"Error parsing HTML content: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error(f"❌ {error_msg}")
         return [], False, error_msg
 
-def scrape_firstcycling_cyclists(race_url):
+def scrape_firstcycling_cyclists(race_url, deadline=None):
     """
     Scrape cyclist data from a FirstCycling.com race URL with PCM data.
     
     Args:
         race_url (str): The FirstCycling race URL (must contain pcm=1 parameter)
+        deadline (Deadline, optional): Deadline of the run (see utils/deadline.py)
         
     Returns:
         tuple: (list of cyclist dicts, success boolean, error message)
     """
     # Step 1: Fetch HTML content
-    html_content, fetch_success, fetch_error = fetch_firstcycling_html(race_url)
+    options = {'deadline': deadline} if deadline else {}
+    with metrics.stage('fetch'):
+        html_content, fetch_success, fetch_error = fetch_firstcycling_html(race_url, **options)
     
     if not fetch_success:
         return [], False, fetch_error
     
     # Step 2: Parse HTML content
-    cyclists, parse_success, parse_error = parse_firstcycling_html(html_content)
+    with metrics.stage('parse'):
+        cyclists, parse_success, parse_error = parse_firstcycling_html(html_content)
+    
+    return cyclists, parse_success, parse_error
+
+async def scrape_firstcycling_cyclists_async(race_url, client=None, deadline=None):
+    """
+    Scrape cyclist data from a FirstCycling.com race URL like scrape_firstcycling_cyclists, as a coroutine.
+    
+    Many URLs can be awaited at once (e.g. with asyncio.gather); the client limits
+    how many pages of a host are fetched at the same time and how fast.
+    
+    Args:
+        race_url (str): The FirstCycling race URL (must contain pcm=1 parameter)
+        client (AsyncFetchClient, optional): Client to fetch with (default: a new client for this call)
+        deadline (Deadline, optional): Deadline of the run (see utils/deadline.py)
+        
+    Returns:
+        tuple: (list of cyclist dicts, success boolean, error message)
+    """
+    if client is None:
+        from src.utils import async_fetch  # asyncio is only loaded by the callers that need it
+        
+        async with async_fetch.AsyncFetchClient() as client:
+            return await scrape_firstcycling_cyclists_async(race_url, client, deadline)
+    
+    options = {'deadline': deadline} if deadline else {}
+    
+    def fetch(url):
+        # Stages are tracked per thread, so the fetch stage is entered in the worker thread
+        with metrics.stage('fetch'):
+            return fetch_firstcycling_html(url, **options)
+    
+    html_content, fetch_success, fetch_error = await client.fetch(race_url, fetch)
+    if not fetch_success:
+        return [], False, fetch_error
+    
+    with metrics.stage('parse'):
+        cyclists, parse_success, parse_error = parse_firstcycling_html(html_content)
     
     return cyclists, parse_success, parse_error
 
-def create_automated_change_file(namespace, change_name, form_data, cyclists):
+def merge_scraped_cyclists(cyclist_lists):
+    """
+    Merge cyclists scraped from several pages, deduplicated by first_cycling_id.
+    
+    The first occurrence of a rider is kept; stats missing from it are filled in
+    from the rider's later occurrences.
+    
+    Args:
+        cyclist_lists (list): Lists of cyclist dicts, in page order
+        
+    Returns:
+        list: Unique cyclist dicts in order of first occurrence
+    """
+    merged = {}
+    for cyclists in cyclist_lists:
+        for cyclist in cyclists:
+            key = cyclist.get('first_cycling_id') or cyclist.get('rider_id') or cyclist.get('name')
+            first = merged.get(key)
+            if first is None:
+                merged[key] = dict(cyclist)
+            elif cyclist.get('stats'):
+                first['stats'] = dict(cyclist['stats'], **(first.get('stats') or {}))
+    return list(merged.values())
+
+def scrape_firstcycling_races(race_urls, max_workers=RACE_FETCH_WORKERS, min_interval=RACE_FETCH_MIN_INTERVAL,
+                              deadline=None):
+    """
+    Scrape several FirstCycling.com race URLs concurrently and merge their cyclists.
+    
+    The pages are fetched and parsed through an AsyncFetchClient (see utils/async_fetch.py):
+    at most max_workers pages at the same time, and requests to the same host are
+    spaced at least min_interval seconds apart.
+    
+    Args:
+        race_urls (list): FirstCycling race URLs (must contain the pcm=1 parameter)
+        max_workers (int): Maximum number of pages fetched at the same time
+        min_interval (float): Minimum seconds between two requests to the same host
+        deadline (Deadline, optional): Deadline of the run; pages not started by then fail (see utils/deadline.py)
+        
+    Returns:
+        tuple: (list of unique cyclist dicts, success boolean, error message)
+    """
+    if not race_urls:
+        return [], False, "No race URLs to scrape"
+    
+    import asyncio
+    from src.utils import async_fetch  # asyncio is only loaded by the callers that need it
+    
+    options = {'deadline': deadline} if deadline else {}
+    
+    def scrape(race_url):
+        if deadline and deadline.expired():
+            return [], False, deadline.error(f"fetching {race_url}")
+        return scrape_firstcycling_cyclists(race_url, **options)
+    
+    workers = max(1, min(max_workers, len(race_urls)))
+    # A one-token bucket refilled every min_interval seconds spaces the requests like a fixed interval
+    rate = 1.0 / min_interval if min_interval > 0 else 0
+    
+    async def scrape_all():
+        async with async_fetch.AsyncFetchClient(max_per_host=workers, rate=rate, burst=1,
+                                                max_workers=workers) as client:
+            # fetch_all() keeps the results in URL order, so the merge does not depend on timing
+            return await client.fetch_all(race_urls, scrape)
+    
+    logger.info(f"🌐 Scraping {len(race_urls)} race pages with {workers} workers...")
+    results = asyncio.run(scrape_all())
+    
+    errors = [f"{race_url}: {error}" for race_url, (_, success, error) in zip(race_urls, results) if not success]
+    if errors:
+        return [], False, f"Failed to scrape {len(errors)} of {len(race_urls)} race pages:\n" + "\n".join(errors)
+    
+    cyclists = merge_scraped_cyclists([page_cyclists for page_cyclists, _, _ in results])
+    logger.info(f"✅ Merged {sum(len(page_cyclists) for page_cyclists, _, _ in results)} scraped riders "
+                f"into {len(cyclists)} unique cyclists")
+    return cyclists, True, None
+
+def load_first_cycling_index(namespace):
+    """
+    Load a namespace's stats.yaml and index its cyclists by first_cycling_id.
+    
+    Args:
+        namespace (str): The namespace whose stats file is loaded
+        
+    Returns:
+        dict: first_cycling_id -> (pcm_id, cyclist data); the first cyclist with an ID wins
+    """
+    stats_file_path = commons.get_path(namespace, 'stats_file')
+    existing_cyclists = {}
+    
+    if os.path.exists(stats_file_path):
+        logger.info(f"📊 Loading existing stats from: {stats_file_path}")
+        with metrics.stage('stats_load'), open(stats_file_path, 'r', encoding='utf-8') as f:
+            existing_cyclists = yaml.safe_load(f) or {}
+        logger.info(f"   - Found {len(existing_cyclists)} existing cyclists in stats file")
+    else:
+        logger.warning(f"⚠️  Stats file not found: {stats_file_path}")
+    
+    cyclists_by_first_cycling_id = {}
+    for pcm_id, cyclist_data in existing_cyclists.items():
+        if cyclist_data.get('first_cycling_id'):
+            cyclists_by_first_cycling_id.setdefault(cyclist_data['first_cycling_id'], (pcm_id, cyclist_data))
+    return cyclists_by_first_cycling_id
+
+def create_automated_change_file(namespace, change_name, form_data, cyclists, first_cycling_index=None):
     """
     Create a change directory and change.yaml file from automated request.
     Looks up cyclists from scraped data in the stats.yaml file and includes their current stats.
+    Scraped stat values that differ from the current stats are written as the cyclist's changes.
     
     Args:
         namespace (str): The namespace for the change
         change_name (str): Name of the change
         form_data (dict): Parsed form data from GitHub issue
-        cyclists (list): List of cyclist dictionaries from scraping (with first_cycling_id)
+        cyclists (list): List of cyclist dictionaries from scraping (with first_cycling_id and optional stats)
+        first_cycling_index (dict, optional): Index from load_first_cycling_index (default: load the stats file)
         
     Returns:
         tuple: (change_file_path, success boolean, error message)
@@ -1550,39 +2677,25 @@ def create_automated_change_file(namespace, change_name, form_data, cyclists):
         os.makedirs(change_dir, exist_ok=True)
         
         # Load existing stats.yaml file to lookup cyclists
-        stats_file_path = commons.get_path(namespace, 'stats_file')
-        existing_cyclists = {}
-        
-        if os.path.exists(stats_file_path):
-            print(f"📊 Loading existing stats from: {stats_file_path}")
-            with open(stats_file_path, 'r', encoding='utf-8') as f:
-                existing_cyclists = yaml.safe_load(f) or {}
-            print(f"   - Found {len(existing_cyclists)} existing cyclists in stats file")
-        else:
-            print(f"⚠️  Stats file not found: {stats_file_path}")
+        if first_cycling_index is None:
+            first_cycling_index = load_first_cycling_index(namespace)
         
         # Build stats list by matching first_cycling_id values
         matched_cyclists = []
         not_found_cyclists = []
+        stat_deltas = 0
         
         for scraped_cyclist in cyclists:
             first_cycling_id = scraped_cyclist.get('first_cycling_id')
             scraped_name = scraped_cyclist.get('name', '')
             
             if not first_cycling_id:
-                print(f"⚠️  Skipping cyclist {scraped_name}: No first_cycling_id")
+                logger.debug(f"⚠️  Skipping cyclist {scraped_name}: No first_cycling_id")
                 not_found_cyclists.append(scraped_name)
                 continue
             
             # Look for this first_cycling_id in existing cyclists
-            found_cyclist = None
-            found_pcm_id = None
-            
-            for pcm_id, cyclist_data in existing_cyclists.items():
-                if cyclist_data.get('first_cycling_id') == first_cycling_id:
-                    found_cyclist = cyclist_data
-                    found_pcm_id = pcm_id
-                    break
+            found_pcm_id, found_cyclist = first_cycling_index.get(first_cycling_id, (None, None))
             
             if found_cyclist:
                 # Create cyclist entry for change file with existing stats
@@ -1592,14 +2705,21 @@ def create_automated_change_file(namespace, change_name, form_data, cyclists):
                     'first_cycling_id': first_cycling_id
                 }
                 
+                # Scraped stats that differ from the current ones become top-level stat changes
+                current_stats = found_cyclist.get('stats') or {}
+                for stat_name, value in (scraped_cyclist.get('stats') or {}).items():
+                    if stat_name in commons.STAT_KEYS and current_stats.get(stat_name) != value:
+                        cyclist_entry[stat_name] = value
+                        stat_deltas += 1
+                
                 # Include existing stats if available, nested in a stats dictionary
                 if 'stats' in found_cyclist:
                     cyclist_entry['stats'] = found_cyclist['stats']
                 
                 matched_cyclists.append(cyclist_entry)
-                print(f"   ✅ Matched: {scraped_name} -> {found_cyclist['name']} (PCM ID: {found_pcm_id})")
+                logger.debug(f"   ✅ Matched: {scraped_name} -> {found_cyclist['name']} (PCM ID: {found_pcm_id})")
             else:
-                print(f"   ❌ Not found: {scraped_name} (FirstCycling ID: {first_cycling_id})")
+                logger.debug(f"   ❌ Not found: {scraped_name} (FirstCycling ID: {first_cycling_id})")
                 not_found_cyclists.append(f"{scraped_name} (FC ID: {first_cycling_id})")
         
         # Create change.yaml content
@@ -1607,9 +2727,11 @@ def create_automated_change_file(namespace, change_name, form_data, cyclists):
             'author': form_data['author'],
             'date': form_data['date'],
             'description': form_data.get('description', ''),
-            'race_url': form_data['race_url'],  # Include race URL for reference
-            'stats': matched_cyclists
+            'race_url': form_data['race_url']  # Include race URL for reference
         }
+        if len(form_data.get('race_urls') or []) > 1:
+            change_data['race_urls'] = form_data['race_urls']
+        change_data['stats'] = matched_cyclists
         
         # Write change.yaml file
         change_file_path = os.path.join(change_dir, 'change.yaml')
@@ -1629,26 +2751,61 @@ def create_automated_change_file(namespace, change_name, form_data, cyclists):
         with open(change_file_path, 'w', encoding='utf-8') as f:
             yaml.dump(change_data, f, Dumper=ChangeYAMLDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
         
-        print(f"✅ Created change file: {change_file_path}")
-        print(f"   - Change: {change_name}")
-        print(f"   - Author: {form_data['author']}")
-        print(f"   - Date: {form_data['date']}")
-        print(f"   - Cyclists matched: {len(matched_cyclists)}")
-        print(f"   - Cyclists not found: {len(not_found_cyclists)}")
+        metrics.increment('cyclists_matched', len(matched_cyclists))
+        metrics.increment('cyclists_unmatched', len(not_found_cyclists))
+        metrics.increment('stat_deltas_detected', stat_deltas)
+        
+        logger.info(f"✅ Created change file: {change_file_path}")
+        logger.info(f"   - Change: {change_name}")
+        logger.info(f"   - Author: {form_data['author']}")
+        logger.info(f"   - Date: {form_data['date']}")
+        logger.info(f"   - Cyclists matched: {len(matched_cyclists)}")
+        logger.info(f"   - Cyclists not found: {len(not_found_cyclists)}")
+        logger.info(f"   - Stat changes detected: {stat_deltas}")
         
         if not_found_cyclists:
-            print(f"   ⚠️  Not found in stats file: {', '.join(not_found_cyclists[:5])}")
+            logger.warning(f"   ⚠️  Not found in stats file: {', '.join(not_found_cyclists[:5])}")
             if len(not_found_cyclists) > 5:
-                print(f"      ... and {len(not_found_cyclists) - 5} more")
+                logger.warning(f"      ... and {len(not_found_cyclists) - 5} more")
         
         return change_file_path, True, None
         
     except Exception as e:
         error_msg = f"Error creating change file: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error(f"❌ {error_msg}")
         return None, False, error_msg
 
-def process_automated_change_request(issue_body, author_override=None, issue_title=None):
+def normalize_race_url(race_url):
+    """
+    Validate a FirstCycling race URL, adding the https:// scheme and pcm=1 parameter when missing.
+    
+    Args:
+        race_url (str): Race URL from the issue form or command line
+        
+    Returns:
+        str: Normalized race URL
+        
+    Raises:
+        ValueError: If the URL is not a firstcycling.com/race.php URL
+    """
+    if not race_url.startswith(('http://', 'https://')):
+        race_url = 'https://' + race_url
+    
+    # Validate URL format and extract components in one regex
+    url_match = re.match(r'^(https?://(?:www\.)?firstcycling\.com/race\.php)(\?.*)?$', race_url)
+    if not url_match:
+        raise ValueError(f"Invalid URL format. Expected firstcycling.com/race.php URL, got: {race_url}")
+    
+    # Check for pcm=1 parameter and add if missing
+    if not re.search(r'[?&]pcm=1(?:&|$)', race_url):
+        separator = '&' if '?' in race_url else '?'
+        race_url = race_url + separator + 'pcm=1'
+        logger.info(f"   ✅ Added pcm=1 parameter to URL")
+    
+    return race_url
+
+def process_automated_change_request(issue_body, author_override=None, issue_title=None, race_urls=None,
+                                     max_workers=RACE_FETCH_WORKERS, deadline=None, first_cycling_indexes=None):
     """
     Complete processing of an automated change request from GitHub issue.
     
@@ -1656,10 +2813,18 @@ def process_automated_change_request(issue_body, author_override=None, issue_tit
         issue_body (str): Raw GitHub issue body text
         author_override (str, optional): Override author field with this value (e.g., GitHub username)
         issue_title (str, optional): Issue title to extract change_name from
+        race_urls (list, optional): Race URLs to scrape instead of the ones in the issue form
+        max_workers (int): Maximum number of race pages fetched at the same time
+        deadline (float or Deadline, optional): Seconds the request may take. Fetch timeouts, retries and sleeps
+            are shortened to the time left, and the request fails with a "Deadline exceeded" error once it is
+            used up instead of starting new fetches
+        first_cycling_indexes (dict, optional): namespace -> load_first_cycling_index() result, filled on first use
+            and reused, so requests of the same namespace load its stats file once
         
     Returns:
         dict: Processing results with success status, file paths, and statistics
     """
+    deadline = deadlines.get_deadline(deadline)
     result = {
         'success': False,
         'form_data': None,
@@ -1670,13 +2835,20 @@ def process_automated_change_request(issue_body, author_override=None, issue_tit
     
     try:
         # Step 1: Parse form data
-        print("📋 Parsing GitHub issue form data...")
+        logger.info("📋 Parsing GitHub issue form data...")
         form_data = parse_github_issue_form(issue_body, issue_title)
         
         # Override author if provided and current author is empty
         if author_override and not form_data.get('author'):
             form_data['author'] = author_override
-            print(f"   🔄 Using GitHub actor as author: {author_override}")
+            logger.info(f"   🔄 Using GitHub actor as author: {author_override}")
+        
+        # Race URLs given on the command line replace the ones in the form
+        if race_urls:
+            form_data['race_urls'] = list(race_urls)
+        elif not form_data.get('race_urls') and form_data.get('race_url'):
+            form_data['race_urls'] = [form_data['race_url']]
+        form_data['race_url'] = form_data['race_urls'][0] if form_data.get('race_urls') else ''
         
         result['form_data'] = form_data
         
@@ -1684,45 +2856,49 @@ def process_automated_change_request(issue_body, author_override=None, issue_tit
                    form_data['race_url'], form_data['namespace']]):
             raise ValueError("Missing required form fields")
         
-        print(f"   ✅ Parsed form data for change: {form_data['change_name']}")
-        
-        # Step 1.5: Validate race URL format
-        print("🔍 Validating race URL format...")
-        race_url = form_data['race_url']
-        if not race_url.startswith(('http://', 'https://')):
-            race_url = 'https://' + race_url
-            form_data['race_url'] = race_url
+        logger.info(f"   ✅ Parsed form data for change: {form_data['change_name']}")
         
-        import re
-        # Validate URL format and extract components in one regex
-        url_match = re.match(r'^(https?://(?:www\.)?firstcycling\.com/race\.php)(\?.*)?$', race_url)
-        if not url_match:
-            raise ValueError(f"Invalid URL format. Expected firstcycling.com/race.php URL, got: {race_url}")
+        # Step 1.5: Validate race URL format (duplicates are only scraped once)
+        logger.info("🔍 Validating race URL format...")
+        normalized_urls = []
+        for race_url in form_data['race_urls']:
+            race_url = normalize_race_url(race_url)
+            if race_url not in normalized_urls:
+                normalized_urls.append(race_url)
+        form_data['race_urls'] = normalized_urls
+        form_data['race_url'] = normalized_urls[0]
         
-        # Check for pcm=1 parameter and add if missing
-        if not re.search(r'[?&]pcm=1(?:&|$)', race_url):
-            separator = '&' if '?' in race_url else '?'
-            race_url = race_url + separator + 'pcm=1'
-            form_data['race_url'] = race_url
-            print(f"   ✅ Added pcm=1 parameter to URL")
-        
-        print(f"   ✅ Valid FirstCycling race URL with PCM data: {race_url}")
+        for race_url in normalized_urls:
+            logger.info(f"   ✅ Valid FirstCycling race URL with PCM data: {race_url}")
         
         # Step 2: Scrape cyclist data
-        print("🌐 Scraping cyclist data...")
-        cyclists, scrape_success, scrape_error = scrape_firstcycling_cyclists(form_data['race_url'])
+        logger.info("🌐 Scraping cyclist data...")
+        options = {}
+        if deadline:
+            logger.info(f"   ⏱️  {deadline.remaining():.0f}s left of the {deadline.seconds:g}s deadline")
+            options['deadline'] = deadline
+        if len(normalized_urls) == 1:
+            cyclists, scrape_success, scrape_error = scrape_firstcycling_cyclists(form_data['race_url'], **options)
+        else:
+            cyclists, scrape_success, scrape_error = scrape_firstcycling_races(normalized_urls, max_workers,
+                                                                               **options)
         result['cyclists_found'] = len(cyclists)
         
         if not scrape_success:
-            print(f"⚠️  Scraping failed: {scrape_error}")
+            logger.warning(f"⚠️  Scraping failed: {scrape_error}")
             result['success'] = False
             result['error'] = scrape_error
             return result
         
         # Step 3: Create change file
-        print("📝 Creating change file...")
+        logger.info("📝 Creating change file...")
+        create_options = {}
+        if first_cycling_indexes is not None:
+            if form_data['namespace'] not in first_cycling_indexes:
+                first_cycling_indexes[form_data['namespace']] = load_first_cycling_index(form_data['namespace'])
+            create_options['first_cycling_index'] = first_cycling_indexes[form_data['namespace']]
         change_file_path, create_success, create_error = create_automated_change_file(
-            form_data['namespace'], form_data['change_name'], form_data, cyclists
+            form_data['namespace'], form_data['change_name'], form_data, cyclists, **create_options
         )
         
         if not create_success:
@@ -1731,11 +2907,55 @@ def process_automated_change_request(issue_body, author_override=None, issue_tit
         result['change_file_path'] = change_file_path
         
         result['success'] = True
-        print("🎉 Automated change request processed successfully!")
+        logger.info("🎉 Automated change request processed successfully!")
         
     except Exception as e:
         error_msg = str(e)
         result['error'] = error_msg
-        print(f"❌ Error processing automated change request: {error_msg}")
+        logger.error(f"❌ Error processing automated change request: {error_msg}")
     
     return result
+
+def process_automated_change_batch(issue_lines, max_workers=RACE_FETCH_WORKERS, deadline=None):
+    """
+    Process many automated change requests in one run.
+    
+    Each line is a JSON object with the issue 'body' and optional 'title' and
+    'actor' (GitHub username used when the form has no author). The requests
+    share the stats index of each namespace (loaded once) and the process-wide
+    fetch state: browser pool, HTTP session, proxy pool and page cache.
+    
+    Args:
+        issue_lines (iterable): JSON lines, one issue per line (blank lines are skipped)
+        max_workers (int): Maximum number of race pages of a request fetched at the same time
+        deadline (float or Deadline, optional): Seconds the whole batch may take; requests not started by then
+            fail with a "Deadline exceeded" error
+        
+    Yields:
+        dict: process_automated_change_request result of each issue, with its 'line' number and 'title'
+    """
+    deadline = deadlines.get_deadline(deadline)
+    first_cycling_indexes = {}
+    
+    for line_number, line in enumerate(issue_lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            issue = json.loads(line)
+            if not isinstance(issue, dict) or not issue.get('body'):
+                raise ValueError("expected a JSON object with an issue 'body'")
+        except ValueError as e:
+            logger.error(f"❌ Skipping issue on line {line_number}: {e}")
+            yield {'line': line_number, 'title': None, 'success': False, 'form_data': None, 'cyclists_found': 0,
+                   'change_file_path': None, 'error': f"Invalid issue on line {line_number}: {e}"}
+            continue
+        
+        logger.info(f"📨 Processing issue on line {line_number}: {issue.get('title') or '(no title)'}")
+        if deadline and deadline.expired():
+            result = {'success': False, 'form_data': None, 'cyclists_found': 0, 'change_file_path': None,
+                      'error': deadline.error(f"processing the issue on line {line_number}")}
+        else:
+            result = process_automated_change_request(issue['body'], author_override=issue.get('actor'),
+                                                      issue_title=issue.get('title'), max_workers=max_workers,
+                                                      deadline=deadline, first_cycling_indexes=first_cycling_indexes)
+        yield dict(result, line=line_number, title=issue.get('title'))
@@ -12,6 +12,7 @@ CREATE TABLE tbl_changes (
     description TEXT NULL,
     author VARCHAR(511) DEFAULT 'Unknown',
     date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    content_hash VARCHAR(64) NULL,
     UNIQUE (name)
 );
 
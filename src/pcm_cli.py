@@ -15,19 +15,38 @@ Commands:
     process-uat            - Process UAT changes by executing SQL and exporting data
     parse-github-issue     - Parse GitHub issue form data (for automation)
     process-automated-change - Process automated change request (for automation)
+    process-automated-batch  - Process a JSON-lines stream of automated change requests
+    compare-stats          - Compare namespace stats via hash trees (namespaces or git refs)
+    detect-conflicts       - Report pending changes that edit the same cyclist stat
+    gen-synthetic          - Create a namespace with reproducible synthetic data for scale testing
     help                   - Show this help message
 
 Examples:
     python pcm_cli.py process-changes
+    python pcm_cli.py process-changes --incremental
+    python pcm_cli.py process-changes --plan
+    python pcm_cli.py process-changes --quiet --log-format json
+    python pcm_cli.py --profile process-changes
+    python pcm_cli.py --profile=mem process-uat
     python pcm_cli.py validate-yaml
     python pcm_cli.py process-uat
     python pcm_cli.py parse-github-issue "$ISSUE_BODY"
     python pcm_cli.py process-automated-change "$ISSUE_BODY"
+    python pcm_cli.py process-automated-change "$ISSUE_BODY" --race-url URL1 --race-url URL2
+    python pcm_cli.py process-automated-change "$ISSUE_BODY" --no-cache
+    python pcm_cli.py process-automated-change "$ISSUE_BODY" --deadline 600
+    python pcm_cli.py process-automated-batch issues.jsonl
+    gh issue list --search "[STATS CR]" --json body,title,author --jq '.[] | {body, title, actor: .author.login}' | python pcm_cli.py process-automated-batch -
+    python pcm_cli.py compare-stats 2025dev --ref origin/uat
+    python pcm_cli.py detect-conflicts
+    python pcm_cli.py gen-synthetic synthetic-10k --cyclists 10000 --changes 20
 """
 
 import os
 import sys
 import json
+import time
+import logging
 import argparse
 from pathlib import Path
 
@@ -37,27 +56,42 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
 from src import api as model_api
+from src.utils import http_cache, metrics, openmetrics, profiling
+from src.utils.logs import configure_logging, get_logger
 
+logger = get_logger(__name__)
 
-def process_changes():
+
+def process_changes(incremental=False):
     """Process change files for all namespaces (main CI/CD operation)."""
     try:
-        summary = model_api.process_all_namespaces()
+        summary = model_api.process_all_namespaces(incremental=incremental)
+        summary['metrics'] = metrics.get_stage_metrics()
         
         print(json.dumps(summary))
         
         # Check if any changes were made
         if summary['total_changes'] > 0:
-            print("✅ Processing completed successfully with new changes!")
+            logger.info("✅ Processing completed successfully with new changes!")
             return True
         else:
-            print("ℹ️  Processing completed - no new changes found.")
+            logger.info("ℹ️  Processing completed - no new changes found.")
             return summary['overall_success']
             
     except Exception as e:
-        print(f"❌ Error during processing: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error during processing: {e}")
+        return False
+
+
+def plan_changes(incremental=False):
+    """Report what process-changes would do, without writing anything (prints JSON only; logs go to stderr)."""
+    try:
+        report = model_api.plan_all_namespaces(incremental=incremental)
+        print(json.dumps(report, indent=2, default=str))
+        return report['overall_success']
+        
+    except Exception as e:
+        print(json.dumps({"plan": True, "overall_success": False, "error": str(e)}))
         return False
 
 
@@ -67,9 +101,7 @@ def validate_yaml_files():
         # Delegate to API for validation logic
         return model_api.validate_yaml_files()
     except Exception as e:
-        print(f"❌ Error during validation: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error during validation: {e}")
         return False
 
 
@@ -79,32 +111,29 @@ def import_from_db(namespace, db_file):
         # Delegate to API for import logic
         return model_api.import_cyclists_from_db(namespace, db_file)
     except Exception as e:
-        print(f"❌ Error during database import: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error during database import: {e}")
         return False
 
 
-def process_uat():
+def process_uat(incremental=False):
     """Process UAT changes by executing SQL inserts and exporting tracking data."""
     try:
         # Delegate to API for UAT processing logic
-        summary = model_api.process_uat_changes()
+        summary = model_api.process_uat_changes(incremental=incremental)
+        summary['metrics'] = metrics.get_stage_metrics()
         
         print(json.dumps(summary))
         
         # Check if any changes were executed
         if summary['total_changes_executed'] > 0:
-            print("✅ UAT processing completed successfully with changes executed!")
+            logger.info("✅ UAT processing completed successfully with changes executed!")
             return True
         else:
-            print("ℹ️  UAT processing completed - no new changes found.")
+            logger.info("ℹ️  UAT processing completed - no new changes found.")
             return summary['overall_success']
             
     except Exception as e:
-        print(f"❌ Error during UAT processing: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error during UAT processing: {e}")
         return False
 
 
@@ -125,21 +154,20 @@ def parse_github_issue(issue_body, github_actor=None, issue_title=None):
                 for key, value in form_data.items():
                     f.write(f"{key}={value}\n")
         
-        # Also print for debugging
-        print("Extracted form data:")
+        # Also log for debugging
+        logger.debug("Extracted form data:")
         for key, value in form_data.items():
-            print(f"  {key}: {value}")
+            logger.debug(f"  {key}: {value}")
         
         return True
         
     except Exception as e:
-        print(f"❌ Error parsing GitHub issue: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error parsing GitHub issue: {e}")
         return False
 
 
-def process_automated_change(issue_body, github_actor=None, issue_title=None):
+def process_automated_change(issue_body, github_actor=None, issue_title=None, race_urls=None, fetch_workers=None,
+                             deadline=None):
     """Process automated change request and output results."""
     try:
         # First parse the form data to get all the fields
@@ -149,15 +177,29 @@ def process_automated_change(issue_body, github_actor=None, issue_title=None):
         if github_actor and not form_data.get('author'):
             form_data['author'] = github_actor
         
+        # Race URLs from the command line replace the ones in the form
+        options = {}
+        if race_urls:
+            form_data['race_url'] = race_urls[0]
+            form_data['race_urls'] = race_urls
+            options['race_urls'] = race_urls
+        if fetch_workers:
+            options['max_workers'] = fetch_workers
+        if deadline is not None:
+            options['deadline'] = deadline
+        
         # Then process the automated change request with the updated form data
-        result = model_api.process_automated_change_request(issue_body, author_override=github_actor, issue_title=issue_title)
+        result = model_api.process_automated_change_request(issue_body, author_override=github_actor,
+                                                            issue_title=issue_title, **options)
         
         # Output for GitHub Actions (key=value format)
         github_output_file = os.environ.get('GITHUB_OUTPUT')
         if github_output_file:
             with open(github_output_file, 'a') as f:
-                # Write form data first
+                # Write form data first (lists as space-separated values)
                 for key, value in form_data.items():
+                    if isinstance(value, list):
+                        value = ' '.join(value)
                     f.write(f"{key}={value}\n")
                 
                 # Write processing results
@@ -168,21 +210,117 @@ def process_automated_change(issue_body, github_actor=None, issue_title=None):
                 if result['change_file_path']:
                     f.write(f"change_file_path={result['change_file_path']}\n")
         
-        # Print result for debugging
-        print("Form data:")
+        # Log result for debugging
+        logger.debug("Form data:")
         for key, value in form_data.items():
-            print(f"  {key}: {value}")
-        print(f"Processing result: {result}")
+            logger.debug(f"  {key}: {value}")
+        logger.info(f"Processing result: {result}")
         
         # Return success status
         return result['success']
         
     except Exception as e:
-        print(f"❌ Error processing automated change: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error processing automated change: {e}")
+        return False
+
+
+def process_automated_batch(issues_file=None, fetch_workers=None, deadline=None):
+    """Process a JSON-lines stream of automated change requests and output one JSON result per issue."""
+    try:
+        options = {}
+        if fetch_workers:
+            options['max_workers'] = fetch_workers
+        if deadline is not None:
+            options['deadline'] = deadline
+        
+        # Issues come from a file, or from stdin when no file (or '-') is given
+        stream = sys.stdin if issues_file in (None, '-') else open(issues_file, 'r', encoding='utf-8')
+        processed = 0
+        failed = 0
+        try:
+            for result in model_api.process_automated_change_batch(stream, **options):
+                form_data = result['form_data'] or {}
+                print(json.dumps({
+                    'line': result['line'],
+                    'title': result['title'],
+                    'success': result['success'],
+                    'change_name': form_data.get('change_name'),
+                    'namespace': form_data.get('namespace'),
+                    'branch_name': form_data.get('branch_name'),
+                    'cyclists_found': result['cyclists_found'],
+                    'change_file_path': result['change_file_path'],
+                    'error': result['error']
+                }), flush=True)
+                processed += 1
+                if not result['success']:
+                    failed += 1
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        
+        if failed:
+            logger.warning(f"⚠️  {failed} of {processed} change requests failed")
+        else:
+            logger.info(f"✅ Processed {processed} change requests")
+        return processed > 0 and not failed
+        
+    except Exception as e:
+        logger.exception(f"❌ Error processing automated change batch: {e}")
+        return False
+
+
+def compare_stats(namespace, other_namespace=None, ref=None):
+    """Compare namespace stats using their hash trees and output the differences."""
+    try:
+        summary = model_api.compare_namespace_stats(namespace, other_namespace, ref)
+        
+        print(json.dumps(summary))
+        
+        if summary['identical']:
+            logger.info("✅ Stats are identical")
+        else:
+            changed_count = (len(summary['cyclists_added']) + len(summary['cyclists_removed'])
+                             + len(summary['cyclists_changed']))
+            logger.warning(f"⚠️  Stats differ in {len(summary['differing_buckets'])} bucket(s), {changed_count} cyclist(s)")
+        return summary['identical']
+        
+    except Exception as e:
+        logger.exception(f"❌ Error comparing stats: {e}")
         return False
-  
+
+
+def detect_conflicts(namespace=None):
+    """Detect pending changes that edit the same cyclist stat with different values."""
+    try:
+        summary = model_api.detect_all_change_conflicts([namespace] if namespace else None)
+        
+        print(json.dumps(summary))
+        
+        if summary['overall_success']:
+            logger.info("✅ No conflicting pending changes found")
+        else:
+            logger.error(f"❌ Found {summary['total_conflicts']} conflicting stat edit(s) in pending changes")
+        return summary['overall_success']
+        
+    except Exception as e:
+        logger.exception(f"❌ Error detecting conflicts: {e}")
+        return False
+
+
+def gen_synthetic(namespace, cyclists, changes, stats_per_change, history_depth, seed):
+    """Generate a synthetic namespace for scale testing and output its summary."""
+    try:
+        summary = model_api.generate_synthetic_namespace(
+            namespace, cyclists=cyclists, changes=changes, stats_per_change=stats_per_change,
+            history_depth=history_depth, seed=seed)
+        print(json.dumps(summary))
+        return True
+        
+    except Exception as e:
+        logger.exception(f"❌ Error generating synthetic namespace: {e}")
+        return False
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -191,31 +329,38 @@ def main():
         epilog="""
 Examples:
     python pcm_cli.py process-changes
+    python pcm_cli.py process-changes --plan
     python pcm_cli.py validate-yaml
     python pcm_cli.py process-uat
     python pcm_cli.py import-from-db 2025 /path/to/database.sqlite
     python pcm_cli.py parse-github-issue "$ISSUE_BODY"
     python pcm_cli.py process-automated-change "$ISSUE_BODY"
+    python pcm_cli.py process-automated-change "$ISSUE_BODY" --race-url URL1 --race-url URL2
+    python pcm_cli.py process-automated-batch issues.jsonl
+    python pcm_cli.py compare-stats 2025dev --ref origin/uat
+    python pcm_cli.py detect-conflicts
+    python pcm_cli.py gen-synthetic synthetic-10k --cyclists 10000 --changes 20
         """
     )
     
     parser.add_argument(
         'command',
         choices=['process-changes', 'validate-yaml', 'import-from-db', 'process-uat', 
-                'parse-github-issue', 'process-automated-change', 'help'],
+                'parse-github-issue', 'process-automated-change', 'process-automated-batch', 'compare-stats', 'detect-conflicts', 'gen-synthetic', 'help'],
         help='Command to execute'
     )
     
     parser.add_argument(
         'namespace',
         nargs='?',
-        help='Namespace for import-from-db command, or issue body for GitHub commands'
+        help='Namespace for import-from-db, compare-stats, detect-conflicts and gen-synthetic commands, issue body for GitHub commands, '
+             'or JSON-lines issues file for process-automated-batch (default: stdin)'
     )
     
     parser.add_argument(
         'db_file',
         nargs='?',
-        help='SQLite database file path for import-from-db command'
+        help='SQLite database file path for import-from-db command, or other namespace for compare-stats'
     )
     
     parser.add_argument(
@@ -228,68 +373,244 @@ Examples:
         help='GitHub issue title (for extracting change name from title)'
     )
     
+    parser.add_argument(
+        '--race-url',
+        action='append',
+        dest='race_urls',
+        help='FirstCycling race URL to scrape instead of the issue form URLs (process-automated-change, repeatable)'
+    )
+    
+    parser.add_argument(
+        '--fetch-workers',
+        type=int,
+        default=None,
+        help=f'Race pages fetched at the same time (process-automated-change/-batch, default: {model_api.RACE_FETCH_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help='Fail instead of fetching further once this many seconds have passed (process-automated-change/-batch)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Fetch race pages again instead of using the on-disk page cache (process-automated-change/-batch)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only discover change directories added since the last recorded commit (process-changes, process-uat)'
+    )
+    
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Print a JSON report of what process-changes would do without writing any files'
+    )
+    
+    parser.add_argument(
+        '--metrics-file',
+        help='Write per-stage wall time, CPU time and peak memory of the run to this JSON file'
+    )
+    
+    parser.add_argument(
+        '--openmetrics-file',
+        help='Write run metrics to this OpenMetrics/Prometheus text file (e.g. for the node_exporter textfile collector)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        choices=profiling.PROFILE_MODES,
+        help='Profile the command: --profile or --profile=cpu (cProfile), --profile=mem (tracemalloc)'
+    )
+    
+    parser.add_argument(
+        '--profile-dir',
+        default=profiling.DEFAULT_PROFILE_DIR,
+        help=f'Directory for profile output files (default: {profiling.DEFAULT_PROFILE_DIR})'
+    )
+    
+    parser.add_argument(
+        '--profile-top',
+        type=int,
+        default=profiling.DEFAULT_TOP,
+        help=f'Number of entries in the profile summaries (default: {profiling.DEFAULT_TOP})'
+    )
+    
+    synthetic_group = parser.add_argument_group('gen-synthetic options')
+    synthetic_group.add_argument('--cyclists', type=int, default=1000, help='Number of cyclists (default: 1000)')
+    synthetic_group.add_argument('--changes', type=int, default=10, help='Number of pending change directories (default: 10)')
+    synthetic_group.add_argument('--stats-per-change', type=int, default=50,
+                                 help='Stat values set by each change (default: 50)')
+    synthetic_group.add_argument('--history-depth', type=int, default=3,
+                                 help='Changes already recorded in the tracking database (default: 3)')
+    synthetic_group.add_argument('--seed', type=int, default=2025, help='Random seed (default: 2025)')
+    
+    parser.add_argument(
+        '--ref',
+        help='Git ref (branch, tag or commit) to compare against for compare-stats'
+    )
+    
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Only show warnings and errors (JSON summaries are still printed)'
+    )
+    verbosity.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Show per-cyclist and per-statement details'
+    )
+    
+    parser.add_argument(
+        '--log-format',
+        choices=['text', 'json'],
+        default='text',
+        help='Log output format: plain text (default) or JSON lines'
+    )
+    
     # Handle no arguments or help
     if len(sys.argv) == 1 or (len(sys.argv) == 2 and sys.argv[1] in ['help', '--help', '-h']):
         parser.print_help()
         return 0
     
-    args = parser.parse_args()
+    args = parser.parse_args(profiling.normalize_profile_argv(sys.argv[1:]))
+    
+    log_level = logging.WARNING if args.quiet else logging.DEBUG if args.verbose else logging.INFO
+    # Commands whose stdout is JSON for other tools log to stderr
+    json_output = args.command == 'process-automated-batch' or (args.command == 'process-changes' and args.plan)
+    log_stream = 'stderr' if json_output else 'stdout'
+    configure_logging(log_level, args.log_format, log_stream)
+    
+    metrics.reset()
+    http_cache.configure(enabled=False if args.no_cache else None)
+    profiler = None
+    if args.profile:
+        profiler = profiling.CommandProfiler(args.profile, args.profile_dir, f"pcm-{args.command}", args.profile_top)
+        profiler.start()
+    
+    started = time.perf_counter()
+    try:
+        success = run_command(parser, args)
+    finally:
+        if profiler:
+            for path in profiler.stop():
+                logger.info(f"🔬 Profile written: {path}")
+    
+    wall_time = time.perf_counter() - started
+    if args.metrics_file:
+        metrics.write_metrics_file(args.metrics_file, args.command, wall_time, success)
+    if args.openmetrics_file:
+        openmetrics.write_openmetrics_file(args.openmetrics_file, args.command, success, wall_time)
+    
+    return 0 if success else 1
 
+
+def run_command(parser, args):
+    """
+    Execute the parsed CLI command.
+    
+    Returns:
+        bool: True if the command succeeded
+    """
     # Execute command
     success = True
     
-    if args.command == 'process-changes':
-        print("=" * 60)
-        print(f"🤖 PCM Stats Management - Processing All Namespaces")
-        print("=" * 60)
+    if args.command == 'process-changes' and args.plan:
+        success = plan_changes(args.incremental)
         
-        success = process_changes()
+    elif args.command == 'process-changes':
+        logger.info("=" * 60)
+        logger.info(f"🤖 PCM Stats Management - Processing All Namespaces")
+        logger.info("=" * 60)
+        
+        success = process_changes(args.incremental)
         
     elif args.command == 'validate-yaml':
         success = validate_yaml_files()
         
     elif args.command == 'import-from-db':
         if not args.namespace or not args.db_file:
-            print("❌ Error: import-from-db command requires namespace and db_file arguments")
-            print("Usage: python pcm_cli.py import-from-db <namespace> <db_file>")
-            return 1
+            logger.error("❌ Error: import-from-db command requires namespace and db_file arguments")
+            logger.info("Usage: python pcm_cli.py import-from-db <namespace> <db_file>")
+            return False
         
-        print("=" * 60)
-        print(f"📥 Importing cyclist data from database to namespace: {args.namespace}")
-        print("=" * 60)
+        logger.info("=" * 60)
+        logger.info(f"📥 Importing cyclist data from database to namespace: {args.namespace}")
+        logger.info("=" * 60)
         
         success = import_from_db(args.namespace, args.db_file)
         
     elif args.command == 'process-uat':
-        print("=" * 60)
-        print(f"🚀 PCM Stats Management - UAT Processing")
-        print("=" * 60)
+        logger.info("=" * 60)
+        logger.info(f"🚀 PCM Stats Management - UAT Processing")
+        logger.info("=" * 60)
         
-        success = process_uat()
+        success = process_uat(args.incremental)
         
     elif args.command == 'parse-github-issue':
         if not args.namespace:
-            print("❌ Error: parse-github-issue command requires issue body as argument")
-            print("Usage: python pcm_cli.py parse-github-issue \"$ISSUE_BODY\" [--github-actor USERNAME] [--issue-title TITLE]")
-            return 1
+            logger.error("❌ Error: parse-github-issue command requires issue body as argument")
+            logger.info("Usage: python pcm_cli.py parse-github-issue \"$ISSUE_BODY\" [--github-actor USERNAME] [--issue-title TITLE]")
+            return False
         
         success = parse_github_issue(args.namespace, args.github_actor, args.issue_title)  # namespace arg contains issue body
         
     elif args.command == 'process-automated-change':
         if not args.namespace:
-            print("❌ Error: process-automated-change command requires issue body as argument")
-            print("Usage: python pcm_cli.py process-automated-change \"$ISSUE_BODY\" [--github-actor USERNAME] [--issue-title TITLE]")
-            return 1
+            logger.error("❌ Error: process-automated-change command requires issue body as argument")
+            logger.info("Usage: python pcm_cli.py process-automated-change \"$ISSUE_BODY\" [--github-actor USERNAME] [--issue-title TITLE]")
+            return False
+        
+        options = {}
+        if args.race_urls:
+            options['race_urls'] = args.race_urls
+        if args.fetch_workers:
+            options['fetch_workers'] = args.fetch_workers
+        if args.deadline is not None:
+            options['deadline'] = args.deadline
+        success = process_automated_change(args.namespace, args.github_actor, args.issue_title,  # namespace arg contains issue body
+                                           **options)
+        
+    elif args.command == 'process-automated-batch':
+        options = {}
+        if args.fetch_workers:
+            options['fetch_workers'] = args.fetch_workers
+        if args.deadline is not None:
+            options['deadline'] = args.deadline
+        success = process_automated_batch(args.namespace, **options)  # namespace arg contains the issues file
+        
+    elif args.command == 'compare-stats':
+        if not args.namespace:
+            logger.error("❌ Error: compare-stats command requires a namespace argument")
+            logger.info("Usage: python pcm_cli.py compare-stats <namespace> [other_namespace] [--ref REF]")
+            return False
         
-        success = process_automated_change(args.namespace, args.github_actor, args.issue_title)  # namespace arg contains issue body
-        if not success:
-            return 1  # Exit with error code for GitHub Actions to detect failure
+        success = compare_stats(args.namespace, args.db_file, args.ref)  # db_file arg contains other namespace
+        
+    elif args.command == 'detect-conflicts':
+        success = detect_conflicts(args.namespace)
+        
+    elif args.command == 'gen-synthetic':
+        if not args.namespace:
+            logger.error("❌ Error: gen-synthetic command requires a namespace argument")
+            logger.info("Usage: python pcm_cli.py gen-synthetic <namespace> [--cyclists N] [--changes N] "
+                        "[--stats-per-change N] [--history-depth N] [--seed N]")
+            return False
+        
+        success = gen_synthetic(args.namespace, args.cyclists, args.changes, args.stats_per_change,
+                                args.history_depth, args.seed)
         
     elif args.command == 'help':
         parser.print_help()
-        return 0
     
-    return 0 if success else 1
+    return success
 
 
 if __name__ == "__main__":
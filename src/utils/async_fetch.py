@@ -0,0 +1,135 @@
+"""
+Thread pool, driven from asyncio, for fetching many pages concurrently.
+
+``AsyncFetchClient.fetch(url)`` can be awaited for many URLs at once (e.g. with
+``asyncio.gather``). Each fetch:
+
+- waits for a slot of its host: at most ``max_per_host`` fetches per host run
+  at the same time;
+- takes a token from the host's token bucket (``ratelimit.TokenBucket``):
+  bursts of ``burst`` requests, then ``rate`` requests per second;
+- runs the blocking fetch in the client's thread pool.
+
+The default fetch is an HTTP GET through the worker thread's requests session
+(``commons.get_shared_session``). The sessions of all threads share one pool of
+keep-alive connections and accept compressed responses, and the cookies of the
+FirstCycling homepage visit are copied into each of them, so the homepage is
+visited once instead of before every page. This is not an asyncio HTTP client:
+the fetches are blocking requests calls (aiohttp is not a dependency), and
+asyncio only schedules and limits them.
+
+Use one client per event loop, e.g. ``async with AsyncFetchClient() as client``.
+When fetches are replayed (``PCM_FETCH_MODE=replay``) the rate limit does not wait.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils import cassettes
+from src.utils import commons
+from src.utils import ratelimit
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_PER_HOST = 4
+DEFAULT_RATE = 0.5  # Requests per second per host, like api.RACE_FETCH_MIN_INTERVAL
+DEFAULT_BURST = 2
+
+
+def fetch_page(url, timeout=30):
+    """
+    Fetch a page with a plain HTTP GET through the thread's pooled session (no proxies, no Selenium).
+
+    Args:
+        url (str): URL to fetch
+        timeout (int): Request timeout in seconds
+
+    Returns:
+        tuple: (content, success, error_message)
+    """
+    return commons.make_request_with_proxy_rotation(
+        url=url,
+        timeout=timeout,
+        verify=False,
+        enable_ssl_warnings=False,
+        use_proxies=False,
+        use_session=True,
+        selenium_fallback=False
+    )
+
+
+async def pause(seconds):
+    """asyncio.sleep, except when replaying (recorded responses never need to be waited for)."""
+    if cassettes.get_fetch_mode() != cassettes.MODE_REPLAY:
+        await asyncio.sleep(seconds)
+
+
+class AsyncFetchClient:
+    """
+    Concurrent fetches with a per-host concurrency limit and token-bucket rate limit.
+
+    Args:
+        max_per_host (int): Maximum number of fetches running at the same time per host
+        rate (float): Requests per second per host (0 disables the rate limit)
+        burst (int): Requests per host allowed at once after an idle period
+        max_workers (int, optional): Threads running the blocking fetches (default: 2 * max_per_host)
+        fetch (callable, optional): Blocking fetch, url -> (content, success, error) (default: fetch_page)
+        clock (callable, optional): Monotonic clock of the rate limiter
+    """
+
+    def __init__(self, max_per_host=DEFAULT_MAX_PER_HOST, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 max_workers=None, fetch=None, clock=None):
+        self.max_per_host = max(1, int(max_per_host))
+        self.bucket = ratelimit.TokenBucket(rate, burst, clock)
+        self._fetch = fetch or fetch_page
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or 2 * self.max_per_host,
+                                            thread_name_prefix='pcm-fetch')
+        # Created on first use, inside the event loop (asyncio primitives bind to a loop on Python 3.8/3.9)
+        self._host_slots = {}
+
+    async def fetch(self, url, fetch=None):
+        """
+        Fetch a URL once its host has a free slot and a token.
+
+        Args:
+            url (str): URL to fetch
+            fetch (callable, optional): Blocking fetch to use instead of the client's
+
+        Returns:
+            tuple: (content, success, error_message)
+        """
+        host = ratelimit.get_host(url)
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        async with slots:
+            delay = self.bucket.reserve(url)
+            if delay > 0:
+                logger.debug(f"⏳ Waiting {delay:.1f}s for a {host} token before fetching {url}")
+                await pause(delay)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fetch or self._fetch, url)
+
+    async def fetch_all(self, urls, fetch=None):
+        """
+        Fetch several URLs concurrently.
+
+        Args:
+            urls (list): URLs to fetch
+            fetch (callable, optional): Blocking fetch to use instead of the client's
+
+        Returns:
+            list: (content, success, error_message) tuples in URL order
+        """
+        return list(await asyncio.gather(*(self.fetch(url, fetch) for url in urls)))
+
+    def close(self):
+        """Wait for running fetches and stop the client's threads."""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
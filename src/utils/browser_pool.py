@@ -0,0 +1,334 @@
+"""
+Pool of reusable Selenium Chrome sessions for fetching FirstCycling pages.
+
+Starting Chrome (and resolving its driver with webdriver-manager) takes far
+longer than loading a page, so drivers are started lazily, up to the pool
+size, and reused for every fetch in the process. Each new session is warmed
+once: the WebDriver flag is hidden and the FirstCycling homepage is visited to
+pick up cookies, followed by a short human-like pause. Later fetches only pay
+for the page load.
+
+A driver that raised during a fetch is quit instead of being returned to the
+pool, so the next fetch starts a fresh session. All pools are shut down at
+interpreter exit.
+
+The pool size defaults to ``PCM_BROWSER_POOL_SIZE`` (2 when unset).
+
+Drivers are configured by a fetch profile (``PCM_FETCH_PROFILE``). The default
+``light`` profile uses the eager page load strategy (page_source is read once
+the DOM is parsed, without waiting for subresources), blocks images,
+stylesheets and fonts, resolves only FirstCycling (and local) hosts so ads and
+analytics never load, and waits for the results table instead of ``body``.
+``full`` loads pages like a regular browser.
+"""
+
+import atexit
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from src.utils import metrics
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+HOMEPAGE_URL = 'https://firstcycling.com/'
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/120.0.0.0 Safari/537.36')
+DEFAULT_POOL_SIZE = 2
+
+# How much of a page Chrome loads before page_source is read
+FETCH_PROFILES = {
+    'full': {
+        'page_load_strategy': 'normal',
+        'block_images': False,
+        'blocked_url_patterns': [],
+        'allowed_hosts': None,  # Every host
+        'wait_selector': 'body'
+    },
+    'light': {
+        'page_load_strategy': 'eager',
+        'block_images': True,
+        'blocked_url_patterns': ['*.css', '*.css?*', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+                                 '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico'],
+        'allowed_hosts': ['firstcycling.com', '*.firstcycling.com', 'localhost'],
+        'wait_selector': 'table'
+    }
+}
+DEFAULT_FETCH_PROFILE = 'light'
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_default_pool_size():
+    """Pool size from PCM_BROWSER_POOL_SIZE, or DEFAULT_POOL_SIZE when unset or invalid."""
+    try:
+        return max(1, int(os.getenv('PCM_BROWSER_POOL_SIZE', DEFAULT_POOL_SIZE)))
+    except ValueError:
+        return DEFAULT_POOL_SIZE
+
+
+def get_fetch_profile(name=None):
+    """
+    Get a fetch profile by name.
+
+    Args:
+        name (str, optional): Profile name (default: PCM_FETCH_PROFILE, or 'light')
+
+    Returns:
+        dict: Profile settings, including its 'name'
+
+    Raises:
+        ValueError: If the profile does not exist
+    """
+    name = name or os.getenv('PCM_FETCH_PROFILE') or DEFAULT_FETCH_PROFILE
+    if name not in FETCH_PROFILES:
+        raise ValueError(f"Unknown fetch profile '{name}' (available: {', '.join(sorted(FETCH_PROFILES))})")
+    return dict(FETCH_PROFILES[name], name=name)
+
+
+def _get_driver_path():
+    """Resolve the ChromeDriver path with webdriver-manager once per process (None without it)."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+            except ImportError:
+                return None
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def build_chrome_options(headless=True, profile=None):
+    """
+    Build the Chrome options for a fetch profile, with the anti-detection options used for FirstCycling.
+
+    Args:
+        headless (bool): Whether to run the browser in headless mode
+        profile (dict, optional): Fetch profile (default: get_fetch_profile())
+
+    Returns:
+        selenium.webdriver.chrome.options.Options: Chrome options
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    profile = profile or get_fetch_profile()
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+
+    # Anti-detection options
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+
+    chrome_options.page_load_strategy = profile['page_load_strategy']
+    if profile['block_images']:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    if profile['allowed_hosts']:
+        # Other hosts fail DNS resolution, so third-party ads and analytics are never requested
+        exclusions = ''.join(f", EXCLUDE {host}" for host in profile['allowed_hosts'])
+        chrome_options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND{exclusions}")
+    return chrome_options
+
+
+def create_chrome_driver(headless=True, profile=None):
+    """
+    Start a Chrome WebDriver configured for a fetch profile.
+
+    Args:
+        headless (bool): Whether to run the browser in headless mode
+        profile (dict, optional): Fetch profile (default: get_fetch_profile())
+
+    Returns:
+        selenium.webdriver.Chrome: New driver
+    """
+    from selenium import webdriver
+
+    profile = profile or get_fetch_profile()
+    chrome_options = build_chrome_options(headless, profile)
+
+    driver_path = _get_driver_path()
+    if driver_path:
+        from selenium.webdriver.chrome.service import Service
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    else:
+        # Fallback to default Chrome driver
+        driver = webdriver.Chrome(options=chrome_options)
+
+    if profile['blocked_url_patterns']:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': profile['blocked_url_patterns']})
+        except Exception:
+            _quit(driver)
+            raise
+    return driver
+
+
+def warm_up_session(driver):
+    """Hide the WebDriver flag and visit the homepage once, like a browser user would."""
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    logger.info("🏠 Visiting FirstCycling homepage...")
+    driver.get(HOMEPAGE_URL)
+    # Random delay to mimic human behavior
+    time.sleep(random.uniform(2, 5))
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.debug(f"Ignoring error while quitting browser: {e}")
+
+
+class BrowserPool:
+    """
+    Thread-safe pool of warmed-up WebDriver sessions.
+
+    Args:
+        size (int, optional): Maximum number of drivers (default: get_default_pool_size())
+        headless (bool): Whether to run the browsers in headless mode
+        profile (dict, optional): Fetch profile of the drivers (default: get_fetch_profile())
+        driver_factory (callable, optional): Creates a driver (default: create_chrome_driver)
+        warm_up (callable, optional): Prepares a new driver (default: warm_up_session)
+    """
+
+    def __init__(self, size=None, headless=True, profile=None, driver_factory=None, warm_up=None):
+        self.size = size or get_default_pool_size()
+        self.headless = headless
+        self.profile = profile or get_fetch_profile()
+        self._driver_factory = driver_factory or (lambda: create_chrome_driver(headless, self.profile))
+        self._warm_up = warm_up or warm_up_session
+        self._condition = threading.Condition()
+        self._idle = []
+        self._started = 0
+        self._closed = False
+
+    @property
+    def closed(self):
+        """True after shutdown()."""
+        with self._condition:
+            return self._closed
+
+    @property
+    def started(self):
+        """Number of live drivers (idle or in use)."""
+        with self._condition:
+            return self._started
+
+    def _acquire(self, timeout=None):
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is shut down")
+                if self._idle:
+                    return self._idle.pop()
+                if self._started < self.size:
+                    self._started += 1
+                    break
+                remaining = None if expires_at is None else expires_at - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No browser session became free within {timeout:.0f}s")
+                self._condition.wait(remaining)
+
+        # Start and warm up the new driver outside the lock; other threads keep using idle drivers
+        driver = None
+        try:
+            started = time.perf_counter()
+            driver = self._driver_factory()
+            self._warm_up(driver)
+        except BaseException:
+            if driver is not None:
+                _quit(driver)
+            with self._condition:
+                self._started -= 1
+                self._condition.notify()
+            raise
+        metrics.increment('browser_sessions_started')
+        logger.info(f"🚀 Started browser session {self.started}/{self.size} "
+                    f"in {time.perf_counter() - started:.1f}s")
+        return driver
+
+    def _release(self, driver, healthy):
+        with self._condition:
+            keep = healthy and not self._closed
+            if keep:
+                self._idle.append(driver)
+            else:
+                self._started -= 1
+            self._condition.notify()
+        if not keep:
+            _quit(driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """
+        Borrow a driver, starting one if none is idle and the pool is not full.
+
+        Blocks while all drivers are in use (at most `timeout` seconds, then
+        raises TimeoutError). The driver is quit instead of returned to the
+        pool when the block raises.
+        """
+        driver = self._acquire(timeout)
+        healthy = False
+        try:
+            yield driver
+            healthy = True
+        finally:
+            self._release(driver, healthy)
+
+    def shutdown(self):
+        """Quit all idle drivers; drivers in use are quit when they are returned."""
+        with self._condition:
+            self._closed = True
+            drivers, self._idle = self._idle, []
+            self._started -= len(drivers)
+            self._condition.notify_all()
+        for driver in drivers:
+            _quit(driver)
+        if drivers:
+            logger.debug(f"Shut down {len(drivers)} browser session(s)")
+
+
+def get_browser_pool(headless=True, profile=None):
+    """
+    Get the process-wide browser pool for the given mode and fetch profile, creating it on first use.
+
+    Args:
+        headless (bool): Whether the pool runs headless browsers
+        profile (dict, optional): Fetch profile (default: get_fetch_profile())
+
+    Returns:
+        BrowserPool: Shared pool
+    """
+    profile = profile or get_fetch_profile()
+    with _pools_lock:
+        key = (headless, profile['name'])
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            pool = _pools[key] = BrowserPool(headless=headless, profile=profile)
+        return pool
+
+
+def shutdown_browser_pools():
+    """Shut down every shared browser pool (registered to run at exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_browser_pools)
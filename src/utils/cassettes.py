@@ -0,0 +1,265 @@
+"""
+Record/replay of network fetches for offline, deterministic runs.
+
+``PCM_FETCH_MODE`` selects how the fetchers in ``commons`` reach the network:
+
+- ``live`` (default): fetch normally.
+- ``record``: fetch normally and save every response (status, headers and
+  body) or error to the cassette directory.
+- ``replay``: answer every fetch from the cassette directory without any
+  network access. A fetch that was not recorded fails like a connection
+  error, and retry/courtesy sleeps are skipped.
+
+Cassettes live in ``PCM_CASSETTE_DIR`` (default ``.cache/cassettes``), one
+JSON file per kind of fetch (``GET`` or ``SELENIUM``) and normalized URL.
+A file holds the responses in the order they were fetched, so retries replay
+the same sequence (e.g. a 403 followed by a 200); once a sequence is used up
+its last response is repeated. The first time a process records a URL, the
+previous recording of that URL is replaced.
+
+The page cache (utils/http_cache.py) is bypassed in record and replay mode,
+so recordings see every fetch and replays do not depend on cache state.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+
+from src.utils import http_cache
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+MODE_LIVE = 'live'
+MODE_RECORD = 'record'
+MODE_REPLAY = 'replay'
+FETCH_MODES = [MODE_LIVE, MODE_RECORD, MODE_REPLAY]
+DEFAULT_CASSETTE_DIR = os.path.join('.cache', 'cassettes')
+
+KIND_GET = 'GET'
+KIND_SELENIUM = 'SELENIUM'
+
+_lock = threading.Lock()
+_recorded = set()
+_replay_positions = {}
+
+
+def get_fetch_mode():
+    """
+    Get the fetch mode from PCM_FETCH_MODE.
+
+    Returns:
+        str: 'live', 'record' or 'replay'
+
+    Raises:
+        ValueError: If PCM_FETCH_MODE is not a known mode
+    """
+    mode = (os.getenv('PCM_FETCH_MODE') or MODE_LIVE).strip().lower()
+    if mode not in FETCH_MODES:
+        raise ValueError(f"Unknown fetch mode '{mode}' (PCM_FETCH_MODE must be one of: {', '.join(FETCH_MODES)})")
+    return mode
+
+
+def get_cassette_dir():
+    """Cassette directory from PCM_CASSETTE_DIR."""
+    return os.getenv('PCM_CASSETTE_DIR', DEFAULT_CASSETTE_DIR)
+
+
+def reset():
+    """Forget what this process recorded and replayed (the next recording of a URL replaces its cassette)."""
+    with _lock:
+        _recorded.clear()
+        _replay_positions.clear()
+
+
+def pause(seconds):
+    """Sleep like time.sleep, except when replaying (recorded responses never need to be waited for)."""
+    if get_fetch_mode() != MODE_REPLAY:
+        time.sleep(seconds)
+
+
+def cassette_path(kind, url, directory=None):
+    """
+    Path of the cassette of a fetch.
+
+    Args:
+        kind (str): 'GET' or 'SELENIUM'
+        url (str): Fetched URL
+        directory (str, optional): Cassette directory (default: get_cassette_dir())
+
+    Returns:
+        str: Path of the JSON cassette file
+    """
+    key = hashlib.sha256(f"{kind} {http_cache.normalize_url(url)}".encode('utf-8')).hexdigest()[:24]
+    return os.path.join(directory or get_cassette_dir(), f"{kind.lower()}-{key}.json")
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write(path, cassette):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cassette, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def encode_body(content):
+    """Store a body as text when it is UTF-8, otherwise as base64."""
+    if content is None:
+        return {}
+    if isinstance(content, str):
+        return {'body': content}
+    try:
+        return {'body': content.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {'body_base64': base64.b64encode(content).decode('ascii')}
+
+
+def decode_body(interaction):
+    """Body of a recorded interaction as bytes (None when it has none)."""
+    if 'body_base64' in interaction:
+        return base64.b64decode(interaction['body_base64'])
+    if 'body' in interaction:
+        return interaction['body'].encode('utf-8')
+    return None
+
+
+def record(kind, url, interaction, directory=None):
+    """
+    Append an interaction to the cassette of a fetch.
+
+    Args:
+        kind (str): 'GET' or 'SELENIUM'
+        url (str): Fetched URL
+        interaction (dict): 'status', 'headers' and body (see encode_body), or 'error' ({'type', 'message'})
+        directory (str, optional): Cassette directory (default: get_cassette_dir())
+    """
+    path = cassette_path(kind, url, directory)
+    with _lock:
+        if path in _recorded and os.path.exists(path):
+            cassette = _read(path)
+        else:
+            cassette = {'kind': kind, 'url': http_cache.normalize_url(url), 'interactions': []}
+        _recorded.add(path)
+        cassette['interactions'].append(interaction)
+        _write(path, cassette)
+    logger.debug(f"📼 Recorded {kind} {url} ({len(cassette['interactions'])} interaction(s))")
+
+
+def replay(kind, url, directory=None):
+    """
+    Get the next recorded interaction of a fetch.
+
+    Args:
+        kind (str): 'GET' or 'SELENIUM'
+        url (str): URL to fetch
+        directory (str, optional): Cassette directory (default: get_cassette_dir())
+
+    Returns:
+        dict: Recorded interaction, or None when the fetch was never recorded
+    """
+    path = cassette_path(kind, url, directory)
+    with _lock:
+        try:
+            interactions = _read(path)['interactions']
+        except (OSError, ValueError, KeyError):
+            return None
+        if not interactions:
+            return None
+        position = _replay_positions.get(path, 0)
+        _replay_positions[path] = position + 1
+    logger.debug(f"📼 Replaying {kind} {url}")
+    return interactions[min(position, len(interactions) - 1)]
+
+
+def http_get(session, url, **kwargs):
+    """
+    GET a URL through a requests session (or the requests module), recording or replaying per PCM_FETCH_MODE.
+
+    Args:
+        session: requests.Session or the requests module
+        url (str): URL to fetch
+        **kwargs: Arguments of session.get()
+
+    Returns:
+        requests.Response: Live or replayed response
+
+    Raises:
+        requests.exceptions.RequestException: Live or replayed request errors; a fetch missing from the
+            cassette raises ConnectionError when replaying
+    """
+    import requests
+
+    mode = get_fetch_mode()
+    if mode == MODE_REPLAY:
+        interaction = replay(KIND_GET, url)
+        if interaction is None:
+            raise requests.exceptions.ConnectionError(
+                f"No recorded response for GET {url} in {get_cassette_dir()} (PCM_FETCH_MODE=replay)")
+        if 'error' in interaction:
+            error_type = getattr(requests.exceptions, interaction['error']['type'], None)
+            if not (isinstance(error_type, type) and issubclass(error_type, requests.exceptions.RequestException)):
+                error_type = requests.exceptions.ConnectionError
+            raise error_type(interaction['error']['message'])
+
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.headers.update(interaction.get('headers') or {})
+        response._content = decode_body(interaction) or b''
+        response.url = url
+        response.reason = interaction.get('reason')
+        return response
+
+    if mode == MODE_LIVE:
+        return session.get(url, **kwargs)
+
+    try:
+        response = session.get(url, **kwargs)
+    except requests.exceptions.RequestException as e:
+        record(KIND_GET, url, {'error': {'type': type(e).__name__, 'message': str(e)}})
+        raise
+    interaction = {'status': response.status_code, 'reason': response.reason, 'headers': dict(response.headers)}
+    interaction.update(encode_body(response.content))
+    record(KIND_GET, url, interaction)
+    return response
+
+
+def fetch_result(kind, url, fetch):
+    """
+    Run a fetcher returning (content, success, error), recording or replaying its result per PCM_FETCH_MODE.
+
+    Args:
+        kind (str): Kind of fetch (e.g. 'SELENIUM')
+        url (str): URL to fetch
+        fetch (callable): Live fetch, called without arguments
+
+    Returns:
+        tuple: (content, success, error_message)
+    """
+    mode = get_fetch_mode()
+    if mode == MODE_REPLAY:
+        interaction = replay(kind, url)
+        if interaction is None:
+            return None, False, f"No recorded {kind} fetch of {url} in {get_cassette_dir()} (PCM_FETCH_MODE=replay)"
+        if 'error' in interaction:
+            return None, False, interaction['error']['message']
+        return decode_body(interaction), True, None
+
+    content, success, error = fetch()
+    if mode == MODE_RECORD:
+        if success:
+            interaction = dict(status=200, headers={}, **encode_body(content))
+        else:
+            interaction = {'error': {'type': kind, 'message': error}}
+        record(kind, url, interaction)
+    return content, success, error
@@ -1,14 +1,116 @@
 import os
-import requests
-import urllib3
+import subprocess
+import threading
 import time
 import random
 
+from src.utils import browser_pool
+from src.utils import cassettes
+from src.utils import deadline as deadlines
+from src.utils import http_cache
+from src.utils import metrics
+from src.utils import proxy_pool
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
 STAT_KEYS = ['fla', 'mo', 'mm', 'dh', 'cob', 'tt', 'prl', 'spr', 'acc', 'end', 'res', 'rec', 'hil', 'att']
+# Column of each stat in the PCM DYN_cyclist table
+STAT_COLUMN_MAPPING = {
+    'fla': 'charac_i_plain',
+    'mo': 'charac_i_mountain',
+    'mm': 'charac_i_medium_mountain',
+    'dh': 'charac_i_downhilling',
+    'cob': 'charac_i_cobble',
+    'tt': 'charac_i_timetrial',
+    'prl': 'charac_i_prologue',
+    'spr': 'charac_i_sprint',
+    'acc': 'charac_i_acceleration',
+    'end': 'charac_i_endurance',
+    'res': 'charac_i_resistance',
+    'rec': 'charac_i_recuperation',
+    'hil': 'charac_i_hill',
+    'att': 'charac_i_baroudeur'
+}
 DATA_PATH = os.path.join('data')
 MODEL_DIR_PATH = os.path.join('src', 'model')
 
-PATH_TYPES = ['root', 'changes_dir', 'stats_file', 'tracking_db', 'cdb']
+PATH_TYPES = ['root', 'changes_dir', 'stats_file', 'stats_hash', 'tracking_db', 'sync_state', 'cdb']
+
+SESSION_POOL_SIZE = 10  # Keep-alive connections kept per host by the shared connection pool
+
+_shared_adapter = None
+_sessions = []  # Sessions of all threads, closed by reset_shared_session
+_session_generation = 0  # Incremented by reset_shared_session, so threads drop their old session
+_thread_sessions = threading.local()
+_warmed_up_hosts = {}  # Host -> cookies set by its homepage visit
+_session_lock = threading.Lock()
+
+def get_shared_session():
+    """
+    Get the calling thread's requests session used by make_request_with_proxy_rotation(use_session=True).
+    
+    A requests.Session is not thread-safe (every response updates its cookie jar),
+    so each thread gets its own session. All of them mount one HTTPAdapter, whose
+    pool keeps SESSION_POOL_SIZE keep-alive connections per host, so later
+    requests from any thread skip the TCP/TLS handshake. The cookies of the
+    homepage visit are copied into the sessions of the other threads
+    (see share_homepage_cookies).
+    
+    Returns:
+        requests.Session: Session of the calling thread
+    """
+    global _shared_adapter
+    session = getattr(_thread_sessions, 'session', None)
+    if session is not None and _thread_sessions.generation == _session_generation:
+        return session
+    
+    import requests
+    
+    with _session_lock:
+        if _shared_adapter is None:
+            _shared_adapter = requests.adapters.HTTPAdapter(pool_connections=SESSION_POOL_SIZE,
+                                                            pool_maxsize=SESSION_POOL_SIZE)
+        session = requests.Session()
+        session.mount('https://', _shared_adapter)
+        session.mount('http://', _shared_adapter)
+        _sessions.append(session)
+        _thread_sessions.session = session
+        _thread_sessions.generation = _session_generation
+        _thread_sessions.cookie_hosts = set()
+    return session
+
+def share_homepage_cookies(session, host):
+    """
+    Copy the cookies of host's homepage visit into the calling thread's session, once per session.
+    
+    Args:
+        session (requests.Session): Session of the calling thread (get_shared_session)
+        host (str): Host whose homepage was visited
+        
+    Returns:
+        bool: Whether the homepage of host was visited (by any thread)
+    """
+    with _session_lock:
+        cookies = _warmed_up_hosts.get(host)
+    if cookies is None:
+        return False
+    if host not in _thread_sessions.cookie_hosts:
+        session.cookies.update(cookies)
+        _thread_sessions.cookie_hosts.add(host)
+    return True
+
+def reset_shared_session():
+    """Close the sessions of all threads; the next request starts a new one (with new cookies and a new homepage visit)."""
+    global _shared_adapter, _session_generation
+    with _session_lock:
+        sessions = _sessions[:]
+        del _sessions[:]
+        _shared_adapter = None
+        _session_generation += 1
+        _warmed_up_hosts.clear()
+    for session in sessions:
+        session.close()
 
 def get_proxy_list(limit=10, timeout=10):
     """
@@ -24,11 +126,11 @@ def get_proxy_list(limit=10, timeout=10):
     try:
         import requests
         
-        print(f"🔄 Fetching proxy list from proxyscrape.com API (limit: {limit})...")
+        logger.info(f"🔄 Fetching proxy list from proxyscrape.com API (limit: {limit})...")
         proxy_api_url = f"https://api.proxyscrape.com/v4/free-proxy-list/get?request=displayproxies&protocol=http&timeout=10000&country=all&ssl=all&anonymity=all&skip=0&limit={limit}"
         
         # Simple request to get proxy list
-        proxy_response = requests.get(proxy_api_url, timeout=timeout)
+        proxy_response = cassettes.http_get(requests, proxy_api_url, timeout=timeout)
         proxy_response.raise_for_status()
         
         # Parse proxy list (should be one proxy per line in "host:port" format)
@@ -49,19 +151,20 @@ def get_proxy_list(limit=10, timeout=10):
                     except (ValueError, IndexError):
                         continue  # Skip invalid proxy entries
             
-            print(f"   - Successfully parsed {len(proxy_list)} valid proxies")
+            logger.info(f"   - Successfully parsed {len(proxy_list)} valid proxies")
         else:
-            print("   - No proxies returned from API")
+            logger.info("   - No proxies returned from API")
             
         return proxy_list
         
     except Exception as e:
-        print(f"⚠️  Could not fetch proxies: {e}")
+        logger.warning(f"⚠️  Could not fetch proxies: {e}")
         return []
 
 def make_request_with_proxy_rotation(url, headers=None, timeout=30, verify=True, proxy_limit=10, 
                                    retry_delays=None, enable_ssl_warnings=False, use_proxies=None, 
-                                   use_session=True, **kwargs):
+                                   use_session=True, use_cache=True, direct_fallback=True, selenium_fallback=True,
+                                   deadline=None, store_in_cache=None, cached=None, cache_if=None, **kwargs):
     """
     Make an HTTP request with automatic proxy rotation and retry logic.
     
@@ -74,17 +177,38 @@ def make_request_with_proxy_rotation(url, headers=None, timeout=30, verify=True,
         retry_delays (list, optional): Delay between retries in seconds (default: [2, 5, 10])
         enable_ssl_warnings (bool): Whether to show SSL warnings (default: False)
         use_proxies (bool, optional): Whether to use proxies. If None, auto-detect based on environment
-        use_session (bool): Whether to use a session for the request (default: True)
+        use_session (bool): Whether to use the thread's pooled session (get_shared_session) for the request (default: True)
+        use_cache (bool): Whether to look the URL up in the on-disk page cache (default: True; see utils/http_cache.py)
+        direct_fallback (bool): Whether to try the direct connection after the proxies (default: True)
+        selenium_fallback (bool): Whether to try Selenium for FirstCycling when all attempts fail (default: True)
+        deadline (Deadline or float, optional): Deadline (or seconds) for all attempts: timeouts and retry delays
+            are shortened to the time left, and no attempt is started after it (see utils/deadline.py)
+        store_in_cache (bool, optional): Whether to store the fetched page in the page cache (default: use_cache)
+        cached (dict, optional): Cache entry the caller already looked up (http_cache.lookup); a stale entry is
+            revalidated with the server
+        cache_if (callable, optional): content -> bool; only pages it accepts are stored in the page cache
         **kwargs: Additional arguments to pass to requests.get()
         
     Returns:
         tuple: (response_content, success_boolean, error_message)
     """
+    # Imported here so commands that never fetch do not pay for loading requests
+    import requests
+    import urllib3
+    
     try: 
         # Suppress SSL warnings if requested
         if not enable_ssl_warnings:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
+        # Serve fresh cached pages without a request; stale ones are revalidated below
+        if store_in_cache is None:
+            store_in_cache = use_cache
+        if cached is None and use_cache:
+            cached = http_cache.lookup(url)
+        if cached and cached['fresh']:
+            return cached['content'], True, None
+        
         # Check if running in GitHub Actions or determine proxy usage
         is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
         
@@ -94,11 +218,11 @@ def make_request_with_proxy_rotation(url, headers=None, timeout=30, verify=True,
             use_proxies = is_github_actions
         
         if is_github_actions:
-            print("⚠️  Running in GitHub Actions - using proxy rotation to avoid IP blocks")
+            logger.warning("⚠️  Running in GitHub Actions - using proxy rotation to avoid IP blocks")
         elif use_proxies:
-            print("🔄 Proxy usage enabled")
+            logger.info("🔄 Proxy usage enabled")
         else:
-            print("🔗 Direct connection mode (proxies disabled)")
+            logger.info("🔗 Direct connection mode (proxies disabled)")
         
         # Set default headers if none provided - simple but effective browser-like headers
         if headers is None:
@@ -107,54 +231,105 @@ def make_request_with_proxy_rotation(url, headers=None, timeout=30, verify=True,
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
+                # Only the encodings urllib3 can decode (br needs the optional brotli package)
+                'Accept-Encoding': urllib3.util.make_headers(accept_encoding=True)['accept-encoding'],
                 'Connection': 'keep-alive',
                 'Upgrade-Insecure-Requests': '1'
             }
         
+        # Ask the server whether the cached copy is still current
+        if cached:
+            validators = {}
+            if cached.get('etag'):
+                validators['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                validators['If-Modified-Since'] = cached['last_modified']
+            headers = dict(headers, **validators)
+        
         # Set default retry delays
         if retry_delays is None:
             retry_delays = [2, 5, 10]
         
-        # Get proxy list for rotation (only if we want to use proxies)
+        deadline = deadlines.get_deadline(deadline)
+        if deadline and deadline.expired():
+            error_msg = deadline.error(f"fetching {url}")
+            logger.error(f"❌ {error_msg}")
+            return None, False, error_msg
+        
+        # Get proxy list for rotation (only if we want to use proxies), best proxies first
         proxy_list = []
+        pool = None
         if use_proxies:
-            proxy_list = get_proxy_list(limit=proxy_limit, timeout=10)
+            pool = proxy_pool.get_proxy_pool()
+            proxy_list = pool.get_proxies(lambda: get_proxy_list(limit=proxy_limit, timeout=10))[:proxy_limit]
         
-        # Calculate max retries - always try direct connection at least once
-        max_retries = max(len(proxy_list) + 1, 3) if proxy_list else 3
+        # Calculate max retries - always try direct connection at least once, unless only proxies are wanted
+        if not direct_fallback:
+            max_retries = len(proxy_list)
+            if not max_retries:
+                error_msg = f"No usable proxies for {url}"
+                logger.error(f"❌ {error_msg}")
+                return None, False, error_msg
+        else:
+            max_retries = max(len(proxy_list) + 1, 3) if proxy_list else 3
         
-        # Create session if requested for better connection handling
-        session = requests.Session() if use_session else requests
+        # Reuse the thread's session if requested: pooled keep-alive connections and cookies across calls
+        session = get_shared_session() if use_session else requests
         
-        # For FirstCycling.com, try to establish a session by visiting homepage first
-        if use_session and 'firstcycling.com' in url.lower():
+        # For FirstCycling.com, establish the session by visiting the homepage first (once per process;
+        # the sessions of other threads get the cookies of that visit)
+        warm_up = (use_session and 'firstcycling.com' in url.lower()
+                   and not share_homepage_cookies(session, 'firstcycling.com'))
+        if warm_up:
             try:
-                print("🏠 Visiting FirstCycling homepage first to establish session...")
-                homepage_response = session.get(
+                logger.info("🏠 Visiting FirstCycling homepage first to establish session...")
+                homepage_response = cassettes.http_get(
+                    session,
                     'https://firstcycling.com/',
                     headers=headers,
-                    timeout=timeout,
+                    timeout=deadline.timeout(timeout) if deadline else timeout,
                     verify=verify,
                     proxies=None  # Always try homepage without proxy first
                 )
                 if homepage_response.status_code == 200:
-                    print("   ✅ Homepage visit successful")
+                    logger.info("   ✅ Homepage visit successful")
+                    with _session_lock:
+                        _warmed_up_hosts['firstcycling.com'] = session.cookies.copy()
+                    _thread_sessions.cookie_hosts.add('firstcycling.com')
                     # Add a small delay to mimic human behavior
-                    time.sleep(random.uniform(1, 3))
+                    delay = random.uniform(1, 3)
+                    cassettes.pause(deadline.timeout(delay) if deadline else delay)
                 else:
-                    print(f"   ⚠️  Homepage returned {homepage_response.status_code}")
+                    logger.warning(f"   ⚠️  Homepage returned {homepage_response.status_code}")
             except Exception as e:
-                print(f"   ⚠️  Homepage visit failed: {e}")
+                logger.warning(f"   ⚠️  Homepage visit failed: {e}")
                 # Continue anyway, might still work
         
+        direct_attempts = 0
+        last_attempt = False  # Set once the backoff was shortened to fit the deadline
         for attempt in range(max_retries):
             try:
-                # Add delay between retries
-                if attempt > 0:
-                    delay = retry_delays[min(attempt - 1, len(retry_delays) - 1)]
-                    print(f"⏳ Retrying in {delay} seconds (attempt {attempt + 1}/{max_retries})...")
-                    time.sleep(delay)
+                # Back off before retrying the direct connection; the next proxy is tried right away
+                if attempt >= len(proxy_list):
+                    if direct_attempts > 0:
+                        delay = retry_delays[min(direct_attempts - 1, len(retry_delays) - 1)]
+                        if deadline and delay >= deadline.remaining():
+                            if last_attempt:
+                                error_msg = deadline.error(f"retry {attempt + 1}/{max_retries} of {url}")
+                                logger.error(f"❌ {error_msg}")
+                                return None, False, error_msg
+                            # The full backoff would use up the time left: wait for half of it and
+                            # make one last attempt with the other half
+                            delay = round(deadline.timeout(delay) / 2, 1)
+                            last_attempt = True
+                        logger.info(f"⏳ Retrying in {delay} seconds (attempt {attempt + 1}/{max_retries})...")
+                        cassettes.pause(delay)
+                    direct_attempts += 1
+                
+                if deadline and deadline.expired():
+                    error_msg = deadline.error(f"attempt {attempt + 1}/{max_retries} of {url}")
+                    logger.error(f"❌ {error_msg}")
+                    return None, False, error_msg
                 
                 # Setup proxy for this attempt
                 proxies = None
@@ -170,33 +345,56 @@ def make_request_with_proxy_rotation(url, headers=None, timeout=30, verify=True,
                                 'http': proxy_url,
                                 'https': proxy_url
                             }
-                            print(f"🔄 Using proxy: {current_proxy['host']}:{current_proxy['port']}")
+                            logger.debug(f"🔄 Using proxy: {current_proxy['host']}:{current_proxy['port']}")
                         else:
-                            print(f"⚠️  Invalid proxy dict at index {attempt}, using direct connection")
+                            logger.warning(f"⚠️  Invalid proxy dict at index {attempt}, using direct connection")
                     except (KeyError, IndexError, TypeError) as e:
-                        print(f"⚠️  Error accessing proxy at index {attempt}: {e}, using direct connection")
+                        logger.warning(f"⚠️  Error accessing proxy at index {attempt}: {e}, using direct connection")
                 elif attempt == 0 and (not proxy_list or len(proxy_list) == 0):
-                    print("🔗 Attempting direct connection (no proxies available)")
+                    logger.info("🔗 Attempting direct connection (no proxies available)")
                 else:
-                    print("🔗 Attempting direct connection (no more proxies)")
+                    logger.info("🔗 Attempting direct connection (no more proxies)")
                 
                 # Make the request
-                response = session.get(
-                    url,
-                    headers=headers,
-                    timeout=timeout,
-                    verify=verify,
-                    proxies=proxies,
-                    **kwargs
-                )
-                response.raise_for_status()
+                method = 'proxy' if proxies else 'http'
+                attempt_started = time.perf_counter()
+                try:
+                    response = cassettes.http_get(
+                        session,
+                        url,
+                        headers=headers,
+                        timeout=deadline.timeout(timeout) if deadline else timeout,
+                        verify=verify,
+                        proxies=proxies,
+                        **kwargs
+                    )
+                    if cached and response.status_code == 304:
+                        metrics.observe('fetch_attempt_duration_seconds', time.perf_counter() - attempt_started,
+                                        method=method, outcome='success')
+                        logger.info(f"💾 Cached page is still current (304 Not Modified), "
+                                    f"using it ({len(cached['content'])} bytes)")
+                        http_cache.mark_revalidated(url)
+                        return cached['content'], True, None
+                    response.raise_for_status()
+                except Exception:
+                    metrics.observe('fetch_attempt_duration_seconds', time.perf_counter() - attempt_started,
+                                    method=method, outcome='failure')
+                    if pool and proxies:
+                        pool.record_failure(current_proxy)
+                    raise
+                latency = time.perf_counter() - attempt_started
+                metrics.observe('fetch_attempt_duration_seconds', latency, method=method, outcome='success')
+                if pool and proxies:
+                    pool.record_success(current_proxy, latency)
                 
                 # Success message
                 success_msg = f"✅ Successfully fetched content ({len(response.content)} bytes)"
                 if proxies and isinstance(current_proxy, dict):
                     success_msg += f" via proxy {current_proxy['host']}:{current_proxy['port']}"
-                print(success_msg)
+                logger.info(success_msg)
                 
+                if store_in_cache:
+                    http_cache.store(url, response.content, response.headers, cache_if)
                 return response.content, True, None
                 
             except requests.exceptions.HTTPError as e:
@@ -206,10 +404,10 @@ def make_request_with_proxy_rotation(url, headers=None, timeout=30, verify=True,
                     if attempt == max_retries - 1:
                         # Final attempt for 403
                         error_msg = f"Access denied (403) for {url}." 
-                        print(f"❌ {error_msg}")
+                        logger.error(f"❌ {error_msg}")
                         return None, False, error_msg
                     else:
-                        print(f"❌ 403 Forbidden on attempt {attempt + 1}{proxy_info}, trying next...")
+                        logger.error(f"❌ 403 Forbidden on attempt {attempt + 1}{proxy_info}, trying next...")
                         continue
                 else:
                     # Other HTTP errors, don't retry
@@ -223,7 +421,7 @@ def make_request_with_proxy_rotation(url, headers=None, timeout=30, verify=True,
                     # Final attempt failed
                     raise e
                 else:
-                    print(f"❌ Connection error on attempt {attempt + 1}{proxy_info}: {str(e)}")
+                    logger.error(f"❌ Connection error on attempt {attempt + 1}{proxy_info}: {str(e)}")
                     continue
                     
             except requests.exceptions.RequestException as e:
@@ -233,24 +431,27 @@ def make_request_with_proxy_rotation(url, headers=None, timeout=30, verify=True,
                     # Final attempt failed
                     raise e
                 else:
-                    print(f"❌ Network error on attempt {attempt + 1}{proxy_info}: {str(e)}")
+                    logger.error(f"❌ Network error on attempt {attempt + 1}{proxy_info}: {str(e)}")
                     continue
         
         # If all proxy attempts failed and it's FirstCycling, try Selenium as last resort
-        if 'firstcycling.com' in url.lower():
-            print("🔄 All standard methods failed, trying Selenium WebDriver as last resort...")
-            return fetch_with_selenium(url, timeout)
+        if selenium_fallback and 'firstcycling.com' in url.lower():
+            logger.info("🔄 All standard methods failed, trying Selenium WebDriver as last resort...")
+            content, success, error = fetch_with_selenium(url, timeout, deadline=deadline)
+            if success and store_in_cache:
+                http_cache.store(url, content, cache_if=cache_if)
+            return content, success, error
         
     except requests.exceptions.RequestException as e:
         error_msg = f"Network error accessing {url}: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error(f"❌ {error_msg}")
         return None, False, error_msg
     except Exception as e:
         error_msg = f"Error making request to {url}: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error(f"❌ {error_msg}")
         return None, False, error_msg
 
-def fetch_with_selenium(url, timeout=30, headless=True):
+def fetch_with_selenium(url, timeout=30, headless=True, profile=None, deadline=None):
     """
     Fetch content using Selenium WebDriver to mimic real browser behavior.
     
@@ -258,72 +459,62 @@ def fetch_with_selenium(url, timeout=30, headless=True):
         url (str): URL to fetch
         timeout (int): Page load timeout
         headless (bool): Whether to run browser in headless mode
+        profile (str, optional): Fetch profile name, 'light' or 'full' (default: PCM_FETCH_PROFILE, or 'light')
+        deadline (Deadline or float, optional): Deadline (or seconds) for the fetch: the page load wait and the
+            wait for a free browser session are shortened to the time left
         
     Returns:
         tuple: (html_content, success, error_message)
     """
+    deadline = deadlines.get_deadline(deadline)
+    if deadline:
+        if deadline.expired():
+            error_msg = deadline.error(f"fetching {url} with Selenium")
+            logger.error(f"❌ {error_msg}")
+            return None, False, error_msg
+        timeout = deadline.timeout(timeout)
+    attempt_started = time.perf_counter()
+    result = cassettes.fetch_result(cassettes.KIND_SELENIUM, url,
+                                    lambda: _fetch_with_selenium(url, timeout, headless, profile, deadline))
+    metrics.observe('fetch_attempt_duration_seconds', time.perf_counter() - attempt_started,
+                    method='selenium', outcome='success' if result[1] else 'failure')
+    return result
+
+def _fetch_with_selenium(url, timeout, headless, profile=None, deadline=None):
+    """Fetch content with a pooled Selenium WebDriver session (see fetch_with_selenium)."""
     try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
         from selenium.common.exceptions import TimeoutException, WebDriverException
         
-        print(f"🌐 Using Selenium WebDriver to fetch: {url}")
-        
-        # Configure Chrome options
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        
-        # Anti-detection options
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        # Create driver
-        try:
-            from webdriver_manager.chrome import ChromeDriverManager
-            from selenium.webdriver.chrome.service import Service
-            
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-        except ImportError:
-            # Fallback to default Chrome driver
-            driver = webdriver.Chrome(options=chrome_options)
+        fetch_profile = browser_pool.get_fetch_profile(profile)
+        logger.info(f"🌐 Using Selenium WebDriver to fetch: {url}")
         
-        try:
-            # Execute script to hide WebDriver
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            # Visit homepage first
-            print("🏠 Visiting FirstCycling homepage...")
-            driver.get("https://firstcycling.com/")
-            
-            # Random delay to mimic human behavior
-            time.sleep(random.uniform(2, 5))
-            
+        # Started and warmed up (homepage visit) on first use, then reused for every fetch
+        pool = browser_pool.get_browser_pool(headless, fetch_profile)
+        with pool.driver(timeout=deadline.remaining() if deadline else None) as driver:
             # Navigate to target URL
-            print(f"🎯 Navigating to target page...")
+            logger.info(f"🎯 Navigating to target page...")
             driver.get(url)
             
-            # Wait for page to load
-            WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            # Wait for the content we parse (the results table with the light profile)
+            try:
+                WebDriverWait(driver, timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, fetch_profile['wait_selector']))
+                )
+            except TimeoutException:
+                if fetch_profile['wait_selector'] == 'body':
+                    raise
+                # Pages without a table (e.g. an empty startlist) are still returned for parsing
+                logger.warning(f"⚠️  No '{fetch_profile['wait_selector']}' element after {timeout}s, "
+                               f"using the page as loaded")
             
             # Get page source
             html_content = driver.page_source
-            
-            print(f"✅ Successfully fetched {len(html_content)} characters with Selenium")
-            return html_content.encode('utf-8'), True, None
-            
-        finally:
-            driver.quit()
+        
+        logger.info(f"✅ Successfully fetched {len(html_content)} characters with Selenium")
+        return html_content.encode('utf-8'), True, None
             
     except ImportError:
         return None, False, "Selenium not installed. Install with: pip install selenium"
@@ -343,8 +534,12 @@ def get_path(namespace, path_type):
         return os.path.join(DATA_PATH, namespace, 'changes')
     elif path_type == 'stats_file':
         return os.path.join(DATA_PATH, namespace, 'stats.yaml')
+    elif path_type == 'stats_hash':
+        return os.path.join(DATA_PATH, namespace, 'stats.hash.json')
     elif path_type == 'tracking_db':
         return os.path.join(DATA_PATH, namespace, 'tracking_db.sqlite')
+    elif path_type == 'sync_state':
+        return os.path.join(DATA_PATH, namespace, 'sync_state.json')
     elif path_type == 'cdb':
         return os.path.join(DATA_PATH, namespace, 'cdb')
 
@@ -365,4 +560,56 @@ def get_available_namespaces():
         if os.path.isdir(item_path):
             namespaces.append(item)
     
-    return sorted(namespaces)
\ No newline at end of file
+    return sorted(namespaces)
+
+
+def run_git(args, cwd=None):
+    """
+    Run a local git command.
+    
+    Args:
+        args (list): Arguments passed to git
+        cwd (str, optional): Directory to run git in
+        
+    Returns:
+        str: Command output, or None if git is unavailable or the command failed
+    """
+    try:
+        result = subprocess.run(['git'] + list(args), cwd=cwd, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.decode('utf-8')
+
+
+def get_git_head(cwd=None):
+    """
+    Get the commit hash of HEAD.
+    
+    Returns:
+        str: Commit hash, or None outside a git repository
+    """
+    output = run_git(['rev-parse', 'HEAD'], cwd=cwd)
+    return output.strip() if output else None
+
+
+def get_changed_paths_since(commit, path):
+    """
+    List files under a directory that were added or modified since a commit.
+    Includes committed, staged, unstaged and untracked files.
+    
+    Args:
+        commit (str): Commit to compare against
+        path (str): Directory to look in
+        
+    Returns:
+        list: Paths relative to the directory, or None if the commit is not in the local history
+    """
+    if not os.path.isdir(path) or run_git(['cat-file', '-e', f'{commit}^{{commit}}'], cwd=path) is None:
+        return None
+    
+    changed = run_git(['diff', '--name-only', '--relative', '-z', '--diff-filter=AMR', commit, '--', '.'], cwd=path)
+    untracked = run_git(['ls-files', '--others', '--exclude-standard', '-z', '--', '.'], cwd=path)
+    if changed is None or untracked is None:
+        return None
+    
+    return [p for p in (changed + untracked).split('\0') if p]
@@ -0,0 +1,70 @@
+"""
+Deadlines shared by the steps of a pipeline run.
+
+A ``Deadline`` is started once (e.g. from ``process-automated-change
+--deadline``) and passed down to every fetch. Each step caps its timeouts and
+sleeps to the time left, and returns a "Deadline exceeded" error instead of
+starting work it cannot finish, so a run ends soon after its budget instead of
+waiting out every retry.
+"""
+
+import time
+
+
+class Deadline:
+    """
+    Point in time after which no new work is started.
+
+    Args:
+        seconds (float): Seconds from now
+        clock (callable, optional): Monotonic clock in seconds (default: time.monotonic)
+    """
+
+    def __init__(self, seconds, clock=None):
+        self.seconds = max(0.0, float(seconds))
+        self._clock = clock or time.monotonic
+        self._expires_at = self._clock() + self.seconds
+
+    def remaining(self):
+        """Seconds left (0 once the deadline has passed)."""
+        return max(0.0, self._expires_at - self._clock())
+
+    def expired(self):
+        """Whether the deadline has passed."""
+        return self.remaining() <= 0
+
+    def timeout(self, timeout):
+        """A timeout (or sleep) in seconds, shortened to the time left."""
+        return min(timeout, self.remaining())
+
+    def within(self, seconds):
+        """
+        Get a deadline at most `seconds` from now that never ends after this one.
+
+        Args:
+            seconds (float): Budget of the step
+
+        Returns:
+            Deadline: Deadline of the step
+        """
+        return Deadline(min(seconds, self.remaining()), self._clock)
+
+    def error(self, action):
+        """Error message for work that was not started, e.g. error('trying selenium')."""
+        return f"Deadline exceeded ({round(self.seconds, 1):g}s) before {action}"
+
+
+def get_deadline(deadline, clock=None):
+    """
+    Get a Deadline from a Deadline or a number of seconds.
+
+    Args:
+        deadline (Deadline, float or None): Deadline, or seconds from now
+        clock (callable, optional): Monotonic clock for a new deadline
+
+    Returns:
+        Deadline: The deadline (None when no deadline was given)
+    """
+    if deadline is None or isinstance(deadline, Deadline):
+        return deadline
+    return Deadline(deadline, clock)
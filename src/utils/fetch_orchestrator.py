@@ -0,0 +1,313 @@
+"""
+Adaptive choice of how to fetch a FirstCycling page.
+
+A page can be fetched four ways ("strategies"):
+
+- ``selenium``: a pooled Chrome session (utils/browser_pool.py)
+- ``session``: a requests session that visits the homepage first
+- ``http``: a plain request without a session
+- ``proxy``: requests through the proxy pool (utils/proxy_pool.py)
+
+Which one works, and how fast, depends on where the pipeline runs:
+FirstCycling blocks GitHub Actions runners, but answers plain requests from
+most other networks. The orchestrator records the outcome and latency of every
+strategy per environment (``github_actions`` or ``local``) in
+``PCM_FETCH_STATS_FILE`` (default ``.cache/fetch_strategies.json``). It then
+tries strategies ordered by expected time to a page: latency divided by the
+smoothed success rate. Strategies without a success yet keep the default order
+after the proven ones. Each strategy runs at most once per page, and no
+strategy is started after the overall deadline (``PCM_FETCH_DEADLINE``
+seconds, default 180, or the run's deadline if that ends sooner; see
+utils/deadline.py). Strategies never exceed that deadline either, because
+their timeouts, retries and sleeps are capped by the time left.
+
+The strategies tried, and their order, can be pinned with
+``PCM_FETCH_STRATEGIES`` (e.g. ``session,selenium``). Otherwise ``proxy`` is
+only used in GitHub Actions, like the proxy auto-detection in
+``commons.make_request_with_proxy_rotation``.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from src.utils import cassettes
+from src.utils import commons
+from src.utils import deadline as deadlines
+from src.utils import http_cache
+from src.utils import metrics
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+STRATEGY_SELENIUM = 'selenium'
+STRATEGY_SESSION = 'session'
+STRATEGY_HTTP = 'http'
+STRATEGY_PROXY = 'proxy'
+# Default order: Selenium is the most reliable way past FirstCycling's bot protection
+STRATEGIES = [STRATEGY_SELENIUM, STRATEGY_SESSION, STRATEGY_HTTP, STRATEGY_PROXY]
+
+DEFAULT_STATS_FILE = os.path.join('.cache', 'fetch_strategies.json')
+DEFAULT_DEADLINE = 180.0
+DEFAULT_STRATEGY_TIMEOUT = 30
+LATENCY_WEIGHT = 0.3
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def get_environment():
+    """Environment the strategy outcomes are recorded for: 'github_actions' or 'local'."""
+    return 'github_actions' if os.getenv('GITHUB_ACTIONS') == 'true' else 'local'
+
+
+def get_default_deadline():
+    """Overall fetch deadline in seconds from PCM_FETCH_DEADLINE (DEFAULT_DEADLINE when unset or invalid)."""
+    try:
+        return max(1.0, float(os.getenv('PCM_FETCH_DEADLINE', DEFAULT_DEADLINE)))
+    except ValueError:
+        return DEFAULT_DEADLINE
+
+
+def get_strategies(environment=None):
+    """
+    Get the strategies that may be tried, in their default order.
+
+    Args:
+        environment (str, optional): 'github_actions' or 'local' (default: get_environment())
+
+    Returns:
+        list: Strategy names
+
+    Raises:
+        ValueError: If PCM_FETCH_STRATEGIES names an unknown strategy
+    """
+    configured = os.getenv('PCM_FETCH_STRATEGIES')
+    if configured:
+        strategies = []
+        for name in configured.replace(',', ' ').split():
+            if name not in STRATEGIES:
+                raise ValueError(f"Unknown fetch strategy '{name}' (available: {', '.join(STRATEGIES)})")
+            if name not in strategies:
+                strategies.append(name)
+        return strategies
+    if (environment or get_environment()) == 'github_actions':
+        return list(STRATEGIES)
+    return [strategy for strategy in STRATEGIES if strategy != STRATEGY_PROXY]
+
+
+class StrategyStats:
+    """
+    Success counts and latency of each strategy per environment, persisted to a JSON file (thread-safe).
+
+    Args:
+        stats_file (str, optional): JSON file the outcomes are kept in (None keeps them in memory only)
+    """
+
+    def __init__(self, stats_file=None):
+        self.stats_file = stats_file
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._data = {}
+        if stats_file and os.path.exists(stats_file):
+            try:
+                with open(stats_file, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️  Ignoring unreadable fetch strategy stats {stats_file}: {e}")
+
+    def get(self, environment, strategy):
+        """Recorded outcomes of a strategy: successes, failures and latency (EWMA of successful fetches)."""
+        with self._lock:
+            return dict(self._data.get(environment, {}).get(strategy, {}))
+
+    def record(self, environment, strategy, success, latency):
+        """
+        Record the outcome of one strategy attempt.
+
+        Args:
+            environment (str): 'github_actions' or 'local'
+            strategy (str): Strategy name
+            success (bool): Whether the page was fetched
+            latency (float): Seconds the attempt took
+        """
+        with self._lock:
+            entry = self._data.setdefault(environment, {}).setdefault(strategy, {})
+            if success:
+                entry['successes'] = entry.get('successes', 0) + 1
+                previous = entry.get('latency')
+                entry['latency'] = round(latency if previous is None
+                                         else LATENCY_WEIGHT * latency + (1 - LATENCY_WEIGHT) * previous, 4)
+            else:
+                entry['failures'] = entry.get('failures', 0) + 1
+        self.save()
+
+    def order(self, environment, strategies):
+        """
+        Order strategies by expected time to a page.
+
+        Strategies that succeeded before come first, by latency / smoothed
+        success rate; the others keep their order, the never-tried ones before
+        the ones that only failed.
+
+        Args:
+            environment (str): 'github_actions' or 'local'
+            strategies (list): Strategy names in their default order
+
+        Returns:
+            list: Strategy names, best first
+        """
+        def sort_key(item):
+            position, strategy = item
+            entry = self.get(environment, strategy)
+            successes = entry.get('successes', 0)
+            if successes:
+                success_rate = (successes + 1) / (successes + entry.get('failures', 0) + 2)
+                return (0, entry.get('latency', 0) / success_rate, position)
+            return (1 if entry.get('failures') else 0.5, 0, position)
+
+        return [strategy for _, strategy in sorted(enumerate(strategies), key=sort_key)]
+
+    def save(self):
+        """Write the stats file atomically (no-op for in-memory stats; errors are only logged)."""
+        if not self.stats_file:
+            return
+        with self._save_lock:
+            with self._lock:
+                data = json.dumps(self._data, indent=2, sort_keys=True)
+            directory = os.path.dirname(self.stats_file) or '.'
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.pcm-fetch-stats-', suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        f.write(data)
+                    os.replace(tmp_path, self.stats_file)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            except OSError as e:
+                logger.warning(f"⚠️  Could not save fetch strategy stats {self.stats_file}: {e}")
+
+
+def get_strategy_stats():
+    """
+    Get the process-wide strategy stats backed by PCM_FETCH_STATS_FILE.
+
+    Returns:
+        StrategyStats: Shared stats, or new in-memory stats when fetches are recorded or replayed
+            (so replays try strategies in the same order as the recording)
+    """
+    if cassettes.get_fetch_mode() != cassettes.MODE_LIVE:
+        return StrategyStats()
+    stats_file = os.getenv('PCM_FETCH_STATS_FILE', DEFAULT_STATS_FILE)
+    with _stats_lock:
+        stats = _stats.get(stats_file)
+        if stats is None:
+            stats = _stats[stats_file] = StrategyStats(stats_file)
+        return stats
+
+
+def run_strategy(strategy, url, timeout, use_cache=True, deadline=None, cached=None, cache_if=None):
+    """
+    Fetch a page with one strategy.
+
+    The page cache is not looked up here (fetch's caller does that once per page), but pages
+    fetched successfully are stored in it.
+
+    Args:
+        strategy (str): Strategy name
+        url (str): URL to fetch
+        timeout (float): Timeout of the strategy's requests in seconds
+        use_cache (bool): Whether to store the fetched page in the on-disk page cache
+        deadline (Deadline, optional): Deadline for the strategy's retries and sleeps
+        cached (dict, optional): Stale cache entry of the URL, revalidated by the HTTP strategies
+        cache_if (callable, optional): content -> bool; only pages it accepts are cached
+
+    Returns:
+        tuple: (content, success, error_message)
+    """
+    if strategy == STRATEGY_SELENIUM:
+        content, success, error = commons.fetch_with_selenium(url=url, timeout=timeout, headless=True,
+                                                              deadline=deadline)
+        if success and use_cache:
+            http_cache.store(url, content, cache_if=cache_if)
+        return content, success, error
+
+    options = {
+        STRATEGY_SESSION: {'use_proxies': False, 'use_session': True},
+        STRATEGY_HTTP: {'use_proxies': False, 'use_session': False},
+        STRATEGY_PROXY: {'use_proxies': True, 'use_session': False, 'direct_fallback': False},
+    }[strategy]
+    return commons.make_request_with_proxy_rotation(
+        url=url,
+        timeout=timeout,
+        verify=False,  # Disable SSL verification for firstcycling.com
+        proxy_limit=10,
+        enable_ssl_warnings=False,
+        use_cache=False,  # Looked up once by fetch's caller
+        store_in_cache=use_cache,
+        cached=cached,
+        cache_if=cache_if,
+        selenium_fallback=False,  # Selenium is a strategy of its own
+        deadline=deadline,
+        **options
+    )
+
+
+def fetch(url, deadline=None, strategies=None, use_cache=True, stats=None, clock=None, cached=None, cache_if=None):
+    """
+    Fetch a page with the historically best strategy first, falling back to the others.
+
+    Args:
+        url (str): URL to fetch
+        deadline (Deadline or float, optional): Seconds the whole fetch may take (default: get_default_deadline()),
+            or the run's Deadline (then the fetch ends at that deadline or after get_default_deadline(), if sooner)
+        strategies (list, optional): Strategies to try (default: get_strategies()), reordered by their record
+        use_cache (bool): Whether to store the fetched page in the on-disk page cache; looking it up
+            first is the caller's job (see api.fetch_firstcycling_html)
+        stats (StrategyStats, optional): Outcome records (default: get_strategy_stats())
+        clock (callable, optional): Monotonic clock for a deadline given in seconds (default: time.monotonic)
+        cached (dict, optional): Stale cache entry of the URL (http_cache.lookup), revalidated instead of
+            downloading the page again
+        cache_if (callable, optional): content -> bool; only pages it accepts are cached (e.g.
+            firstcycling.has_rider_table, so bot-challenge pages served with status 200 are not)
+
+    Returns:
+        tuple: (content, success, error_message); the error lists what every tried strategy reported
+    """
+    clock = clock or time.monotonic
+    stats = stats or get_strategy_stats()
+    environment = get_environment()
+    if isinstance(deadline, deadlines.Deadline):
+        deadline = deadline.within(get_default_deadline())
+    else:
+        deadline = deadlines.Deadline(get_default_deadline() if deadline is None else deadline, clock)
+    ordered = stats.order(environment, strategies or get_strategies(environment))
+    logger.info(f"🧭 Fetch strategies for {environment}: {' → '.join(ordered)}")
+
+    errors = []
+    for strategy in ordered:
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            errors.append(deadline.error(f"trying {strategy}"))
+            break
+
+        logger.info(f"🔄 Trying {strategy} ({remaining:.0f}s left)...")
+        attempt_started = clock()
+        content, success, error = run_strategy(strategy, url, min(DEFAULT_STRATEGY_TIMEOUT, remaining), use_cache,
+                                               deadline, cached=cached, cache_if=cache_if)
+        latency = clock() - attempt_started
+        stats.record(environment, strategy, success, latency)
+        metrics.increment('fetch_strategy_attempts', strategy=strategy, outcome='success' if success else 'failure')
+
+        if success:
+            logger.info(f"✅ {strategy} fetched {len(content)} bytes in {latency:.1f}s")
+            return content, True, None
+        logger.warning(f"⚠️  {strategy} failed: {error}")
+        errors.append(f"{strategy}: {error}")
+
+    return None, False, "All fetch strategies failed:\n" + "\n".join(f"   • {error}" for error in errors)
@@ -0,0 +1,319 @@
+"""
+Fast extraction of riders from FirstCycling race pages.
+
+Uses lxml when it is installed and BeautifulSoup with ``html.parser``
+otherwise. The BeautifulSoup path only builds the ``<table>`` subtrees
+(SoupStrainer) instead of the whole page. Both backends walk the page exactly
+like the original parser did (every table, every row after the first, every
+rider link in the row), so they return the same cyclists in the same order.
+
+With ``pcm=1`` the result tables have one column per PCM stat (FLA, MTN, ...).
+The first row of a table maps these columns to ``commons.STAT_KEYS`` by header
+title or abbreviation, and the stat values of each rider row are read in the
+same pass as its rider links.
+"""
+
+import re
+
+from src.utils import commons
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+RIDER_HREF_PATTERN = re.compile(r'/?rider\.php\?r=\d+')
+RIDER_ID_PATTERN = re.compile(r'r=(\d+)')
+CAMEL_CASE_PATTERN = re.compile(r'([a-z])([A-Z])')
+TABLE_TAG_BYTES_PATTERN = re.compile(rb'<table[\s>]', re.IGNORECASE)
+RIDER_HREF_BYTES_PATTERN = re.compile(rb'rider\.php\?r=\d+')
+
+# FirstCycling stat column header (title before '|', or abbreviation) -> stat key
+STAT_HEADERS = {
+    'FLAT': 'fla', 'FLA': 'fla',
+    'MOUNTAIN': 'mo', 'MTN': 'mo',
+    'MEDIUM MOUNTAIN': 'mm', 'MM': 'mm',
+    'DOWNHILL': 'dh', 'DHI': 'dh',
+    'COBBLES': 'cob', 'COB': 'cob',
+    'TIMETRIAL': 'tt', 'TIME TRIAL': 'tt', 'TTR': 'tt',
+    'PROLOGUE': 'prl', 'PRL': 'prl',
+    'SPRINT': 'spr', 'SPR': 'spr',
+    'ACCELERATION': 'acc', 'ACC': 'acc',
+    'STAMINA': 'end', 'STA': 'end',
+    'RESISTENCE': 'res', 'RESISTANCE': 'res', 'RES': 'res',
+    'RECUPERATION': 'rec', 'REC': 'rec',
+    'HILL': 'hil', 'HIL': 'hil',
+    'ATTACKING': 'att', 'ATT': 'att',
+}
+
+BACKEND_LXML = 'lxml'
+BACKEND_HTML_PARSER = 'html.parser'
+
+_lxml_html = None
+_lxml_checked = False
+
+
+def _get_lxml_html():
+    """Import lxml.html on first use; None when lxml is not installed."""
+    global _lxml_html, _lxml_checked
+    if not _lxml_checked:
+        try:
+            from lxml import html as lxml_html
+            _lxml_html = lxml_html
+        except ImportError:
+            _lxml_html = None
+        _lxml_checked = True
+    return _lxml_html
+
+
+def get_parser_backend():
+    """
+    Get the backend used to parse race pages.
+
+    Returns:
+        str: 'lxml' when lxml is installed, otherwise 'html.parser'
+    """
+    return BACKEND_LXML if _get_lxml_html() is not None else BACKEND_HTML_PARSER
+
+
+def _to_text(html_content):
+    """Decode bytes the way BeautifulSoup does, so both backends see the same text."""
+    if isinstance(html_content, bytes):
+        from bs4.dammit import UnicodeDammit
+        return UnicodeDammit(html_content, is_html=True).unicode_markup
+    return html_content
+
+
+def has_rider_table(html_content):
+    """
+    Check cheaply (without parsing) that a page has a table and rider links.
+
+    Bot-challenge and error pages have neither, so they are not mistaken for
+    a race page that can be cached.
+
+    Args:
+        html_content (bytes or str): Page content
+
+    Returns:
+        bool: True if the page contains a <table> and a rider link
+    """
+    if isinstance(html_content, str):
+        html_content = html_content.encode('utf-8')
+    return bool(TABLE_TAG_BYTES_PATTERN.search(html_content) and RIDER_HREF_BYTES_PATTERN.search(html_content))
+
+
+def _stat_key(title, text):
+    """Map a header cell to a stat key by its title ("FLAT | ...") or abbreviation ("FLA")."""
+    for label in (title.split('|')[0], text):
+        stat_key = STAT_HEADERS.get(label.strip().upper())
+        if stat_key:
+            return stat_key
+    return None
+
+
+def _positions(cells):
+    """Yield (column position, cell) pairs, honouring colspan."""
+    position = 0
+    for cell in cells:
+        yield position, cell
+        colspan = cell.get('colspan') or '1'
+        position += int(colspan) if colspan.isdigit() and int(colspan) > 0 else 1
+
+
+def _stat_columns(cells, cell_text):
+    """
+    Map the stat columns of a header row.
+
+    Args:
+        cells (list): Header cells (td/th elements) of the row
+        cell_text (callable): Returns the stripped text of a cell
+
+    Returns:
+        dict: Column position -> stat key
+    """
+    columns = {}
+    for position, cell in _positions(cells):
+        stat_key = _stat_key(cell.get('title') or '', cell_text(cell))
+        if stat_key and stat_key in commons.STAT_KEYS and stat_key not in columns.values():
+            columns[position] = stat_key
+    return columns
+
+
+def _stat_values(stat_columns, cells, cell_text):
+    """
+    Read the stat values of a rider row.
+
+    Args:
+        stat_columns (dict): Column position -> stat key (from _stat_columns)
+        cells (list): Cells (td/th elements) of the row
+        cell_text (callable): Returns the text of a cell without whitespace
+
+    Returns:
+        dict: Stat key -> int value, ordered like commons.STAT_KEYS (empty cells are skipped)
+    """
+    values = {}
+    last_column = max(stat_columns)
+    for position, cell in _positions(cells):
+        if position > last_column:
+            break
+        stat_key = stat_columns.get(position)
+        if stat_key:
+            text = cell_text(cell)
+            if text.isdigit():
+                values[stat_key] = int(text)
+    return {stat_key: values[stat_key] for stat_key in commons.STAT_KEYS if stat_key in values}
+
+
+def _build_cyclist(href, title, link_text, row_index, stats=None):
+    """
+    Build a cyclist dict from one rider link.
+
+    Args:
+        href (str): Link target
+        title (str): Title attribute ('' when missing)
+        link_text (callable): Returns the link text, only called when the title is empty
+        row_index (int): Index of the row in its table
+        stats (dict, optional): Stat values read from the row
+
+    Returns:
+        dict: Cyclist data, or None if the link has no usable ID or name
+    """
+    match = RIDER_ID_PATTERN.search(href)
+    if not match:
+        return None
+    rider_id = match.group(1)
+
+    # Prefer the title attribute, converting "First Last" to "Last First"
+    name = title.strip()
+    if name and ' ' in name:
+        parts = name.strip().split()
+        if len(parts) >= 2:
+            name = f"{' '.join(parts[1:])} {parts[0]}"
+
+    # Without a title, split link text like "LampertiLuke" before capital letters
+    if not name:
+        name = CAMEL_CASE_PATTERN.sub(r'\1 \2', link_text())
+
+    if name and len(name) > 1 and rider_id:
+        cyclist = {
+            'name': name,
+            'href': href,
+            'rider_id': rider_id,
+            'table_row_number': row_index,
+            'first_cycling_id': int(rider_id)  # For compatibility
+        }
+        if stats:
+            cyclist['stats'] = stats
+        return cyclist
+    return None
+
+
+def _lxml_text(element):
+    """Text of an lxml element like BeautifulSoup's get_text(strip=True); itertext() skips comments."""
+    return ''.join(text.strip() for text in element.itertext() if text.strip())
+
+
+def _lxml_value_text(cell):
+    return ''.join(cell.text_content().split())
+
+
+def _lxml_cells(row):
+    return [cell for cell in row if cell.tag in ('td', 'th')]
+
+
+def _extract_with_lxml(lxml_html, html_text):
+    try:
+        root = lxml_html.document_fromstring(html_text)
+    except Exception:
+        # Empty documents, or text lxml refuses (e.g. with an XML encoding declaration)
+        return None
+
+    cyclists = []
+    for table in root.iter('table'):
+        stat_columns = {}
+        for row_index, row in enumerate(table.iter('tr')):
+            if row_index == 0:
+                stat_columns = _stat_columns(_lxml_cells(row), _lxml_text)
+                continue
+            links = [link for link in row.iter('a')
+                     if link.get('href') is not None and RIDER_HREF_PATTERN.search(link.get('href'))]
+            if not links:
+                continue
+            # Rows of nested tables are walked too, but only this table's own rows have its stat columns
+            stats = None
+            if stat_columns and next(row.iterancestors('table'), None) is table:
+                stats = _stat_values(stat_columns, _lxml_cells(row), _lxml_value_text)
+            for link in links:
+                cyclist = _build_cyclist(link.get('href'), link.get('title', ''), lambda: _lxml_text(link),
+                                         row_index, stats)
+                if cyclist:
+                    cyclists.append(cyclist)
+    return cyclists
+
+
+def _soup_text(cell):
+    return cell.get_text(strip=True)
+
+
+def _soup_value_text(cell):
+    return ''.join(cell.get_text().split())
+
+
+def _soup_cells(row):
+    return row.find_all(['td', 'th'], recursive=False)
+
+
+def _extract_with_soup(html_content):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    soup = BeautifulSoup(html_content, 'html.parser', parse_only=SoupStrainer('table'))
+    cyclists = []
+    for table in soup.find_all('table'):
+        stat_columns = {}
+        for row_index, row in enumerate(table.find_all('tr')):
+            if row_index == 0:
+                stat_columns = _stat_columns(_soup_cells(row), _soup_text)
+                continue
+            links = row.find_all('a', href=RIDER_HREF_PATTERN)
+            if not links:
+                continue
+            stats = None
+            if stat_columns and row.find_parent('table') is table:
+                stats = _stat_values(stat_columns, _soup_cells(row), _soup_value_text)
+            for link in links:
+                cyclist = _build_cyclist(link.get('href', ''), link.get('title', ''),
+                                         lambda: link.get_text(strip=True), row_index, stats)
+                if cyclist:
+                    cyclists.append(cyclist)
+    return cyclists
+
+
+def extract_cyclists(html_content, backend=None):
+    """
+    Extract the riders linked from the tables of a FirstCycling page.
+
+    Args:
+        html_content (str or bytes): HTML content of the page
+        backend (str, optional): 'lxml' or 'html.parser' (default: lxml when installed)
+
+    Returns:
+        list: Unique cyclist dicts (first occurrence of each rider ID) with
+              name, href, rider_id, table_row_number and first_cycling_id, plus
+              stats (stat key -> value) for riders listed in a table with PCM stat columns
+    """
+    cyclists = None
+    if (backend or get_parser_backend()) == BACKEND_LXML:
+        lxml_html = _get_lxml_html()
+        if lxml_html is None:
+            raise ImportError("lxml is not installed. Install with: pip install lxml")
+        cyclists = _extract_with_lxml(lxml_html, _to_text(html_content))
+        if cyclists is None:
+            logger.debug("lxml could not parse the page, falling back to html.parser")
+    if cyclists is None:
+        cyclists = _extract_with_soup(html_content)
+
+    unique_cyclists = {}
+    for cyclist in cyclists:
+        first = unique_cyclists.setdefault(cyclist['rider_id'], cyclist)
+        # A rider linked from a side table first still gets the stats of the results table
+        if 'stats' in cyclist and 'stats' not in first:
+            first['stats'] = cyclist['stats']
+    return list(unique_cyclists.values())
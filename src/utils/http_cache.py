@@ -0,0 +1,310 @@
+"""
+Persistent on-disk cache of fetched pages.
+
+Responses are stored under a cache directory (``PCM_HTTP_CACHE_DIR``, default
+``.cache/http``) keyed by the normalized URL, so re-running an automated
+change request does not fetch the same race page again:
+
+- Entries younger than the TTL (``PCM_HTTP_CACHE_TTL`` seconds, default 12
+  hours) are served without any request.
+- Older entries are revalidated when the plain-HTTP path is used: their ETag
+  and Last-Modified values are sent as If-None-Match/If-Modified-Since, and
+  a 304 answer refreshes the entry instead of downloading the page again.
+- The cache is bounded (``PCM_HTTP_CACHE_MAX_BYTES``, default 200 MiB); the
+  least recently used entries are evicted first.
+
+Each entry is a ``<sha256>.body`` file with the content and a ``.json`` file
+with its metadata, both written atomically. The cache can be switched off
+for a process with ``configure(enabled=False)`` (``--no-cache`` on the CLI)
+or ``PCM_HTTP_CACHE=0``, and is always bypassed when ``PCM_FETCH_MODE``
+records or replays fetches (see utils/cassettes.py).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from src.utils import cassettes
+from src.utils import metrics
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'http')
+DEFAULT_TTL = 12 * 60 * 60
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+_enabled = None
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def normalize_url(url):
+    """
+    Normalize a URL for use as a cache key.
+
+    The scheme and host are lower-cased, a leading 'www.' and the fragment are
+    dropped and the query parameters are sorted, so
+    ``https://www.FirstCycling.com/race.php?y=2025&r=1&pcm=1`` and
+    ``https://firstcycling.com/race.php?pcm=1&r=1&y=2025`` share an entry.
+
+    Args:
+        url (str): URL to normalize
+
+    Returns:
+        str: Normalized URL
+    """
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    netloc = f"{host}:{parsed.port}" if parsed.port else host
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((parsed.scheme.lower(), netloc, parsed.path or '/', '', query, ''))
+
+
+def _write_atomic(file_path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix='.pcm-cache-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class HTTPCache:
+    """
+    Size-bounded LRU cache of page contents on disk.
+
+    Args:
+        directory (str): Cache directory (created on first write)
+        ttl (float): Seconds an entry is served without revalidation
+        max_bytes (int): Maximum total size of the cached contents
+        clock (callable, optional): Wall clock in seconds (default: time.time)
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES, clock=None):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock or time.time
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.body', base + '.json'
+
+    def get(self, url):
+        """
+        Look up a URL.
+
+        Args:
+            url (str): Requested URL
+
+        Returns:
+            dict: 'content' (bytes), 'fresh' (bool), 'etag', 'last_modified', 'stored_at' and 'url',
+                  or None when the URL is not cached
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['content'] = f.read()
+        except (OSError, ValueError):
+            return None
+
+        now = self._clock()
+        entry['fresh'] = now - entry.get('stored_at', 0) < self.ttl
+        # The body's modification time records the last use, for LRU eviction
+        try:
+            os.utime(body_path, (now, now))
+        except OSError:
+            pass
+        return entry
+
+    def put(self, url, content, headers=None):
+        """
+        Store the content of a URL.
+
+        Args:
+            url (str): Requested URL
+            content (bytes or str): Page content
+            headers (dict, optional): Response headers (ETag and Last-Modified are kept for revalidation)
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        entry = {
+            'url': normalize_url(url),
+            'stored_at': self._clock(),
+            'size': len(content),
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified')
+        }
+        body_path, meta_path = self._paths(url)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_atomic(body_path, content)
+            _write_atomic(meta_path, json.dumps(entry, sort_keys=True).encode('utf-8'))
+            now = self._clock()
+            os.utime(body_path, (now, now))
+            self._evict()
+
+    def refresh(self, url):
+        """Mark a cached URL as fresh again (after a 304 Not Modified answer)."""
+        body_path, meta_path = self._paths(url)
+        with self._lock:
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return
+            entry['stored_at'] = self._clock()
+            _write_atomic(meta_path, json.dumps(entry, sort_keys=True).encode('utf-8'))
+
+    def _entries(self):
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.body'):
+                body_path = os.path.join(self.directory, file_name)
+                try:
+                    status = os.stat(body_path)
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, body_path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (body_path, body_path[:-len('.body')] + '.json'):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+            logger.debug(f"🗑️  Evicted cached page {os.path.basename(body_path)} ({size} bytes)")
+
+    def size(self):
+        """Total size in bytes of the cached contents."""
+        with self._lock:
+            if not os.path.isdir(self.directory):
+                return 0
+            return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            if not os.path.isdir(self.directory):
+                return
+            for file_name in os.listdir(self.directory):
+                if file_name.endswith(('.body', '.json')):
+                    os.remove(os.path.join(self.directory, file_name))
+
+
+def configure(enabled=None):
+    """
+    Enable or disable the cache for this process.
+
+    Args:
+        enabled (bool, optional): False disables the cache (--no-cache); None restores the
+            PCM_HTTP_CACHE environment default
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    """Whether fetches use the cache (configure() wins over PCM_HTTP_CACHE; never when recording or replaying)."""
+    if cassettes.get_fetch_mode() != cassettes.MODE_LIVE:
+        return False
+    if _enabled is not None:
+        return _enabled
+    return os.getenv('PCM_HTTP_CACHE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def get_http_cache():
+    """
+    Get the process-wide cache configured by the environment.
+
+    Returns:
+        HTTPCache: Shared cache, or None when caching is disabled
+    """
+    if not is_enabled():
+        return None
+    directory = os.getenv('PCM_HTTP_CACHE_DIR', DEFAULT_CACHE_DIR)
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = HTTPCache(
+                directory,
+                ttl=float(os.getenv('PCM_HTTP_CACHE_TTL', DEFAULT_TTL)),
+                max_bytes=int(os.getenv('PCM_HTTP_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+            )
+        return cache
+
+
+def lookup(url):
+    """
+    Look up a URL in the shared cache, counting the result in the http_cache_lookups metric.
+
+    Args:
+        url (str): Requested URL
+
+    Returns:
+        dict: Cache entry (see HTTPCache.get), or None when disabled or not cached
+    """
+    cache = get_http_cache()
+    if cache is None:
+        return None
+    entry = cache.get(url)
+    result = 'miss' if entry is None else 'hit' if entry['fresh'] else 'stale'
+    metrics.increment('http_cache_lookups', result=result)
+    if result == 'hit':
+        logger.info(f"💾 Using cached page for {url} ({len(entry['content'])} bytes)")
+    return entry
+
+
+def store(url, content, headers=None, cache_if=None):
+    """
+    Store a fetched page in the shared cache (no-op when disabled; errors are only logged).
+
+    Args:
+        url (str): Requested URL
+        content (bytes): Page content
+        headers (dict, optional): Response headers (ETag and Last-Modified are kept for revalidation)
+        cache_if (callable, optional): content -> bool; pages it rejects (e.g. bot-challenge or error pages
+            served with status 200) are not stored
+    """
+    cache = get_http_cache()
+    if cache is None or content is None:
+        return
+    if cache_if is not None and not cache_if(content):
+        logger.warning(f"⚠️  Not caching {url}: the page failed the cache check")
+        return
+    try:
+        cache.put(url, content, headers)
+    except OSError as e:
+        logger.warning(f"⚠️  Could not cache {url}: {e}")
+
+
+def mark_revalidated(url):
+    """Refresh a cached page the server answered 304 Not Modified for, counting it in http_cache_lookups."""
+    metrics.increment('http_cache_lookups', result='revalidated')
+    cache = get_http_cache()
+    if cache is None:
+        return
+    try:
+        cache.refresh(url)
+    except OSError as e:
+        logger.warning(f"⚠️  Could not refresh cached {url}: {e}")
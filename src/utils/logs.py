@@ -0,0 +1,122 @@
+"""
+Logging setup for the PCM stats tooling.
+
+All modules log through children of the ``pcm`` logger (``get_logger(__name__)``).
+Importing the package does not configure logging: the ``pcm`` logger only has
+a ``NullHandler``, so library users and pytest's caplog see its records through
+the usual propagation. The CLI calls ``configure_logging``, which writes records
+to stdout (or stderr for commands whose stdout is JSON), resolved when each
+record is emitted so that redirected or captured output keeps working. By
+default only the message is printed (INFO and above), which keeps the console
+output identical to the previous print-based output; the CLI can switch to
+quiet, verbose or JSON-lines output.
+"""
+
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+
+ROOT_LOGGER_NAME = 'pcm'
+TEXT_FORMAT = '%(message)s'
+LOG_FORMATS = ('text', 'json')
+LOG_STREAMS = ('stdout', 'stderr')
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Stream handler that always writes to the current sys.stdout or sys.stderr."""
+
+    def __init__(self, stream_name='stdout'):
+        self.stream_name = stream_name
+        super().__init__(getattr(sys, stream_name))
+
+    @property
+    def stream(self):
+        return getattr(sys, self.stream_name)
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format each record as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        data = getattr(record, 'data', None)
+        if data:
+            entry['data'] = data
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def get_logger(name=None):
+    """
+    Get a logger below the ``pcm`` root logger.
+
+    Args:
+        name (str, optional): Module name (e.g. ``__name__``); the ``src.`` prefix is dropped
+
+    Returns:
+        logging.Logger: The logger
+    """
+    if not name:
+        return logging.getLogger(ROOT_LOGGER_NAME)
+    if name.startswith('src.'):
+        name = name[len('src.'):]
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def configure_logging(level=logging.INFO, log_format='text', stream='stdout'):
+    """
+    Configure the ``pcm`` logger. Calling it again replaces the previous configuration.
+
+    Args:
+        level (int): Minimum level to output (e.g. logging.WARNING for --quiet, logging.DEBUG for --verbose)
+        log_format (str): 'text' for plain messages or 'json' for JSON lines
+        stream (str): 'stdout', or 'stderr' to keep stdout free for a command's JSON output
+
+    Returns:
+        logging.Logger: The configured root ``pcm`` logger
+    """
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{log_format}', expected one of: {', '.join(LOG_FORMATS)}")
+    if stream not in LOG_STREAMS:
+        raise ValueError(f"Unknown log stream '{stream}', expected one of: {', '.join(LOG_STREAMS)}")
+
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(logger.handlers):
+        if isinstance(handler, ConsoleHandler):
+            logger.removeHandler(handler)
+
+    handler = ConsoleHandler(stream)
+    if log_format == 'json':
+        handler.setFormatter(JsonLinesFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def reset_logging():
+    """Remove the handler added by ``configure_logging`` and let ``pcm`` records propagate again."""
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(logger.handlers):
+        if isinstance(handler, ConsoleHandler):
+            logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+# Library use stays silent (and records still propagate, e.g. to pytest's caplog) until the CLI configures logging
+logging.getLogger(ROOT_LOGGER_NAME).addHandler(logging.NullHandler())
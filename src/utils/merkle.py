@@ -0,0 +1,263 @@
+"""
+Hierarchical (Merkle) hashing of namespace stats.
+
+Every cyclist in a stats file is hashed on its own, cyclists are grouped into
+buckets by PCM ID range and the bucket hashes are combined into a single root
+hash. Two namespaces (or two branches of the same namespace) are identical when
+their roots match; when they differ only the buckets with different hashes need
+to be inspected to find the cyclists that changed.
+
+The tree is stored next to the stats file as a small JSON sidecar containing
+the root and the bucket hashes only. Cyclist hashes are recomputed on demand
+from the stats data, which keeps the sidecar small and git-diff friendly. The
+sidecar also records the digest of the stats file it was built from, so a
+stats file edited by hand or by a git merge is detected and rehashed.
+"""
+
+import hashlib
+import json
+import os
+
+BUCKET_SIZE = 1000
+HASH_TREE_VERSION = 1
+
+
+def hash_cyclist(pcm_id, cyclist_data):
+    """
+    Hash a single cyclist entry from a stats file.
+
+    Args:
+        pcm_id (str or int): PCM ID of the cyclist
+        cyclist_data (dict): Cyclist entry (name, first_cycling_id, stats)
+
+    Returns:
+        str: Hex digest of the canonical cyclist representation
+    """
+    payload = json.dumps([str(pcm_id), cyclist_data], sort_keys=True, separators=(',', ':'),
+                         ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def hash_stats_content(content):
+    """
+    Digest of the raw content of a stats file.
+
+    This is git's blob ID of the content, so the digest of a stats file at a git
+    ref can be read with ``git rev-parse <ref>:<path>`` without reading the file.
+
+    Args:
+        content (bytes or str): Content of the stats file
+
+    Returns:
+        str: Hex digest of the content
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha1(b'blob %d\0' % len(content) + content).hexdigest()
+
+
+def hash_stats_file(file_path):
+    """
+    Digest of a stats file (see hash_stats_content).
+
+    Returns:
+        str: Hex digest, or None if the file does not exist
+    """
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'rb') as f:
+        return hash_stats_content(f.read())
+
+
+def get_bucket_id(pcm_id, bucket_size=BUCKET_SIZE):
+    """Return the bucket a PCM ID belongs to."""
+    return int(pcm_id) // bucket_size
+
+
+def _combine_hashes(hashes):
+    """Combine a {key: hash} mapping into one digest, ordered by numeric key."""
+    digest = hashlib.sha256()
+    for key in sorted(hashes, key=int):
+        digest.update(f"{key}:{hashes[key]}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def hash_bucket(stats_data, pcm_ids):
+    """
+    Hash the cyclists of one bucket.
+
+    Args:
+        stats_data (dict): Full stats data keyed by PCM ID
+        pcm_ids (iterable): PCM IDs belonging to the bucket
+
+    Returns:
+        str: Hex digest of the bucket
+    """
+    return _combine_hashes({pcm_id: hash_cyclist(pcm_id, stats_data[pcm_id]) for pcm_id in pcm_ids})
+
+
+def _group_by_bucket(pcm_ids, bucket_size):
+    buckets = {}
+    for pcm_id in pcm_ids:
+        buckets.setdefault(str(get_bucket_id(pcm_id, bucket_size)), []).append(str(pcm_id))
+    return buckets
+
+
+def build_hash_tree(stats_data, bucket_size=BUCKET_SIZE):
+    """
+    Build the complete hash tree for a stats file.
+
+    Args:
+        stats_data (dict): Stats data keyed by PCM ID
+        bucket_size (int): Number of consecutive PCM IDs per bucket
+
+    Returns:
+        dict: Hash tree with root, bucket hashes and cyclist count
+    """
+    stats_data = {str(pcm_id): data for pcm_id, data in (stats_data or {}).items()}
+    buckets = {
+        bucket_id: hash_bucket(stats_data, pcm_ids)
+        for bucket_id, pcm_ids in _group_by_bucket(stats_data.keys(), bucket_size).items()
+    }
+    return {
+        'version': HASH_TREE_VERSION,
+        'bucket_size': bucket_size,
+        'cyclist_count': len(stats_data),
+        'root': _combine_hashes(buckets),
+        'buckets': {bucket_id: buckets[bucket_id] for bucket_id in sorted(buckets, key=int)}
+    }
+
+
+def update_hash_tree(tree, stats_data, touched_pcm_ids):
+    """
+    Incrementally update a hash tree after some cyclists changed.
+
+    Only the buckets containing a touched cyclist are rehashed; all other
+    bucket hashes are reused from the existing tree.
+
+    Args:
+        tree (dict): Existing hash tree (as returned by build_hash_tree)
+        stats_data (dict): Updated stats data keyed by PCM ID
+        touched_pcm_ids (iterable): PCM IDs that were added, changed or removed
+
+    Returns:
+        dict: Updated hash tree
+    """
+    if not is_valid_hash_tree(tree):
+        return build_hash_tree(stats_data)
+
+    bucket_size = tree['bucket_size']
+    stats_data = {str(pcm_id): data for pcm_id, data in (stats_data or {}).items()}
+    touched_buckets = {str(get_bucket_id(pcm_id, bucket_size)) for pcm_id in touched_pcm_ids}
+    if not touched_buckets:
+        return tree
+
+    members = {bucket_id: [] for bucket_id in touched_buckets}
+    for pcm_id in stats_data:
+        bucket_id = str(get_bucket_id(pcm_id, bucket_size))
+        if bucket_id in members:
+            members[bucket_id].append(pcm_id)
+
+    buckets = dict(tree['buckets'])
+    for bucket_id, pcm_ids in members.items():
+        if pcm_ids:
+            buckets[bucket_id] = hash_bucket(stats_data, pcm_ids)
+        else:
+            buckets.pop(bucket_id, None)
+
+    return {
+        'version': HASH_TREE_VERSION,
+        'bucket_size': bucket_size,
+        'cyclist_count': len(stats_data),
+        'root': _combine_hashes(buckets),
+        'buckets': {bucket_id: buckets[bucket_id] for bucket_id in sorted(buckets, key=int)}
+    }
+
+
+def is_current_hash_tree(tree, stats_digest):
+    """Check that a hash tree is valid and was built from the stats file with the given digest."""
+    return is_valid_hash_tree(tree) and tree.get('stats_digest') == stats_digest
+
+
+def is_valid_hash_tree(tree):
+    """Check that a loaded hash tree has the expected structure and version."""
+    return (isinstance(tree, dict)
+            and tree.get('version') == HASH_TREE_VERSION
+            and isinstance(tree.get('bucket_size'), int)
+            and isinstance(tree.get('buckets'), dict)
+            and 'root' in tree)
+
+
+def load_hash_tree(file_path):
+    """
+    Load a hash tree sidecar file.
+
+    Returns:
+        dict: The hash tree, or None if the file is missing or unreadable
+    """
+    if not os.path.exists(file_path):
+        return None
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            tree = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return tree if is_valid_hash_tree(tree) else None
+
+
+def write_hash_tree(tree, file_path):
+    """Write a hash tree sidecar file."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(tree, f, indent=1)
+        f.write('\n')
+
+
+def diff_hash_trees(tree_a, tree_b):
+    """
+    Find the buckets that differ between two hash trees.
+
+    Args:
+        tree_a (dict): First hash tree
+        tree_b (dict): Second hash tree
+
+    Returns:
+        list: Sorted bucket IDs whose hashes differ (empty if the roots match)
+    """
+    if tree_a['root'] == tree_b['root']:
+        return []
+    if tree_a['bucket_size'] != tree_b['bucket_size']:
+        raise ValueError("Cannot compare hash trees with different bucket sizes")
+
+    buckets_a = tree_a['buckets']
+    buckets_b = tree_b['buckets']
+    return sorted((bucket_id for bucket_id in set(buckets_a) | set(buckets_b)
+                   if buckets_a.get(bucket_id) != buckets_b.get(bucket_id)), key=int)
+
+
+def diff_cyclists(stats_a, stats_b, bucket_ids, bucket_size=BUCKET_SIZE):
+    """
+    Find the cyclists that differ between two stats files within the given buckets.
+
+    Args:
+        stats_a (dict): First stats data keyed by PCM ID
+        stats_b (dict): Second stats data keyed by PCM ID
+        bucket_ids (iterable): Buckets to inspect (from diff_hash_trees)
+        bucket_size (int): Bucket size used by both trees
+
+    Returns:
+        dict: Sorted lists of 'added', 'removed' and 'changed' PCM IDs (relative to stats_a)
+    """
+    bucket_ids = {str(bucket_id) for bucket_id in bucket_ids}
+    stats_a = {str(k): v for k, v in (stats_a or {}).items() if str(get_bucket_id(k, bucket_size)) in bucket_ids}
+    stats_b = {str(k): v for k, v in (stats_b or {}).items() if str(get_bucket_id(k, bucket_size)) in bucket_ids}
+
+    added = [pcm_id for pcm_id in stats_b if pcm_id not in stats_a]
+    removed = [pcm_id for pcm_id in stats_a if pcm_id not in stats_b]
+    changed = [pcm_id for pcm_id in stats_a
+               if pcm_id in stats_b and hash_cyclist(pcm_id, stats_a[pcm_id]) != hash_cyclist(pcm_id, stats_b[pcm_id])]
+
+    return {
+        'added': sorted(added, key=int),
+        'removed': sorted(removed, key=int),
+        'changed': sorted(changed, key=int)
+    }
@@ -0,0 +1,235 @@
+"""
+Per-stage timing and memory metrics for pipeline runs.
+
+Code marks pipeline stages with ``with metrics.stage('stats_load'):``. Every
+stage accumulates its number of calls, wall time, CPU time and peak memory in
+a process-wide, thread-safe registry, which the CLI adds to its JSON summary
+and can write to a metrics file. Stages may be nested; each stage records its
+own totals.
+
+Besides stages, code can record per-run counters (``increment``) and
+observations such as request latencies (``observe``), both with labels.
+
+Listeners (e.g. the profiler in ``src/utils/profiling.py``) can hook into
+every stage with ``add_stage_listener``, so their output is attributed to the
+same named spans.
+
+Peak memory comes from tracemalloc when it is tracing (peak of traced Python
+allocations during the stage, memory source 'tracemalloc'). Otherwise it is
+how much the stage raised the process peak RSS (memory source
+'rss_peak_growth'): the RSS high-water mark never goes down, so a stage that
+stays below the peak of an earlier stage reports 0.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_stages = {}
+_counters = {}
+_observations = {}
+_lock = threading.Lock()
+_local = threading.local()
+_listeners = []
+
+
+def reset():
+    """Clear all recorded stage metrics."""
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+        _observations.clear()
+
+
+def increment(name, value=1, **labels):
+    """
+    Add to a per-run counter.
+
+    Args:
+        name (str): Counter name (e.g. 'changes_processed')
+        value (int or float): Amount to add
+        **labels: Label values (e.g. method='proxy')
+    """
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    """
+    Record one observation (e.g. a latency in seconds); count and sum are kept.
+
+    Args:
+        name (str): Observation name (e.g. 'fetch_attempt_duration_seconds')
+        value (float): Observed value
+        **labels: Label values (e.g. method='selenium', outcome='success')
+    """
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        entry = _observations.setdefault(key, {'count': 0, 'sum': 0.0})
+        entry['count'] += 1
+        entry['sum'] += value
+
+
+def get_counters():
+    """
+    Get the counters recorded so far.
+
+    Returns:
+        list: {'name', 'labels', 'value'} dicts sorted by name and labels
+    """
+    with _lock:
+        return [{'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(_counters.items())]
+
+
+def get_observations():
+    """
+    Get the observations recorded so far.
+
+    Returns:
+        list: {'name', 'labels', 'count', 'sum'} dicts sorted by name and labels
+    """
+    with _lock:
+        return [{'name': name, 'labels': dict(labels), 'count': entry['count'], 'sum': round(entry['sum'], 6)}
+                for (name, labels), entry in sorted(_observations.items())]
+
+
+def add_stage_listener(listener):
+    """
+    Register a listener that is entered around every stage.
+
+    Args:
+        listener (callable): Called with the stage name, must return a context manager
+    """
+    _listeners.append(listener)
+
+
+def remove_stage_listener(listener):
+    """Unregister a listener added with add_stage_listener."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _active_frames():
+    if not hasattr(_local, 'frames'):
+        _local.frames = []
+    return _local.frames
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _start_memory_window(frame):
+    if tracemalloc.is_tracing():
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+    else:
+        frame['rss_start'] = _peak_rss_bytes()
+
+
+def _memory_peak(frame):
+    if tracemalloc.is_tracing():
+        return max(tracemalloc.get_traced_memory()[1], frame['child_peak']), 'tracemalloc'
+    rss_start = frame.get('rss_start')
+    if rss_start is None:
+        return None, 'rss_peak_growth'
+    return _peak_rss_bytes() - rss_start, 'rss_peak_growth'
+
+
+@contextmanager
+def stage(name):
+    """
+    Record wall time, CPU time and peak memory of a pipeline stage.
+
+    Args:
+        name (str): Stage name (e.g. 'stats_load', 'sql_generation')
+    """
+    frames = _active_frames()
+    frame = {'child_peak': 0}
+    frames.append(frame)
+    _start_memory_window(frame)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with ExitStack() as listeners:
+            for listener in list(_listeners):
+                listeners.enter_context(listener(name))
+            yield
+    finally:
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+        peak_memory, memory_source = _memory_peak(frame)
+        frames.pop()
+        if frames and peak_memory is not None:
+            # reset_peak() in this stage hid part of the parent's window; pass the peak up
+            frames[-1]['child_peak'] = max(frames[-1]['child_peak'], peak_memory)
+
+        with _lock:
+            entry = _stages.setdefault(name, {
+                'calls': 0,
+                'wall_time': 0.0,
+                'cpu_time': 0.0,
+                'peak_memory_bytes': None,
+                'memory_source': memory_source
+            })
+            entry['calls'] += 1
+            entry['wall_time'] += wall_time
+            entry['cpu_time'] += cpu_time
+            if peak_memory is not None:
+                entry['peak_memory_bytes'] = max(entry['peak_memory_bytes'] or 0, peak_memory)
+
+
+def get_stage_metrics():
+    """
+    Get the metrics recorded so far.
+
+    Returns:
+        dict: Stage name -> {'calls', 'wall_time', 'cpu_time', 'peak_memory_bytes', 'memory_source'},
+              times in seconds rounded to microseconds
+    """
+    with _lock:
+        return {
+            name: dict(entry, wall_time=round(entry['wall_time'], 6), cpu_time=round(entry['cpu_time'], 6))
+            for name, entry in _stages.items()
+        }
+
+
+def write_metrics_file(file_path, command, wall_time, success):
+    """
+    Write the recorded stage metrics of a CLI run to a JSON file.
+
+    Args:
+        file_path (str): Destination path (parent directories are created)
+        command (str): CLI command that was run
+        wall_time (float): Total wall time of the command in seconds
+        success (bool): Whether the command succeeded
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'command': command,
+            'success': success,
+            'wall_time': round(wall_time, 6),
+            'stages': get_stage_metrics(),
+            'counters': get_counters(),
+            'observations': get_observations()
+        }, f, indent=2)
+        f.write('\n')
@@ -0,0 +1,143 @@
+"""
+OpenMetrics / Prometheus text-file export of pipeline runs.
+
+After a CLI run the recorded stage metrics, counters and observations (see
+``src/utils/metrics.py``) are written to a text file that node_exporter's
+textfile collector can scrape. Every value describes the last run only, so
+counts are exported as gauges and latencies as summaries (``_count``/``_sum``),
+which both the Prometheus text format and OpenMetrics accept. The file is
+written atomically so the collector never reads a partial file.
+"""
+
+import os
+import tempfile
+import time
+
+from src.utils import metrics
+
+METRIC_PREFIX = 'pcm'
+
+METRIC_HELP = {
+    'run_success': 'Whether the last run succeeded (1) or failed (0).',
+    'run_duration_seconds': 'Wall time of the last run.',
+    'run_timestamp_seconds': 'Unix time at which the last run finished.',
+    'stage_duration_seconds': 'Wall time spent in each pipeline stage during the last run.',
+    'stage_cpu_seconds': 'CPU time spent in each pipeline stage during the last run.',
+    'stage_calls': 'Number of times each pipeline stage ran during the last run.',
+    'stage_peak_memory_bytes': 'Peak memory observed in each pipeline stage during the last run.',
+    'changes_processed': 'Change files turned into SQL by the last run.',
+    'stat_rows_generated': 'Stat history rows generated into inserts.sql files by the last run.',
+    'changes_executed': 'Changes whose SQL was executed against the tracking database by the last run.',
+    'stat_rows_inserted': 'Stat history rows inserted into the tracking database by the last run.',
+    'sql_statements_executed': 'SQL statements executed against the tracking database by the last run.',
+    'yaml_files_validated': 'YAML files validated by the last run.',
+    'cyclists_matched': 'Scraped riders matched to a cyclist in the stats file by the last run.',
+    'cyclists_unmatched': 'Scraped riders not found in the stats file by the last run.',
+    'stat_deltas_detected': 'Scraped stat values that differ from the stats file in the last run.',
+    'browser_sessions_started': 'Selenium browser sessions started (and warmed up) by the last run.',
+    'http_cache_lookups': 'Page cache lookups of the last run by result (hit, stale, miss, revalidated).',
+    'proxy_circuits_opened': 'Proxies skipped by the circuit breaker after repeated failures in the last run.',
+    'fetch_strategy_attempts': 'Page fetches by strategy (selenium, session, http, proxy) and outcome in the last run.',
+    'fetch_attempt_duration_seconds': 'Latency of HTTP, proxy and Selenium fetch attempts during the last run.',
+}
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_sample(name, labels, value):
+    if labels:
+        label_text = ','.join(f'{key}="{_escape_label_value(val)}"' for key, val in sorted(labels.items()))
+        return f"{name}{{{label_text}}} {value}"
+    return f"{name} {value}"
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def _family(lines, short_name, metric_type, samples):
+    """Append one metric family (HELP, TYPE and samples) to the output lines."""
+    name = f"{METRIC_PREFIX}_{short_name}"
+    lines.append(f"# HELP {name} {METRIC_HELP.get(short_name, short_name.replace('_', ' ') + '.')}")
+    lines.append(f"# TYPE {name} {metric_type}")
+    for suffix, labels, value in samples:
+        lines.append(_format_sample(name + suffix, labels, _format_value(value)))
+
+
+def render_openmetrics(command, success, wall_time, finished_at=None):
+    """
+    Render the metrics of a run in the OpenMetrics text format.
+
+    Args:
+        command (str): CLI command that was run (added as the ``command`` label)
+        success (bool): Whether the command succeeded
+        wall_time (float): Total wall time of the command in seconds
+        finished_at (float, optional): Unix timestamp of the end of the run (default: now)
+
+    Returns:
+        str: OpenMetrics text, terminated by ``# EOF``
+    """
+    base = {'command': command}
+    lines = []
+    _family(lines, 'run_success', 'gauge', [('', base, bool(success))])
+    _family(lines, 'run_duration_seconds', 'gauge', [('', base, wall_time)])
+    _family(lines, 'run_timestamp_seconds', 'gauge', [('', base, finished_at if finished_at is not None else time.time())])
+
+    stages = metrics.get_stage_metrics()
+    for short_name, key in (('stage_duration_seconds', 'wall_time'), ('stage_cpu_seconds', 'cpu_time'),
+                            ('stage_calls', 'calls'), ('stage_peak_memory_bytes', 'peak_memory_bytes')):
+        samples = [('', dict(base, stage=stage), entry[key]) for stage, entry in sorted(stages.items())
+                   if entry[key] is not None]
+        if samples:
+            _family(lines, short_name, 'gauge', samples)
+
+    counters = {}
+    for counter in metrics.get_counters():
+        counters.setdefault(counter['name'], []).append(('', dict(base, **counter['labels']), counter['value']))
+    for name in sorted(counters):
+        _family(lines, name, 'gauge', counters[name])
+
+    observations = {}
+    for observation in metrics.get_observations():
+        labels = dict(base, **observation['labels'])
+        observations.setdefault(observation['name'], []).extend([
+            ('_count', labels, observation['count']),
+            ('_sum', labels, observation['sum'])
+        ])
+    for name in sorted(observations):
+        _family(lines, name, 'summary', observations[name])
+
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def write_openmetrics_file(file_path, command, success, wall_time):
+    """
+    Atomically write the metrics of a run to an OpenMetrics text file.
+
+    Args:
+        file_path (str): Destination path (use a ``.prom`` extension for node_exporter)
+        command (str): CLI command that was run
+        success (bool): Whether the command succeeded
+        wall_time (float): Total wall time of the command in seconds
+    """
+    content = render_openmetrics(command, success, wall_time)
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.pcm-metrics-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,203 @@
+"""
+Built-in profiling for pcm_cli commands (``--profile[=cpu|mem]``).
+
+The profiler wraps a whole CLI command and hooks into the pipeline stages
+marked with ``metrics.stage(name)``, so results are attributed to named spans
+(stats load, SQL generation, ...):
+
+- ``cpu``: cProfile. Writes a ``.pstats`` file for the whole command and a
+  text summary with the top functions overall and per span. While a span is
+  active its calls are recorded by a separate profiler for that span; the
+  ``.pstats`` file combines all of them.
+- ``mem``: tracemalloc. Writes a text summary with the top allocation sites of
+  the command and the net allocations made inside each span.
+
+Spans are only profiled on the thread that started the profiler, and nested
+spans are attributed to the outermost one.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.utils import metrics
+
+PROFILE_MODES = ('cpu', 'mem')
+DEFAULT_PROFILE_DIR = 'profiles'
+DEFAULT_TOP = 25
+TRACEMALLOC_FRAMES = 10
+
+
+class CommandProfiler:
+    """Profile a CLI command in cpu (cProfile) or mem (tracemalloc) mode."""
+
+    def __init__(self, mode, output_dir=DEFAULT_PROFILE_DIR, name='pcm', top=DEFAULT_TOP):
+        """
+        Args:
+            mode (str): 'cpu' or 'mem'
+            output_dir (str): Directory for the profile files
+            name (str): Base name of the profile files (a timestamp is appended)
+            top (int): Number of entries in the text summaries
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of: {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.name = f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        self.top = top
+        self._thread_id = None
+        self._depth = 0
+        self._profile = None
+        self._span_profiles = {}
+        self._span_allocations = {}
+        self._started_tracemalloc = False
+
+    def start(self):
+        """Start profiling and attach to pipeline stages."""
+        self._thread_id = threading.get_ident()
+        if self.mode == 'cpu':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._started_tracemalloc = True
+        metrics.add_stage_listener(self.span)
+
+    def stop(self):
+        """
+        Stop profiling and write the profile files.
+
+        Returns:
+            list: Paths of the files written
+        """
+        metrics.remove_stage_listener(self.span)
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.mode == 'cpu':
+            self._profile.disable()
+            return self._write_cpu_profile()
+
+        snapshot = self._take_snapshot()
+        traced_memory = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        return self._write_mem_profile(snapshot, traced_memory)
+
+    @contextmanager
+    def span(self, name):
+        """
+        Attribute the profile data collected inside the block to a named span.
+
+        Args:
+            name (str): Span name
+        """
+        if threading.get_ident() != self._thread_id:
+            yield
+            return
+        if self._depth:
+            # Nested spans are attributed to the outermost one
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+            return
+
+        self._depth = 1
+        try:
+            if self.mode == 'cpu':
+                span_profile = self._span_profiles.setdefault(name, cProfile.Profile())
+                self._profile.disable()
+                span_profile.enable()
+                try:
+                    yield
+                finally:
+                    span_profile.disable()
+                    self._profile.enable()
+            else:
+                before = self._take_snapshot()
+                try:
+                    yield
+                finally:
+                    self._record_allocations(name, before, self._take_snapshot())
+        finally:
+            self._depth = 0
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def _record_allocations(self, name, before, after):
+        allocations = self._span_allocations.setdefault(name, {})
+        for stat in after.compare_to(before, 'lineno'):
+            if not stat.size_diff:
+                continue
+            frame = stat.traceback[0]
+            key = f"{frame.filename}:{frame.lineno}"
+            size, count = allocations.get(key, (0, 0))
+            allocations[key] = (size + stat.size_diff, count + stat.count_diff)
+
+    def _write_cpu_profile(self):
+        stats = pstats.Stats(self._profile)
+        for span_profile in self._span_profiles.values():
+            stats.add(span_profile)
+        pstats_path = os.path.join(self.output_dir, f"{self.name}.pstats")
+        stats.dump_stats(pstats_path)
+
+        summary = io.StringIO()
+        summary.write(f"CPU profile: {pstats_path}\n\n")
+        summary.write(f"== Top {self.top} functions by cumulative time (whole command) ==\n")
+        pstats.Stats(pstats_path, stream=summary).sort_stats('cumulative').print_stats(self.top)
+        for name in sorted(self._span_profiles):
+            summary.write(f"\n== Span: {name} ==\n")
+            pstats.Stats(self._span_profiles[name], stream=summary).sort_stats('cumulative').print_stats(self.top)
+
+        summary_path = os.path.join(self.output_dir, f"{self.name}.cpu.txt")
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        return [pstats_path, summary_path]
+
+    def _write_mem_profile(self, snapshot, traced_memory):
+        current, peak = traced_memory
+        lines = [
+            f"Memory profile (tracemalloc, {TRACEMALLOC_FRAMES} frames)",
+            f"Traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB",
+            ""
+        ]
+        lines.append(f"== Top {self.top} allocation sites (live at end of command) ==")
+        for stat in snapshot.statistics('lineno')[:self.top]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}")
+
+        for name in sorted(self._span_allocations):
+            allocations = sorted(self._span_allocations[name].items(), key=lambda item: -abs(item[1][0]))
+            lines.append("")
+            lines.append(f"== Span: {name} (net allocations, top {self.top}) ==")
+            for site, (size, count) in allocations[:self.top]:
+                lines.append(f"{size / 1024:+10.1f} KiB {count:+8d} blocks  {site}")
+
+        summary_path = os.path.join(self.output_dir, f"{self.name}.mem.txt")
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        return [summary_path]
+
+
+def normalize_profile_argv(argv):
+    """
+    Turn a bare ``--profile`` into ``--profile=cpu`` so it cannot swallow the command name.
+
+    Args:
+        argv (list): Command-line arguments (without the program name)
+
+    Returns:
+        list: Normalized arguments
+    """
+    return ['--profile=cpu' if arg == '--profile' else arg for arg in argv]
@@ -0,0 +1,228 @@
+"""
+Cached, health-scored pool of HTTP proxies.
+
+Fetching the proxy list from proxyscrape costs a network round-trip, and most
+free proxies are dead or blocked, so the pool keeps what it learns in a state
+file (``PCM_PROXY_STATE_FILE``, default ``.cache/proxies.json``) across runs:
+
+- The fetched list is reused until it is ``PCM_PROXY_LIST_TTL`` seconds old
+  (default 600).
+- Every attempt through a proxy updates its success and failure counts and its
+  latency (exponentially weighted moving average). Proxies are tried best
+  score first: the smoothed success rate divided by ``1 + latency / 5 s``, so
+  an untried proxy (score 0.5) comes after fast proxies that proved to work
+  and before the ones that keep failing.
+- A circuit breaker skips a proxy after ``CIRCUIT_FAILURES`` consecutive
+  failures. It is tried again (half-open) once a cooldown has passed, which
+  doubles every time the circuit opens again (5 minutes up to 1 hour); one
+  success closes it.
+
+When fetches are recorded or replayed (``PCM_FETCH_MODE``, see
+utils/cassettes.py) the pool starts empty and is not persisted, so runs do not
+depend on the state left by earlier runs.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from src.utils import cassettes
+from src.utils import metrics
+from src.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_STATE_FILE = os.path.join('.cache', 'proxies.json')
+DEFAULT_LIST_TTL = 600
+CIRCUIT_FAILURES = 3
+CIRCUIT_COOLDOWN = 300
+MAX_CIRCUIT_COOLDOWN = 3600
+LATENCY_WEIGHT = 0.3
+LATENCY_SCALE = 5.0
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def proxy_key(proxy):
+    """'host:port' key of a proxy dict."""
+    return f"{proxy['host']}:{proxy['port']}"
+
+
+class ProxyPool:
+    """
+    Proxy list cache and per-proxy health (thread-safe).
+
+    Args:
+        state_file (str, optional): JSON file the list and health are kept in (None keeps them in memory only)
+        list_ttl (float): Seconds the fetched list is reused
+        clock (callable, optional): Wall clock in seconds (default: time.time)
+    """
+
+    def __init__(self, state_file=None, list_ttl=DEFAULT_LIST_TTL, clock=None):
+        self.state_file = state_file
+        self.list_ttl = list_ttl
+        self._clock = clock or time.time
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._state = {'fetched_at': None, 'proxies': [], 'health': {}}
+        if state_file and os.path.exists(state_file):
+            try:
+                with open(state_file, 'r', encoding='utf-8') as f:
+                    self._state.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️  Ignoring unreadable proxy state {state_file}: {e}")
+
+    def get_proxies(self, fetch):
+        """
+        Get the proxies to try, best first.
+
+        Args:
+            fetch (callable): Fetches a fresh proxy list (list of {'host', 'port'} dicts) when the cached one expired
+
+        Returns:
+            list: Proxy dicts whose circuit is not open, ordered by score
+        """
+        with self._lock:
+            fetched_at = self._state['fetched_at']
+            expired = fetched_at is None or self._clock() - fetched_at >= self.list_ttl
+        if expired:
+            proxies = fetch()
+            if proxies:
+                with self._lock:
+                    self._state['proxies'] = [{'host': proxy['host'], 'port': proxy['port']} for proxy in proxies]
+                    self._state['fetched_at'] = self._clock()
+                self.save()
+        with self._lock:
+            proxies = list(self._state['proxies'])
+        if not expired:
+            logger.info(f"🔄 Using cached proxy list ({len(proxies)} proxies)")
+        return self.rank(proxies)
+
+    def rank(self, proxies):
+        """
+        Order proxies by score, leaving out the ones whose circuit is open.
+
+        Args:
+            proxies (list): Proxy dicts
+
+        Returns:
+            list: Usable proxy dicts, best first (ties keep their order)
+        """
+        now = self._clock()
+        with self._lock:
+            usable = [proxy for proxy in proxies
+                      if self._health(proxy).get('open_until', 0) <= now]
+            skipped = len(proxies) - len(usable)
+            ranked = sorted(usable, key=lambda proxy: -self._score(self._health(proxy)))
+        if skipped:
+            logger.info(f"   - Skipping {skipped} proxies with an open circuit")
+        return ranked
+
+    def score(self, proxy):
+        """Score of a proxy: smoothed success rate / (1 + latency / LATENCY_SCALE)."""
+        with self._lock:
+            return self._score(self._health(proxy))
+
+    def is_open(self, proxy):
+        """Whether the circuit of a proxy is open (the proxy is skipped)."""
+        with self._lock:
+            return self._health(proxy).get('open_until', 0) > self._clock()
+
+    def record_success(self, proxy, latency):
+        """
+        Record a successful request through a proxy (closes its circuit).
+
+        Args:
+            proxy (dict): Proxy dict
+            latency (float): Seconds the request took
+        """
+        with self._lock:
+            health = self._state['health'].setdefault(proxy_key(proxy), {})
+            health['successes'] = health.get('successes', 0) + 1
+            previous = health.get('latency')
+            health['latency'] = round(latency if previous is None
+                                      else LATENCY_WEIGHT * latency + (1 - LATENCY_WEIGHT) * previous, 4)
+            health['consecutive_failures'] = 0
+            health.pop('open_until', None)
+            health.pop('trips', None)
+        self.save()
+
+    def record_failure(self, proxy):
+        """
+        Record a failed request through a proxy, opening its circuit after CIRCUIT_FAILURES failures in a row.
+
+        Args:
+            proxy (dict): Proxy dict
+        """
+        with self._lock:
+            health = self._state['health'].setdefault(proxy_key(proxy), {})
+            health['failures'] = health.get('failures', 0) + 1
+            health['consecutive_failures'] = health.get('consecutive_failures', 0) + 1
+            # A half-open proxy that fails again trips immediately
+            opened = (health['consecutive_failures'] >= CIRCUIT_FAILURES
+                      and health.get('open_until', 0) <= self._clock())
+            if opened:
+                health['trips'] = health.get('trips', 0) + 1
+                cooldown = min(CIRCUIT_COOLDOWN * 2 ** (health['trips'] - 1), MAX_CIRCUIT_COOLDOWN)
+                health['open_until'] = self._clock() + cooldown
+        if opened:
+            metrics.increment('proxy_circuits_opened')
+            logger.info(f"   - Proxy {proxy_key(proxy)} failed {health['consecutive_failures']} times in a row, "
+                        f"skipping it for {cooldown // 60:.0f} min")
+        self.save()
+
+    def save(self):
+        """Write the state file atomically (no-op for in-memory pools; errors are only logged)."""
+        if not self.state_file:
+            return
+        with self._save_lock:
+            self._write()
+
+    def _write(self):
+        # Serialized by _save_lock, so a snapshot never overwrites a newer one
+        with self._lock:
+            data = json.dumps(self._state, indent=2, sort_keys=True)
+        directory = os.path.dirname(self.state_file) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.pcm-proxies-', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(tmp_path, self.state_file)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"⚠️  Could not save proxy state {self.state_file}: {e}")
+
+    def _health(self, proxy):
+        return self._state['health'].get(proxy_key(proxy), {})
+
+    @staticmethod
+    def _score(health):
+        successes = health.get('successes', 0)
+        attempts = successes + health.get('failures', 0)
+        return (successes + 1) / (attempts + 2) / (1 + health.get('latency', 0) / LATENCY_SCALE)
+
+
+def get_proxy_pool():
+    """
+    Get the process-wide proxy pool backed by PCM_PROXY_STATE_FILE.
+
+    Returns:
+        ProxyPool: Shared pool, or a new in-memory pool when fetches are recorded or replayed
+    """
+    if cassettes.get_fetch_mode() != cassettes.MODE_LIVE:
+        return ProxyPool()
+    state_file = os.getenv('PCM_PROXY_STATE_FILE', DEFAULT_STATE_FILE)
+    with _pools_lock:
+        pool = _pools.get(state_file)
+        if pool is None:
+            pool = _pools[state_file] = ProxyPool(
+                state_file, list_ttl=float(os.getenv('PCM_PROXY_LIST_TTL', DEFAULT_LIST_TTL)))
+        return pool
@@ -0,0 +1,57 @@
+"""
+Per-host rate limiting for concurrent fetches.
+
+``TokenBucket`` allows short bursts: up to ``burst`` requests to a host go out
+at once, then ``rate`` requests per second, while requests to different hosts
+never wait on each other. A bucket of size 1 spaces the requests to a host
+``1 / rate`` seconds apart. It only reserves tokens (under a lock) and returns
+the delay, so asyncio callers can wait with ``asyncio.sleep``.
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+def get_host(url):
+    """Lower-case host of a URL, ignoring a leading 'www.' ('' when there is none)."""
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class TokenBucket:
+    """
+    Per-host token buckets (thread-safe).
+
+    Args:
+        rate (float): Tokens added per second (0 disables the limit)
+        burst (int): Bucket size, i.e. requests allowed at once after an idle period
+        clock (callable, optional): Monotonic clock in seconds (default: time.monotonic)
+    """
+
+    def __init__(self, rate, burst=1, clock=None):
+        self.rate = max(0.0, float(rate))
+        self.burst = max(1, int(burst))
+        self._clock = clock or time.monotonic
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def reserve(self, url):
+        """
+        Take a token for the URL's host; tokens taken from an empty bucket are owed and delay later requests.
+
+        Args:
+            url (str): URL about to be requested
+
+        Returns:
+            float: Seconds the caller must wait before sending the request
+        """
+        if not self.rate:
+            return 0.0
+        host = get_host(url)
+        with self._lock:
+            now = self._clock()
+            tokens, updated = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+            self._buckets[host] = (tokens, now)
+        return max(0.0, -tokens / self.rate)
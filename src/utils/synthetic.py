@@ -0,0 +1,153 @@
+"""
+Deterministic synthetic data for scale testing.
+
+Generates PCM-style cyclists (as ``DYN_cyclist`` rows of an ``init_cdb.sqlite``
+database) and change files from a seeded random generator, so the same
+arguments produce byte-identical namespaces on every machine. Namespace
+assembly (stats.yaml, tracking history) lives in ``api.generate_synthetic_namespace``.
+"""
+
+import random
+import sqlite3
+
+from src.utils import commons
+
+DEFAULT_SEED = 2025
+
+FIRST_NAMES = [
+    'Adam', 'Alberto', 'Alexis', 'Andrea', 'Anton', 'Arnaud', 'Ben', 'Bruno', 'Carlos', 'Christophe',
+    'Daniel', 'David', 'Diego', 'Egan', 'Elia', 'Enric', 'Fabio', 'Felix', 'Filippo', 'Florian',
+    'Geraint', 'Giulio', 'Guillaume', 'Hugo', 'Ion', 'Jakob', 'Jan', 'Jasper', 'Jonas', 'Jorge',
+    'Julian', 'Kasper', 'Lars', 'Lennard', 'Lorenzo', 'Lucas', 'Magnus', 'Marc', 'Mathieu', 'Matteo',
+    'Mikel', 'Nairo', 'Nils', 'Oier', 'Oliver', 'Pascal', 'Pavel', 'Peter', 'Primoz', 'Quentin',
+    'Rafal', 'Remco', 'Richard', 'Romain', 'Santiago', 'Sepp', 'Simon', 'Stefan', 'Tadej', 'Thibaut',
+    'Thomas', 'Tim', 'Tobias', 'Tom', 'Valentin', 'Vincenzo', 'Warren', 'Wout', 'Xandro', 'Yves'
+]
+
+LAST_NAMES = [
+    'Alaphilippe', 'Almeida', 'Bardet', 'Barguil', 'Bernal', 'Bettiol', 'Bilbao', 'Cavagna', 'Ciccone', 'Cort',
+    'Dainese', 'Dumoulin', 'Evenepoel', 'Fortunato', 'Froner', 'Ganna', 'Gaudu', 'Geoghegan', 'Girmay', 'Groves',
+    'Hayter', 'Healy', 'Hindley', 'Izagirre', 'Jorgenson', 'Kamna', 'Kooij', 'Kuss', 'Landa', 'Laporte',
+    'Madouas', 'Martinez', 'Matthews', 'Meeus', 'Milan', 'Mohoric', 'Narvaez', 'Nys', 'Onley', 'Pedersen',
+    'Philipsen', 'Pidcock', 'Pogacar', 'Powless', 'Quintana', 'Rodriguez', 'Roglic', 'Rota', 'Sagan', 'Schachmann',
+    'Simmons', 'Sivakov', 'Skjelmose', 'Soler', 'Stuyven', 'Tiberi', 'Uijtdebroeks', 'Valverde', 'Van Aert', 'Vauquelin',
+    'Vernon', 'Vingegaard', 'Vlasov', 'Wellens', 'Woods', 'Yates', 'Zana', 'Zimmermann', 'Zingle', 'Zwiehoff'
+]
+
+# Stat boosts per rider profile; unlisted stats use the base value only
+RIDER_PROFILES = {
+    'sprinter': {'spr': 14, 'acc': 12, 'fla': 10, 'cob': 4},
+    'climber': {'mo': 14, 'mm': 10, 'hil': 8, 'rec': 6},
+    'rouleur': {'fla': 12, 'cob': 12, 'tt': 6, 'end': 6},
+    'puncheur': {'hil': 14, 'mm': 8, 'acc': 6, 'att': 6},
+    'time_trialist': {'tt': 14, 'prl': 12, 'fla': 6, 'end': 4},
+    'allrounder': {'mo': 8, 'tt': 8, 'hil': 6, 'rec': 6, 'res': 6},
+    'baroudeur': {'att': 14, 'end': 10, 'res': 8, 'fla': 4}
+}
+
+MIN_STAT = 50
+MAX_STAT = 85
+
+
+def generate_cyclists(count, rng):
+    """
+    Generate PCM-style cyclist rows.
+
+    Args:
+        count (int): Number of cyclists
+        rng (random.Random): Seeded random generator
+
+    Returns:
+        list: Dicts with the DYN_cyclist columns, ordered by IDcyclist
+    """
+    pcm_ids = sorted(rng.sample(range(1, count * 3 + 1), count))
+    first_cycling_ids = rng.sample(range(10000, 10000 + count * 20), count)
+    profiles = sorted(RIDER_PROFILES)
+
+    cyclists = []
+    for pcm_id, first_cycling_id in zip(pcm_ids, first_cycling_ids):
+        boosts = RIDER_PROFILES[rng.choice(profiles)]
+        base = rng.randint(MIN_STAT, 66)
+        row = {
+            'IDcyclist': pcm_id,
+            'gene_sz_lastname': rng.choice(LAST_NAMES),
+            'gene_sz_firstname': rng.choice(FIRST_NAMES),
+            'gene_i_birthdate': int(f"{rng.randint(1985, 2006)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"),
+            'fkIDteam': rng.randint(1, 120),
+            # The importer reads the FirstCycling ID from this column; about 1 in 10 riders has none
+            'value_f_current_ability': first_cycling_id if rng.random() >= 0.1 else None
+        }
+        for stat_key in commons.STAT_KEYS:
+            value = base + boosts.get(stat_key, 0) + rng.randint(-3, 3)
+            row[commons.STAT_COLUMN_MAPPING[stat_key]] = max(MIN_STAT, min(MAX_STAT, value))
+        cyclists.append(row)
+    return cyclists
+
+
+def write_init_cdb(db_path, cyclists):
+    """
+    Write cyclist rows to a PCM-style database with a DYN_cyclist table.
+
+    Args:
+        db_path (str): Path of the SQLite database to create
+        cyclists (list): Rows from generate_cyclists
+    """
+    columns = ['IDcyclist', 'gene_sz_lastname', 'gene_sz_firstname', 'gene_i_birthdate', 'fkIDteam',
+               'value_f_current_ability'] + [commons.STAT_COLUMN_MAPPING[key] for key in commons.STAT_KEYS]
+    column_types = {'gene_sz_lastname': 'TEXT', 'gene_sz_firstname': 'TEXT', 'value_f_current_ability': 'REAL'}
+    column_sql = ', '.join(f"{column} {column_types.get(column, 'INTEGER')}" for column in columns)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(f"CREATE TABLE DYN_cyclist ({column_sql}, PRIMARY KEY (IDcyclist))")
+        conn.executemany(
+            f"INSERT INTO DYN_cyclist ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [tuple(row[column] for column in columns) for row in cyclists]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def generate_change_stats(stats_data, pcm_ids, stat_edits, rng):
+    """
+    Generate the stats list of one change file.
+
+    Picks random cyclists and nudges 1-3 of their stats by a few points until
+    ``stat_edits`` stat values have been set. ``stats_data`` is not modified.
+
+    Args:
+        stats_data (dict): Current stats keyed by PCM ID (as in stats.yaml)
+        pcm_ids (list): PCM IDs to choose from
+        stat_edits (int): Number of stat values to set
+        rng (random.Random): Seeded random generator
+
+    Returns:
+        list: Change file stat entries (pcm_id, name, optional first_cycling_id, stat values)
+    """
+    entries = []
+    edited = set()
+    remaining = stat_edits
+    while remaining > 0 and len(edited) < len(pcm_ids):
+        pcm_id = rng.choice(pcm_ids)
+        if pcm_id in edited:
+            continue
+        edited.add(pcm_id)
+
+        cyclist = stats_data[pcm_id]
+        current_stats = cyclist.get('stats', {})
+        entry = {'pcm_id': int(pcm_id), 'name': cyclist['name']}
+        if cyclist.get('first_cycling_id'):
+            entry['first_cycling_id'] = cyclist['first_cycling_id']
+        stat_keys = rng.sample(commons.STAT_KEYS, min(remaining, rng.randint(1, 3)))
+        for stat_key in stat_keys:
+            delta = rng.choice([-3, -2, -1, 1, 2, 3])
+            entry[stat_key] = max(MIN_STAT, min(MAX_STAT + 5, current_stats.get(stat_key, MIN_STAT) + delta))
+        remaining -= len(stat_keys)
+        entries.append(entry)
+    return entries
+
+
+def create_rng(seed=DEFAULT_SEED):
+    """Create the seeded random generator used for all synthetic data."""
+    return random.Random(seed)
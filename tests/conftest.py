@@ -0,0 +1,25 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+
+from src.utils import commons
+from src.utils import http_cache
+from src.utils import logs
+
+
+@pytest.fixture(autouse=True)
+def isolated_fetch_state(tmp_path, monkeypatch):
+    """Keep fetches out of the on-disk page cache (unless a test enables it), the proxy/strategy state files,
+    the change file cache, the shared session and the logging configuration of earlier tests."""
+    monkeypatch.setenv('PCM_HTTP_CACHE', '0')
+    monkeypatch.setenv('PCM_PROXY_STATE_FILE', str(tmp_path / 'proxies.json'))
+    monkeypatch.setenv('PCM_FETCH_STATS_FILE', str(tmp_path / 'fetch_strategies.json'))
+    monkeypatch.setenv('PCM_CHANGE_FILE_CACHE', str(tmp_path / 'change_files.json'))
+    http_cache.configure(None)
+    commons.reset_shared_session()
+    yield
+    http_cache.configure(None)
+    commons.reset_shared_session()
+    logs.reset_logging()
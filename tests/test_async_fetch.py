@@ -0,0 +1,142 @@
+"""
+Tests for the asyncio-driven fetch client (src/utils/async_fetch.py) and the pooled sessions it fetches with.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from src import api
+from src.utils import async_fetch, commons
+
+RACE_URLS = [f'https://firstcycling.com/race.php?r={race}&pcm=1' for race in range(5)]
+
+
+def tracking_fetch():
+    """Blocking fetch stand-in recording the peak number of fetches running at once per host."""
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+
+    def fetch(url):
+        host = url.split('/')[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.05)
+        with lock:
+            active[host] -= 1
+        return url.encode('utf-8'), True, None
+
+    return fetch, peak
+
+
+def test_fetches_are_limited_per_host():
+    fetch, peak = tracking_fetch()
+    urls = RACE_URLS + ['https://example.com/a', 'https://example.com/b']
+
+    async def run():
+        async with async_fetch.AsyncFetchClient(max_per_host=2, rate=0, fetch=fetch) as client:
+            return await client.fetch_all(urls)
+
+    results = asyncio.run(run())
+
+    assert results == [(url.encode('utf-8'), True, None) for url in urls]
+    assert peak == {'firstcycling.com': 2, 'example.com': 2}
+
+
+def test_fetches_wait_for_tokens():
+    fetch, _ = tracking_fetch()
+    waits = []
+
+    async def fake_pause(seconds):
+        waits.append(seconds)
+
+    async def run():
+        async with async_fetch.AsyncFetchClient(max_per_host=5, rate=0.5, burst=2, fetch=fetch,
+                                                clock=lambda: 100.0) as client:
+            return await client.fetch_all(RACE_URLS[:4])
+
+    with patch('src.utils.async_fetch.pause', side_effect=fake_pause):
+        asyncio.run(run())
+
+    assert sorted(waits) == [2.0, 4.0]
+
+
+@patch('requests.Session')
+def test_shared_session_visits_the_homepage_once(mock_session_class):
+    session = mock_session_class.return_value
+    session.get.return_value = MagicMock(status_code=200, content=b'<html>race</html>')
+
+    with patch('src.utils.cassettes.time.sleep'):
+        for url in RACE_URLS[:3]:
+            assert async_fetch.fetch_page(url) == (b'<html>race</html>', True, None)
+
+    assert mock_session_class.call_count == 1
+    assert [call.args[0] for call in session.get.call_args_list] == ['https://firstcycling.com/'] + RACE_URLS[:3]
+    assert 'br' not in session.get.call_args.kwargs['headers']['Accept-Encoding']
+    assert commons.get_shared_session() is session
+
+
+def in_thread(function):
+    """Run function in a new thread and return its result."""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(function()))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def test_each_thread_gets_its_own_session_on_one_pool():
+    session = commons.get_shared_session()
+    other_session = in_thread(commons.get_shared_session)
+
+    assert other_session is not session
+    assert other_session.get_adapter('https://firstcycling.com/') is session.get_adapter('https://firstcycling.com/')
+    assert commons.get_shared_session() is session
+
+    commons.reset_shared_session()
+    assert commons.get_shared_session() is not session
+
+
+@patch('requests.Session')
+def test_homepage_cookies_are_shared_with_other_threads(mock_session_class):
+    sessions = []
+
+    def new_session():
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200, content=b'<html>race</html>')
+        sessions.append(session)
+        return session
+
+    mock_session_class.side_effect = new_session
+
+    with patch('src.utils.cassettes.time.sleep'):
+        async_fetch.fetch_page(RACE_URLS[0])
+        in_thread(lambda: async_fetch.fetch_page(RACE_URLS[1]))
+
+    first, second = sessions
+    assert [call.args[0] for call in first.get.call_args_list] == ['https://firstcycling.com/', RACE_URLS[0]]
+    assert [call.args[0] for call in second.get.call_args_list] == [RACE_URLS[1]]
+    second.cookies.update.assert_called_once_with(first.cookies.copy.return_value)
+
+
+@patch('src.api.parse_firstcycling_html')
+@patch('src.api.fetch_firstcycling_html')
+def test_scrape_many_race_pages_concurrently(mock_fetch, mock_parse):
+    mock_fetch.side_effect = lambda url: (url.encode('utf-8'), True, None)
+    mock_parse.side_effect = lambda html: ([{'name': html.decode('utf-8')}], True, None)
+
+    async def run():
+        async with async_fetch.AsyncFetchClient(rate=0) as client:
+            return await asyncio.gather(*(api.scrape_firstcycling_cyclists_async(url, client) for url in RACE_URLS))
+
+    results = asyncio.run(run())
+
+    assert results == [([{'name': url}], True, None) for url in RACE_URLS]
+
+
+@patch('src.api.fetch_firstcycling_html', return_value=(None, False, 'Access denied (403)'))
+def test_scrape_async_fetch_failure(_):
+    assert asyncio.run(api.scrape_firstcycling_cyclists_async(RACE_URLS[0])) == ([], False, 'Access denied (403)')
@@ -10,7 +10,10 @@ from src.api import (
     parse_firstcycling_html,
     scrape_firstcycling_cyclists,
     create_automated_change_file,
-    process_automated_change_request
+    merge_scraped_cyclists,
+    scrape_firstcycling_races,
+    process_automated_change_request,
+    process_automated_change_batch
 )
 
 
@@ -507,6 +510,76 @@ test
         assert matched_cyclist['stats']['fla'] == 85
         assert matched_cyclist['stats']['mo'] == 70
 
+    @patch('src.api.commons.get_path')
+    @patch('os.path.exists')
+    @patch('os.makedirs')
+    @patch('builtins.open', new_callable=mock_open)
+    @patch('yaml.safe_load')
+    @patch('yaml.dump')
+    def test_create_automated_change_file_stat_deltas(self, mock_yaml_dump, mock_yaml_load, mock_file, mock_makedirs, mock_exists, mock_get_path):
+        """Test that scraped stats that differ from the stats file become top-level stat changes."""
+        mock_get_path.side_effect = lambda ns, path_type: {
+            'changes_dir': '/test/changes',
+            'stats_file': '/test/stats.yaml'
+        }[path_type]
+        mock_exists.return_value = True
+        mock_yaml_load.return_value = {
+            '12345': {
+                'name': 'Lamperti Luke',
+                'first_cycling_id': 98765,
+                'stats': {'fla': 85, 'mo': 70, 'tt': 75}
+            }
+        }
+        form_data = {'author': 'Test Author', 'date': '2025-08-06', 'race_url': 'https://firstcycling.com/race.php?r=123&pcm=1'}
+        scraped_cyclists = [
+            {'name': 'Lamperti Luke', 'first_cycling_id': 98765, 'stats': {'fla': 86, 'mo': 70, 'spr': 60}}
+        ]
+        
+        file_path, success, error = create_automated_change_file('test_namespace', 'test-change', form_data, scraped_cyclists)
+        
+        assert success is True
+        matched_cyclist = mock_yaml_dump.call_args[0][0]['stats'][0]
+        # Only changed values are written; the current stats stay as a reference
+        assert matched_cyclist['fla'] == 86
+        assert matched_cyclist['spr'] == 60
+        assert 'mo' not in matched_cyclist
+        assert matched_cyclist['stats'] == {'fla': 85, 'mo': 70, 'tt': 75}
+
+    def test_automated_change_file_with_stat_deltas_is_processed(self):
+        """Test that a change file created from scraped stats updates the stats file when processed."""
+        from src.api import create_new_database, process_new_change_files
+        from src.utils import commons
+        
+        test_data_dir = tempfile.mkdtemp(prefix="pcm_test_")
+        original_data_path = commons.DATA_PATH
+        original_model_dir_path = commons.MODEL_DIR_PATH
+        commons.DATA_PATH = test_data_dir
+        commons.MODEL_DIR_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'model')
+        try:
+            namespace = 'delta_namespace'
+            os.makedirs(commons.get_path(namespace, 'changes_dir'))
+            with open(commons.get_path(namespace, 'stats_file'), 'w', encoding='utf-8') as f:
+                yaml.dump({'12345': {'name': 'Lamperti Luke', 'first_cycling_id': 93695,
+                                     'stats': {'fla': 70, 'mo': 60}}}, f, sort_keys=False)
+            create_new_database(namespace, 'tracking')
+            
+            cyclists, _, _ = parse_firstcycling_html(
+                '<table><tr><th>Rider</th><th title="FLAT | Power">FLA</th><th title="MOUNTAIN | Power">MTN</th></tr>'
+                '<tr><td><a href="rider.php?r=93695" title="Luke Lamperti">x</a></td><td>73</td><td>60</td></tr></table>')
+            form_data = {'author': 'Test Author', 'date': '2025-08-06', 'race_url': 'https://firstcycling.com/race.php?r=1&pcm=1'}
+            _, success, _ = create_automated_change_file(namespace, 'race-change', form_data, cyclists)
+            assert success is True
+            
+            summary = process_new_change_files(namespace)
+            
+            assert summary['new_changes'] == 1
+            with open(commons.get_path(namespace, 'stats_file'), 'r', encoding='utf-8') as f:
+                assert yaml.safe_load(f)['12345']['stats'] == {'fla': 73, 'mo': 60}
+        finally:
+            commons.DATA_PATH = original_data_path
+            commons.MODEL_DIR_PATH = original_model_dir_path
+            shutil.rmtree(test_data_dir)
+
     @patch('src.api.commons.get_path')
     @patch('os.makedirs')
     def test_create_automated_change_file_directory_error(self, mock_makedirs, mock_get_path):
@@ -656,5 +729,175 @@ test_namespace
             assert result['success'] is True
             assert 'pcm=1' in result['form_data']['race_url']
 
+    def test_parse_github_issue_form_multiple_race_urls(self):
+        """Test that the Race URLs field accepts one URL per line."""
+        issue_body = '''### Author
+Test Author
+
+### Race URLs
+https://firstcycling.com/race.php?r=17&e=1
+firstcycling.com/race.php?r=17&e=2, https://firstcycling.com/race.php?r=17&e=3
+
+### Namespace
+test_namespace
+'''
+        result = parse_github_issue_form(issue_body)
+        
+        assert result['race_urls'] == ['https://firstcycling.com/race.php?r=17&e=1',
+                                       'firstcycling.com/race.php?r=17&e=2',
+                                       'https://firstcycling.com/race.php?r=17&e=3']
+        assert result['race_url'] == 'https://firstcycling.com/race.php?r=17&e=1'
+
+    def test_merge_scraped_cyclists(self):
+        """Test that riders on several pages are merged by first_cycling_id, keeping the first occurrence."""
+        stage_1 = [{'name': 'Doe John', 'first_cycling_id': 1, 'table_row_number': 1},
+                   {'name': 'Smith Jane', 'first_cycling_id': 2, 'table_row_number': 2, 'stats': {'fla': 70}}]
+        stage_2 = [{'name': 'Smith Jane', 'first_cycling_id': 2, 'table_row_number': 1, 'stats': {'fla': 71, 'mo': 60}},
+                   {'name': 'Doe John', 'first_cycling_id': 1, 'table_row_number': 2, 'stats': {'spr': 80}},
+                   {'name': 'New Rider', 'first_cycling_id': 3, 'table_row_number': 3}]
+        
+        merged = merge_scraped_cyclists([stage_1, stage_2])
+        
+        assert [cyclist['first_cycling_id'] for cyclist in merged] == [1, 2, 3]
+        assert merged[0] == {'name': 'Doe John', 'first_cycling_id': 1, 'table_row_number': 1, 'stats': {'spr': 80}}
+        assert merged[1]['stats'] == {'fla': 70, 'mo': 60}
+        assert 'stats' not in stage_1[0]
+
+    def test_scrape_firstcycling_races_concurrently(self):
+        """Test that race pages are scraped in parallel and merged in URL order."""
+        import threading
+        import time
+        
+        urls = [f'https://firstcycling.com/race.php?r={race}&pcm=1' for race in range(4)]
+        active = []
+        peak = []
+        lock = threading.Lock()
+        
+        def fake_scrape(race_url):
+            with lock:
+                active.append(race_url)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(race_url)
+            race = int(race_url.split('r=')[1].split('&')[0])
+            # Every page lists its own rider and rider 100
+            return [{'name': f'Rider {race}', 'first_cycling_id': race + 1},
+                    {'name': 'Shared Rider', 'first_cycling_id': 100}], True, None
+        
+        with patch('src.api.scrape_firstcycling_cyclists', side_effect=fake_scrape):
+            cyclists, success, error = scrape_firstcycling_races(urls, max_workers=3, min_interval=0)
+        
+        assert success is True
+        assert error is None
+        assert max(peak) == 3
+        assert [cyclist['first_cycling_id'] for cyclist in cyclists] == [1, 100, 2, 3, 4]
+
+    def test_scrape_firstcycling_races_rate_limits_per_host(self):
+        """Test that requests to the same host wait for the rate limiter."""
+        urls = [f'https://firstcycling.com/race.php?r={race}&pcm=1' for race in range(3)]
+        
+        waits = []
+        
+        async def fake_pause(seconds):
+            waits.append(seconds)
+        
+        with patch('src.api.scrape_firstcycling_cyclists', return_value=([], True, None)), \
+             patch('src.utils.async_fetch.pause', side_effect=fake_pause):
+            scrape_firstcycling_races(urls, max_workers=3, min_interval=2.0)
+        
+        assert sorted(round(seconds) for seconds in waits) == [2, 4]
+
+    def test_scrape_firstcycling_races_failure(self):
+        """Test that a failed page fails the whole scrape with the page's error."""
+        urls = ['https://firstcycling.com/race.php?r=1&pcm=1', 'https://firstcycling.com/race.php?r=2&pcm=1']
+        results = {urls[0]: ([{'name': 'A B', 'first_cycling_id': 1}], True, None),
+                   urls[1]: ([], False, 'Access denied (403)')}
+        
+        with patch('src.api.scrape_firstcycling_cyclists', side_effect=results.get):
+            cyclists, success, error = scrape_firstcycling_races(urls, min_interval=0)
+        
+        assert success is False
+        assert cyclists == []
+        assert 'r=2&pcm=1: Access denied (403)' in error
+
+    def test_process_automated_change_request_multiple_race_urls(self):
+        """Test that several race URLs are normalized, deduplicated and merged into one change file."""
+        issue_body = '''### Author
+Test Author
+
+### Race URLs
+firstcycling.com/race.php?r=17&e=1
+https://firstcycling.com/race.php?r=17&e=2&pcm=1
+https://firstcycling.com/race.php?r=17&e=1&pcm=1
+
+### Namespace
+test_namespace
+'''
+        with patch('src.api.scrape_firstcycling_races') as mock_scrape, \
+             patch('src.api.create_automated_change_file') as mock_create:
+            mock_scrape.return_value = (self.expected_cyclists, True, None)
+            mock_create.return_value = ('/test/change.yaml', True, None)
+            
+            result = process_automated_change_request(issue_body, issue_title='[STATS CR] Stages', max_workers=2)
+        
+        assert result['success'] is True
+        assert result['cyclists_found'] == 2
+        expected_urls = ['https://firstcycling.com/race.php?r=17&e=1&pcm=1',
+                         'https://firstcycling.com/race.php?r=17&e=2&pcm=1']
+        mock_scrape.assert_called_once_with(expected_urls, 2)
+        assert result['form_data']['race_urls'] == expected_urls
+        assert result['form_data']['race_url'] == expected_urls[0]
+
+    def test_process_automated_change_request_race_urls_override(self):
+        """Test that race URLs passed in replace the issue form URL."""
+        with patch('src.api.scrape_firstcycling_cyclists') as mock_scrape, \
+             patch('src.api.create_automated_change_file') as mock_create:
+            mock_scrape.return_value = ([], True, None)
+            mock_create.return_value = ('/test/change.yaml', True, None)
+            
+            result = process_automated_change_request(
+                self.sample_issue_body, race_urls=['https://firstcycling.com/race.php?r=99'])
+        
+        assert result['success'] is True
+        mock_scrape.assert_called_once_with('https://firstcycling.com/race.php?r=99&pcm=1')
+
+    def test_process_automated_change_batch(self):
+        """Test that a JSON-lines batch yields one result per issue and loads each namespace's stats once."""
+        import json
+        
+        def issue(namespace, race):
+            body = (f"### Author\nTest Author\n\n### Race URL\nhttps://firstcycling.com/race.php?r={race}\n\n"
+                    f"### Namespace\n{namespace}\n")
+            return json.dumps({'body': body, 'title': f'[STATS CR] Race {race}', 'actor': 'octocat'})
+        
+        lines = [issue('ns_a', 1), '', 'not json', issue('ns_b', 2), issue('ns_a', 3), json.dumps({'title': 'No body'})]
+        
+        with patch('src.api.scrape_firstcycling_cyclists', return_value=(self.expected_cyclists, True, None)), \
+             patch('src.api.load_first_cycling_index', side_effect=lambda namespace: {'index': namespace}) as mock_load, \
+             patch('src.api.create_automated_change_file', return_value=('/test/change.yaml', True, None)) as mock_create:
+            results = list(process_automated_change_batch(lines))
+        
+        assert [(result['line'], result['success']) for result in results] == [
+            (1, True), (3, False), (4, True), (5, True), (6, False)]
+        assert results[0]['title'] == '[STATS CR] Race 1'
+        assert results[0]['form_data']['author'] == 'Test Author'
+        assert 'Invalid issue on line 3' in results[1]['error']
+        assert "expected a JSON object with an issue 'body'" in results[4]['error']
+        assert [call.args[0] for call in mock_load.call_args_list] == ['ns_a', 'ns_b']
+        assert [call.kwargs['first_cycling_index'] for call in mock_create.call_args_list] == [
+            {'index': 'ns_a'}, {'index': 'ns_b'}, {'index': 'ns_a'}]
+
+    def test_process_automated_change_batch_deadline(self):
+        """Test that issues not started before the batch deadline fail without being processed."""
+        import json
+        
+        with patch('src.api.process_automated_change_request') as mock_process:
+            results = list(process_automated_change_batch([json.dumps({'body': self.sample_issue_body})], deadline=0))
+        
+        assert results[0]['success'] is False
+        assert results[0]['error'] == 'Deadline exceeded (0s) before processing the issue on line 1'
+        mock_process.assert_not_called()
+
 if __name__ == '__main__':
     pytest.main([__file__])
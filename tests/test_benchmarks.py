@@ -0,0 +1,135 @@
+"""
+Tests for the benchmark harness and a smoke run of the pipeline suite (benchmarks/).
+"""
+
+import filecmp
+import os
+
+from benchmarks import bench_parser, bench_pipeline, harness
+from benchmarks.fixtures import generate_firstcycling_pages
+from src.utils import commons
+
+
+def _results(**cases):
+    return {'cases': cases}
+
+
+class TestHarness:
+    """Test cases for measurement and baseline comparison."""
+
+    def test_measure_runs_setup_before_every_run(self):
+        calls = []
+
+        result = harness.measure(lambda state: calls.append(state), setup=lambda: len(calls), repeat=2)
+
+        assert calls == [0, 1, 2]
+        assert result['repeat'] == 2
+        assert result['wall_time_min'] <= result['wall_time_median']
+
+    def test_measure_reports_peak_memory(self):
+        result = harness.measure(lambda _: [bytes(1024) for _ in range(2000)], repeat=1)
+
+        assert result['peak_memory_bytes'] > 1024 * 2000
+
+    def test_regression_beyond_tolerance_fails(self):
+        baseline = _results(case={'wall_time_min': 1.0, 'peak_memory_bytes': 1000})
+        current = _results(case={'wall_time_min': 1.3, 'peak_memory_bytes': 1100})
+
+        comparison = harness.compare_to_baseline(current, baseline, tolerance=0.25)
+
+        assert [(entry['case'], entry['metric']) for entry in comparison['regressions']] == [('case', 'wall_time_min')]
+        assert harness.report_comparison(comparison, 0.25) is False
+
+    def test_improvements_new_cases_and_noise(self):
+        baseline = _results(fast={'wall_time_min': 0.001, 'peak_memory_bytes': 0},
+                            slow={'wall_time_min': 2.0, 'peak_memory_bytes': 1000})
+        current = _results(fast={'wall_time_min': 0.004, 'peak_memory_bytes': 0},
+                           slow={'wall_time_min': 1.0, 'peak_memory_bytes': 1000},
+                           added={'wall_time_min': 1.0, 'peak_memory_bytes': 1000})
+
+        comparison = harness.compare_to_baseline(current, baseline, tolerance=0.25)
+
+        assert comparison['regressions'] == []
+        assert comparison['new_cases'] == ['added']
+        assert [entry['case'] for entry in comparison['improvements']] == ['slow']
+
+    def test_baseline_timings_are_scaled_to_this_machine(self):
+        baseline = dict(_results(case={'wall_time_min': 1.0, 'peak_memory_bytes': 1000}), calibration_seconds=0.1)
+        current = dict(_results(case={'wall_time_min': 1.6, 'peak_memory_bytes': 1000}), calibration_seconds=0.15)
+
+        comparison = harness.compare_to_baseline(current, baseline, tolerance=0.25)
+
+        assert comparison['machine_scale'] == 1.5
+        assert comparison['regressions'] == []
+
+        current['cases']['case']['wall_time_min'] = 2.0
+        regressions = harness.compare_to_baseline(current, baseline, tolerance=0.25)['regressions']
+        assert [(entry['baseline'], entry['current']) for entry in regressions] == [(1.5, 2.0)]
+
+    def test_calibrate(self):
+        assert harness.calibrate(repeat=1) > 0
+
+    def test_results_round_trip(self, tmp_path):
+        path = str(tmp_path / 'results' / 'pipeline.json')
+        results = harness.build_results('pipeline', {'case': {'wall_time_min': 1.0}})
+
+        harness.write_results(path, results)
+
+        assert harness.load_results(path) == results
+        assert harness.load_results(str(tmp_path / 'missing.json')) is None
+
+
+class TestPipelineSuite:
+    """Smoke test of the pipeline benchmarks on a tiny namespace."""
+
+    def test_sizes(self):
+        assert bench_pipeline.parse_size('10k') == 10000
+        assert bench_pipeline.parse_size('2500') == 2500
+        assert bench_pipeline.size_label(100000) == '100k'
+
+    def test_run_suite(self):
+        original_data_path = commons.DATA_PATH
+
+        results = bench_pipeline.run_suite([40], repeat=1)
+
+        assert commons.DATA_PATH == original_data_path
+        assert sorted(results['cases']) == sorted(f"{name}[40]" for name in (
+            'import_cyclists_from_db', 'process_new_change_files', 'process_uat_namespace',
+            'export_tracking_data', 'validate_yaml_files', 'create_automated_change_file',
+            'process_automated_change_request'))
+        assert all(case['wall_time_min'] > 0 for case in results['cases'].values())
+
+    def test_main_fails_on_regression(self, tmp_path):
+        baseline_path = str(tmp_path / 'baseline.json')
+        harness.write_results(baseline_path, harness.build_results('pipeline', {
+            'export_tracking_data[40]': {'wall_time_min': 1e-9, 'peak_memory_bytes': 1}
+        }))
+        argv = ['--sizes', '40', '--repeat', '1', '--case', 'export_tracking_data',
+                '--output', str(tmp_path / 'results.json'), '--baseline', baseline_path]
+
+        assert bench_pipeline.main(argv) == 1
+        assert os.path.exists(str(tmp_path / 'results.json'))
+
+
+class TestParserSuite:
+    """Test cases for the FirstCycling parser fixtures and benchmark."""
+
+    def test_fixtures_are_reproducible(self, tmp_path):
+        rider_counts = generate_firstcycling_pages.generate_pages(str(tmp_path))
+
+        fixtures_dir = generate_firstcycling_pages.FIXTURES_DIR
+        names = [f"{page}.html" for page in rider_counts]
+        _, mismatch, errors = filecmp.cmpfiles(fixtures_dir, str(tmp_path), names, shallow=False)
+        assert mismatch == [] and errors == []
+        assert all(150 <= count <= 200 for count in rider_counts.values())
+
+    def test_run_suite_parses_every_rider(self, tmp_path):
+        rider_counts = generate_firstcycling_pages.generate_pages(str(tmp_path))
+
+        results = bench_parser.run_suite(repeat=1, cases=['grand_tour_gc', 'one_day_startlist'],
+                                         fixtures_dir=str(tmp_path))
+
+        assert sorted(results['cases']) == ['parse_firstcycling_html[grand_tour_gc]',
+                                            'parse_firstcycling_html[one_day_startlist]']
+        assert results['cases']['parse_firstcycling_html[grand_tour_gc]']['riders'] == rider_counts['grand_tour_gc']
+        assert results['cases']['parse_firstcycling_html[one_day_startlist]']['peak_memory_bytes'] > 0
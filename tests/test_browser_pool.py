@@ -0,0 +1,334 @@
+"""
+Tests for the reusable Selenium browser pool (src/utils/browser_pool.py).
+"""
+
+import http.server
+import os
+import shutil
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import browser_pool, commons, firstcycling
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'benchmarks', 'fixtures', 'firstcycling')
+
+
+class FakeDriver:
+    """Stand-in for a Selenium WebDriver."""
+
+    def __init__(self):
+        self.visited = []
+        self.quit_calls = 0
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class FakeFactory:
+    def __init__(self):
+        self.drivers = []
+        self.warmed = []
+
+    def create(self):
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return driver
+
+    def warm_up(self, driver):
+        self.warmed.append(driver)
+
+
+def create_pool(size=2):
+    factory = FakeFactory()
+    return browser_pool.BrowserPool(size=size, driver_factory=factory.create, warm_up=factory.warm_up), factory
+
+
+def test_drivers_are_started_lazily_and_reused():
+    pool, factory = create_pool()
+    assert factory.drivers == []
+
+    for race in range(3):
+        with pool.driver() as driver:
+            driver.get(f'https://firstcycling.com/race.php?r={race}')
+
+    assert len(factory.drivers) == 1
+    assert factory.warmed == factory.drivers
+    assert len(factory.drivers[0].visited) == 3
+    assert pool.started == 1
+
+
+def test_pool_size_bounds_concurrent_drivers():
+    pool, factory = create_pool(size=2)
+    in_use = []
+    peak = []
+    lock = threading.Lock()
+
+    def fetch():
+        with pool.driver() as driver:
+            with lock:
+                in_use.append(driver)
+                peak.append(len(in_use))
+            time.sleep(0.02)
+            with lock:
+                in_use.remove(driver)
+
+    threads = [threading.Thread(target=fetch) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(factory.drivers) == 2
+    assert max(peak) == 2
+
+
+def test_failed_driver_is_replaced():
+    pool, factory = create_pool()
+
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            raise RuntimeError("page crashed")
+    with pool.driver():
+        pass
+
+    assert len(factory.drivers) == 2
+    assert factory.drivers[0].quit_calls == 1
+    assert pool.started == 1
+
+
+def test_failed_warm_up_frees_the_slot():
+    factory = FakeFactory()
+
+    def broken_warm_up(driver):
+        raise RuntimeError("homepage down")
+
+    pool = browser_pool.BrowserPool(size=1, driver_factory=factory.create, warm_up=broken_warm_up)
+
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            pass
+
+    assert pool.started == 0
+    assert factory.drivers[0].quit_calls == 1
+
+
+def test_waiting_for_a_driver_times_out():
+    pool, _ = create_pool(size=1)
+
+    with pool.driver():
+        with pytest.raises(TimeoutError, match='No browser session became free within 0s'):
+            with pool.driver(timeout=0.05):
+                pass
+
+    with pool.driver(timeout=0.05):
+        pass
+
+
+def test_shutdown_quits_all_drivers():
+    pool, factory = create_pool()
+    with pool.driver():
+        with pool.driver():
+            pass
+
+    pool.shutdown()
+
+    assert [driver.quit_calls for driver in factory.drivers] == [1, 1]
+    assert pool.started == 0
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            pass
+
+
+def test_shared_pool_is_recreated_after_shutdown():
+    pool = browser_pool.get_browser_pool(headless=True)
+    assert browser_pool.get_browser_pool(headless=True) is pool
+
+    browser_pool.shutdown_browser_pools()
+
+    assert browser_pool.get_browser_pool(headless=True) is not pool
+    browser_pool.shutdown_browser_pools()
+
+
+def test_pool_size_from_environment():
+    with patch.dict('os.environ', {'PCM_BROWSER_POOL_SIZE': '3'}):
+        assert browser_pool.BrowserPool().size == 3
+    with patch.dict('os.environ', {'PCM_BROWSER_POOL_SIZE': 'many'}):
+        assert browser_pool.BrowserPool().size == browser_pool.DEFAULT_POOL_SIZE
+
+
+def test_fetch_with_selenium_reuses_the_pooled_session():
+    pytest.importorskip('selenium')
+    factory = FakeFactory()
+    pool = browser_pool.BrowserPool(size=1, driver_factory=factory.create, warm_up=factory.warm_up)
+
+    with patch('src.utils.browser_pool.get_browser_pool', return_value=pool), \
+            patch.object(FakeDriver, 'page_source', '<html><body>race</body></html>', create=True), \
+            patch.object(FakeDriver, 'find_element', lambda self, *args: object(), create=True):
+        results = [commons.fetch_with_selenium(f'https://firstcycling.com/race.php?r={race}&pcm=1')
+                   for race in range(2)]
+
+    assert results == [(b'<html><body>race</body></html>', True, None)] * 2
+    assert len(factory.drivers) == 1
+    assert len(factory.warmed) == 1
+
+
+def test_light_profile_chrome_options():
+    pytest.importorskip('selenium')
+
+    options = browser_pool.build_chrome_options(headless=True, profile=browser_pool.get_fetch_profile('light'))
+
+    assert options.page_load_strategy == 'eager'
+    assert '--blink-settings=imagesEnabled=false' in options.arguments
+    assert ('--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE firstcycling.com, EXCLUDE *.firstcycling.com, '
+            'EXCLUDE localhost') in options.arguments
+    assert options.experimental_options['prefs'] == {'profile.managed_default_content_settings.images': 2}
+
+
+def test_full_profile_chrome_options():
+    pytest.importorskip('selenium')
+
+    options = browser_pool.build_chrome_options(headless=False, profile=browser_pool.get_fetch_profile('full'))
+
+    assert options.page_load_strategy == 'normal'
+    assert '--headless' not in options.arguments
+    assert not [argument for argument in options.arguments
+                if argument.startswith(('--blink-settings', '--host-resolver-rules'))]
+
+
+def test_fetch_profile_selection():
+    assert browser_pool.get_fetch_profile()['name'] == 'light'
+    with patch.dict('os.environ', {'PCM_FETCH_PROFILE': 'full'}):
+        assert browser_pool.get_fetch_profile()['wait_selector'] == 'body'
+    with pytest.raises(ValueError):
+        browser_pool.get_fetch_profile('tiny')
+
+
+def test_shared_pools_are_kept_per_profile():
+    light = browser_pool.get_browser_pool(profile=browser_pool.get_fetch_profile('light'))
+    full = browser_pool.get_browser_pool(profile=browser_pool.get_fetch_profile('full'))
+
+    assert light is not full
+    assert full.profile['page_load_strategy'] == 'normal'
+    browser_pool.shutdown_browser_pools()
+
+
+class SelectorDriver(FakeDriver):
+    """Fake driver whose page only contains the given tag."""
+
+    def __init__(self, tag):
+        super().__init__()
+        self.tag = tag
+        self.page_source = f'<html><body><{tag}></{tag}></body></html>'
+        self.lookups = []
+
+    def find_element(self, by, value):
+        from selenium.common.exceptions import NoSuchElementException
+        self.lookups.append((by, value))
+        if value not in (self.tag, 'body'):
+            raise NoSuchElementException(value)
+        return object()
+
+
+def test_light_fetch_waits_for_the_results_table():
+    pytest.importorskip('selenium')
+    driver = SelectorDriver('table')
+    pool = browser_pool.BrowserPool(size=1, driver_factory=lambda: driver, warm_up=lambda d: None)
+
+    with patch('src.utils.browser_pool.get_browser_pool', return_value=pool):
+        content, success, _ = commons.fetch_with_selenium('https://firstcycling.com/race.php?r=1&pcm=1',
+                                                          profile='light')
+
+    assert success is True
+    assert content == b'<html><body><table></table></body></html>'
+    assert driver.lookups == [('css selector', 'table')]
+
+
+def test_light_fetch_returns_pages_without_a_table():
+    pytest.importorskip('selenium')
+    driver = SelectorDriver('div')
+    pool = browser_pool.BrowserPool(size=1, driver_factory=lambda: driver, warm_up=lambda d: None)
+
+    with patch('src.utils.browser_pool.get_browser_pool', return_value=pool):
+        content, success, _ = commons.fetch_with_selenium('https://firstcycling.com/race.php?r=1&pcm=1',
+                                                          timeout=0.1, profile='light')
+
+    assert success is True
+    assert b'<div>' in content
+
+
+def _chrome_available():
+    return any(shutil.which(name) for name in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'))
+
+
+class RecordingHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves the race page fixtures plus stand-in assets, recording every requested path."""
+
+    requested = []
+
+    def do_GET(self):
+        self.requested.append(self.path)
+        if self.path.startswith('/race.php'):
+            body = _read_fixture('grand_tour_gc.html').replace(
+                '</head>', '<img src="/logo.png"><link rel="stylesheet" href="/fonts.css"></head>').encode('utf-8')
+            content_type = 'text/html; charset=utf-8'
+        elif self.path.startswith('/js/'):
+            body, content_type = b'', 'application/javascript'
+        else:
+            body, content_type = b'', 'text/css' if '.css' in self.path else 'image/png'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture
+def stand_in_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), RecordingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    RecordingHandler.requested = []
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(not _chrome_available(), reason='Chrome is not installed')
+@pytest.mark.parametrize('profile_name', ['light', 'full'])
+def test_fetch_from_stand_in_server(stand_in_server, profile_name):
+    pytest.importorskip('selenium')
+    profile = browser_pool.get_fetch_profile(profile_name)
+    pool = browser_pool.BrowserPool(size=1, profile=profile, warm_up=lambda driver: None)
+    url = f'{stand_in_server}/race.php?r=1&pcm=1'
+
+    try:
+        with patch('src.utils.browser_pool.get_browser_pool', return_value=pool):
+            content, success, error = commons.fetch_with_selenium(url, profile=profile_name)
+    finally:
+        pool.shutdown()
+
+    assert success is True, error
+    # The browser's serialized DOM parses to the same riders and stats as the page itself
+    assert firstcycling.extract_cyclists(content) == firstcycling.extract_cyclists(_read_fixture('grand_tour_gc.html'))
+    assets_requested = [path for path in RecordingHandler.requested if path.endswith(('.png', '.css', '.css?v=42'))]
+    if profile_name == 'light':
+        assert assets_requested == []
+    else:
+        assert assets_requested
@@ -0,0 +1,146 @@
+"""
+Tests for record/replay of fetches (src/utils/cassettes.py).
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from src import api
+from src.utils import cassettes, commons
+
+RACE_URL = 'https://firstcycling.com/race.php?r=17&y=2025&pcm=1'
+
+
+@pytest.fixture
+def cassette_dir(tmp_path, monkeypatch):
+    directory = str(tmp_path / 'cassettes')
+    monkeypatch.setenv('PCM_CASSETTE_DIR', directory)
+    cassettes.reset()
+    yield directory
+    cassettes.reset()
+
+
+def live_response(status_code=200, content=b'<html>race</html>', headers=None):
+    response = MagicMock(status_code=status_code, reason='OK' if status_code == 200 else 'Forbidden',
+                         content=content, headers=headers or {'Content-Type': 'text/html'})
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    return response
+
+
+def test_unknown_fetch_mode(monkeypatch):
+    monkeypatch.setenv('PCM_FETCH_MODE', 'offline')
+
+    with pytest.raises(ValueError, match='Unknown fetch mode'):
+        cassettes.get_fetch_mode()
+
+
+def test_bodies_round_trip():
+    for content in (b'<html>race</html>', b'\x1f\x8b\x08\x00binary'):
+        assert cassettes.decode_body(cassettes.encode_body(content)) == content
+    assert 'body_base64' in cassettes.encode_body(b'\xff\xfe')
+
+
+def test_recorded_responses_are_replayed_in_order(cassette_dir, monkeypatch):
+    session = MagicMock()
+    session.get.side_effect = [live_response(403, b''), live_response(headers={'ETag': '"v1"'})]
+    monkeypatch.setenv('PCM_FETCH_MODE', 'record')
+    recorded = [cassettes.http_get(session, RACE_URL, timeout=5).status_code for _ in range(2)]
+
+    monkeypatch.setenv('PCM_FETCH_MODE', 'replay')
+    cassettes.reset()
+    replayed = [cassettes.http_get(None, 'https://www.firstcycling.com/race.php?pcm=1&y=2025&r=17')
+                for _ in range(3)]
+
+    assert recorded == [403, 200]
+    assert [response.status_code for response in replayed] == [403, 200, 200]
+    with pytest.raises(requests.exceptions.HTTPError):
+        replayed[0].raise_for_status()
+    assert replayed[1].content == b'<html>race</html>'
+    assert replayed[1].headers['etag'] == '"v1"'
+
+
+def test_new_recording_replaces_the_previous_one(cassette_dir, monkeypatch):
+    monkeypatch.setenv('PCM_FETCH_MODE', 'record')
+    session = MagicMock()
+    session.get.return_value = live_response(content=b'old')
+    cassettes.http_get(session, RACE_URL)
+
+    cassettes.reset()
+    session.get.return_value = live_response(content=b'new')
+    cassettes.http_get(session, RACE_URL)
+
+    monkeypatch.setenv('PCM_FETCH_MODE', 'replay')
+    assert cassettes.replay(cassettes.KIND_GET, RACE_URL)['body'] == 'new'
+    assert cassettes.replay(cassettes.KIND_GET, RACE_URL)['body'] == 'new'
+
+
+def test_errors_are_replayed(cassette_dir, monkeypatch):
+    session = MagicMock()
+    session.get.side_effect = requests.exceptions.ProxyError('proxy refused')
+    monkeypatch.setenv('PCM_FETCH_MODE', 'record')
+    with pytest.raises(requests.exceptions.ProxyError):
+        cassettes.http_get(session, RACE_URL)
+
+    monkeypatch.setenv('PCM_FETCH_MODE', 'replay')
+    with pytest.raises(requests.exceptions.ProxyError, match='proxy refused'):
+        cassettes.http_get(session, RACE_URL)
+    with pytest.raises(requests.exceptions.ConnectionError, match='No recorded response'):
+        cassettes.http_get(session, 'https://firstcycling.com/race.php?r=18&pcm=1')
+    assert session.get.call_count == 1
+
+
+def test_live_mode_does_not_record(cassette_dir):
+    session = MagicMock()
+    session.get.return_value = live_response()
+
+    assert cassettes.http_get(session, RACE_URL, timeout=5) is session.get.return_value
+    session.get.assert_called_once_with(RACE_URL, timeout=5)
+    assert cassettes.replay(cassettes.KIND_GET, RACE_URL) is None
+
+
+@patch('src.utils.commons._fetch_with_selenium')
+def test_selenium_fetch_is_recorded_and_replayed(mock_fetch, cassette_dir, monkeypatch):
+    mock_fetch.return_value = (b'<html>race</html>', True, None)
+    monkeypatch.setenv('PCM_FETCH_MODE', 'record')
+    commons.fetch_with_selenium(RACE_URL)
+
+    monkeypatch.setenv('PCM_FETCH_MODE', 'replay')
+    with patch('requests.Session') as mock_session_class:
+        content, success, error = api.fetch_firstcycling_html(RACE_URL)
+
+    assert (content, success, error) == (b'<html>race</html>', True, None)
+    assert mock_fetch.call_count == 1
+    mock_session_class.assert_not_called()
+
+
+@patch('src.utils.commons._fetch_with_selenium')
+def test_replay_without_recording_fails_offline(mock_fetch, cassette_dir, monkeypatch):
+    monkeypatch.setenv('PCM_FETCH_MODE', 'replay')
+
+    with patch('src.utils.cassettes.time.sleep') as mock_sleep:
+        content, success, error = api.fetch_firstcycling_html(RACE_URL)
+
+    assert (content, success) == (None, False)
+    assert 'No recorded' in error
+    mock_fetch.assert_not_called()
+    mock_sleep.assert_not_called()
+
+
+@patch('requests.Session')
+def test_replayed_retries_do_not_sleep(mock_session_class, cassette_dir, monkeypatch):
+    mock_session_class.return_value.get.side_effect = [live_response(403, b''), live_response()]
+    monkeypatch.setenv('PCM_FETCH_MODE', 'record')
+    with patch('src.utils.cassettes.time.sleep'):
+        recorded = commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=False)
+
+    monkeypatch.setenv('PCM_FETCH_MODE', 'replay')
+    cassettes.reset()
+    with patch('src.utils.cassettes.time.sleep') as mock_sleep:
+        replayed = commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=False)
+
+    assert recorded == replayed == (b'<html>race</html>', True, None)
+    mock_sleep.assert_not_called()
+    assert mock_session_class.return_value.get.call_count == 2
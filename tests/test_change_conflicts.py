@@ -0,0 +1,109 @@
+"""
+Tests for detecting overlapping and conflicting edits across pending changes.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import yaml
+
+from src import api
+from src.utils import commons
+
+
+class TestChangeConflicts:
+    """Test cases for the pending change conflict index."""
+
+    def setup_method(self):
+        """Set up a temporary namespace for each test."""
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_conflict_test_")
+        self.original_data_path = commons.DATA_PATH
+        self.original_model_dir_path = commons.MODEL_DIR_PATH
+        commons.DATA_PATH = self.test_data_dir
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        commons.MODEL_DIR_PATH = os.path.join(project_root, 'src', 'model')
+        os.makedirs(commons.get_path('ns', 'changes_dir'))
+
+    def teardown_method(self):
+        """Clean up the temporary namespace."""
+        commons.DATA_PATH = self.original_data_path
+        commons.MODEL_DIR_PATH = self.original_model_dir_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def create_change(self, name, stats):
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), name)
+        os.makedirs(change_dir)
+        with open(os.path.join(change_dir, 'change.yaml'), 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'date': '2025-08-11', 'stats': stats}, f)
+
+    def test_no_pending_changes(self):
+        summary = api.detect_change_conflicts('ns')
+
+        assert summary['pending_changes'] == 0
+        assert summary['overlaps'] == []
+        assert summary['success'] is True
+
+    def test_overlapping_edits_with_same_value_are_not_conflicts(self):
+        self.create_change('a-change', [{'pcm_id': 1, 'name': 'A', 'fla': 70}])
+        self.create_change('b-change', [{'pcm_id': 1, 'name': 'A', 'fla': 70, 'mo': 60}])
+
+        summary = api.detect_change_conflicts('ns')
+
+        assert summary['pending_changes'] == 2
+        assert len(summary['overlaps']) == 1
+        assert summary['overlaps'][0]['stat'] == 'fla'
+        assert summary['conflicts'] == []
+        assert summary['success'] is True
+
+    def test_conflicting_values_report_applied_value(self):
+        self.create_change('a-change', [{'pcm_id': 1, 'name': 'A', 'fla': 70}])
+        self.create_change('b-change', [{'pcm_id': 1, 'name': 'A', 'fla': 75}])
+        self.create_change('c-change', [{'pcm_id': 2, 'name': 'B', 'fla': 75}])
+
+        summary = api.detect_change_conflicts('ns')
+
+        assert summary['success'] is False
+        assert len(summary['conflicts']) == 1
+        conflict = summary['conflicts'][0]
+        assert (conflict['pcm_id'], conflict['stat']) == ('1', 'fla')
+        assert [edit['change'] for edit in conflict['changes']] == ['a-change', 'b-change']
+        assert conflict['values'] == [70, 75]
+        assert conflict['applied_value'] == 75
+
+    def test_list_and_dict_values_are_reported(self):
+        self.create_change('a-change', [{'pcm_id': 1, 'name': 'A', 'fla': [70, 71]}])
+        self.create_change('b-change', [{'pcm_id': 1, 'name': 'A', 'fla': {'value': 75}}])
+        self.create_change('c-change', [{'pcm_id': 1, 'name': 'A', 'fla': [70, 71]}])
+
+        summary = api.detect_change_conflicts('ns')
+
+        assert len(summary['conflicts']) == 1
+        assert summary['conflicts'][0]['values'] == [[70, 71], {'value': 75}]
+        assert summary['conflicts'][0]['applied_value'] == [70, 71]
+
+    def test_processed_changes_are_ignored(self):
+        self.create_change('a-change', [{'pcm_id': 1, 'name': 'A', 'fla': 70}])
+        self.create_change('b-change', [{'pcm_id': 1, 'name': 'A', 'fla': 75}])
+        api.create_new_database('ns', 'tracking')
+        conn = sqlite3.connect(commons.get_path('ns', 'tracking_db'))
+        conn.execute("INSERT INTO tbl_changes (name) VALUES ('a-change')")
+        conn.commit()
+        conn.close()
+
+        summary = api.detect_change_conflicts('ns')
+
+        assert summary['pending_changes'] == 1
+        assert summary['conflicts'] == []
+
+    def test_unreadable_change_file_is_reported(self):
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), 'broken')
+        os.makedirs(change_dir)
+        with open(os.path.join(change_dir, 'change.yaml'), 'w') as f:
+            f.write("stats: [\n")
+
+        summary = api.detect_change_conflicts('ns')
+
+        assert summary['success'] is False
+        assert summary['errors'][0]['change'] == 'broken'
@@ -0,0 +1,154 @@
+"""
+Tests for change file content hashes stored in tbl_changes.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest.mock import patch
+
+import yaml
+
+from src import api
+from src.utils import commons
+
+
+class TestChangeContentHash:
+    """Test cases for detecting change files edited after processing."""
+
+    def setup_method(self):
+        """Set up a temporary namespace with a tracking database."""
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_hash_test_")
+        self.original_data_path = commons.DATA_PATH
+        self.original_model_dir_path = commons.MODEL_DIR_PATH
+        commons.DATA_PATH = self.test_data_dir
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        commons.MODEL_DIR_PATH = os.path.join(project_root, 'src', 'model')
+        os.makedirs(commons.get_path('ns', 'changes_dir'))
+        api.create_new_database('ns', 'tracking')
+
+    def teardown_method(self):
+        """Clean up the temporary namespace."""
+        commons.DATA_PATH = self.original_data_path
+        commons.MODEL_DIR_PATH = self.original_model_dir_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def write_change(self, name, fla):
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), name)
+        os.makedirs(change_dir, exist_ok=True)
+        change_file = os.path.join(change_dir, 'change.yaml')
+        with open(change_file, 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'date': '2025-08-11',
+                       'stats': [{'pcm_id': 1, 'name': 'A', 'fla': fla}]}, f)
+        return change_file
+
+    def test_content_hash_recorded_after_uat(self):
+        change_file = self.write_change('c1', 70)
+        api.process_new_change_files('ns')
+        api.process_uat_namespace('ns')
+
+        conn = sqlite3.connect(commons.get_path('ns', 'tracking_db'))
+        stored_hash = conn.execute("SELECT content_hash FROM tbl_changes WHERE name = 'c1'").fetchone()[0]
+        conn.close()
+
+        assert stored_hash == api._hash_change_file(change_file)
+
+    def test_unchanged_processed_change_is_not_flagged(self):
+        self.write_change('c1', 70)
+        api.process_new_change_files('ns')
+        api.process_uat_namespace('ns')
+
+        summary = api.process_new_change_files('ns')
+
+        assert summary['processed_files'] == 0
+        assert summary['modified_changes'] == []
+
+    def test_edited_processed_change_is_flagged(self):
+        self.write_change('c1', 70)
+        api.process_new_change_files('ns')
+        api.process_uat_namespace('ns')
+
+        self.write_change('c1', 99)
+        summary = api.process_new_change_files('ns')
+
+        assert summary['processed_files'] == 0
+        assert summary['modified_changes'] == ['c1']
+
+    def test_unchanged_change_file_is_not_rehashed(self):
+        self.write_change('c1', 70)
+        api.process_new_change_files('ns')
+        api.process_uat_namespace('ns')
+
+        with patch('src.api._hash_change_file', side_effect=api._hash_change_file) as mock_hash:
+            summary = api.process_new_change_files('ns')
+
+        assert summary['modified_changes'] == []
+        mock_hash.assert_not_called()
+
+    def test_touched_change_file_is_rehashed(self):
+        change_file = self.write_change('c1', 70)
+        api.process_new_change_files('ns')
+        api.process_uat_namespace('ns')
+        mtime_ns = os.stat(change_file).st_mtime_ns
+
+        os.utime(change_file, ns=(mtime_ns + 10 ** 9, mtime_ns + 10 ** 9))
+        assert api.process_new_change_files('ns')['modified_changes'] == []
+
+        self.write_change('c1', 71)  # Same size, different content
+        os.utime(change_file, ns=(mtime_ns + 2 * 10 ** 9, mtime_ns + 2 * 10 ** 9))
+        assert api.process_new_change_files('ns')['modified_changes'] == ['c1']
+
+    def test_legacy_database_is_migrated(self):
+        db_path = os.path.join(self.test_data_dir, 'legacy.sqlite')
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE tbl_changes (id INTEGER PRIMARY KEY, name VARCHAR(511) NOT NULL)")
+        conn.execute("INSERT INTO tbl_changes (name) VALUES ('old-change')")
+
+        api._migrate_tracking_schema(conn)
+
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(tbl_changes)")]
+        assert 'content_hash' in columns
+        assert api.find_modified_changes(conn.cursor(), commons.get_path('ns', 'changes_dir')) == []
+        conn.close()
+
+    def test_connecting_does_not_migrate(self):
+        db_path = commons.get_path('ns', 'tracking_db')
+        os.remove(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE tbl_changes (id INTEGER PRIMARY KEY, name VARCHAR(511) NOT NULL)")
+        conn.close()
+
+        api.get_database_connection('ns').close()
+
+        conn = sqlite3.connect(db_path)
+        assert [row[1] for row in conn.execute("PRAGMA table_info(tbl_changes)")] == ['id', 'name']
+        conn.close()
+
+    def test_generated_sql_does_not_depend_on_the_checkout(self):
+        change_file = self.write_change('c1', 70)
+        api.process_new_change_files('ns')
+        inserts_sql = os.path.join(os.path.dirname(change_file), 'inserts.sql')
+        with open(inserts_sql, 'r', encoding='utf-8') as f:
+            first = f.read()
+        os.remove(os.environ['PCM_CHANGE_FILE_CACHE'])
+        mtime_ns = os.stat(change_file).st_mtime_ns
+        os.utime(change_file, ns=(mtime_ns + 10 ** 9, mtime_ns + 10 ** 9))  # Like a fresh clone
+
+        api.process_new_change_files('ns')
+
+        with open(inserts_sql, 'r', encoding='utf-8') as f:
+            assert f.read() == first
+        assert 'mtime' not in first
+
+    def test_fresh_checkout_hashes_each_file_once(self):
+        self.write_change('c1', 70)
+        api.process_new_change_files('ns')
+        api.process_uat_namespace('ns')
+        os.remove(os.environ['PCM_CHANGE_FILE_CACHE'])
+
+        with patch('src.api._hash_change_file', side_effect=api._hash_change_file) as mock_hash:
+            assert api.process_new_change_files('ns')['modified_changes'] == []
+            assert api.process_new_change_files('ns')['modified_changes'] == []
+
+        assert mock_hash.call_count == 1
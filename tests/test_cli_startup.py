@@ -0,0 +1,49 @@
+"""
+Startup budget of pcm_cli commands that never touch the network (measured with python -X importtime).
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'pcm_cli.py')
+
+# Only loaded by the code paths that fetch or scrape pages
+NETWORK_MODULES = ('requests', 'urllib3', 'charset_normalizer', 'idna', 'bs4', 'lxml', 'selenium',
+                   'webdriver_manager', 'asyncio')
+# Generous: all imports of these commands take well under 0.2 s without the network modules
+IMPORT_BUDGET_SECONDS = 0.5
+
+
+def run_with_importtime(command, cwd):
+    """
+    Run a pcm_cli command with -X importtime.
+
+    Returns:
+        tuple: (names of the imported modules, total import time in seconds)
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', CLI_PATH, command],
+                            cwd=cwd, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stdout + result.stderr
+    modules = []
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or line.rstrip().endswith('| imported package'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.append(name.strip())
+        if name[1] != ' ':  # Top-level import; nested ones are counted in its cumulative time
+            total += int(cumulative) / 1e6
+    return modules, total
+
+
+@pytest.mark.parametrize('command', ['validate-yaml', 'process-uat'])
+def test_offline_commands_do_not_import_network_modules(command, tmp_path):
+    run_with_importtime(command, tmp_path)  # Compile stale .pyc files outside the measured run
+    modules, total = run_with_importtime(command, tmp_path)
+
+    assert 'src.api' in modules
+    assert [name for name in modules if name.split('.')[0] in NETWORK_MODULES] == []
+    assert total < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,161 @@
+"""
+Tests for run deadlines (src/utils/deadline.py) and how the fetches honour them.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src import api
+from src.utils import commons, fetch_orchestrator
+from src.utils.deadline import Deadline, get_deadline
+
+RACE_URL = 'https://firstcycling.com/race.php?r=17&y=2025&pcm=1'
+
+
+class FakeClock:
+    """Clock that advances when sleep() is called."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_deadline():
+    clock = FakeClock()
+    deadline = Deadline(10, clock)
+
+    clock.now = 4.0
+    assert deadline.remaining() == 6.0
+    assert deadline.timeout(30) == 6.0
+    assert deadline.timeout(2) == 2
+    assert deadline.within(3).remaining() == 3.0
+    assert deadline.within(60).remaining() == 6.0
+
+    clock.now = 12.0
+    assert deadline.expired()
+    assert deadline.remaining() == 0.0
+    assert deadline.error('trying selenium') == 'Deadline exceeded (10s) before trying selenium'
+
+
+def test_get_deadline():
+    deadline = Deadline(5)
+
+    assert get_deadline(None) is None
+    assert get_deadline(deadline) is deadline
+    assert get_deadline(2.5).seconds == 2.5
+
+
+def forbidden_session(mock_session_class, clock):
+    """Make the mocked session answer every request with 403 after one second of the clock."""
+    forbidden = MagicMock(status_code=403)
+    forbidden.raise_for_status.side_effect = requests.exceptions.HTTPError(response=forbidden)
+    session = mock_session_class.return_value
+    session.get.side_effect = lambda url, **kwargs: clock.sleep(1.0) or forbidden
+    return session
+
+
+@patch('src.utils.commons.get_proxy_list', return_value=[])
+@patch('requests.Session')
+def test_last_retry_fits_its_backoff_in_the_time_left(mock_session_class, _):
+    clock = FakeClock()
+    session = forbidden_session(mock_session_class, clock)
+
+    with patch('src.utils.cassettes.time.sleep', side_effect=clock.sleep) as mock_sleep:
+        content, success, error = commons.make_request_with_proxy_rotation(
+            'https://example.com/race', use_proxies=True, deadline=Deadline(8, clock))
+
+    assert (content, success) == (None, False)
+    assert error == 'Access denied (403) for https://example.com/race.'
+    # The 5s backoff of the third attempt does not fit in the 4s left: it waits 2s and tries once more
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [2, 2.0]
+    assert [call.kwargs['timeout'] for call in session.get.call_args_list] == [8, 5.0, 2.0]
+
+
+@patch('src.utils.commons.get_proxy_list', return_value=[])
+@patch('requests.Session')
+def test_retries_stop_after_the_last_retry(mock_session_class, _):
+    clock = FakeClock()
+    session = forbidden_session(mock_session_class, clock)
+
+    with patch('src.utils.cassettes.time.sleep', side_effect=clock.sleep) as mock_sleep:
+        content, success, error = commons.make_request_with_proxy_rotation(
+            'https://example.com/race', use_proxies=True, deadline=Deadline(2.5, clock))
+
+    assert (content, success) == (None, False)
+    assert error == 'Deadline exceeded (2.5s) before retry 3/3 of https://example.com/race'
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [0.8]
+    assert session.get.call_count == 2
+
+
+@patch('requests.Session')
+def test_no_request_after_the_deadline(mock_session_class):
+    clock = FakeClock()
+    deadline = Deadline(5, clock)
+    clock.now = 5.0
+
+    content, success, error = commons.make_request_with_proxy_rotation(RACE_URL, deadline=deadline)
+
+    assert (content, success) == (None, False)
+    assert error == f'Deadline exceeded (5s) before fetching {RACE_URL}'
+    mock_session_class.return_value.get.assert_not_called()
+
+
+@patch('src.utils.commons._fetch_with_selenium', return_value=(b'<html>race</html>', True, None))
+def test_selenium_wait_is_shortened_to_the_time_left(mock_fetch):
+    clock = FakeClock()
+    deadline = Deadline(20, clock)
+    clock.now = 8.0
+
+    assert commons.fetch_with_selenium(RACE_URL, timeout=30, deadline=deadline) == (b'<html>race</html>', True, None)
+    assert mock_fetch.call_args.args[:2] == (RACE_URL, 12.0)
+
+    clock.now = 20.0
+    content, success, error = commons.fetch_with_selenium(RACE_URL, deadline=deadline)
+    assert error == f'Deadline exceeded (20s) before fetching {RACE_URL} with Selenium'
+    assert mock_fetch.call_count == 1
+
+
+def test_run_deadline_ends_the_fetch_sooner(monkeypatch):
+    monkeypatch.setenv('PCM_FETCH_DEADLINE', '180')
+    clock = FakeClock()
+    timeouts = []
+
+    def run_strategy(strategy, url, timeout, use_cache=True, deadline=None, cached=None, cache_if=None):
+        timeouts.append((strategy, timeout, deadline.remaining()))
+        clock.sleep(timeout)
+        return None, False, 'Timed out'
+
+    with patch('src.utils.fetch_orchestrator.run_strategy', side_effect=run_strategy):
+        content, success, error = fetch_orchestrator.fetch(RACE_URL, deadline=Deadline(40, clock),
+                                                           strategies=['selenium', 'session', 'http'],
+                                                           stats=fetch_orchestrator.StrategyStats())
+
+    assert success is False
+    assert timeouts == [('selenium', 30, 40.0), ('session', 10.0, 10.0)]
+    assert 'Deadline exceeded (40s) before trying http' in error
+
+
+@patch('src.api.parse_github_issue_form')
+@patch('src.api.create_automated_change_file')
+def test_automated_change_request_fails_fast_once_the_deadline_passed(mock_create_file, mock_parse):
+    mock_parse.return_value = {
+        'change_name': 'Test Change',
+        'date': '2025-08-06',
+        'author': 'Test Author',
+        'race_url': RACE_URL,
+        'namespace': 'test_namespace'
+    }
+
+    with patch('src.utils.fetch_orchestrator.run_strategy') as mock_run_strategy:
+        result = api.process_automated_change_request('issue body', deadline=0)
+
+    assert result['success'] is False
+    assert 'Deadline exceeded (0s) before trying' in result['error']
+    mock_run_strategy.assert_not_called()
+    mock_create_file.assert_not_called()
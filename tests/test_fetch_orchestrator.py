@@ -0,0 +1,174 @@
+"""
+Tests for the adaptive fetch strategy selection (src/utils/fetch_orchestrator.py).
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src import api
+from src.utils import commons, fetch_orchestrator
+
+RACE_URL = 'https://firstcycling.com/race.php?r=17&y=2025&pcm=1'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake_strategies(outcomes, clock=None, durations=None):
+    """run_strategy stand-in: strategy -> (content, success, error), advancing the clock by its duration."""
+    calls = []
+
+    def run_strategy(strategy, url, timeout, use_cache=True, deadline=None, cached=None, cache_if=None):
+        calls.append((strategy, timeout))
+        if clock is not None:
+            clock.now += (durations or {}).get(strategy, 1.0)
+        return outcomes[strategy]
+
+    return run_strategy, calls
+
+
+def test_strategies_per_environment(monkeypatch):
+    monkeypatch.delenv('PCM_FETCH_STRATEGIES', raising=False)
+
+    assert fetch_orchestrator.get_strategies('local') == ['selenium', 'session', 'http']
+    assert fetch_orchestrator.get_strategies('github_actions') == ['selenium', 'session', 'http', 'proxy']
+
+    monkeypatch.setenv('PCM_FETCH_STRATEGIES', 'session, selenium,session')
+    assert fetch_orchestrator.get_strategies('github_actions') == ['session', 'selenium']
+
+    monkeypatch.setenv('PCM_FETCH_STRATEGIES', 'curl')
+    with pytest.raises(ValueError, match="Unknown fetch strategy 'curl'"):
+        fetch_orchestrator.get_strategies()
+
+
+def test_fastest_successful_strategy_comes_first():
+    stats = fetch_orchestrator.StrategyStats()
+    stats.record('local', 'selenium', True, 12.0)
+    stats.record('local', 'session', True, 1.5)
+    stats.record('local', 'http', False, 0.3)
+
+    assert stats.order('local', ['selenium', 'session', 'http', 'proxy']) == ['session', 'selenium', 'proxy', 'http']
+    assert stats.order('github_actions', ['selenium', 'session']) == ['selenium', 'session']
+
+
+def test_unreliable_strategy_ranks_below_a_reliable_one():
+    stats = fetch_orchestrator.StrategyStats()
+    stats.record('local', 'selenium', True, 6.0)
+    for success in (True,) + (False,) * 10:
+        stats.record('local', 'session', success, 1.5)
+
+    assert stats.order('local', ['session', 'selenium']) == ['selenium', 'session']
+
+
+def test_stats_persist(tmp_path):
+    stats_file = str(tmp_path / 'fetch_strategies.json')
+    fetch_orchestrator.StrategyStats(stats_file).record('github_actions', 'proxy', True, 3.0)
+
+    assert fetch_orchestrator.StrategyStats(stats_file).get('github_actions', 'proxy') == {'successes': 1, 'latency': 3.0}
+
+
+def test_fetch_falls_back_without_repeating_strategies():
+    stats = fetch_orchestrator.StrategyStats()
+    run_strategy, calls = fake_strategies({
+        'selenium': (None, False, 'ChromeDriver not found'),
+        'session': (b'<html>race</html>', True, None),
+        'http': (b'<html>race</html>', True, None),
+    })
+
+    with patch('src.utils.fetch_orchestrator.run_strategy', side_effect=run_strategy):
+        first = fetch_orchestrator.fetch(RACE_URL, strategies=['selenium', 'session', 'http'], stats=stats)
+        second = fetch_orchestrator.fetch(RACE_URL, strategies=['selenium', 'session', 'http'], stats=stats)
+
+    assert first == second == (b'<html>race</html>', True, None)
+    assert [strategy for strategy, _ in calls] == ['selenium', 'session', 'session']
+
+
+def test_all_strategies_failing_reports_every_error():
+    run_strategy, calls = fake_strategies({
+        'selenium': (None, False, 'ChromeDriver not found'),
+        'session': (None, False, 'Access denied (403)'),
+    })
+
+    with patch('src.utils.fetch_orchestrator.run_strategy', side_effect=run_strategy):
+        content, success, error = fetch_orchestrator.fetch(RACE_URL, strategies=['selenium', 'session'],
+                                                           stats=fetch_orchestrator.StrategyStats())
+
+    assert (content, success) == (None, False)
+    assert 'selenium: ChromeDriver not found' in error
+    assert 'session: Access denied (403)' in error
+
+
+def test_deadline_caps_timeouts_and_stops_trying():
+    clock = FakeClock()
+    run_strategy, calls = fake_strategies({
+        'selenium': (None, False, 'Timed out'),
+        'session': (None, False, 'Network error'),
+        'http': (b'<html>race</html>', True, None),
+    }, clock=clock, durations={'selenium': 30.0, 'session': 15.0})
+
+    with patch('src.utils.fetch_orchestrator.run_strategy', side_effect=run_strategy):
+        content, success, error = fetch_orchestrator.fetch(
+            RACE_URL, deadline=45, strategies=['selenium', 'session', 'http'],
+            stats=fetch_orchestrator.StrategyStats(), clock=clock)
+
+    assert success is False
+    assert calls == [('selenium', 30), ('session', 15.0)]
+    assert 'Deadline exceeded (45s) before trying http' in error
+
+
+def test_zero_deadline_tries_nothing():
+    run_strategy, calls = fake_strategies({'session': (b'<html>race</html>', True, None)})
+
+    with patch('src.utils.fetch_orchestrator.run_strategy', side_effect=run_strategy):
+        content, success, error = fetch_orchestrator.fetch(RACE_URL, deadline=0, strategies=['session'],
+                                                           stats=fetch_orchestrator.StrategyStats(),
+                                                           clock=FakeClock())
+
+    assert (content, success) == (None, False)
+    assert calls == []
+    assert 'Deadline exceeded (0s) before trying session' in error
+
+
+def test_environment_is_recorded(monkeypatch):
+    monkeypatch.setenv('GITHUB_ACTIONS', 'true')
+    stats = fetch_orchestrator.StrategyStats()
+    run_strategy, _ = fake_strategies({'proxy': (b'<html>race</html>', True, None)})
+
+    with patch('src.utils.fetch_orchestrator.run_strategy', side_effect=run_strategy):
+        fetch_orchestrator.fetch(RACE_URL, strategies=['proxy'], stats=stats)
+
+    assert stats.get('github_actions', 'proxy')['successes'] == 1
+    assert stats.get('local', 'proxy') == {}
+
+
+@patch('src.utils.commons.make_request_with_proxy_rotation')
+@patch('src.utils.commons.fetch_with_selenium')
+def test_http_strategies_never_fall_back_to_selenium(mock_selenium, mock_make_request, monkeypatch):
+    monkeypatch.setenv('PCM_FETCH_STRATEGIES', 'selenium,session,http,proxy')
+    mock_selenium.return_value = (None, False, 'Selenium error: ChromeDriver not found')
+    mock_make_request.return_value = (None, False, 'Network error')
+
+    content, success, error = api.fetch_firstcycling_html(RACE_URL)
+
+    assert success is False
+    assert mock_selenium.call_count == 1
+    options = [(call.kwargs['use_session'], call.kwargs['use_proxies'], call.kwargs['selenium_fallback'])
+               for call in mock_make_request.call_args_list]
+    assert options == [(True, False, False), (False, False, False), (False, True, False)]
+    assert mock_make_request.call_args_list[2].kwargs['direct_fallback'] is False
+
+
+@patch('src.utils.commons.get_proxy_list', return_value=[])
+@patch('requests.Session')
+def test_proxy_only_request_without_proxies(mock_session_class, _):
+    content, success, error = commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=True,
+                                                                       direct_fallback=False)
+
+    assert (content, success, error) == (None, False, 'No usable proxies for https://example.com/race')
+    mock_session_class.return_value.get.assert_not_called()
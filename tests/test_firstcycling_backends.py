@@ -0,0 +1,115 @@
+"""
+Tests for the lxml and html.parser backends of the FirstCycling parser (src/utils/firstcycling.py).
+"""
+
+import glob
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src import api
+from src.utils import firstcycling
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'benchmarks', 'fixtures', 'firstcycling')
+
+ROW_HTML = '<table><tr><th>#</th></tr>{rows}</table>'
+
+EDGE_CASES = {
+    'empty': '',
+    'no_table': '<div><a href="rider.php?r=1" title="Tadej Pogacar">x</a></div>',
+    'header_only': ROW_HTML.format(rows=''),
+    'title_with_extra_spaces': ROW_HTML.format(
+        rows='<tr><td><a href="/rider.php?r=2&amp;y=2025" title="  Wout  van  Aert ">x</a></td></tr>'),
+    'text_without_title': ROW_HTML.format(
+        rows='<tr><td><a href="rider.php?r=3"><!-- flag --><span>Lamperti</span> Luke</a></td></tr>'),
+    'nested_tables': ROW_HTML.format(
+        rows='<tr><td><table><tr><td><a href="rider.php?r=4">Inner</a></td></tr>'
+             '<tr><td><a href="rider.php?r=5" title="Jonas Vingegaard">x</a></td></tr></table></td></tr>'),
+    'duplicates_and_other_links': ROW_HTML.format(
+        rows='<tr><td><a href="team.php?l=1">Team</a><a href="rider.php?r=6" title="A B">x</a></td></tr>'
+             '<tr><td><a href="rider.php?r=6" title="A B">x</a><a href="rider.php?id=7">No id</a></td></tr>'),
+    'stat_columns': '<table><tr><th>#</th><th colspan="2">Rider</th><th title="FLAT | Power">FLA</th>'
+                    '<th>X</th><th title="MOUNTAIN | Power">MTN</th><th>SPR</th></tr>'
+                    '<tr><td>1</td><td></td><td><a href="rider.php?r=9" title="A B">x</a></td>'
+                    '<td><span class="pcmBox"> 71 </span></td><td>5</td><td>-</td><td>80</td></tr>'
+                    '<tr><td>2</td><td><table><tr><th>FLA</th></tr>'
+                    '<tr><td><a href="rider.php?r=10" title="C D">x</a></td></tr></table></td></tr></table>',
+    'utf8_bytes': ('<meta charset="utf-8">' + ROW_HTML.format(
+        rows='<tr><td><a href="rider.php?r=8" title="Tadej Pogačar">x</a></td></tr>')).encode('utf-8'),
+}
+
+
+def _fixture_pages():
+    return sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('name', sorted(EDGE_CASES))
+def test_backends_agree_on_edge_cases(name):
+    pytest.importorskip('lxml')
+    html = EDGE_CASES[name]
+
+    assert firstcycling.extract_cyclists(html, backend='lxml') == \
+        firstcycling.extract_cyclists(html, backend='html.parser')
+
+
+@pytest.mark.parametrize('path', _fixture_pages(), ids=os.path.basename)
+def test_backends_agree_on_race_pages(path):
+    pytest.importorskip('lxml')
+    html = _read(path)
+
+    cyclists = firstcycling.extract_cyclists(html, backend='lxml')
+
+    assert len(cyclists) >= 150
+    assert all(len(cyclist['stats']) == 14 for cyclist in cyclists)
+    assert cyclists == firstcycling.extract_cyclists(html, backend='html.parser')
+
+
+def test_name_and_row_semantics():
+    cyclists = firstcycling.extract_cyclists(EDGE_CASES['title_with_extra_spaces'] + EDGE_CASES['text_without_title'])
+
+    assert cyclists == [
+        {'name': 'van Aert Wout', 'href': '/rider.php?r=2&y=2025', 'rider_id': '2', 'table_row_number': 1,
+         'first_cycling_id': 2},
+        {'name': 'Lamperti Luke', 'href': 'rider.php?r=3', 'rider_id': '3', 'table_row_number': 1,
+         'first_cycling_id': 3}
+    ]
+
+
+def test_stat_columns():
+    cyclists = firstcycling.extract_cyclists(EDGE_CASES['stat_columns'])
+
+    # colspan shifts the columns, '-' is skipped, and riders of a nested table get no stats
+    assert cyclists[0]['stats'] == {'fla': 71, 'spr': 80}
+    assert 'stats' not in cyclists[1]
+
+
+def test_falls_back_to_html_parser_without_lxml():
+    with patch('src.utils.firstcycling._get_lxml_html', return_value=None):
+        assert firstcycling.get_parser_backend() == 'html.parser'
+        cyclists, success, _ = api.parse_firstcycling_html(EDGE_CASES['duplicates_and_other_links'])
+
+    assert success is True
+    assert [cyclist['rider_id'] for cyclist in cyclists] == ['6']
+
+
+def test_lxml_backend_requires_lxml():
+    with patch('src.utils.firstcycling._get_lxml_html', return_value=None):
+        with pytest.raises(ImportError):
+            firstcycling.extract_cyclists('<table></table>', backend='lxml')
+
+
+@pytest.mark.parametrize('path', _fixture_pages(), ids=os.path.basename)
+def test_race_pages_have_rider_table(path):
+    assert firstcycling.has_rider_table(_read(path))
+
+
+def test_challenge_page_has_no_rider_table():
+    assert not firstcycling.has_rider_table('<html><body>Just a moment...<a href="/rider.php?r=1">x</a></body></html>')
+    assert not firstcycling.has_rider_table(b'<html><table><tr><td>Error</td></tr></table></html>')
@@ -301,6 +301,16 @@ class TestFirstCyclingParser(unittest.TestCase):
         actual_names = [cyclist['name'] for cyclist in cyclists]
         self.assertEqual(actual_names, expected_names)
 
+    def test_stat_columns_are_extracted(self):
+        """Test that the PCM stat columns are mapped to stat keys and read per rider."""
+        cyclists, success, error = parse_firstcycling_html(self.test_html)
+        
+        self.assertTrue(success)
+        
+        # The header has all 14 stat columns, but the rows only fill the first (FLA)
+        actual_stats = [cyclist['stats'] for cyclist in cyclists]
+        self.assertEqual(actual_stats, [{'fla': 73}, {'fla': 72}, {'fla': 73}, {'fla': 76}, {'fla': 64}])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,198 @@
+"""
+Tests for the on-disk page cache (src/utils/http_cache.py) and its use by the fetchers.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import api
+from src.utils import commons, http_cache, metrics
+
+RACE_URL = 'https://firstcycling.com/race.php?r=17&y=2025&pcm=1'
+RACE_PAGE = b'<html><table><tr><td><a href="rider.php?r=1">Rider</a></td></tr></table></html>'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Enable the shared cache in a temporary directory."""
+    directory = str(tmp_path / 'http')
+    monkeypatch.setenv('PCM_HTTP_CACHE', '1')
+    monkeypatch.setenv('PCM_HTTP_CACHE_DIR', directory)
+    metrics.reset()
+    yield directory
+    metrics.reset()
+
+
+def lookups():
+    return {counter['labels']['result']: counter['value'] for counter in metrics.get_counters()
+            if counter['name'] == 'http_cache_lookups'}
+
+
+def response(status_code=200, content=b'<html>race</html>', headers=None):
+    return MagicMock(status_code=status_code, content=content, headers=headers or {})
+
+
+def test_normalize_url():
+    assert (http_cache.normalize_url('https://www.FirstCycling.com/race.php?y=2025&r=17&pcm=1#results')
+            == http_cache.normalize_url('HTTPS://firstcycling.com/race.php?pcm=1&r=17&y=2025'))
+    assert http_cache.normalize_url(RACE_URL) != http_cache.normalize_url(RACE_URL.replace('&pcm=1', ''))
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    clock = FakeClock()
+    cache = http_cache.HTTPCache(str(tmp_path), ttl=60, clock=clock)
+
+    assert cache.get(RACE_URL) is None
+    cache.put(RACE_URL, '<html>race</html>', {'ETag': '"v1"', 'Last-Modified': 'Mon, 06 Oct 2025 10:00:00 GMT'})
+
+    entry = cache.get('https://www.firstcycling.com/race.php?pcm=1&y=2025&r=17')
+    assert entry['content'] == b'<html>race</html>'
+    assert entry['fresh'] is True
+    assert (entry['etag'], entry['last_modified']) == ('"v1"', 'Mon, 06 Oct 2025 10:00:00 GMT')
+
+    clock.now += 61
+    assert cache.get(RACE_URL)['fresh'] is False
+    cache.refresh(RACE_URL)
+    assert cache.get(RACE_URL)['fresh'] is True
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = FakeClock()
+    cache = http_cache.HTTPCache(str(tmp_path), max_bytes=250, clock=clock)
+    urls = [f'https://firstcycling.com/race.php?r={race}&pcm=1' for race in range(3)]
+
+    for url in urls[:2]:
+        clock.now += 1
+        cache.put(url, b'x' * 100)
+    clock.now += 1
+    cache.get(urls[0])
+    clock.now += 1
+    cache.put(urls[2], b'x' * 100)
+
+    assert cache.get(urls[1]) is None
+    assert cache.get(urls[0]) is not None and cache.get(urls[2]) is not None
+    assert cache.size() == 200
+
+
+def test_configure_disables_the_cache(cache_dir):
+    assert http_cache.get_http_cache() is not None
+    http_cache.configure(enabled=False)
+    assert http_cache.get_http_cache() is None
+    assert http_cache.lookup(RACE_URL) is None
+
+
+class TestRequestCaching:
+    """Test cases for the cache in commons.make_request_with_proxy_rotation."""
+
+    @patch('requests.Session')
+    def test_fresh_page_is_served_without_a_request(self, mock_session_class, cache_dir):
+        mock_session_class.return_value.get.return_value = response(headers={'ETag': '"v1"'})
+
+        first = commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=False)
+        second = commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=False)
+
+        assert first == second == (b'<html>race</html>', True, None)
+        assert mock_session_class.return_value.get.call_count == 1
+        assert lookups() == {'miss': 1, 'hit': 1}
+
+    @patch('requests.Session')
+    def test_stale_page_is_revalidated(self, mock_session_class, cache_dir, monkeypatch):
+        monkeypatch.setenv('PCM_HTTP_CACHE_TTL', '0')
+        get = mock_session_class.return_value.get
+        get.return_value = response(headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 06 Oct 2025 10:00:00 GMT'})
+        commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=False)
+
+        get.return_value = response(status_code=304, content=b'')
+        content, success, _ = commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=False)
+
+        assert (content, success) == (b'<html>race</html>', True)
+        sent_headers = get.call_args.kwargs['headers']
+        assert sent_headers['If-None-Match'] == '"v1"'
+        assert sent_headers['If-Modified-Since'] == 'Mon, 06 Oct 2025 10:00:00 GMT'
+        assert lookups() == {'miss': 1, 'stale': 1, 'revalidated': 1}
+
+    @patch('requests.Session')
+    def test_use_cache_false_always_fetches(self, mock_session_class, cache_dir):
+        mock_session_class.return_value.get.return_value = response()
+
+        for _ in range(2):
+            commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=False, use_cache=False)
+
+        assert mock_session_class.return_value.get.call_count == 2
+        assert not os.path.exists(cache_dir)
+
+
+class TestFirstCyclingCaching:
+    """Test cases for the cache in api.fetch_firstcycling_html."""
+
+    @patch('src.utils.commons.make_request_with_proxy_rotation')
+    @patch('src.utils.commons.fetch_with_selenium')
+    def test_selenium_page_is_cached(self, mock_selenium, mock_make_request, cache_dir):
+        mock_selenium.return_value = (RACE_PAGE, True, None)
+
+        assert api.fetch_firstcycling_html(RACE_URL) == (RACE_PAGE, True, None)
+        assert api.fetch_firstcycling_html(RACE_URL) == (RACE_PAGE, True, None)
+
+        mock_selenium.assert_called_once()
+        mock_make_request.assert_not_called()
+
+    @patch('src.utils.commons.make_request_with_proxy_rotation')
+    @patch('src.utils.commons.fetch_with_selenium')
+    def test_selenium_page_without_rider_table_is_not_cached(self, mock_selenium, mock_make_request, cache_dir):
+        challenge_page = b'<html><body>Checking your browser before accessing firstcycling.com</body></html>'
+        mock_selenium.return_value = (challenge_page, True, None)
+
+        assert api.fetch_firstcycling_html(RACE_URL) == (challenge_page, True, None)
+        assert api.fetch_firstcycling_html(RACE_URL) == (challenge_page, True, None)
+
+        assert mock_selenium.call_count == 2
+
+    @patch('requests.get')
+    def test_http_page_without_rider_table_is_not_cached(self, mock_get, cache_dir, monkeypatch):
+        monkeypatch.setenv('PCM_FETCH_STRATEGIES', 'http')
+        challenge_page = b'<html><body>Checking your browser before accessing firstcycling.com</body></html>'
+        mock_get.return_value = response(content=challenge_page)
+
+        assert api.fetch_firstcycling_html(RACE_URL) == (challenge_page, True, None)
+        assert api.fetch_firstcycling_html(RACE_URL) == (challenge_page, True, None)
+
+        assert mock_get.call_count == 2
+
+    @patch('requests.get')
+    def test_cache_is_looked_up_once_per_fetch(self, mock_get, cache_dir, monkeypatch):
+        monkeypatch.setenv('PCM_FETCH_STRATEGIES', 'http')
+        monkeypatch.setenv('PCM_HTTP_CACHE_TTL', '0')
+        mock_get.return_value = response(content=RACE_PAGE, headers={'ETag': '"v1"'})
+        api.fetch_firstcycling_html(RACE_URL)
+        assert lookups() == {'miss': 1}
+
+        mock_get.return_value = response(status_code=304, content=b'')
+
+        assert api.fetch_firstcycling_html(RACE_URL) == (RACE_PAGE, True, None)
+        assert mock_get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+        assert lookups() == {'miss': 1, 'stale': 1, 'revalidated': 1}
+
+    @patch('src.utils.commons.fetch_with_selenium')
+    def test_no_cache_option(self, mock_selenium, cache_dir):
+        from src import pcm_cli
+
+        mock_selenium.return_value = (RACE_PAGE, True, None)
+        api.fetch_firstcycling_html(RACE_URL)
+
+        with patch.object(sys, 'argv', ['pcm_cli.py', 'validate-yaml', '--no-cache']), \
+                patch('src.pcm_cli.run_command', return_value=True):
+            pcm_cli.main()
+        api.fetch_firstcycling_html(RACE_URL)
+
+        assert mock_selenium.call_count == 2
@@ -0,0 +1,138 @@
+"""
+Tests for git-aware incremental change discovery.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+import yaml
+
+from src import api
+from src.utils import commons
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+
+
+class TestIncrementalDiscovery:
+    """Test cases for discovering change directories from git history."""
+
+    def setup_method(self):
+        """Set up a temporary git repository with one namespace."""
+        self.repo_dir = tempfile.mkdtemp(prefix="pcm_git_test_")
+        self.original_data_path = commons.DATA_PATH
+        self.original_model_dir_path = commons.MODEL_DIR_PATH
+        self.original_cwd = os.getcwd()
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        commons.MODEL_DIR_PATH = os.path.join(project_root, 'src', 'model')
+        commons.DATA_PATH = os.path.join(self.repo_dir, 'data')
+        os.chdir(self.repo_dir)
+
+        self.git('init', '-q')
+        self.git('config', 'user.email', 'test@example.com')
+        self.git('config', 'user.name', 'Test')
+        os.makedirs(commons.get_path('ns', 'changes_dir'))
+        api.create_new_database('ns', 'tracking')
+        self.add_change('a-change')
+        self.commit('initial')
+
+    def teardown_method(self):
+        """Clean up the temporary repository."""
+        os.chdir(self.original_cwd)
+        commons.DATA_PATH = self.original_data_path
+        commons.MODEL_DIR_PATH = self.original_model_dir_path
+        shutil.rmtree(self.repo_dir, ignore_errors=True)
+
+    def git(self, *args):
+        subprocess.run(['git'] + list(args), cwd=self.repo_dir, check=True, capture_output=True)
+
+    def commit(self, message):
+        self.git('add', '-A')
+        self.git('commit', '-q', '-m', message)
+
+    def add_change(self, name, fla=70):
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), name)
+        os.makedirs(change_dir, exist_ok=True)
+        with open(os.path.join(change_dir, 'change.yaml'), 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'date': '2025-08-11',
+                       'stats': [{'pcm_id': 1, 'name': 'A', 'fla': fla}]}, f)
+
+    def test_without_history_falls_back_to_full_scan(self):
+        change_directories, mode, head = api.discover_change_directories('ns', incremental=True)
+
+        assert mode == 'full'
+        assert change_directories == ['a-change']
+        assert head == commons.get_git_head()
+
+    def test_non_incremental_mode_always_scans(self):
+        change_directories, mode, head = api.discover_change_directories('ns')
+
+        assert mode == 'full'
+        assert head is None
+
+    def test_only_new_changes_are_discovered(self):
+        summary = api.process_new_change_files('ns', incremental=True)
+        assert summary['discovery_mode'] == 'full'
+        self.commit('processed')
+
+        self.add_change('b-change')
+        self.commit('add b')
+        self.add_change('c-change')  # untracked, not committed yet
+
+        change_directories, mode, _ = api.discover_change_directories(
+            'ns', True, 'process-changes', api.CHANGE_FILE_NAMES)
+
+        assert mode == 'incremental'
+        assert change_directories == ['b-change', 'c-change']
+
+    def test_failed_change_is_rediscovered(self):
+        api.process_new_change_files('ns', incremental=True)
+        synced_commit = api._load_sync_state('ns')['process-changes']
+        self.commit('processed')
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), 'b-change')
+        os.makedirs(change_dir)
+        with open(os.path.join(change_dir, 'change.yaml'), 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'stats': []}, f)  # No date - skipped
+        self.commit('add broken b')
+
+        summary = api.process_new_change_files('ns', incremental=True)
+
+        assert summary['processed_files'] == 0
+        assert api._load_sync_state('ns') == {'process-changes': synced_commit}
+
+        self.add_change('c-change')
+        self.commit('add c')
+        change_directories, mode, _ = api.discover_change_directories(
+            'ns', True, 'process-changes', api.CHANGE_FILE_NAMES)
+
+        assert mode == 'incremental'
+        assert change_directories == ['b-change', 'c-change']
+
+    def test_uat_discovery_includes_generated_sql(self):
+        api.process_new_change_files('ns')
+        api._record_sync_commit('ns', 'process-uat', commons.get_git_head())
+        self.commit('processed')
+
+        change_directories, mode, _ = api.discover_change_directories('ns', True, 'process-uat')
+
+        assert mode == 'incremental'
+        assert change_directories == ['a-change']
+
+    def test_unknown_recorded_commit_falls_back_to_full_scan(self):
+        api._record_sync_commit('ns', 'process-changes', '0' * 40)
+
+        change_directories, mode, _ = api.discover_change_directories('ns', incremental=True)
+
+        assert mode == 'full'
+        assert change_directories == ['a-change']
+
+    def test_uat_records_its_own_commit(self):
+        api.process_new_change_files('ns')
+        head = commons.get_git_head()
+
+        summary = api.process_uat_namespace('ns', incremental=True)
+
+        assert summary['changes_executed'] == 1
+        assert api._load_sync_state('ns') == {'process-uat': head}
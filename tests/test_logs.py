@@ -0,0 +1,93 @@
+"""
+Tests for the logging layer (src/utils/logs.py).
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import yaml
+
+from src import api
+from src.utils import commons, logs
+
+
+class TestLogging:
+    """Test cases for log levels and output formats."""
+
+    def setup_method(self):
+        """Set up a temporary namespace with a change file and log to stdout like the CLI."""
+        logs.configure_logging()
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_logs_test_")
+        self.original_data_path = commons.DATA_PATH
+        commons.DATA_PATH = self.test_data_dir
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), 'c1')
+        os.makedirs(change_dir)
+        self.change_file = os.path.join(change_dir, 'change.yaml')
+        with open(self.change_file, 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'date': '2025-08-11',
+                       'stats': [{'pcm_id': 1, 'name': 'A', 'fla': 70}, {'pcm_id': 2, 'name': 'B', 'mo': 60}]}, f)
+
+    def teardown_method(self):
+        """Clean up the temporary namespace."""
+        commons.DATA_PATH = self.original_data_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def run_update(self):
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            api.update_stats_file_with_changes('ns', self.change_file)
+        return mock_stdout.getvalue()
+
+    def test_default_logs_counters_only(self):
+        output = self.run_update()
+
+        assert "New cyclists added: 2" in output
+        assert "Added new cyclist" not in output
+
+    def test_verbose_logs_each_item(self):
+        logs.configure_logging(logging.DEBUG)
+
+        output = self.run_update()
+
+        assert "Added new cyclist: A (PCM ID: 1)" in output
+        assert "Updated B mo: None → 60" in output
+
+    def test_quiet_hides_info(self):
+        logs.configure_logging(logging.WARNING)
+
+        assert self.run_update() == ""
+
+    def test_json_lines_output(self):
+        logs.configure_logging(log_format='json')
+
+        records = [json.loads(line) for line in self.run_update().splitlines()]
+
+        assert records
+        assert {record['level'] for record in records} == {'info'}
+        assert records[0]['logger'] == 'pcm.api'
+        assert any("New cyclists added: 2" in record['message'] for record in records)
+
+    def test_unknown_format_is_rejected(self):
+        try:
+            logs.configure_logging(log_format='xml')
+        except ValueError as e:
+            assert 'xml' in str(e)
+        else:
+            raise AssertionError("ValueError not raised")
+
+    def test_logger_names(self):
+        assert logs.get_logger('src.utils.commons').name == 'pcm.utils.commons'
+        assert logs.get_logger().name == 'pcm'
+
+    def test_records_propagate_until_configured(self, caplog):
+        logs.reset_logging()
+
+        with caplog.at_level(logging.INFO, logger='pcm'):
+            output = self.run_update()
+
+        assert output == ""
+        assert any("New cyclists added: 2" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,193 @@
+"""
+Tests for the namespace stats hash tree (src/utils/merkle.py) and its
+integration with stats file updates.
+"""
+
+import os
+import shutil
+import tempfile
+
+import yaml
+
+from src import api
+from src.utils import commons, merkle
+
+
+def _stats(count, offset=0):
+    return {
+        str(pcm_id): {
+            'name': f'Cyclist {pcm_id}',
+            'stats': {'fla': 60 + pcm_id % 20, 'mo': 55 + pcm_id % 25}
+        }
+        for pcm_id in range(offset, offset + count)
+    }
+
+
+class TestHashTree:
+    """Test cases for building, updating and diffing hash trees."""
+
+    def test_build_is_deterministic_and_order_independent(self):
+        stats = _stats(50)
+        reversed_stats = dict(reversed(list(stats.items())))
+
+        assert merkle.build_hash_tree(stats)['root'] == merkle.build_hash_tree(reversed_stats)['root']
+
+    def test_buckets_follow_pcm_id_ranges(self):
+        stats = {'1': {'name': 'A'}, '999': {'name': 'B'}, '1000': {'name': 'C'}, '4321': {'name': 'D'}}
+
+        tree = merkle.build_hash_tree(stats, bucket_size=1000)
+
+        assert list(tree['buckets'].keys()) == ['0', '1', '4']
+        assert tree['cyclist_count'] == 4
+
+    def test_incremental_update_matches_full_rebuild(self):
+        stats = _stats(3000)
+        tree = merkle.build_hash_tree(stats)
+
+        stats['1500']['stats']['fla'] = 99
+        stats['5000'] = {'name': 'New Cyclist'}
+        del stats['10']
+        updated = merkle.update_hash_tree(tree, stats, {'1500', '5000', '10'})
+
+        assert updated == merkle.build_hash_tree(stats)
+        assert updated['root'] != tree['root']
+
+    def test_update_removes_empty_buckets(self):
+        stats = {'1': {'name': 'A'}, '2500': {'name': 'B'}}
+        tree = merkle.build_hash_tree(stats)
+
+        del stats['2500']
+        updated = merkle.update_hash_tree(tree, stats, {'2500'})
+
+        assert '2' not in updated['buckets']
+        assert updated == merkle.build_hash_tree(stats)
+
+    def test_diff_identical_trees(self):
+        stats = _stats(100)
+
+        assert merkle.diff_hash_trees(merkle.build_hash_tree(stats), merkle.build_hash_tree(stats)) == []
+
+    def test_diff_reports_only_changed_buckets_and_cyclists(self):
+        stats_a = _stats(5000)
+        stats_b = _stats(5000)
+        stats_b['42']['name'] = 'Renamed'
+        stats_b['7000'] = {'name': 'Added'}
+        del stats_b['3001']
+
+        buckets = merkle.diff_hash_trees(merkle.build_hash_tree(stats_a), merkle.build_hash_tree(stats_b))
+        cyclists = merkle.diff_cyclists(stats_a, stats_b, buckets)
+
+        assert buckets == ['0', '3', '7']
+        assert cyclists == {'added': ['7000'], 'removed': ['3001'], 'changed': ['42']}
+
+    def test_sidecar_round_trip(self, tmp_path):
+        tree = merkle.build_hash_tree(_stats(10))
+        path = str(tmp_path / 'stats.hash.json')
+
+        merkle.write_hash_tree(tree, path)
+
+        assert merkle.load_hash_tree(path) == tree
+        assert merkle.load_hash_tree(str(tmp_path / 'missing.json')) is None
+
+
+class TestStatsHashSidecar:
+    """Test cases for keeping the stats.hash.json sidecar in sync with stats.yaml."""
+
+    def setup_method(self):
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_merkle_test_")
+        self.original_data_path = commons.DATA_PATH
+        commons.DATA_PATH = self.test_data_dir
+        os.makedirs(os.path.join(self.test_data_dir, 'ns', 'changes'))
+
+    def teardown_method(self):
+        commons.DATA_PATH = self.original_data_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def _write_change(self, name, stats):
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), name)
+        os.makedirs(change_dir, exist_ok=True)
+        change_file = os.path.join(change_dir, 'change.yaml')
+        with open(change_file, 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'date': '2025-08-11', 'stats': stats}, f)
+        return change_file
+
+    def test_update_stats_file_maintains_sidecar(self):
+        api.update_stats_file_with_changes('ns', self._write_change('c1', [
+            {'pcm_id': 1, 'name': 'A', 'fla': 70},
+            {'pcm_id': 2500, 'name': 'B', 'mo': 65}
+        ]))
+        api.update_stats_file_with_changes('ns', self._write_change('c2', [
+            {'pcm_id': 1, 'name': 'A', 'fla': 75}
+        ]))
+
+        tree = merkle.load_hash_tree(commons.get_path('ns', 'stats_hash'))
+        assert tree == dict(merkle.build_hash_tree(api.load_stats_data('ns')),
+                            stats_digest=merkle.hash_stats_file(commons.get_path('ns', 'stats_file')))
+
+    def test_sidecar_is_rebuilt_after_a_manual_edit(self):
+        api.update_stats_file_with_changes('ns', self._write_change('c1', [
+            {'pcm_id': 1, 'name': 'A', 'fla': 70},
+            {'pcm_id': 2500, 'name': 'B', 'mo': 65}
+        ]))
+        stats_file = commons.get_path('ns', 'stats_file')
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            f.write(content.replace('mo: 65', 'mo: 66'))
+
+        api.update_stats_file_with_changes('ns', self._write_change('c2', [
+            {'pcm_id': 1, 'name': 'A', 'fla': 75}
+        ]))
+
+        tree = merkle.load_hash_tree(commons.get_path('ns', 'stats_hash'))
+        assert tree['root'] == merkle.build_hash_tree(api.load_stats_data('ns'))['root']
+
+    def test_compare_namespaces(self):
+        api.update_stats_file_with_changes('ns', self._write_change('c1', [
+            {'pcm_id': 1, 'name': 'A', 'fla': 70}
+        ]))
+        shutil.copytree(commons.get_path('ns', 'root'), commons.get_path('other', 'root'))
+
+        assert api.compare_namespace_stats('ns', 'other')['identical'] is True
+
+        api.update_stats_file_with_changes('ns', self._write_change('c2', [
+            {'pcm_id': 1, 'name': 'A', 'fla': 80}
+        ]))
+        summary = api.compare_namespace_stats('ns', 'other')
+
+        assert summary['identical'] is False
+        assert summary['differing_buckets'] == ['0']
+        assert summary['cyclists_changed'] == ['1']
+
+    def test_compare_detects_stats_edited_without_the_sidecar(self):
+        api.update_stats_file_with_changes('ns', self._write_change('c1', [
+            {'pcm_id': 1, 'name': 'A', 'fla': 70},
+            {'pcm_id': 2500, 'name': 'B', 'mo': 65}
+        ]))
+        shutil.copytree(commons.get_path('ns', 'root'), commons.get_path('other', 'root'))
+        stats_file = commons.get_path('other', 'stats_file')
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            f.write(content.replace('mo: 65', 'mo: 66'))
+        with open(commons.get_path('other', 'stats_hash'), 'rb') as f:
+            sidecar = f.read()
+
+        summary = api.compare_namespace_stats('ns', 'other')
+
+        assert summary['identical'] is False
+        assert summary['differing_buckets'] == ['2']
+        assert summary['cyclists_changed'] == ['2500']
+        # Comparing is read-only: the stale sidecar is left for the next write of stats.yaml to refresh
+        with open(commons.get_path('other', 'stats_hash'), 'rb') as f:
+            assert f.read() == sidecar
+
+    def test_only_differing_buckets_are_loaded(self):
+        api.update_stats_file_with_changes('ns', self._write_change('c1', [
+            {'pcm_id': 1, 'name': 'A', 'fla': 70},
+            {'pcm_id': 2500, 'name': 'B', 'mo': 65},
+            {'pcm_id': 2501, 'name': 'C', 'mo': 60}
+        ]))
+
+        assert sorted(api._load_stats_buckets('ns', ['2'], 1000)) == ['2500', '2501']
+        assert api._load_stats_buckets('ns', ['7'], 1000) == {}
@@ -0,0 +1,128 @@
+"""
+Tests for per-stage pipeline metrics (src/utils/metrics.py).
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+from unittest.mock import patch
+
+import yaml
+
+from src import pcm_cli
+from src.utils import commons, metrics
+
+
+class TestStageMetrics:
+    """Test cases for recording stage metrics."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def teardown_method(self):
+        metrics.reset()
+
+    def test_stage_accumulates_calls_and_time(self):
+        for _ in range(2):
+            with metrics.stage('stats_load'):
+                time.sleep(0.01)
+
+        entry = metrics.get_stage_metrics()['stats_load']
+        assert entry['calls'] == 2
+        assert entry['wall_time'] >= 0.02
+        assert entry['cpu_time'] >= 0
+        assert set(entry) == {'calls', 'wall_time', 'cpu_time', 'peak_memory_bytes', 'memory_source'}
+
+    def test_stage_is_recorded_when_exception_is_raised(self):
+        try:
+            with metrics.stage('parse'):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+
+        assert metrics.get_stage_metrics()['parse']['calls'] == 1
+
+    def test_nested_stage_peak_memory_with_tracemalloc(self):
+        tracemalloc.start()
+        try:
+            with metrics.stage('outer'):
+                with metrics.stage('inner'):
+                    data = bytearray(2 * 1024 * 1024)
+                    del data
+        finally:
+            tracemalloc.stop()
+
+        stages = metrics.get_stage_metrics()
+        assert stages['inner']['memory_source'] == 'tracemalloc'
+        assert stages['inner']['peak_memory_bytes'] >= 2 * 1024 * 1024
+        assert stages['outer']['peak_memory_bytes'] >= stages['inner']['peak_memory_bytes']
+
+    def test_rss_peak_growth_without_tracemalloc(self):
+        # Process peak RSS at the start and end of each stage: it never goes down
+        with patch('src.utils.metrics._peak_rss_bytes', side_effect=[100, 300, 300, 300]):
+            with metrics.stage('stats_load'):
+                pass
+            with metrics.stage('stats_write'):
+                pass
+
+        stages = metrics.get_stage_metrics()
+        assert stages['stats_load']['memory_source'] == 'rss_peak_growth'
+        assert stages['stats_load']['peak_memory_bytes'] == 200
+        assert stages['stats_write']['peak_memory_bytes'] == 0
+
+    def test_write_metrics_file(self, tmp_path):
+        with metrics.stage('fetch'):
+            pass
+        path = str(tmp_path / 'out' / 'metrics.json')
+
+        metrics.write_metrics_file(path, 'process-changes', 1.5, True)
+
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        assert data['command'] == 'process-changes'
+        assert data['success'] is True
+        assert data['stages']['fetch']['calls'] == 1
+
+
+class TestCliMetrics:
+    """Test cases for metrics in the process-changes summary and --metrics-file."""
+
+    def setup_method(self):
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_metrics_test_")
+        self.original_data_path = commons.DATA_PATH
+        self.original_model_dir_path = commons.MODEL_DIR_PATH
+        commons.DATA_PATH = self.test_data_dir
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        commons.MODEL_DIR_PATH = os.path.join(project_root, 'src', 'model')
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), 'c1')
+        os.makedirs(change_dir)
+        with open(os.path.join(change_dir, 'change.yaml'), 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'date': '2025-08-11', 'stats': [{'pcm_id': 1, 'name': 'A', 'fla': 70}]}, f)
+
+    def teardown_method(self):
+        commons.DATA_PATH = self.original_data_path
+        commons.MODEL_DIR_PATH = self.original_model_dir_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_process_changes_reports_stage_metrics(self):
+        metrics_file = os.path.join(self.test_data_dir, 'metrics.json')
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
+                patch('sys.argv', ['pcm_cli.py', 'process-changes', '--metrics-file', metrics_file]):
+            exit_code = pcm_cli.main()
+
+        summary_line = next(line for line in mock_stdout.getvalue().splitlines() if line.startswith('{'))
+        summary = json.loads(summary_line)
+        expected_stages = {'namespace_discovery', 'sql_generation', 'stats_load', 'stats_write'}
+        assert exit_code == 0
+        assert expected_stages <= set(summary['metrics'])
+
+        with open(metrics_file, encoding='utf-8') as f:
+            data = json.load(f)
+        assert data['command'] == 'process-changes'
+        assert expected_stages <= set(data['stages'])
+        assert data['wall_time'] > 0
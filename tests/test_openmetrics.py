@@ -0,0 +1,130 @@
+"""
+Tests for the OpenMetrics text-file exporter (src/utils/openmetrics.py).
+"""
+
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import yaml
+
+from src import pcm_cli
+from src.utils import commons, metrics, openmetrics
+
+
+class TestOpenMetricsRendering:
+    """Test cases for rendering recorded metrics."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def teardown_method(self):
+        metrics.reset()
+
+    def test_render_stages_counters_and_observations(self):
+        with metrics.stage('sql_generation'):
+            pass
+        metrics.increment('changes_processed', 3)
+        metrics.observe('fetch_attempt_duration_seconds', 0.5, method='proxy', outcome='failure')
+        metrics.observe('fetch_attempt_duration_seconds', 1.5, method='proxy', outcome='failure')
+
+        text = openmetrics.render_openmetrics('process-changes', True, 2.0, finished_at=1700000000)
+        lines = text.splitlines()
+
+        assert lines[-1] == '# EOF'
+        assert 'pcm_run_success{command="process-changes"} 1' in lines
+        assert 'pcm_run_duration_seconds{command="process-changes"} 2.0' in lines
+        assert '# TYPE pcm_stage_duration_seconds gauge' in lines
+        assert 'pcm_stage_calls{command="process-changes",stage="sql_generation"} 1' in lines
+        assert '# TYPE pcm_changes_processed gauge' in lines
+        assert 'pcm_changes_processed{command="process-changes"} 3' in lines
+        assert '# TYPE pcm_fetch_attempt_duration_seconds summary' in lines
+        labels = 'command="process-changes",method="proxy",outcome="failure"'
+        assert f'pcm_fetch_attempt_duration_seconds_count{{{labels}}} 2' in lines
+        assert f'pcm_fetch_attempt_duration_seconds_sum{{{labels}}} 2.0' in lines
+
+    def test_every_family_has_help_and_type(self):
+        metrics.increment('cyclists_matched', 2)
+        lines = openmetrics.render_openmetrics('process-automated-change', False, 1.0).splitlines()
+
+        for index, line in enumerate(lines):
+            if line.startswith('# HELP'):
+                assert lines[index + 1].startswith('# TYPE ' + line.split()[2])
+        assert 'pcm_run_success{command="process-automated-change"} 0' in lines
+
+    def test_label_values_are_escaped(self):
+        metrics.increment('yaml_files_validated', kind='a"b\\c')
+
+        text = openmetrics.render_openmetrics('validate-yaml', True, 1.0)
+
+        assert 'kind="a\\"b\\\\c"' in text
+
+    def test_write_is_atomic(self, tmp_path):
+        path = str(tmp_path / 'pcm.prom')
+
+        openmetrics.write_openmetrics_file(path, 'process-uat', True, 0.25)
+
+        assert os.listdir(str(tmp_path)) == ['pcm.prom']
+        with open(path, encoding='utf-8') as f:
+            assert f.read().endswith('# EOF\n')
+
+
+class TestFetchAttemptMetrics:
+    """Test cases for fetch attempt latencies recorded by commons."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def teardown_method(self):
+        metrics.reset()
+
+    @patch('requests.Session')
+    def test_direct_request_is_recorded_as_http(self, mock_session_class):
+        response = MagicMock(content=b'<html></html>')
+        mock_session_class.return_value.get.return_value = response
+
+        content, success, _ = commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=False)
+
+        observations = metrics.get_observations()
+        assert success is True
+        assert [(o['labels']['method'], o['labels']['outcome'], o['count']) for o in observations] == [('http', 'success', 1)]
+
+    @patch('src.utils.commons._fetch_with_selenium')
+    def test_selenium_attempt_is_recorded(self, mock_fetch):
+        mock_fetch.return_value = (None, False, "Selenium not installed")
+
+        commons.fetch_with_selenium('https://firstcycling.com/race.php?r=1')
+
+        assert metrics.get_observations()[0]['labels'] == {'method': 'selenium', 'outcome': 'failure'}
+
+
+class TestCliOpenMetrics:
+    """Test cases for pcm_cli --openmetrics-file."""
+
+    def setup_method(self):
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_openmetrics_test_")
+        self.original_data_path = commons.DATA_PATH
+        commons.DATA_PATH = self.test_data_dir
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), 'c1')
+        os.makedirs(change_dir)
+        with open(os.path.join(change_dir, 'change.yaml'), 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'date': '2025-08-11', 'stats': [{'pcm_id': 1, 'name': 'A', 'fla': 70}]}, f)
+
+    def teardown_method(self):
+        commons.DATA_PATH = self.original_data_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_validate_yaml_writes_textfile(self):
+        path = os.path.join(self.test_data_dir, 'textfile', 'pcm_validate.prom')
+
+        with patch('sys.stdout', new_callable=StringIO), \
+                patch('sys.argv', ['pcm_cli.py', 'validate-yaml', '--openmetrics-file', path]):
+            exit_code = pcm_cli.main()
+
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        assert exit_code == 0
+        assert 'pcm_run_success{command="validate-yaml"} 1' in text
+        assert 'pcm_yaml_files_validated{command="validate-yaml",kind="change",result="valid"} 1' in text
@@ -375,6 +375,71 @@ procyclingstats"""
         # process should not be called if parse fails
         mock_process.assert_not_called()
 
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('src.pcm_cli.model_api.process_automated_change_batch')
+    def test_process_automated_batch(self, mock_batch, mock_stdout):
+        """Test process_automated_batch printing one JSON result per issue."""
+        import json
+        mock_batch.return_value = iter([
+            {'line': 1, 'title': '[STATS CR] Stage 1', 'success': True, 'cyclists_found': 2,
+             'change_file_path': 'data/ns/changes/stage-1/change.yaml', 'error': None,
+             'form_data': {'change_name': 'stage-1', 'namespace': 'ns', 'branch_name': 'change/stage-1'}},
+            {'line': 2, 'title': None, 'success': False, 'cyclists_found': 0, 'change_file_path': None,
+             'error': 'Invalid issue on line 2: Expecting value', 'form_data': None},
+        ])
+        
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as f:
+            f.write('{"body": "..."}\nnot json\n')
+        try:
+            result = pcm_cli.process_automated_batch(f.name, fetch_workers=2, deadline=600.0)
+        finally:
+            os.remove(f.name)
+        
+        assert result is False
+        assert mock_batch.call_args.kwargs == {'max_workers': 2, 'deadline': 600.0}
+        printed = [json.loads(line) for line in mock_stdout.getvalue().splitlines() if line.startswith('{')]
+        assert printed[0] == {'line': 1, 'title': '[STATS CR] Stage 1', 'success': True, 'change_name': 'stage-1',
+                              'namespace': 'ns', 'branch_name': 'change/stage-1', 'cyclists_found': 2,
+                              'change_file_path': 'data/ns/changes/stage-1/change.yaml', 'error': None}
+        assert printed[1]['success'] is False
+        assert printed[1]['change_name'] is None
+
+    @patch('sys.stderr', new_callable=StringIO)
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('src.pcm_cli.model_api.process_automated_change_batch')
+    def test_main_process_automated_batch_stdout_is_json_only(self, mock_batch, mock_stdout, mock_stderr):
+        """Test that process-automated-batch logs to stderr, so every stdout line is a JSON result."""
+        import json
+        from src.utils.logs import get_logger
+        
+        def batch(stream, **options):
+            get_logger('src.api').info("🌐 Scraping 1 race pages with 1 workers...")
+            yield {'line': 1, 'title': '[STATS CR] Stage 1', 'success': True, 'cyclists_found': 2,
+                   'change_file_path': 'data/ns/changes/stage-1/change.yaml', 'error': None,
+                   'form_data': {'change_name': 'stage-1', 'namespace': 'ns', 'branch_name': 'change/stage-1'}}
+        
+        mock_batch.side_effect = batch
+        
+        with patch('sys.argv', ['pcm_cli.py', 'process-automated-batch', '-']):
+            result = pcm_cli.main()
+        
+        assert result == 0
+        lines = mock_stdout.getvalue().splitlines()
+        assert [json.loads(line)['change_name'] for line in lines] == ['stage-1']
+        assert 'Scraping 1 race pages' in mock_stderr.getvalue()
+        assert 'Processed 1 change requests' in mock_stderr.getvalue()
+
+    @patch('sys.argv', ['pcm_cli.py', 'process-automated-batch', '-', '--deadline', '900'])
+    @patch('src.pcm_cli.process_automated_batch')
+    def test_main_process_automated_batch(self, mock_batch):
+        """Test main function with process-automated-batch command reading stdin."""
+        mock_batch.return_value = True
+        
+        result = pcm_cli.main()
+        
+        assert result == 0
+        mock_batch.assert_called_once_with('-', deadline=900.0)
+
     @patch('sys.argv', ['pcm_cli.py', 'help'])
     @patch('sys.stdout', new_callable=StringIO)
     def test_main_help_command(self, mock_stdout):
@@ -443,6 +508,44 @@ procyclingstats"""
         assert result == 1  # Should exit with error code
         mock_process.assert_called_once_with('test_issue_body', None, None)
 
+    @patch('sys.argv', ['pcm_cli.py', 'process-automated-change', 'test_issue_body',
+                        '--race-url', 'https://firstcycling.com/race.php?r=1',
+                        '--race-url', 'https://firstcycling.com/race.php?r=2', '--fetch-workers', '2'])
+    @patch('src.pcm_cli.process_automated_change')
+    def test_main_process_automated_change_race_urls(self, mock_process):
+        """Test main function passing --race-url and --fetch-workers to process-automated-change."""
+        mock_process.return_value = True
+        
+        result = pcm_cli.main()
+        
+        assert result == 0
+        mock_process.assert_called_once_with('test_issue_body', None, None,
+                                             race_urls=['https://firstcycling.com/race.php?r=1',
+                                                        'https://firstcycling.com/race.php?r=2'],
+                                             fetch_workers=2)
+
+    @patch('sys.argv', ['pcm_cli.py', 'process-automated-change', 'test_issue_body', '--deadline', '600'])
+    @patch('src.pcm_cli.process_automated_change')
+    def test_main_process_automated_change_deadline(self, mock_process):
+        """Test main function passing --deadline to process-automated-change."""
+        mock_process.return_value = True
+        
+        result = pcm_cli.main()
+        
+        assert result == 0
+        mock_process.assert_called_once_with('test_issue_body', None, None, deadline=600.0)
+
+    @patch('sys.argv', ['pcm_cli.py', 'process-automated-change', 'test_issue_body', '--deadline', '0'])
+    @patch('src.pcm_cli.process_automated_change')
+    def test_main_process_automated_change_zero_deadline(self, mock_process):
+        """Test that --deadline 0 is passed on instead of being taken for no deadline."""
+        mock_process.return_value = True
+        
+        result = pcm_cli.main()
+        
+        assert result == 0
+        mock_process.assert_called_once_with('test_issue_body', None, None, deadline=0.0)
+
     @patch('sys.argv', ['pcm_cli.py', 'process-automated-change'])
     @patch('sys.stdout', new_callable=StringIO)
     def test_main_process_automated_change_missing_args(self, mock_stdout):
@@ -0,0 +1,131 @@
+"""
+Tests for planning change processing without side effects (process-changes --plan).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import yaml
+
+from src import api, pcm_cli
+from src.utils import commons
+
+
+class TestPlanMode:
+    """Test cases for the dry-run impact report."""
+
+    def setup_method(self):
+        """Set up a temporary namespace with one processed change."""
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_plan_test_")
+        self.original_data_path = commons.DATA_PATH
+        self.original_model_dir_path = commons.MODEL_DIR_PATH
+        commons.DATA_PATH = self.test_data_dir
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        commons.MODEL_DIR_PATH = os.path.join(project_root, 'src', 'model')
+        os.makedirs(commons.get_path('ns', 'changes_dir'))
+
+        api.create_new_database('ns', 'tracking')
+        self.write_change('a-change', [{'pcm_id': 1, 'name': 'A', 'fla': 70, 'mo': 60}])
+        api.process_new_change_files('ns')
+        api.process_uat_namespace('ns')
+
+    def teardown_method(self):
+        """Clean up the temporary namespace."""
+        commons.DATA_PATH = self.original_data_path
+        commons.MODEL_DIR_PATH = self.original_model_dir_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def write_change(self, name, stats):
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), name)
+        os.makedirs(change_dir, exist_ok=True)
+        with open(os.path.join(change_dir, 'change.yaml'), 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'date': '2025-08-11', 'stats': stats}, f)
+
+    def snapshot(self):
+        files = {}
+        for root, _, names in os.walk(self.test_data_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    files[path] = hashlib.sha256(f.read()).hexdigest()
+        return files
+
+    def test_plan_reports_changes_without_writing(self):
+        self.write_change('b-change', [{'pcm_id': 1, 'name': 'A', 'fla': 75, 'mo': 60},
+                                       {'pcm_id': 2, 'name': 'B', 'hil': 65}])
+        before = self.snapshot()
+
+        report = api.plan_namespace('ns')
+
+        assert self.snapshot() == before
+        assert report['pending_changes'] == 1
+        change = report['changes']['b-change']
+        assert {(row['pcm_id'], row['stat'], row['old_value'], row['new_value'])
+                for row in change['inserted_stat_rows']} == {('1', 'fla', 70, 75), ('2', 'hil', None, 65)}
+        assert change['noop_stats_skipped'] == [{'pcm_id': '1', 'stat': 'mo', 'value': 60}]
+        assert change['cyclists_added'] == ['2']
+        assert change['tracking_cyclists_added'] == ['2']
+        assert change['error'] is None
+
+    def test_plan_matches_actual_processing(self):
+        self.write_change('b-change', [{'pcm_id': 1, 'name': 'A', 'fla': 75}, {'pcm_id': 2, 'name': 'B', 'hil': 65}])
+
+        report = api.plan_namespace('ns')
+        summary = api.process_new_change_files('ns')
+
+        assert report['pending_changes'] == summary['processed_files']
+        assert report['totals']['stat_rows'] == 2
+        assert sorted(api.load_stats_data('ns')) == ['1'] + report['changes']['b-change']['cyclists_added']
+
+    def test_plan_reports_conflicts_and_errors(self):
+        self.write_change('b-change', [{'pcm_id': 1, 'name': 'A', 'fla': 75}])
+        self.write_change('c-change', [{'pcm_id': 1, 'name': 'A', 'fla': 80}])
+        self.write_change('d-change', [{'pcm_id': 3, 'name': 'C'}])
+        with open(os.path.join(commons.get_path('ns', 'changes_dir'), 'd-change', 'change.yaml'), 'w') as f:
+            f.write("author: Tester\n")
+
+        report = api.plan_namespace('ns')
+
+        assert [(c['pcm_id'], c['stat']) for c in report['conflicts']] == [('1', 'fla')]
+        assert report['changes']['c-change']['inserted_stat_rows'][0]['old_value'] == 70
+        assert report['changes']['d-change']['error']
+        assert report['totals']['errors'] == 1
+
+    def test_plan_without_tracking_database(self):
+        os.remove(commons.get_path('ns', 'tracking_db'))
+        before = self.snapshot()
+
+        report = api.plan_namespace('ns')
+
+        assert self.snapshot() == before
+        assert list(report['changes']) == ['a-change']
+
+    def test_cli_prints_json_only(self):
+        self.write_change('b-change', [{'pcm_id': 1, 'name': 'A', 'fla': 75}])
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
+                patch('sys.argv', ['pcm_cli.py', 'process-changes', '--plan']):
+            exit_code = pcm_cli.main()
+
+        report = json.loads(mock_stdout.getvalue())
+        assert exit_code == 0
+        assert report['plan'] is True
+        assert report['namespaces']['ns']['totals']['stat_rows'] == 1
+
+    def test_cli_logs_to_stderr_in_incremental_plan(self):
+        self.write_change('b-change', [{'pcm_id': 1, 'name': 'A', 'fla': 75}])
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
+                patch('sys.stderr', new_callable=StringIO) as mock_stderr, \
+                patch('sys.argv', ['pcm_cli.py', 'process-changes', '--plan', '--incremental']):
+            exit_code = pcm_cli.main()
+
+        report = json.loads(mock_stdout.getvalue())
+        assert exit_code == 0
+        assert report['namespaces']['ns']['totals']['stat_rows'] == 1
+        assert 'falling back to full scan' in mock_stderr.getvalue()
@@ -16,6 +16,7 @@ sys.path.insert(0, project_root)
 
 from src.pcm_cli import process_changes
 from src.utils import commons
+from src.utils.logs import configure_logging
 
 
 class TestProcessChanges:
@@ -39,6 +40,9 @@ class TestProcessChanges:
         # Change to test directory
         os.chdir(self.test_data_dir)
         
+        # Log to stdout like the CLI
+        configure_logging()
+        
     def teardown_method(self):
         """Clean up test environment after each test."""
         # Restore original settings
@@ -249,6 +253,33 @@ class TestProcessChanges:
         assert "✅ Processing completed successfully with new changes!" in output
         assert "Added new cyclist" in output or "New cyclists added: 1" in output
     
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_new_cyclist_in_several_pending_changes(self, mock_stdout):
+        """Test that two pending changes adding the same new cyclist both apply in UAT."""
+        from src.api import process_new_change_files, process_uat_namespace
+
+        test_changes = {
+            "a-first-change": {
+                "author": "Test Author",
+                "date": "2025-08-11",
+                "stats": [{"pcm_id": "99999", "name": "New Cyclist", "fla": 80}]
+            },
+            "b-second-change": {
+                "author": "Test Author",
+                "date": "2025-08-12",
+                "stats": [{"pcm_id": "99999", "name": "New Cyclist", "mo": 70}]
+            }
+        }
+
+        self.create_test_namespace("shared_cyclist_namespace", test_changes, {})
+        self.create_tracking_database("shared_cyclist_namespace")
+
+        process_new_change_files("shared_cyclist_namespace")
+        result = process_uat_namespace("shared_cyclist_namespace")
+
+        assert result["success"] is True
+        assert result["changes_executed"] == 2
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_process_changes_stat_updates(self, mock_stdout):
         """Test processing that updates existing cyclist stats."""
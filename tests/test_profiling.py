@@ -0,0 +1,105 @@
+"""
+Tests for the built-in command profiler (src/utils/profiling.py).
+"""
+
+import os
+import pstats
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from src import pcm_cli
+from src.utils import commons, metrics, profiling
+
+
+def _busy_stats_load():
+    return sum(i * i for i in range(20000))
+
+
+def _allocate_rows():
+    return [{'pcm_id': i, 'fla': i % 85} for i in range(5000)]
+
+
+class TestCommandProfiler:
+    """Test cases for cpu and mem profiling with named spans."""
+
+    def test_cpu_profile_attributes_spans(self, tmp_path):
+        profiler = profiling.CommandProfiler('cpu', str(tmp_path), 'pcm-test', top=10)
+        profiler.start()
+        with metrics.stage('stats_load'):
+            _busy_stats_load()
+        pstats_path, summary_path = profiler.stop()
+
+        functions = {func[2] for func in pstats.Stats(pstats_path).stats}
+        assert '_busy_stats_load' in functions
+        with open(summary_path, encoding='utf-8') as f:
+            summary = f.read()
+        assert '== Span: stats_load ==' in summary
+        assert '_busy_stats_load' in summary.split('== Span: stats_load ==')[1]
+
+    def test_mem_profile_lists_allocation_sites(self, tmp_path):
+        profiler = profiling.CommandProfiler('mem', str(tmp_path), 'pcm-test', top=10)
+        profiler.start()
+        with metrics.stage('sql_generation'):
+            rows = _allocate_rows()
+        paths = profiler.stop()
+
+        with open(paths[0], encoding='utf-8') as f:
+            summary = f.read()
+        assert len(rows) == 5000
+        assert 'Top 10 allocation sites' in summary
+        assert '== Span: sql_generation' in summary
+        assert 'test_profiling.py' in summary.split('== Span: sql_generation')[1]
+
+    def test_listener_is_removed_after_stop(self, tmp_path):
+        profiler = profiling.CommandProfiler('cpu', str(tmp_path))
+        profiler.start()
+        profiler.stop()
+
+        assert profiler.span not in metrics._listeners
+
+    def test_unknown_mode_is_rejected(self):
+        with pytest.raises(ValueError):
+            profiling.CommandProfiler('gpu')
+
+    def test_bare_profile_flag_defaults_to_cpu(self):
+        assert profiling.normalize_profile_argv(['--profile', 'process-changes']) == ['--profile=cpu', 'process-changes']
+        assert profiling.normalize_profile_argv(['--profile=mem', 'process-uat']) == ['--profile=mem', 'process-uat']
+
+
+class TestCliProfiling:
+    """Test cases for pcm_cli --profile."""
+
+    def setup_method(self):
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_profile_test_")
+        self.original_data_path = commons.DATA_PATH
+        self.original_model_dir_path = commons.MODEL_DIR_PATH
+        commons.DATA_PATH = os.path.join(self.test_data_dir, 'data')
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        commons.MODEL_DIR_PATH = os.path.join(project_root, 'src', 'model')
+        change_dir = os.path.join(commons.get_path('ns', 'changes_dir'), 'c1')
+        os.makedirs(change_dir)
+        with open(os.path.join(change_dir, 'change.yaml'), 'w', encoding='utf-8') as f:
+            yaml.dump({'author': 'Tester', 'date': '2025-08-11', 'stats': [{'pcm_id': 1, 'name': 'A', 'fla': 70}]}, f)
+
+    def teardown_method(self):
+        commons.DATA_PATH = self.original_data_path
+        commons.MODEL_DIR_PATH = self.original_model_dir_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_profile_process_changes(self):
+        profile_dir = os.path.join(self.test_data_dir, 'profiles')
+        argv = ['pcm_cli.py', '--profile', 'process-changes', '--profile-dir', profile_dir]
+
+        with patch('sys.stdout', new_callable=StringIO), patch('sys.argv', argv):
+            exit_code = pcm_cli.main()
+
+        files = sorted(os.listdir(profile_dir))
+        assert exit_code == 0
+        assert [os.path.splitext(name)[1] for name in files] == ['.txt', '.pstats']
+        with open(os.path.join(profile_dir, files[0]), encoding='utf-8') as f:
+            assert '== Span: sql_generation ==' in f.read()
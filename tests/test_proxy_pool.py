@@ -0,0 +1,151 @@
+"""
+Tests for the cached, health-scored proxy pool (src/utils/proxy_pool.py).
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.utils import commons, metrics, proxy_pool
+
+PROXIES = [{'host': '10.0.0.1', 'port': 8080}, {'host': '10.0.0.2', 'port': 8080}, {'host': '10.0.0.3', 'port': 3128}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def keys(proxies):
+    return [proxy_pool.proxy_key(proxy) for proxy in proxies]
+
+
+def test_proxy_list_is_cached_for_the_ttl():
+    clock = FakeClock()
+    pool = proxy_pool.ProxyPool(list_ttl=600, clock=clock)
+    fetch = MagicMock(return_value=PROXIES)
+
+    pool.get_proxies(fetch)
+    clock.now += 599
+    assert keys(pool.get_proxies(fetch)) == keys(PROXIES)
+    assert fetch.call_count == 1
+
+    clock.now += 1
+    pool.get_proxies(fetch)
+    assert fetch.call_count == 2
+
+
+def test_empty_proxy_list_is_not_cached():
+    pool = proxy_pool.ProxyPool()
+    fetch = MagicMock(side_effect=[[], PROXIES])
+
+    assert pool.get_proxies(fetch) == []
+    assert keys(pool.get_proxies(fetch)) == keys(PROXIES)
+
+
+def test_proxies_are_ranked_by_success_rate_and_latency():
+    pool = proxy_pool.ProxyPool()
+    fast, slow, failing = PROXIES
+    pool.record_success(slow, 4.0)
+    pool.record_success(fast, 0.2)
+    pool.record_failure(failing)
+
+    assert keys(pool.rank(PROXIES[::-1] + [{'host': '10.0.0.4', 'port': 80}])) == [
+        '10.0.0.1:8080', '10.0.0.4:80', '10.0.0.2:8080', '10.0.0.3:3128']
+    assert pool.score({'host': '10.0.0.4', 'port': 80}) == 0.5
+
+
+def test_circuit_breaker():
+    clock = FakeClock()
+    pool = proxy_pool.ProxyPool(clock=clock)
+    proxy = PROXIES[0]
+    metrics.reset()
+
+    for _ in range(proxy_pool.CIRCUIT_FAILURES):
+        assert not pool.is_open(proxy)
+        pool.record_failure(proxy)
+    assert pool.is_open(proxy)
+    assert keys(pool.rank(PROXIES)) == keys(PROXIES[1:])
+
+    # Half-open after the cooldown: one more failure opens the circuit for twice as long
+    clock.now += proxy_pool.CIRCUIT_COOLDOWN
+    assert not pool.is_open(proxy)
+    pool.record_failure(proxy)
+    clock.now += proxy_pool.CIRCUIT_COOLDOWN
+    assert pool.is_open(proxy)
+    clock.now += proxy_pool.CIRCUIT_COOLDOWN
+
+    pool.record_success(proxy, 1.0)
+    pool.record_failure(proxy)
+    assert not pool.is_open(proxy)
+    assert [counter['value'] for counter in metrics.get_counters()
+            if counter['name'] == 'proxy_circuits_opened'] == [2]
+    metrics.reset()
+
+
+def test_state_persists_across_runs(tmp_path):
+    state_file = str(tmp_path / 'state' / 'proxies.json')
+    pool = proxy_pool.ProxyPool(state_file)
+    pool.get_proxies(lambda: PROXIES)
+    pool.record_success(PROXIES[2], 0.5)
+
+    reloaded = proxy_pool.ProxyPool(state_file)
+    fetch = MagicMock()
+
+    assert keys(reloaded.get_proxies(fetch)) == ['10.0.0.3:3128', '10.0.0.1:8080', '10.0.0.2:8080']
+    fetch.assert_not_called()
+    assert [name for name in os.listdir(os.path.dirname(state_file))] == ['proxies.json']
+
+
+def test_in_memory_pool_when_replaying(monkeypatch):
+    monkeypatch.setenv('PCM_FETCH_MODE', 'replay')
+
+    assert proxy_pool.get_proxy_pool().state_file is None
+    assert proxy_pool.get_proxy_pool() is not proxy_pool.get_proxy_pool()
+
+
+class TestProxyRotation:
+    """Test cases for the pool in commons.make_request_with_proxy_rotation."""
+
+    @patch('src.utils.commons.get_proxy_list')
+    @patch('requests.Session')
+    def test_working_proxy_is_tried_first_without_sleeping(self, mock_session_class, mock_get_proxy_list):
+        mock_get_proxy_list.return_value = PROXIES
+        used = []
+
+        def fake_get(url, proxies=None, **kwargs):
+            used.append(proxies['http'] if proxies else 'direct')
+            if proxies and proxies['http'].endswith('10.0.0.3:3128'):
+                return MagicMock(status_code=200, content=b'<html>race</html>')
+            raise requests.exceptions.ProxyError('dead proxy')
+
+        mock_session_class.return_value.get.side_effect = fake_get
+
+        with patch('src.utils.cassettes.time.sleep') as mock_sleep:
+            first = commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=True)
+            second = commons.make_request_with_proxy_rotation('https://example.com/race', use_proxies=True)
+
+        assert first == second == (b'<html>race</html>', True, None)
+        assert used == ['http://10.0.0.1:8080', 'http://10.0.0.2:8080', 'http://10.0.0.3:3128',
+                        'http://10.0.0.3:3128']
+        assert mock_get_proxy_list.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch('src.utils.commons.get_proxy_list', return_value=[])
+    @patch('requests.Session')
+    def test_direct_retries_still_back_off(self, mock_session_class, _):
+        forbidden = MagicMock(status_code=403)
+        forbidden.raise_for_status.side_effect = requests.exceptions.HTTPError(response=forbidden)
+        mock_session_class.return_value.get.return_value = forbidden
+
+        with patch('src.utils.cassettes.time.sleep') as mock_sleep:
+            content, success, error = commons.make_request_with_proxy_rotation('https://example.com/race',
+                                                                               use_proxies=True)
+
+        assert (content, success) == (None, False)
+        assert 'Access denied (403)' in error
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [2, 5]
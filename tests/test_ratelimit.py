@@ -0,0 +1,38 @@
+"""
+Tests for the per-host token buckets (src/utils/ratelimit.py).
+"""
+
+from src.utils import ratelimit
+
+
+class FakeClock:
+    """Clock that only advances when the test moves it."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_host():
+    assert ratelimit.get_host('https://www.FirstCycling.com/race.php?r=1') == 'firstcycling.com'
+    assert ratelimit.get_host('http://firstcycling.com:8080/') == 'firstcycling.com'
+    assert ratelimit.get_host('not a url') == ''
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    clock = FakeClock()
+    bucket = ratelimit.TokenBucket(0.5, burst=2, clock=clock)
+
+    assert [bucket.reserve('https://firstcycling.com/') for _ in range(4)] == [0.0, 0.0, 2.0, 4.0]
+    assert bucket.reserve('https://example.com/') == 0.0
+
+    clock.now += 10.0  # The owed tokens are paid back and the bucket refills up to its size
+    assert [bucket.reserve('https://firstcycling.com/') for _ in range(3)] == [0.0, 0.0, 2.0]
+
+
+def test_token_bucket_without_rate_never_waits():
+    bucket = ratelimit.TokenBucket(0)
+
+    assert [bucket.reserve('https://firstcycling.com/') for _ in range(3)] == [0.0, 0.0, 0.0]
@@ -0,0 +1,162 @@
+"""
+Tests for reproducible synthetic namespaces (gen-synthetic).
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+
+from src import api, pcm_cli
+from src.utils import commons, synthetic
+
+
+def _read_tree(root_path):
+    """Return the text files of a namespace keyed by relative path (the SQLite files are skipped)."""
+    files = {}
+    for dir_path, _, file_names in os.walk(root_path):
+        for file_name in file_names:
+            if file_name.endswith('.sqlite'):
+                continue
+            path = os.path.join(dir_path, file_name)
+            with open(path, encoding='utf-8') as f:
+                files[os.path.relpath(path, root_path)] = f.read()
+    return files
+
+
+class TestSyntheticNamespace:
+    """Test cases for generate_synthetic_namespace."""
+
+    def setup_method(self):
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_synthetic_test_")
+        self.original_data_path = commons.DATA_PATH
+        self.original_model_dir_path = commons.MODEL_DIR_PATH
+        commons.DATA_PATH = self.test_data_dir
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        commons.MODEL_DIR_PATH = os.path.join(project_root, 'src', 'model')
+
+    def teardown_method(self):
+        commons.DATA_PATH = self.original_data_path
+        commons.MODEL_DIR_PATH = self.original_model_dir_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def generate(self, namespace, **kwargs):
+        options = dict(cyclists=60, changes=3, stats_per_change=10, history_depth=2, seed=7)
+        options.update(kwargs)
+        return api.generate_synthetic_namespace(namespace, **options)
+
+    def test_same_seed_produces_identical_files(self):
+        self.generate('first')
+        self.generate('second')
+        self.generate('other-seed', seed=8)
+
+        first = _read_tree(commons.get_path('first', 'root'))
+        assert first == _read_tree(commons.get_path('second', 'root'))
+        assert first != _read_tree(commons.get_path('other-seed', 'root'))
+
+    def test_init_database_and_stats_file(self):
+        summary = self.generate('ns')
+
+        conn = sqlite3.connect(os.path.join(summary['path'], 'init_cdb.sqlite'))
+        try:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(DYN_cyclist)")]
+            row_count = conn.execute("SELECT COUNT(*) FROM DYN_cyclist").fetchone()[0]
+        finally:
+            conn.close()
+        stats_data = api.load_stats_data('ns')
+
+        assert row_count == 60
+        assert set(commons.STAT_COLUMN_MAPPING.values()) <= set(columns)
+        assert summary['cyclists'] == len(stats_data) == 60
+        assert all(set(cyclist['stats']) == set(commons.STAT_KEYS) for cyclist in stats_data.values())
+
+    def test_history_is_recorded_and_pending_changes_process(self):
+        summary = self.generate('ns')
+
+        conn = api.get_database_connection('ns', read_only=True)
+        try:
+            recorded = [row[0] for row in conn.execute("SELECT name FROM tbl_changes ORDER BY name")]
+            history_rows = conn.execute("SELECT COUNT(*) FROM tbl_change_stat_history").fetchone()[0]
+        finally:
+            conn.close()
+        result = api.process_new_change_files('ns')
+
+        assert recorded == ['2025-01-01-synthetic-history-0001', '2025-01-02-synthetic-history-0002']
+        assert history_rows == summary['history_stat_rows'] == 20
+        assert result['modified_changes'] == []
+        assert result['processed_files'] == 3
+        assert result['new_changes'] > 0
+
+    def test_history_values_match_stats_file(self):
+        self.generate('ns', history_depth=3, changes=0)
+
+        conn = api.get_database_connection('ns', read_only=True)
+        try:
+            latest = conn.execute("""
+                SELECT c.pcm_id, h.stat_name, h.stat_value FROM tbl_change_stat_history h
+                JOIN tbl_cyclists c ON c.id = h.cyclist_id
+                WHERE h.version = (SELECT MAX(version) FROM tbl_change_stat_history
+                                   WHERE cyclist_id = h.cyclist_id AND stat_name = h.stat_name)
+            """).fetchall()
+        finally:
+            conn.close()
+        stats_data = api.load_stats_data('ns')
+
+        assert latest
+        assert all(stats_data[pcm_id]['stats'][stat] == value for pcm_id, stat, value in latest)
+
+    def test_existing_namespace_is_refused(self):
+        os.makedirs(commons.get_path('ns', 'root'))
+
+        with pytest.raises(FileExistsError):
+            self.generate('ns')
+
+    def test_change_stats_respect_edit_budget(self):
+        rng = synthetic.create_rng(1)
+        stats_data = {str(i): {'name': f'Rider {i}', 'stats': {'fla': 60}} for i in range(1, 11)}
+
+        entries = synthetic.generate_change_stats(stats_data, list(stats_data), 7, rng)
+
+        edits = sum(1 for entry in entries for key in entry if key in commons.STAT_KEYS)
+        assert edits == 7
+        assert len({entry['pcm_id'] for entry in entries}) == len(entries)
+        assert stats_data['1']['stats'] == {'fla': 60}
+
+
+class TestCliGenSynthetic:
+    """Test cases for pcm_cli gen-synthetic."""
+
+    def setup_method(self):
+        self.test_data_dir = tempfile.mkdtemp(prefix="pcm_synthetic_cli_test_")
+        self.original_data_path = commons.DATA_PATH
+        self.original_model_dir_path = commons.MODEL_DIR_PATH
+        commons.DATA_PATH = self.test_data_dir
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        commons.MODEL_DIR_PATH = os.path.join(project_root, 'src', 'model')
+
+    def teardown_method(self):
+        commons.DATA_PATH = self.original_data_path
+        commons.MODEL_DIR_PATH = self.original_model_dir_path
+        shutil.rmtree(self.test_data_dir, ignore_errors=True)
+
+    def test_gen_synthetic_prints_summary(self):
+        argv = ['pcm_cli.py', '--quiet', 'gen-synthetic', 'scale', '--cyclists', '25', '--changes', '2',
+                '--stats-per-change', '5', '--history-depth', '1']
+
+        with patch('sys.stdout', new_callable=StringIO) as stdout, patch('sys.argv', argv):
+            exit_code = pcm_cli.main()
+
+        summary = json.loads(stdout.getvalue().strip().splitlines()[-1])
+        assert exit_code == 0
+        assert summary['cyclists'] == 25
+        assert summary['pending_changes'] == 2
+        assert len(os.listdir(commons.get_path('scale', 'changes_dir'))) == 3
+
+    def test_gen_synthetic_requires_namespace(self):
+        with patch('sys.stdout', new_callable=StringIO), patch('sys.argv', ['pcm_cli.py', 'gen-synthetic']):
+            assert pcm_cli.main() == 1
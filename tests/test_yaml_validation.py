@@ -1,3 +1,4 @@
+import logging
 import os
 import pytest
 import shutil
@@ -15,6 +16,7 @@ sys.path.insert(0, project_root)
 
 from src.pcm_cli import validate_yaml_files
 from src.utils import commons
+from src.utils.logs import configure_logging
 
 
 class TestYamlValidation:
@@ -33,6 +35,9 @@ class TestYamlValidation:
         # Change to test directory
         os.chdir(self.test_data_dir)
         
+        # Log to stdout like the CLI
+        configure_logging()
+        
     def teardown_method(self):
         """Clean up test environment after each test."""
         # Restore original settings
@@ -151,6 +156,19 @@ class TestYamlValidation:
         assert "❌" in output
         assert "Missing required fields" in output
     
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_validate_yaml_files_quiet_lists_failed_files(self, mock_stdout):
+        """Test that --quiet still lists the files that failed validation and why."""
+        self.create_test_namespace("quiet_namespace", {"missing-fields-change": {"author": "Test Author"}}, {})
+        
+        configure_logging(logging.WARNING)
+        result = validate_yaml_files()
+        
+        assert result is False
+        output = mock_stdout.getvalue()
+        assert "   - missing-fields-change/change.yaml: Change file validation error: Missing required fields" in output
+        assert "All YAML files passed validation" not in output
+    
     @patch('sys.stdout', new_callable=StringIO)
     def test_validate_yaml_files_missing_required_fields_stats(self, mock_stdout):
         """Test validation with stats file missing required fields."""